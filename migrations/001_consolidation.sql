@@ -35,6 +35,9 @@ CREATE TABLE IF NOT EXISTS arkham_vectors.collections (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     last_reindex TIMESTAMP,
     vector_count INTEGER DEFAULT 0,
+    hnsw_m INTEGER,
+    hnsw_ef_construction INTEGER,
+    hnsw_ef_search INTEGER,
     CONSTRAINT valid_metric CHECK (distance_metric IN ('cosine', 'euclidean', 'dot')),
     CONSTRAINT valid_index CHECK (index_type IN ('ivfflat', 'hnsw', 'none'))
 );
@@ -271,6 +274,27 @@ CREATE TRIGGER trg_job_status
     FOR EACH ROW
     EXECUTE FUNCTION arkham_jobs.notify_job_status();
 
+-- Notify on any transition into a terminal state (wakes wait_for_result callers)
+CREATE OR REPLACE FUNCTION arkham_jobs.notify_job_finished()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.status IN ('completed', 'failed', 'dead')
+       AND OLD.status IS DISTINCT FROM NEW.status THEN
+        PERFORM pg_notify('arkham_job_finished', json_build_object(
+            'job_id', NEW.id,
+            'status', NEW.status
+        )::text);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_job_finished ON arkham_jobs.jobs;
+CREATE TRIGGER trg_job_finished
+    AFTER UPDATE OF status ON arkham_jobs.jobs
+    FOR EACH ROW
+    EXECUTE FUNCTION arkham_jobs.notify_job_finished();
+
 -- Notify on worker state change
 CREATE OR REPLACE FUNCTION arkham_jobs.notify_worker_event()
 RETURNS TRIGGER AS $$
@@ -445,6 +469,7 @@ BEGIN
     RAISE NOTICE '  - arkham_job_available';
     RAISE NOTICE '  - arkham_job_completed';
     RAISE NOTICE '  - arkham_job_failed';
+    RAISE NOTICE '  - arkham_job_finished';
     RAISE NOTICE '  - arkham_worker_event';
     RAISE NOTICE '===========================================';
 END;
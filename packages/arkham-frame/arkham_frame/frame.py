@@ -162,6 +162,15 @@ class ArkhamFrame:
             await self.events.initialize()
             logger.info("EventBus initialized")
 
+            # Durable outbox for events that must survive restarts (set
+            # events.outbox to false to run on the in-process bus only)
+            if self.config.get("events.outbox", True):
+                try:
+                    await self.events.initialize_outbox(self.config.database_url)
+                    logger.info("EventOutbox initialized")
+                except Exception as e:
+                    logger.warning(f"EventOutbox failed to initialize: {e}")
+
             # Connect event bus to AI Analyst for audit trail
             if self.ai_analyst:
                 self.ai_analyst.set_event_bus(self.events)
@@ -0,0 +1,160 @@
+"""
+Pagination - Opaque keyset (seek) cursors shared by shards.
+
+OFFSET pagination makes the database read and discard every skipped row,
+so page N costs O(N). A keyset cursor instead records the sort key of the
+last row served, and the next page starts with a WHERE clause that an
+index on (sort column, id) can seek to directly. NULL sort values sort last in
+both directions and are read in a separate phase, so no condition needs
+an OR that the planner cannot turn into an index range.
+
+Cursors are URL-safe base64 JSON. They are not signed: they carry only
+positions, never permissions, and every query still applies its own
+tenant and project filters.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Cursor token is malformed or belongs to a different query."""
+    pass
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        if "$d" in value:
+            return date.fromisoformat(value["$d"])
+    return value
+
+
+def encode_cursor(**fields: Any) -> str:
+    """Encode cursor fields (JSON values, datetimes or dates) as a token."""
+    payload = {key: _encode_value(value) for key, value in fields.items()}
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, **expected: Any) -> Dict[str, Any]:
+    """
+    Decode a cursor token.
+
+    Args:
+        token: Token from encode_cursor
+        **expected: Fields that must match (e.g. the sort the cursor was
+            issued for); a mismatch raises InvalidCursorError
+
+    Returns:
+        Dict of cursor fields
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+    if not isinstance(payload, dict):
+        raise InvalidCursorError("Malformed cursor")
+
+    try:
+        fields = {key: _decode_value(value) for key, value in payload.items()}
+    except ValueError as e:
+        raise InvalidCursorError("Malformed cursor") from e
+
+    for key, value in expected.items():
+        if fields.get(key) != value:
+            raise InvalidCursorError(f"Cursor was issued for a different {key}")
+    return fields
+
+
+def keyset_condition(
+    column: str,
+    id_column: str,
+    descending: bool,
+    value: Any,
+    last_id: Any,
+    param_prefix: str = "cursor",
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    WHERE condition selecting rows after (value, last_id) in one phase.
+
+    A non-null position gives a row comparison, so a btree on
+    (column, id_column) can seek; it never matches NULL sort values,
+    which are served by a separate phase (see keyset_phases). A null
+    position pages through the NULL rows by id_column.
+
+    Args:
+        column: Sort column (trusted SQL identifier)
+        id_column: Unique tiebreaker column (trusted SQL identifier)
+        descending: Sort direction
+        value: Sort value of the last row served (may be None)
+        last_id: Tiebreaker value of the last row served
+        param_prefix: Prefix for the named parameters
+
+    Returns:
+        (sql, params) using :name placeholders
+    """
+    v, i = f"{param_prefix}_value", f"{param_prefix}_id"
+    op = "<" if descending else ">"
+    params: Dict[str, Any] = {i: last_id}
+
+    if value is None:
+        return f"({column} IS NULL AND {id_column} {op} :{i})", params
+
+    params[v] = value
+    return f"(({column}, {id_column}) {op} (:{v}, :{i}))", params
+
+
+def keyset_phases(
+    column: str,
+    id_column: str,
+    descending: bool,
+    position: Optional[Tuple[Any, Any]] = None,
+    param_prefix: str = "cursor",
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    WHERE conditions for the remaining phases of a NULLS LAST ordering.
+
+    Rows with a sort value come first, then rows whose sort value is NULL,
+    in both directions. Run each phase with ORDER BY column {dir},
+    id_column {dir} until the page is full; every phase is a plain
+    index range, unlike an OR across NULL and non-NULL rows.
+
+    Args:
+        column: Sort column (trusted SQL identifier)
+        id_column: Unique tiebreaker column (trusted SQL identifier)
+        descending: Sort direction
+        position: (value, last_id) of the last row served, or None for
+            the first page
+        param_prefix: Prefix for the named parameters
+
+    Returns:
+        List of (sql, params) using :name placeholders
+    """
+    nulls = (f"({column} IS NULL)", {})
+    if position is None:
+        return [(f"({column} IS NOT NULL)", {}), nulls]
+
+    value, last_id = position
+    condition = keyset_condition(column, id_column, descending, value, last_id, param_prefix)
+    return [condition] if value is None else [condition, nulls]
+
+
+def next_cursor(rows_returned: int, limit: int, **fields: Any) -> Optional[str]:
+    """Token for the following page, or None when this page was the last."""
+    if rows_returned < limit:
+        return None
+    return encode_cursor(**fields)
@@ -58,6 +58,7 @@ from .vectors import (
     DistanceMetric,
     EMBEDDING_DIMENSIONS,
 )
+from .embedding_executor import EmbeddingExecutor, EmbeddingExecutorError
 from .llm import (
     LLMService,
     LLMError,
@@ -77,7 +78,7 @@ from .chunks import (
     ChunkConfig,
     ChunkStrategy,
 )
-from .events import EventBus, EventValidationError, EventDeliveryError
+from .events import EventBus, EventOutbox, EventValidationError, EventDeliveryError
 from .workers import WorkerService, WorkerError, WorkerNotFoundError, QueueUnavailableError
 from .resources import (
     ResourceService,
@@ -157,6 +158,7 @@ __all__ = [
     "LLMService",
     "ChunkService",
     "EventBus",
+    "EventOutbox",
     "WorkerService",
     "ResourceService",
     "StorageService",
@@ -178,6 +180,8 @@ __all__ = [
     "VectorSearchResult",
     "DistanceMetric",
     "EMBEDDING_DIMENSIONS",
+    "EmbeddingExecutor",
+    "EmbeddingExecutorError",
     # LLM types
     "LLMResponse",
     "StreamChunk",
@@ -2,11 +2,133 @@
 DatabaseService - PostgreSQL database access with schema isolation.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Callable
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from collections import OrderedDict
+from functools import lru_cache
+import json
 import logging
+import os
+import re
+import time
 
 logger = logging.getLogger(__name__)
 
+# Execution backends for execute/fetch_one/fetch_all
+BACKEND_SQLALCHEMY = "sqlalchemy"
+BACKEND_ASYNCPG = "asyncpg"
+
+# Upper bound on SQL strings whose parameter types are remembered
+_PARAM_TYPES_CACHE_SIZE = 1024
+
+# Matches string literals, quoted identifiers and :: casts (left untouched)
+# as well as :name bind parameters (rewritten to asyncpg $N placeholders).
+_BIND_PARAM_RE = re.compile(
+    r"('(?:[^']|'')*')"
+    r'|("(?:[^"]|"")*")'
+    r"|(::)"
+    r"|(?<![:\w]):([A-Za-z_][A-Za-z0-9_]*)"
+)
+
+
+@lru_cache(maxsize=1024)
+def _compile_for_asyncpg(query: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Rewrite a :name style query into asyncpg's positional $N form.
+
+    Returns the rewritten query and the parameter names in positional order.
+    A name used more than once maps to the same placeholder. Results are
+    cached, so repeated shard queries only pay for the rewrite once.
+    """
+    names: List[str] = []
+
+    def _replace(match: re.Match) -> str:
+        name = match.group(4)
+        if name is None:
+            return match.group(0)
+        if name not in names:
+            names.append(name)
+        return f"${names.index(name) + 1}"
+
+    return _BIND_PARAM_RE.sub(_replace, query), tuple(names)
+
+
+def _encode_json(value: Any) -> str:
+    """
+    Encode a json/jsonb parameter for asyncpg.
+
+    Shards pass jsonb values pre-serialized (json.dumps(...) into
+    CAST(:x AS jsonb)), which is what the SQLAlchemy path expects, so strings
+    are sent as-is; only Python structures are serialized here.
+    """
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, default=str)
+
+
+# Binary-format codecs, so json/jsonb also work with binary COPY
+# (copy_records); jsonb's binary form is a version byte and the text.
+def _encode_jsonb(value: Any) -> bytes:
+    return b"\x01" + _encode_json(value).encode()
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    return json.loads(data[1:])
+
+
+def _encode_json_binary(value: Any) -> bytes:
+    return _encode_json(value).encode()
+
+
+_TIMESTAMP_TYPES = {"timestamp", "timestamptz"}
+_INT_TYPES = {"int2", "int4", "int8", "oid"}
+_FLOAT_TYPES = {"float4", "float8"}
+_TEXT_TYPES = {"text", "varchar", "bpchar", "name"}
+
+
+def _coerce_param(type_name: str, value: Any) -> Any:
+    """
+    Adapt a parameter to what asyncpg's codec for type_name accepts.
+
+    The SQLAlchemy path sends parameters as literals that PostgreSQL parses,
+    so existing callers pass ISO strings for timestamps, numbers for text
+    columns and so on. asyncpg's binary codecs reject those; the common
+    cases are converted here and anything else is left to asyncpg.
+    """
+    if value is None:
+        return None
+    if type_name in _TIMESTAMP_TYPES:
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        elif isinstance(value, date) and not isinstance(value, datetime):
+            value = datetime.combine(value, datetime.min.time())
+        if type_name == "timestamp" and isinstance(value, datetime) and value.tzinfo:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    if type_name == "date":
+        if isinstance(value, str):
+            return datetime.fromisoformat(value.strip().replace("Z", "+00:00")).date()
+        if isinstance(value, datetime):
+            return value.date()
+        return value
+    if type_name in _INT_TYPES and isinstance(value, str):
+        return int(value)
+    if type_name in _FLOAT_TYPES and isinstance(value, (str, Decimal)):
+        return float(value)
+    if type_name == "numeric" and isinstance(value, (str, float, int)) and not isinstance(value, bool):
+        return Decimal(str(value))
+    if type_name == "bool" and isinstance(value, str):
+        return value.strip().lower() in ("true", "t", "1", "yes", "on")
+    if type_name in _TEXT_TYPES and not isinstance(value, str):
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, default=str)
+        return str(value)
+    return value
+
 
 class DatabaseError(Exception):
     """Base database error."""
@@ -31,11 +153,171 @@ class QueryExecutionError(DatabaseError):
         super().__init__(f"{message} - Query: {query[:100]}")
 
 
+class PoolMetrics:
+    """Connection checkout metrics for the native asyncpg pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.total_query_ms = 0.0
+        self.queries = 0
+        self.errors = 0
+
+    def record_checkout(self, wait_ms: float) -> None:
+        self.checkouts += 1
+        self.in_use += 1
+        self.max_in_use = max(self.max_in_use, self.in_use)
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def record_release(self, query_ms: float, failed: bool) -> None:
+        self.in_use -= 1
+        self.queries += 1
+        self.total_query_ms += query_ms
+        if failed:
+            self.errors += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "in_use": self.in_use,
+            "max_in_use": self.max_in_use,
+            "avg_wait_ms": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 3),
+            "avg_query_ms": round(self.total_query_ms / self.queries, 3) if self.queries else 0.0,
+            "queries": self.queries,
+            "errors": self.errors,
+        }
+
+
+class DatabaseTransaction:
+    """
+    Statements on one connection inside one open transaction.
+
+    Obtained from DatabaseService.transaction(); takes the same :name / ?
+    parameter styles as the service.
+    """
+
+    def __init__(self, service: "DatabaseService", conn, native: bool):
+        self._service = service
+        self._conn = conn
+        self._native = native  # asyncpg connection, else SQLAlchemy
+        self._after_commit: List[Callable] = []
+
+    def after_commit(self, callback: Callable) -> None:
+        """
+        Run callback once the transaction has committed.
+
+        Callbacks run in registration order and may be async; they are
+        dropped if the transaction rolls back.
+        """
+        self._after_commit.append(callback)
+
+    async def _run_after_commit(self) -> None:
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                result = callback()
+                if hasattr(result, "__await__"):
+                    await result
+            except Exception as e:
+                logger.error(f"After-commit callback failed: {e}")
+
+    async def _run(self, method: str, query: str, params):
+        if self._native:
+            return await self._service._run_on(self._conn, method, query, params)
+        try:
+            from sqlalchemy import text
+            query, params = self._service._convert_params(query, params)
+            return self._conn.execute(text(query), params)
+        except Exception as e:
+            raise QueryExecutionError(str(e), query)
+
+    async def execute(self, query: str, params=None) -> None:
+        """Execute a statement."""
+        await self._run("execute", query, params)
+
+    async def fetch_one(self, query: str, params=None) -> Optional[Dict[str, Any]]:
+        """Fetch a single row."""
+        row = await self._run("fetchrow", query, params)
+        if not self._native:
+            row = row.fetchone()
+            return dict(row._mapping) if row else None
+        return dict(row) if row else None
+
+    async def fetch_all(self, query: str, params=None) -> List[Dict[str, Any]]:
+        """Fetch all rows."""
+        rows = await self._run("fetch", query, params)
+        if not self._native:
+            return [dict(row._mapping) for row in rows.fetchall()]
+        return [dict(row) for row in rows]
+
+    async def copy_records(
+        self,
+        table: str,
+        columns: List[str],
+        records: List[tuple],
+        schema: Optional[str] = None,
+    ) -> None:
+        """
+        Bulk-load records into a table.
+
+        Uses binary COPY on the asyncpg backend and a multi-row INSERT on
+        SQLAlchemy. json/jsonb values are passed as Python structures.
+
+        Args:
+            table: Table name (trusted SQL identifier)
+            columns: Column names, in record order
+            records: Row tuples
+            schema: Schema of the table (default: search path)
+        """
+        if not records:
+            return
+        if self._native:
+            try:
+                await self._conn.copy_records_to_table(
+                    table, records=records, columns=columns, schema_name=schema
+                )
+            except Exception as e:
+                raise QueryExecutionError(str(e), f"COPY {table}")
+            return
+
+        name = f"{schema}.{table}" if schema else table
+        query = (
+            f"INSERT INTO {name} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(f':c{i}' for i in range(len(columns)))})"
+        )
+        try:
+            from sqlalchemy import text
+            self._conn.execute(text(query), [
+                {
+                    f"c{i}": json.dumps(v, default=str) if isinstance(v, (dict, list)) else v
+                    for i, v in enumerate(record)
+                }
+                for record in records
+            ])
+        except Exception as e:
+            raise QueryExecutionError(str(e), query)
+
+
 class DatabaseService:
     """
     Database service with schema isolation.
 
     Each shard gets its own schema (arkham_{shard_name}).
+
+    Queries issued through execute/fetch_one/fetch_all run on one of two
+    backends, selected with ARKHAM_DB_BACKEND (or the database_backend
+    config key):
+        - "sqlalchemy" (default): synchronous engine, blocks the event loop
+        - "asyncpg": native async pool; statements are prepared once per
+          connection and reused from asyncpg's statement cache
+
+    Both accept the same :name / ? parameter styles. Administrative helpers
+    (stats, vacuum, reset) always use the SQLAlchemy engine.
     """
 
     def __init__(self, config):
@@ -43,6 +325,11 @@ class DatabaseService:
         self._engine = None
         self._session_factory = None
         self._connected = False
+        self._pool = None
+        self._backend = BACKEND_SQLALCHEMY
+        self._pool_metrics = PoolMetrics()
+        # SQL text -> parameter types PostgreSQL inferred for it
+        self._param_types: OrderedDict[str, tuple] = OrderedDict()
 
     async def initialize(self) -> None:
         """Initialize database connection."""
@@ -63,13 +350,76 @@ class DatabaseService:
             logger.error(f"Database connection failed: {e}")
             self._connected = False
 
+        backend = os.environ.get("ARKHAM_DB_BACKEND") or self.config.get(
+            "database_backend", BACKEND_SQLALCHEMY
+        )
+        if self._connected and backend == BACKEND_ASYNCPG:
+            await self._initialize_pool()
+
+    async def _initialize_pool(self) -> None:
+        """Create the native asyncpg pool used by the asyncpg backend."""
+        try:
+            import asyncpg
+
+            async def init_connection(conn):
+                """Initialize connection with JSON codecs."""
+                await conn.set_type_codec(
+                    'jsonb',
+                    encoder=_encode_jsonb,
+                    decoder=_decode_jsonb,
+                    schema='pg_catalog',
+                    format='binary'
+                )
+                await conn.set_type_codec(
+                    'json',
+                    encoder=_encode_json_binary,
+                    decoder=json.loads,
+                    schema='pg_catalog',
+                    format='binary'
+                )
+
+            # asyncpg does not understand SQLAlchemy dialect prefixes
+            dsn = re.sub(r"^postgresql\+\w+://", "postgresql://", self.config.database_url)
+
+            self._pool = await asyncpg.create_pool(
+                dsn,
+                min_size=self.config.get("database_pool_min", 2),
+                max_size=self.config.get("database_pool_max", 20),
+                command_timeout=60,
+                statement_cache_size=self.config.get("database_statement_cache", 256),
+                init=init_connection,
+            )
+            self._backend = BACKEND_ASYNCPG
+            logger.info("Database using native asyncpg backend")
+        except Exception as e:
+            logger.warning(f"asyncpg pool unavailable, using SQLAlchemy backend: {e}")
+            self._pool = None
+            self._backend = BACKEND_SQLALCHEMY
+
     async def shutdown(self) -> None:
         """Close database connection."""
+        if self._pool:
+            await self._pool.close()
+            self._pool = None
         if self._engine:
             self._engine.dispose()
         self._connected = False
         logger.info("Database connection closed")
 
+    @property
+    def backend(self) -> str:
+        """Name of the backend serving execute/fetch_one/fetch_all."""
+        return self._backend
+
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Get connection pool checkout metrics for the asyncpg backend."""
+        metrics = {"backend": self._backend}
+        if self._pool:
+            metrics["pool_size"] = self._pool.get_size()
+            metrics["pool_idle"] = self._pool.get_idle_size()
+            metrics.update(self._pool_metrics.to_dict())
+        return metrics
+
     async def is_connected(self) -> bool:
         """Check if database is connected."""
         if not self._connected or not self._engine:
@@ -153,6 +503,7 @@ class DatabaseService:
                 stats["schemas"] = schema_stats
                 stats["total_tables"] = sum(s["tables"] for s in schema_stats)
                 stats["total_rows"] = sum(s["rows"] for s in schema_stats)
+                stats["pool"] = self.get_pool_metrics()
 
         except Exception as e:
             logger.error(f"Failed to get database stats: {e}")
@@ -313,10 +664,121 @@ class DatabaseService:
             return new_query, param_dict
         return query, {}
 
+    @asynccontextmanager
+    async def _checkout(self):
+        """Acquire a pooled asyncpg connection, recording wait and hold times."""
+        started = time.perf_counter()
+        async with self._pool.acquire() as conn:
+            acquired = time.perf_counter()
+            self._pool_metrics.record_checkout((acquired - started) * 1000)
+            failed = False
+            try:
+                yield conn
+            except Exception:
+                failed = True
+                raise
+            finally:
+                self._pool_metrics.record_release(
+                    (time.perf_counter() - acquired) * 1000, failed
+                )
+
+    def _asyncpg_args(self, query: str, params) -> Tuple[str, list]:
+        """Translate a query and its params into asyncpg's positional form."""
+        query, params = self._convert_params(query, params)
+        sql, names = _compile_for_asyncpg(query)
+        try:
+            return sql, [params[name] for name in names]
+        except KeyError as e:
+            raise QueryExecutionError(f"Missing parameter {e}", query)
+
+    @staticmethod
+    def _coerce_args(param_types, args: list, query: str) -> list:
+        """Coerce positional args to the statement's parameter types."""
+        coerced = []
+        for i, (pg_type, value) in enumerate(zip(param_types, args), start=1):
+            try:
+                coerced.append(_coerce_param(pg_type.name, value))
+            except (TypeError, ValueError) as e:
+                raise QueryExecutionError(
+                    f"Invalid value for parameter ${i} ({pg_type.name}): {value!r} ({e})",
+                    query,
+                )
+        return coerced
+
+    async def _run_asyncpg(self, method: str, query: str, params):
+        """
+        Run a query on the asyncpg pool with conn.execute/fetchrow/fetch.
+
+        Arguments are coerced to the parameter types PostgreSQL inferred for
+        the statement (see _run_on).
+        """
+        async with self._checkout() as conn:
+            return await self._run_on(conn, method, query, params)
+
+    async def _run_on(self, conn, method: str, query: str, params):
+        """
+        Run a query on a checked-out asyncpg connection.
+
+        The parameter types of each SQL string are learned once, by running
+        its first call through an explicit prepared statement; later calls
+        go straight to conn.execute/fetchrow/fetch, which asyncpg serves
+        from the connection's statement cache without another Parse.
+        """
+        sql, args = self._asyncpg_args(query, params)
+        try:
+            if not args:
+                return await getattr(conn, method)(sql)
+            param_types = self._param_types.get(sql)
+            if param_types is not None:
+                self._param_types.move_to_end(sql)
+                args = self._coerce_args(param_types, args, query)
+                return await getattr(conn, method)(sql, *args)
+
+            statement = await conn.prepare(sql)
+            param_types = tuple(statement.get_parameters())
+            args = self._coerce_args(param_types, args, query)
+            self._param_types[sql] = param_types
+            if len(self._param_types) > _PARAM_TYPES_CACHE_SIZE:
+                self._param_types.popitem(last=False)
+            # PreparedStatement has no execute(); fetch runs it the same way
+            return await getattr(statement, "fetch" if method == "execute" else method)(*args)
+        except QueryExecutionError:
+            raise
+        except Exception as e:
+            # The statement may have changed meaning (e.g. after DDL)
+            self._param_types.pop(sql, None)
+            raise QueryExecutionError(str(e), query)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Run statements on one connection inside one transaction.
+
+        Yields a DatabaseTransaction. The transaction commits when the block
+        exits and rolls back if it raises; callbacks registered with
+        after_commit() run once the commit succeeded.
+        """
+        if not self._connected:
+            raise DatabaseError("Database not connected")
+        if self._pool:
+            async with self._checkout() as conn:
+                async with conn.transaction():
+                    tx = DatabaseTransaction(self, conn, native=True)
+                    yield tx
+        else:
+            with self._engine.connect() as conn:
+                with conn.begin():
+                    tx = DatabaseTransaction(self, conn, native=False)
+                    yield tx
+        await tx._run_after_commit()
+
     async def execute(self, query: str, params=None) -> None:
         """Execute a query (for DDL, INSERT, UPDATE, DELETE)."""
         if not self._connected:
             raise DatabaseError("Database not connected")
+        if self._pool:
+            await self._run_asyncpg("execute", query, params)
+            return
         try:
             from sqlalchemy import text
             query, params = self._convert_params(query, params)
@@ -326,10 +788,35 @@ class DatabaseService:
         except Exception as e:
             raise QueryExecutionError(str(e), query)
 
+    async def execute_autocommit(self, query: str) -> None:
+        """
+        Execute a statement outside a transaction block.
+
+        For statements PostgreSQL refuses to run inside one, such as
+        CREATE INDEX CONCURRENTLY.
+        """
+        if not self._connected:
+            raise DatabaseError("Database not connected")
+        if self._pool:
+            # Without arguments asyncpg uses the simple query protocol,
+            # which runs the statement in its own implicit transaction
+            await self._run_asyncpg("execute", query, None)
+            return
+        try:
+            from sqlalchemy import text
+            with self._engine.connect() as conn:
+                conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+                conn.execute(text(query))
+        except Exception as e:
+            raise QueryExecutionError(str(e), query)
+
     async def fetch_one(self, query: str, params=None) -> Optional[Dict[str, Any]]:
         """Fetch a single row."""
         if not self._connected:
             raise DatabaseError("Database not connected")
+        if self._pool:
+            row = await self._run_asyncpg("fetchrow", query, params)
+            return dict(row) if row else None
         try:
             from sqlalchemy import text
             query, params = self._convert_params(query, params)
@@ -346,6 +833,9 @@ class DatabaseService:
         """Fetch all rows."""
         if not self._connected:
             raise DatabaseError("Database not connected")
+        if self._pool:
+            rows = await self._run_asyncpg("fetch", query, params)
+            return [dict(row) for row in rows]
         try:
             from sqlalchemy import text
             query, params = self._convert_params(query, params)
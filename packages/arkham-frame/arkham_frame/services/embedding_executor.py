@@ -0,0 +1,223 @@
+"""
+EmbeddingExecutor - Off-loop embedding with dynamic micro-batching.
+
+Local embedding models (sentence-transformers) are CPU/GPU bound and
+synchronous. Calling encode() from a coroutine stalls the event loop for
+the whole forward pass. The executor gives the model its own thread and
+feeds it from a queue:
+
+- Concurrent callers are coalesced: once a request arrives the executor
+  waits up to max_wait_ms for more, then encodes everything as one batch
+  (bounded by max_batch_size texts).
+- Interactive single-text requests (search queries, claim lookups) are
+  taken ahead of bulk chunks, so a re-embedding job does not add its whole
+  backlog to query latency.
+- The queue is bounded; submitters wait when it is full instead of
+  piling unbounded work into memory.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 2.0
+DEFAULT_MAX_QUEUE_SIZE = 256
+
+
+class EmbeddingExecutorError(Exception):
+    """Embedding executor is closed or failed."""
+    pass
+
+
+class EmbeddingExecutor:
+    """
+    Runs an encode function on a dedicated thread with micro-batching.
+
+    Args:
+        encode_fn: Synchronous callable mapping a list of texts to a list
+            of vectors (plain lists, one per text, same order). Runs on the
+            executor thread only, so it may lazily load the model.
+        max_batch_size: Texts per encode call
+        max_wait_ms: How long to hold a batch open for more requests
+        max_queue_size: Pending requests before submitters block
+        name: Thread name prefix
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], List[Any]],
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        name: str = "embedding",
+    ):
+        self._encode_fn = encode_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_queue_size = max(1, max_queue_size)
+        self._name = name
+
+        self._pending: Dict[int, Deque[Tuple[List[str], asyncio.Future]]] = {
+            PRIORITY_INTERACTIVE: deque(),
+            PRIORITY_BULK: deque(),
+        }
+        self._not_empty = asyncio.Event()
+        self._capacity = asyncio.Semaphore(self.max_queue_size)
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._pending_texts = 0
+
+        self._requests = 0
+        self._texts = 0
+        self._batches = 0
+        self._encode_seconds = 0.0
+        self._errors = 0
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed one text at interactive priority."""
+        vectors = await self._submit([text], PRIORITY_INTERACTIVE)
+        return vectors[0]
+
+    async def embed_many(self, texts: List[str], priority: int = PRIORITY_BULK) -> List[List[float]]:
+        """Embed many texts, split into max_batch_size requests."""
+        if not texts:
+            return []
+        chunks = [
+            texts[i:i + self.max_batch_size]
+            for i in range(0, len(texts), self.max_batch_size)
+        ]
+        results = await asyncio.gather(*(self._submit(chunk, priority) for chunk in chunks))
+        return [vector for chunk in results for vector in chunk]
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run a callable on the model thread (e.g. loading or swapping the model)."""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._thread_pool, fn, *args)
+
+    async def close(self) -> None:
+        """Stop the batcher and fail anything still queued."""
+        self._closed = True
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for queue in self._pending.values():
+            while queue:
+                _, future = queue.popleft()
+                if not future.done():
+                    future.set_exception(EmbeddingExecutorError("Embedding executor closed"))
+        if self._thread_pool:
+            self._thread_pool.shutdown(wait=False)
+            self._thread_pool = None
+
+    def queue_depth(self) -> int:
+        """Requests waiting to be batched."""
+        return sum(len(q) for q in self._pending.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics."""
+        return {
+            "requests": self._requests,
+            "texts": self._texts,
+            "batches": self._batches,
+            "avg_batch_size": round(self._texts / self._batches, 2) if self._batches else 0.0,
+            "avg_encode_ms": round(self._encode_seconds * 1000 / self._batches, 2) if self._batches else 0.0,
+            "queue_depth": self.queue_depth(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "max_queue_size": self.max_queue_size,
+            "errors": self._errors,
+        }
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _ensure_started(self) -> None:
+        if self._closed:
+            raise EmbeddingExecutorError("Embedding executor closed")
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self._name)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._batch_loop())
+
+    async def _submit(self, texts: List[str], priority: int) -> List[List[float]]:
+        self._ensure_started()
+        await self._capacity.acquire()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[priority].append((texts, future))
+        self._pending_texts += len(texts)
+        self._requests += 1
+        self._not_empty.set()
+        return await future
+
+    def _take_batch(self) -> List[Tuple[List[str], asyncio.Future]]:
+        """Pop whole requests, interactive first, up to max_batch_size texts."""
+        batch = []
+        size = 0
+        for priority in (PRIORITY_INTERACTIVE, PRIORITY_BULK):
+            queue = self._pending[priority]
+            while queue:
+                texts, _ = queue[0]
+                if batch and size + len(texts) > self.max_batch_size:
+                    return batch
+                batch.append(queue.popleft())
+                self._capacity.release()
+                self._pending_texts -= len(texts)
+                size += len(texts)
+        return batch
+
+    async def _batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._not_empty.wait()
+
+            # Hold the batch open briefly so concurrent callers can join it
+            if self.max_wait and self._pending_texts < self.max_batch_size:
+                await asyncio.sleep(self.max_wait)
+
+            batch = [(texts, f) for texts, f in self._take_batch() if not f.done()]
+            if not self.queue_depth():
+                self._not_empty.clear()
+            if not batch:
+                continue
+
+            texts = [text for request, _ in batch for text in request]
+            started = time.perf_counter()
+            try:
+                vectors = await loop.run_in_executor(self._thread_pool, self._encode_fn, texts)
+            except Exception as e:
+                self._errors += 1
+                logger.error(f"Embedding batch of {len(texts)} texts failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self._batches += 1
+            self._texts += len(texts)
+            self._encode_seconds += time.perf_counter() - started
+
+            offset = 0
+            for request, future in batch:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(request)])
+                offset += len(request)
@@ -1,12 +1,28 @@
 """
 EventBus - Event publishing and subscription.
+
+Subscriptions are compiled into an index (exact-match dict, prefix trie
+for trailing-wildcard patterns like "document.*", and precompiled regexes
+for everything else), so emit does not re-run fnmatch over every pattern.
+Handlers run sequentially by default, or concurrently with per-handler
+timeouts when configured (events.concurrent_dispatch / events.handler_timeout).
+
+Events that must survive a restart go through EventOutbox instead: a
+PostgreSQL table written in the producer's transaction and relayed to
+named consumers whose cursors are persisted.
 """
 
-from typing import Dict, Any, List, Callable, Optional
+from typing import Dict, Any, List, Callable, Optional, Tuple
+from collections import deque
 from datetime import datetime
 from dataclasses import dataclass, field
+from itertools import islice
+import asyncio
 import logging
 import fnmatch
+import json
+import re
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -31,28 +47,635 @@ class Event:
     sequence: int = 0
 
 
+_WILDCARD_CHARS = ("*", "?", "[")
+
+# Upper bound on cached event_type -> handlers lookups
+_MATCH_CACHE_SIZE = 1024
+
+
+class _TrieNode:
+    """Prefix trie node; entries are subscriptions whose prefix ends here."""
+
+    __slots__ = ("children", "entries")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.entries: List[Tuple[int, Callable]] = []
+
+
+class _SubscriptionIndex:
+    """
+    Compiled view of the subscriber table.
+
+    Each subscription keeps an ordinal so matches are returned in the
+    order they would have been found by scanning patterns in insertion
+    order (what sequential dispatch has always done).
+    """
+
+    def __init__(self, subscribers: Dict[str, List[Callable]]):
+        self._exact: Dict[str, List[Tuple[int, Callable]]] = {}
+        self._trie = _TrieNode()
+        self._regexes: List[Tuple[re.Pattern, List[Tuple[int, Callable]]]] = []
+        self._cache: Dict[str, List[Callable]] = {}
+
+        ordinal = 0
+        for pattern, callbacks in subscribers.items():
+            entries = []
+            for callback in callbacks:
+                entries.append((ordinal, callback))
+                ordinal += 1
+            if not entries:
+                continue
+
+            if not any(c in pattern for c in _WILDCARD_CHARS):
+                self._exact.setdefault(pattern, []).extend(entries)
+            elif pattern.endswith("*") and not any(c in pattern[:-1] for c in _WILDCARD_CHARS):
+                node = self._trie
+                for char in pattern[:-1]:
+                    node = node.children.setdefault(char, _TrieNode())
+                node.entries.extend(entries)
+            else:
+                self._regexes.append((re.compile(fnmatch.translate(pattern)), entries))
+
+    def match(self, event_type: str) -> List[Callable]:
+        """Return callbacks subscribed to patterns matching event_type."""
+        cached = self._cache.get(event_type)
+        if cached is not None:
+            return cached
+
+        matched: List[Tuple[int, Callable]] = list(self._exact.get(event_type, ()))
+
+        node = self._trie
+        matched.extend(node.entries)
+        for char in event_type:
+            node = node.children.get(char)
+            if node is None:
+                break
+            matched.extend(node.entries)
+
+        for regex, entries in self._regexes:
+            if regex.match(event_type):
+                matched.extend(entries)
+
+        matched.sort(key=lambda entry: entry[0])
+        callbacks = [callback for _, callback in matched]
+
+        if len(self._cache) >= _MATCH_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[event_type] = callbacks
+        return callbacks
+
+
+OUTBOX_CHANNEL = "arkham_event_outbox"
+
+OUTBOX_SCHEMA_SQL = """
+CREATE SCHEMA IF NOT EXISTS arkham_frame;
+
+CREATE TABLE IF NOT EXISTS arkham_frame.event_outbox (
+    seq BIGSERIAL PRIMARY KEY,
+    event_type VARCHAR(200) NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}',
+    source VARCHAR(100) NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_event_outbox_created
+    ON arkham_frame.event_outbox (created_at);
+
+CREATE TABLE IF NOT EXISTS arkham_frame.event_cursors (
+    consumer VARCHAR(100) PRIMARY KEY,
+    last_seq BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Payload is bound as text and cast so callers' connections need no JSON codec.
+# The NOTIFY is transactional: it is only delivered if the caller commits.
+OUTBOX_INSERT_SQL = f"""
+WITH ins AS (
+    INSERT INTO arkham_frame.event_outbox (event_type, payload, source)
+    VALUES ($1, $2::text::jsonb, $3)
+    RETURNING seq
+)
+SELECT seq, pg_notify('{OUTBOX_CHANNEL}', seq::text) FROM ins
+"""
+
+# Same insert for DatabaseTransaction, which takes :name parameters
+OUTBOX_INSERT_NAMED_SQL = f"""
+WITH ins AS (
+    INSERT INTO arkham_frame.event_outbox (event_type, payload, source)
+    VALUES (:event_type, CAST(:payload AS jsonb), :source)
+    RETURNING seq
+)
+SELECT seq, pg_notify('{OUTBOX_CHANNEL}', seq::text) FROM ins
+"""
+
+
+class _HighWaterMark:
+    """
+    Highest outbox sequence below which every row is known to be visible.
+
+    BIGSERIAL values are handed out at INSERT time but become visible at
+    COMMIT, so a relay reading "seq > cursor" can see 7 before 6 commits
+    and skip 6 for good. The relay only delivers up to the last contiguous
+    sequence; a hole is waited on for gap_timeout seconds and then assumed
+    to be a rolled-back insert.
+    """
+
+    def __init__(self, start: int = 0, gap_timeout: float = 10.0):
+        self.value = start
+        self.gap_timeout = gap_timeout
+        self._holes: Dict[int, float] = {}
+
+    def advance(self, visible_seqs: List[int], now: float) -> int:
+        """Advance over sorted visible sequences > value. Returns the new mark."""
+        expected = self.value + 1
+        for seq in visible_seqs:
+            if seq < expected:
+                continue
+            if seq > expected:
+                first_seen = self._holes.setdefault(expected, now)
+                if now - first_seen < self.gap_timeout:
+                    break
+                logger.debug(f"Outbox gap {expected}..{seq - 1} timed out, skipping")
+            self.value = seq
+            expected = seq + 1
+
+        self._holes = {s: t for s, t in self._holes.items() if s > self.value}
+        return self.value
+
+
+@dataclass
+class _OutboxConsumer:
+    """A durable consumer tracked by a cursor row."""
+    name: str
+    pattern: str
+    handler: Callable
+    batch_size: int
+    start_seq: int
+    regex: re.Pattern = None
+    delivered: int = 0
+    errors: int = 0
+    last_error: Optional[str] = None
+
+
+class EventOutbox:
+    """
+    Transactional outbox for events that must not be lost.
+
+    Producers write events with write() using the same connection (and
+    transaction) as their business change, so the event exists if and only
+    if the change committed. A relay task tails the table, woken by
+    NOTIFY and falling back to polling, and hands each registered consumer
+    its matching events in batches. Consumer progress is a row in
+    event_cursors that only advances after the handler returns, which
+    gives at-least-once delivery across restarts and lets a consumer be
+    replayed from any sequence.
+    """
+
+    def __init__(
+        self,
+        pool=None,
+        database_url: Optional[str] = None,
+        poll_interval: float = 1.0,
+        batch_size: int = 100,
+        gap_timeout: float = 10.0,
+        retention_days: int = 7,
+        cursor_expiry_days: int = 30,
+    ):
+        self._pool = pool
+        self._owns_pool = False
+        self._database_url = database_url
+        self._poll_interval = poll_interval
+        self._batch_size = batch_size
+        self._scan_limit = batch_size * 10
+        self._retention_days = retention_days
+        self._cursor_expiry_days = cursor_expiry_days
+        self._consumers: Dict[str, _OutboxConsumer] = {}
+        self._cursors: Dict[str, int] = {}
+        self._hwm = _HighWaterMark(gap_timeout=gap_timeout)
+        self._wakeup = asyncio.Event()
+        self._relay_task: Optional[asyncio.Task] = None
+        self._running = False
+        self._last_prune = 0.0
+        self._written = 0
+
+    async def initialize(self) -> None:
+        """Create the pool and tables, then start the relay."""
+        if self._pool is None:
+            import asyncpg
+
+            async def init_connection(conn):
+                """Initialize connection with JSON codecs."""
+                for json_type in ("jsonb", "json"):
+                    await conn.set_type_codec(
+                        json_type,
+                        encoder=json.dumps,
+                        decoder=json.loads,
+                        schema="pg_catalog",
+                    )
+
+            # asyncpg does not understand SQLAlchemy dialect prefixes
+            dsn = re.sub(r"^postgresql\+\w+://", "postgresql://", self._database_url)
+            self._pool = await asyncpg.create_pool(
+                dsn,
+                min_size=1,
+                max_size=4,
+                timeout=10,
+                command_timeout=60,
+                init=init_connection,
+            )
+            self._owns_pool = True
+
+        async with self._pool.acquire() as conn:
+            await conn.execute(OUTBOX_SCHEMA_SQL)
+            # Everything already in the table is treated as visible; consumers
+            # behind it catch up from their own cursors. Delivered sequences
+            # cover a table that has been pruned empty.
+            start = await conn.fetchval(
+                """
+                SELECT GREATEST(
+                    (SELECT COALESCE(MAX(seq), 0) FROM arkham_frame.event_outbox),
+                    (SELECT COALESCE(MAX(last_seq), 0) FROM arkham_frame.event_cursors)
+                )
+                """
+            )
+        self._hwm.value = start or 0
+
+        self._running = True
+        self._relay_task = asyncio.create_task(self._relay_loop())
+        logger.info(f"EventOutbox relay started at seq {self._hwm.value}")
+
+    async def shutdown(self) -> None:
+        """Stop the relay and close the pool if we created it."""
+        self._running = False
+        self._wakeup.set()
+        if self._relay_task:
+            self._relay_task.cancel()
+            try:
+                await self._relay_task
+            except asyncio.CancelledError:
+                pass
+            self._relay_task = None
+        if self._owns_pool and self._pool:
+            await self._pool.close()
+            self._pool = None
+
+    async def write(
+        self,
+        conn,
+        event_type: str,
+        payload: Dict[str, Any],
+        source: str,
+    ) -> int:
+        """
+        Append an event inside the caller's transaction.
+
+        Args:
+            conn: A DatabaseTransaction (from DatabaseService.transaction()),
+                or an asyncpg connection inside `async with conn.transaction()`
+            event_type: Event type (e.g. "document.processed")
+            payload: JSON-serializable payload
+            source: Emitting component
+
+        Returns:
+            Outbox sequence number of the event
+        """
+        if not event_type:
+            raise EventValidationError("event_type is required")
+        try:
+            data = json.dumps(payload or {}, default=str)
+        except (TypeError, ValueError) as e:
+            raise EventValidationError(f"Payload is not JSON-serializable: {e}")
+
+        if hasattr(conn, "after_commit"):
+            row = await conn.fetch_one(OUTBOX_INSERT_NAMED_SQL, {
+                "event_type": event_type,
+                "payload": data,
+                "source": source,
+            })
+        else:
+            row = await conn.fetchrow(OUTBOX_INSERT_SQL, event_type, data, source)
+        self._written += 1
+        return row["seq"]
+
+    async def publish(self, event_type: str, payload: Dict[str, Any], source: str) -> int:
+        """Append an event in its own transaction."""
+        async with self._pool.acquire() as conn:
+            return await self.write(conn, event_type, payload, source)
+
+    def register_consumer(
+        self,
+        name: str,
+        pattern: str,
+        handler: Callable,
+        batch_size: Optional[int] = None,
+        start: str = "latest",
+    ) -> None:
+        """
+        Register a durable consumer.
+
+        Args:
+            name: Stable consumer name; its cursor survives restarts
+            pattern: Event type pattern (fnmatch, e.g. "document.*")
+            handler: Callable receiving a list of Event; may be async.
+                Raising leaves the cursor untouched so the batch is retried.
+            batch_size: Max events per handler call
+            start: Where a brand-new consumer begins: "latest" or "earliest"
+        """
+        if start not in ("latest", "earliest"):
+            raise ValueError(f"start must be 'latest' or 'earliest', got {start!r}")
+        self._consumers[name] = _OutboxConsumer(
+            name=name,
+            pattern=pattern,
+            handler=handler,
+            batch_size=batch_size or self._batch_size,
+            start_seq=self._hwm.value if start == "latest" else 0,
+            regex=re.compile(fnmatch.translate(pattern)),
+        )
+        self._cursors.pop(name, None)
+        self._wakeup.set()
+
+    def unregister_consumer(self, name: str) -> None:
+        """Stop delivering to a consumer. Its cursor row is kept."""
+        self._consumers.pop(name, None)
+        self._cursors.pop(name, None)
+
+    async def replay(self, name: str, from_seq: int = 0) -> None:
+        """Rewind a consumer so events with seq >= from_seq are redelivered."""
+        await self._store_cursor(name, max(from_seq - 1, 0))
+        self._wakeup.set()
+
+    async def get_cursors(self) -> Dict[str, int]:
+        """Get the persisted position of every consumer."""
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT consumer, last_seq FROM arkham_frame.event_cursors"
+            )
+        return {row["consumer"]: row["last_seq"] for row in rows}
+
+    async def _store_cursor(self, name: str, seq: int) -> None:
+        async with self._pool.acquire() as conn:
+            await conn.execute(
+                """
+                INSERT INTO arkham_frame.event_cursors (consumer, last_seq, updated_at)
+                VALUES ($1, $2, CURRENT_TIMESTAMP)
+                ON CONFLICT (consumer) DO UPDATE
+                SET last_seq = EXCLUDED.last_seq, updated_at = EXCLUDED.updated_at
+                """,
+                name, seq,
+            )
+        self._cursors[name] = seq
+
+    async def _load_cursor(self, consumer: _OutboxConsumer) -> int:
+        """Read a consumer's cursor, creating it on first registration."""
+        async with self._pool.acquire() as conn:
+            seq = await conn.fetchval(
+                "SELECT last_seq FROM arkham_frame.event_cursors WHERE consumer = $1",
+                consumer.name,
+            )
+        if seq is None:
+            seq = consumer.start_seq
+            await self._store_cursor(consumer.name, seq)
+        self._cursors[consumer.name] = seq
+        return seq
+
+    def _handle_notify(self, conn, pid, channel, payload) -> None:
+        self._wakeup.set()
+
+    async def _relay_loop(self) -> None:
+        """Deliver outbox events until shutdown, reconnecting LISTEN as needed."""
+        listen_conn = None
+        while self._running:
+            try:
+                if listen_conn is None or listen_conn.is_closed():
+                    listen_conn = await self._pool.acquire()
+                    await listen_conn.add_listener(OUTBOX_CHANNEL, self._handle_notify)
+
+                await self.relay_once()
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"EventOutbox relay error: {e}")
+                if listen_conn is not None:
+                    await self._release_listener(listen_conn)
+                    listen_conn = None
+                await asyncio.sleep(self._poll_interval)
+
+        if listen_conn is not None:
+            await self._release_listener(listen_conn)
+
+    async def _release_listener(self, conn) -> None:
+        try:
+            await conn.remove_listener(OUTBOX_CHANNEL, self._handle_notify)
+        except Exception:
+            pass
+        try:
+            await self._pool.release(conn)
+        except Exception:
+            pass
+
+    async def relay_once(self) -> int:
+        """Run one relay pass. Returns the number of events delivered."""
+        async with self._pool.acquire() as conn:
+            seqs = await conn.fetch(
+                """
+                SELECT seq FROM arkham_frame.event_outbox
+                WHERE seq > $1 ORDER BY seq LIMIT $2
+                """,
+                self._hwm.value, self._scan_limit,
+            )
+        hwm = self._hwm.advance([r["seq"] for r in seqs], time.monotonic())
+
+        delivered = 0
+        for consumer in list(self._consumers.values()):
+            cursor = self._cursors.get(consumer.name)
+            if cursor is None:
+                cursor = await self._load_cursor(consumer)
+            if cursor < hwm:
+                delivered += await self._deliver(consumer, cursor, hwm)
+
+        if time.monotonic() - self._last_prune > 3600:
+            await self.prune()
+        return delivered
+
+    async def _deliver(self, consumer: _OutboxConsumer, cursor: int, hwm: int) -> int:
+        """Feed one consumer everything in (cursor, hwm] that matches its pattern."""
+        delivered = 0
+        while cursor < hwm:
+            async with self._pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """
+                    SELECT seq, event_type, payload::text AS payload, source, created_at
+                    FROM arkham_frame.event_outbox
+                    WHERE seq > $1 AND seq <= $2
+                    ORDER BY seq LIMIT $3
+                    """,
+                    cursor, hwm, self._scan_limit,
+                )
+            if not rows:
+                await self._store_cursor(consumer.name, hwm)
+                break
+
+            matching = [
+                Event(
+                    event_type=row["event_type"],
+                    payload=json.loads(row["payload"]),
+                    source=row["source"],
+                    timestamp=row["created_at"],
+                    sequence=row["seq"],
+                )
+                for row in rows
+                if consumer.regex.match(row["event_type"])
+            ]
+
+            for start in range(0, len(matching), consumer.batch_size):
+                batch = matching[start:start + consumer.batch_size]
+                try:
+                    result = consumer.handler(batch)
+                    if hasattr(result, "__await__"):
+                        await result
+                except Exception as e:
+                    consumer.errors += 1
+                    consumer.last_error = str(e)
+                    logger.error(f"Outbox consumer {consumer.name} failed at seq {batch[0].sequence}: {e}")
+                    # Keep what was acknowledged so far; the rest is retried
+                    if start:
+                        await self._store_cursor(consumer.name, matching[start - 1].sequence)
+                    return delivered
+                consumer.delivered += len(batch)
+                delivered += len(batch)
+
+            cursor = rows[-1]["seq"]
+            await self._store_cursor(consumer.name, cursor)
+
+        return delivered
+
+    async def prune(self) -> int:
+        """
+        Delete events every live consumer has seen and that are past retention.
+
+        Cursors of consumers not registered here that have not moved for
+        cursor_expiry_days are expired first, so a consumer that was
+        removed (or a process that never came back) does not hold the
+        table forever.
+        """
+        self._last_prune = time.monotonic()
+        async with self._pool.acquire() as conn:
+            expired = await conn.fetch(
+                """
+                DELETE FROM arkham_frame.event_cursors
+                WHERE updated_at < CURRENT_TIMESTAMP - make_interval(days => $1)
+                  AND NOT (consumer = ANY($2::text[]))
+                RETURNING consumer
+                """,
+                self._cursor_expiry_days, list(self._consumers),
+            )
+            for row in expired:
+                logger.warning(f"Expired stale outbox cursor {row['consumer']}")
+            result = await conn.execute(
+                """
+                DELETE FROM arkham_frame.event_outbox
+                WHERE seq <= (SELECT COALESCE(MIN(last_seq), 0) FROM arkham_frame.event_cursors)
+                  AND created_at < CURRENT_TIMESTAMP - make_interval(days => $1)
+                """,
+                self._retention_days,
+            )
+        count = int(result.split()[-1]) if result else 0
+        if count:
+            logger.info(f"Pruned {count} delivered events from outbox")
+        return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get relay statistics."""
+        return {
+            "running": self._running,
+            "high_water_mark": self._hwm.value,
+            "written": self._written,
+            "consumers": {
+                c.name: {
+                    "pattern": c.pattern,
+                    "cursor": self._cursors.get(c.name),
+                    "delivered": c.delivered,
+                    "errors": c.errors,
+                    "last_error": c.last_error,
+                }
+                for c in self._consumers.values()
+            },
+        }
+
+
 class EventBus:
     """
     Event bus for publish/subscribe messaging.
     """
 
-    def __init__(self, config=None):
+    def __init__(
+        self,
+        config=None,
+        concurrent_dispatch: Optional[bool] = None,
+        handler_timeout: Optional[float] = None,
+    ):
         self.config = config
         self._subscribers: Dict[str, List[Callable]] = {}
-        self._event_history: List[Event] = []
-        self._max_history = 1000
+        self._index: Optional[_SubscriptionIndex] = None
+        self._event_history: deque = deque(maxlen=1000)
         self._sequence = 0
         self._initialized = False
 
+        if concurrent_dispatch is None and config is not None:
+            concurrent_dispatch = config.get("events.concurrent_dispatch", False)
+        if handler_timeout is None and config is not None:
+            handler_timeout = config.get("events.handler_timeout", None)
+        self._concurrent_dispatch = bool(concurrent_dispatch)
+        self._handler_timeout = handler_timeout
+
+        self._handler_errors = 0
+        self._handler_timeouts = 0
+
+        self.outbox: Optional[EventOutbox] = None
+
+    @property
+    def _max_history(self) -> int:
+        return self._event_history.maxlen
+
+    @_max_history.setter
+    def _max_history(self, size: int) -> None:
+        self._event_history = deque(self._event_history, maxlen=size)
+
     async def initialize(self) -> None:
         """Initialize event bus."""
         self._initialized = True
         logger.info("EventBus initialized")
 
+    async def initialize_outbox(self, database_url: Optional[str] = None, pool=None) -> None:
+        """Start the durable outbox relay (see EventOutbox)."""
+        get = self.config.get if self.config is not None else (lambda key, default=None: default)
+        outbox = EventOutbox(
+            pool=pool,
+            database_url=database_url,
+            poll_interval=get("events.outbox_poll_interval", 1.0),
+            batch_size=get("events.outbox_batch_size", 100),
+            retention_days=get("events.outbox_retention_days", 7),
+            cursor_expiry_days=get("events.outbox_cursor_expiry_days", 30),
+        )
+        await outbox.initialize()
+        self.outbox = outbox
+
     async def shutdown(self) -> None:
         """Shutdown event bus."""
+        if self.outbox:
+            await self.outbox.shutdown()
+            self.outbox = None
         self._initialized = False
         self._subscribers.clear()
+        self._index = None
         logger.info("EventBus shut down")
 
     async def subscribe(self, pattern: str, callback: Callable) -> None:
@@ -60,6 +683,7 @@ class EventBus:
         if pattern not in self._subscribers:
             self._subscribers[pattern] = []
         self._subscribers[pattern].append(callback)
+        self._index = None
 
     async def unsubscribe(self, pattern: str, callback: Callable) -> None:
         """Unsubscribe from events."""
@@ -68,6 +692,37 @@ class EventBus:
                 self._subscribers[pattern].remove(callback)
             except ValueError:
                 pass
+            if not self._subscribers[pattern]:
+                del self._subscribers[pattern]
+            self._index = None
+
+    def _match(self, event_type: str) -> List[Callable]:
+        """Look up handlers for an event type, compiling the index if stale."""
+        if self._index is None:
+            self._index = _SubscriptionIndex(self._subscribers)
+        return self._index.match(event_type)
+
+    async def _invoke(self, callback: Callable, event: Dict[str, Any]) -> None:
+        """Run one handler, isolating its errors and enforcing the timeout."""
+        try:
+            if not callable(callback):
+                return
+            result = callback(event)
+            # Handle async callbacks
+            if hasattr(result, "__await__"):
+                if self._handler_timeout:
+                    await asyncio.wait_for(result, timeout=self._handler_timeout)
+                else:
+                    await result
+        except asyncio.TimeoutError:
+            self._handler_timeouts += 1
+            logger.error(
+                f"Event callback timed out after {self._handler_timeout}s "
+                f"for {event['event_type']}: {getattr(callback, '__qualname__', callback)}"
+            )
+        except Exception as e:
+            self._handler_errors += 1
+            logger.error(f"Event callback error: {e}")
 
     async def emit(
         self,
@@ -85,49 +740,104 @@ class EventBus:
             sequence=self._sequence,
         )
 
-        # Add to history
-        self._event_history.insert(0, event)
-        if len(self._event_history) > self._max_history:
-            self._event_history = self._event_history[:self._max_history]
+        # Add to history (most recent first)
+        self._event_history.appendleft(event)
 
         # Deliver to subscribers
-        for pattern, callbacks in self._subscribers.items():
-            if fnmatch.fnmatch(event_type, pattern):
-                for callback in callbacks:
-                    try:
-                        if callable(callback):
-                            result = callback({
-                                "event_type": event_type,
-                                "payload": payload,
-                                "source": source,
-                            })
-                            # Handle async callbacks
-                            if hasattr(result, "__await__"):
-                                await result
-                    except Exception as e:
-                        logger.error(f"Event callback error: {e}")
+        callbacks = self._match(event_type)
+        if not callbacks:
+            return
 
-    def get_events(
+        def make_event() -> Dict[str, Any]:
+            return {
+                "event_type": event_type,
+                "payload": payload,
+                "source": source,
+            }
+
+        if self._concurrent_dispatch and len(callbacks) > 1:
+            await asyncio.gather(*(self._invoke(cb, make_event()) for cb in callbacks))
+        else:
+            for callback in callbacks:
+                await self._invoke(callback, make_event())
+
+    async def emit_durable(
+        self,
+        event_type: str,
+        payload: Dict[str, Any],
+        source: str,
+        transaction=None,
+    ) -> int:
+        """
+        Record an event in the outbox and emit it to in-process subscribers.
+
+        Pass the DatabaseTransaction of the change the event describes to
+        write the event in that transaction; in-process subscribers are then
+        only notified once it commits, and nothing is delivered if it rolls
+        back. Without an outbox the event is only emitted in-process and
+        0 is returned.
+        """
+        seq = 0
+        if self.outbox is not None:
+            if transaction is not None:
+                seq = await self.outbox.write(transaction, event_type, payload, source)
+            else:
+                seq = await self.outbox.publish(event_type, payload, source)
+
+        if transaction is not None:
+            transaction.after_commit(lambda: self.emit(event_type, payload, source))
+        else:
+            await self.emit(event_type, payload, source)
+        return seq
+
+    def consume(
+        self,
+        name: str,
+        pattern: str,
+        handler: Callable,
+        batch_size: Optional[int] = None,
+        start: str = "latest",
+    ) -> None:
+        """Register a durable, batched consumer of outbox events."""
+        if self.outbox is None:
+            raise EventDeliveryError("Event outbox is not initialized")
+        self.outbox.register_consumer(name, pattern, handler, batch_size=batch_size, start=start)
+
+    def stop_consuming(self, name: str) -> None:
+        """Unregister a durable consumer; its cursor is kept for the next run."""
+        if self.outbox is not None:
+            self.outbox.unregister_consumer(name)
+
+    def _filter_history(
         self,
         source: Optional[str] = None,
         event_type: Optional[str] = None,
-        limit: int = 100,
-        offset: int = 0,
-    ) -> List[Event]:
-        """Get recent events with optional filtering."""
-        events = self._event_history
+    ):
+        """Iterate history (most recent first) matching the filters."""
+        events = iter(self._event_history)
 
         if source:
-            events = [e for e in events if e.source == source]
+            events = (e for e in events if e.source == source)
 
         if event_type:
             # Support wildcards in event_type filter
             if "*" in event_type:
-                events = [e for e in events if fnmatch.fnmatch(e.event_type, event_type)]
+                regex = re.compile(fnmatch.translate(event_type))
+                events = (e for e in events if regex.match(e.event_type))
             else:
-                events = [e for e in events if e.event_type == event_type]
+                events = (e for e in events if e.event_type == event_type)
 
-        return events[offset:offset + limit]
+        return events
+
+    def get_events(
+        self,
+        source: Optional[str] = None,
+        event_type: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Event]:
+        """Get recent events with optional filtering."""
+        return list(islice(self._filter_history(source, event_type), offset, offset + limit))
 
     def get_event_types(self) -> List[str]:
         """Get list of unique event types in history."""
@@ -143,18 +853,24 @@ class EventBus:
         event_type: Optional[str] = None,
     ) -> int:
         """Get count of events matching filters."""
-        events = self._event_history
-
-        if source:
-            events = [e for e in events if e.source == source]
-
-        if event_type:
-            if "*" in event_type:
-                events = [e for e in events if fnmatch.fnmatch(e.event_type, event_type)]
-            else:
-                events = [e for e in events if e.event_type == event_type]
+        if not source and not event_type:
+            return len(self._event_history)
+        return sum(1 for _ in self._filter_history(source, event_type))
 
-        return len(events)
+    def get_stats(self) -> Dict[str, Any]:
+        """Get subscription and dispatch statistics."""
+        return {
+            "patterns": len(self._subscribers),
+            "subscriptions": sum(len(cbs) for cbs in self._subscribers.values()),
+            "concurrent_dispatch": self._concurrent_dispatch,
+            "handler_timeout": self._handler_timeout,
+            "handler_errors": self._handler_errors,
+            "handler_timeouts": self._handler_timeouts,
+            "history_size": len(self._event_history),
+            "max_history": self._max_history,
+            "sequence": self._sequence,
+            "outbox": self.outbox.get_stats() if self.outbox else None,
+        }
 
     def clear_history(self) -> int:
         """Clear event history. Returns count of cleared events."""
@@ -1,8 +1,10 @@
 """
-VectorMaintenanceService - Scheduled maintenance for pgvector IVFFlat indexes.
+VectorMaintenanceService - Scheduled maintenance for pgvector IVFFlat/HNSW indexes.
 
 Provides:
-- Weekly scheduled reindexing (Sunday 3 AM by default)
+- Weekly scheduled reindexing (Sunday 3 AM by default), built online with
+  CREATE INDEX CONCURRENTLY so search stays available
+- Reindex progress reporting
 - Nightly health checks (every night at 2 AM)
 - Manual reindex trigger from Settings UI
 - Collection statistics and health reporting
@@ -35,6 +37,7 @@ class ReindexResult:
     status: MaintenanceStatus = MaintenanceStatus.RUNNING
     old_lists: int = 0
     new_lists: int = 0
+    index_type: str = "ivfflat"
     vector_count: int = 0
     duration_seconds: float = 0
     error: Optional[str] = None
@@ -267,10 +270,13 @@ class VectorMaintenanceService:
     # Manual Operations
     # =========================================
 
-    async def reindex_all(self) -> Dict[str, Any]:
+    async def reindex_all(self, index_type: Optional[str] = None) -> Dict[str, Any]:
         """
         Reindex all vector collections.
 
+        Args:
+            index_type: "ivfflat" or "hnsw" to switch index type; None keeps each collection's
+
         Returns:
             Dict with success status and details
         """
@@ -311,11 +317,12 @@ class VectorMaintenanceService:
                     result.vector_count = info.vector_count if hasattr(info, 'vector_count') else 0
 
                     # Perform reindex
-                    reindex_result = await self._vectors.reindex_collection(coll_name)
+                    reindex_result = await self._vectors.reindex_collection(coll_name, index_type=index_type)
 
                     result.completed_at = datetime.utcnow()
                     result.duration_seconds = (result.completed_at - result.started_at).total_seconds()
-                    result.new_lists = reindex_result.get('new_lists', result.old_lists)
+                    result.new_lists = reindex_result.get('lists', result.old_lists)
+                    result.index_type = reindex_result.get('index_type', result.index_type)
                     result.status = MaintenanceStatus.COMPLETED
 
                     logger.info(
@@ -354,12 +361,13 @@ class VectorMaintenanceService:
             self._reindex_in_progress = False
             self._current_operation = None
 
-    async def reindex_collection(self, collection: str) -> Dict[str, Any]:
+    async def reindex_collection(self, collection: str, index_type: Optional[str] = None) -> Dict[str, Any]:
         """
         Reindex a specific collection.
 
         Args:
             collection: Collection name to reindex
+            index_type: "ivfflat" or "hnsw" to switch index type; None keeps the current one
 
         Returns:
             Dict with success status and details
@@ -391,11 +399,12 @@ class VectorMaintenanceService:
             result.vector_count = info.vector_count if hasattr(info, 'vector_count') else 0
 
             # Perform reindex
-            reindex_result = await self._vectors.reindex_collection(collection)
+            reindex_result = await self._vectors.reindex_collection(collection, index_type=index_type)
 
             result.completed_at = datetime.utcnow()
             result.duration_seconds = (result.completed_at - result.started_at).total_seconds()
-            result.new_lists = reindex_result.get('new_lists', result.old_lists)
+            result.new_lists = reindex_result.get('lists', result.old_lists)
+            result.index_type = reindex_result.get('index_type', result.index_type)
             result.status = MaintenanceStatus.COMPLETED
 
             # Add to history
@@ -415,6 +424,7 @@ class VectorMaintenanceService:
                 "collection": collection,
                 "old_lists": result.old_lists,
                 "new_lists": result.new_lists,
+                "index_type": result.index_type,
                 "vector_count": result.vector_count,
                 "duration_seconds": result.duration_seconds,
             }
@@ -469,6 +479,8 @@ class VectorMaintenanceService:
                         "index_type": info.index_type if hasattr(info, 'index_type') else "unknown",
                         "lists": info.lists if hasattr(info, 'lists') else 0,
                         "probes": info.probes if hasattr(info, 'probes') else 0,
+                        "m": getattr(info, 'm', None),
+                        "ef_search": getattr(info, 'ef_search', None),
                         "last_reindex": info.last_reindex.isoformat() if hasattr(info, 'last_reindex') and info.last_reindex else None,
                     }
 
@@ -481,7 +493,12 @@ class VectorMaintenanceService:
                         optimal_lists = self._calculate_optimal_lists(coll_data["vector_count"])
                         current_lists = coll_data["lists"]
 
-                        if current_lists > 0 and abs(current_lists - optimal_lists) / optimal_lists > 0.5:
+                        # lists only applies to IVFFlat; HNSW graphs don't degrade the same way
+                        if (
+                            coll_data["index_type"] == "ivfflat"
+                            and current_lists > 0
+                            and abs(current_lists - optimal_lists) / optimal_lists > 0.5
+                        ):
                             result.warnings.append(
                                 f"{coll_name}: lists={current_lists} may be suboptimal "
                                 f"(suggested ~{optimal_lists} for {coll_data['vector_count']} vectors)"
@@ -540,8 +557,15 @@ class VectorMaintenanceService:
             "last_health_check": self._last_health_check.isoformat() if self._last_health_check else None,
             "config": self._config,
             "initialized": self._initialized,
+            "reindex_progress": self.get_reindex_progress(),
         }
 
+    def get_reindex_progress(self) -> Dict[str, Any]:
+        """Per-collection progress of the current or last index build."""
+        if not self._vectors or not hasattr(self._vectors, "get_reindex_progress"):
+            return {}
+        return self._vectors.get_reindex_progress()
+
     def get_reindex_history(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get reindex operation history."""
         return [
@@ -552,6 +576,7 @@ class VectorMaintenanceService:
                 "status": r.status.value,
                 "old_lists": r.old_lists,
                 "new_lists": r.new_lists,
+                "index_type": r.index_type,
                 "vector_count": r.vector_count,
                 "duration_seconds": r.duration_seconds,
                 "error": r.error,
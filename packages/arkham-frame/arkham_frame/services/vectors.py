@@ -1,5 +1,5 @@
 """
-VectorService - pgvector vector store with IVFFlat indexes and embedding.
+VectorService - pgvector vector store with IVFFlat/HNSW indexes and embedding.
 
 Provides vector storage, similarity search, and embedding generation
 for semantic search capabilities using PostgreSQL + pgvector.
@@ -7,11 +7,14 @@ for semantic search capabilities using PostgreSQL + pgvector.
 Uses a single-database architecture with pgvector extension.
 """
 
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+import asyncio
 import logging
+import struct
+import time
 import uuid
 import json
 
@@ -57,6 +60,15 @@ class CollectionInfo:
     lists: int = 100
     probes: int = 10
     last_reindex: Optional[datetime] = None
+    # HNSW specific
+    m: Optional[int] = None
+    ef_construction: Optional[int] = None
+    ef_search: Optional[int] = None
+
+    @property
+    def vector_count(self) -> int:
+        """Alias for points_count used by maintenance and settings."""
+        return self.points_count
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -70,6 +82,9 @@ class CollectionInfo:
             "index_type": self.index_type,
             "lists": self.lists,
             "probes": self.probes,
+            "m": self.m,
+            "ef_construction": self.ef_construction,
+            "ef_search": self.ef_search,
             "last_reindex": self.last_reindex.isoformat() if self.last_reindex else None,
         }
 
@@ -172,6 +187,160 @@ CLOUD_EMBEDDING_MODELS = {
 # Combined lookup for backwards compatibility
 EMBEDDING_DIMENSIONS = {**LOCAL_EMBEDDING_MODELS, **CLOUD_EMBEDDING_MODELS}
 
+# Batches at least this large go through binary COPY instead of executemany
+BULK_UPSERT_THRESHOLD = 256
+
+# Index types a collection can be built with
+INDEX_TYPES = ("ivfflat", "hnsw")
+
+# pgvector operator class per distance metric
+DISTANCE_OPS = {
+    "cosine": "vector_cosine_ops",
+    "euclidean": "vector_l2_ops",
+    "dot": "vector_ip_ops",
+}
+
+# HNSW needs pgvector 0.5.0+
+HNSW_MIN_PGVECTOR_VERSION = (0, 5, 0)
+
+# Query vectors per LATERAL search statement
+SEARCH_BATCH_MAX_QUERIES = 128
+
+# Collection metadata rarely changes, so searches read it from a process-wide
+# cache instead of the database. Entries expire after a TTL so changes made
+# by other processes are picked up.
+_collection_meta_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def encode_vector_binary(value) -> bytes:
+    """
+    Encode a vector in pgvector's binary wire format.
+
+    Layout: uint16 dimensions, uint16 unused, then float32 values, all
+    big-endian. Accepts lists, numpy arrays, or the '[1,2,3]' text form.
+    """
+    if isinstance(value, str):
+        value = json.loads(value)
+    if hasattr(value, "astype"):
+        return struct.pack(">HH", len(value), 0) + value.astype(">f4").tobytes()
+    return struct.pack(f">HH{len(value)}f", len(value), 0, *value)
+
+
+def decode_vector_binary(data: bytes) -> List[float]:
+    """Decode pgvector's binary wire format into a list of floats."""
+    dim, _ = struct.unpack_from(">HH", data)
+    return list(struct.unpack_from(f">{dim}f", data, 4))
+
+
+# Schema the pgvector extension put the vector type in
+VECTOR_TYPE_SCHEMA_SQL = """
+    SELECT n.nspname FROM pg_type t
+    JOIN pg_namespace n ON n.oid = t.typnamespace
+    WHERE t.typname = 'vector'
+"""
+
+
+async def register_vector_codec(conn) -> Optional[str]:
+    """
+    Send and receive vectors on a connection in pgvector's binary format.
+
+    Meant for the pool's per-connection init: changing a codec later
+    clears the connection's prepared statement cache. Text parameters
+    such as '[1,2,3]' are still accepted.
+
+    Returns:
+        Schema of the vector type, or None if pgvector is not installed
+    """
+    schema = await conn.fetchval(VECTOR_TYPE_SCHEMA_SQL)
+    if schema:
+        await conn.set_type_codec(
+            "vector",
+            schema=schema,
+            encoder=encode_vector_binary,
+            decoder=decode_vector_binary,
+            format="binary",
+        )
+    return schema
+
+
+@dataclass
+class ReindexProgress:
+    """Progress of an online index rebuild, read from pg_stat_progress_create_index."""
+    collection: str
+    index_type: str
+    index_name: str
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    phase: str = "pending"
+    blocks_done: int = 0
+    blocks_total: int = 0
+    tuples_done: int = 0
+    tuples_total: int = 0
+    status: str = "running"  # running, swapping, completed, failed
+    error: Optional[str] = None
+
+    @property
+    def percent(self) -> float:
+        """Best available completion estimate (tuples, then blocks)."""
+        if self.status == "completed":
+            return 100.0
+        if self.tuples_total:
+            return round(100.0 * self.tuples_done / self.tuples_total, 1)
+        if self.blocks_total:
+            return round(100.0 * self.blocks_done / self.blocks_total, 1)
+        return 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "collection": self.collection,
+            "index_type": self.index_type,
+            "index_name": self.index_name,
+            "started_at": self.started_at.isoformat(),
+            "phase": self.phase,
+            "blocks_done": self.blocks_done,
+            "blocks_total": self.blocks_total,
+            "tuples_done": self.tuples_done,
+            "tuples_total": self.tuples_total,
+            "percent": self.percent,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class BulkIngestStats:
+    """Throughput counters for the COPY ingestion path."""
+
+    def __init__(self):
+        self.batches = 0
+        self.rows = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.fallbacks = 0
+
+    def record(self, rows: int, nbytes: int, seconds: float) -> None:
+        self.batches += 1
+        self.rows += rows
+        self.bytes += nbytes
+        self.seconds += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "rows_per_sec": round(self.rows / self.seconds, 1) if self.seconds else 0.0,
+            "bytes_per_sec": round(self.bytes / self.seconds, 1) if self.seconds else 0.0,
+            "fallbacks": self.fallbacks,
+        }
+
+
+def invalidate_collection_cache(name: Optional[str] = None) -> None:
+    """Drop cached metadata for one collection, or all of them."""
+    if name is None:
+        _collection_meta_cache.clear()
+    else:
+        _collection_meta_cache.pop(name, None)
+
 
 class VectorService:
     """
@@ -180,7 +349,8 @@ class VectorService:
     Provides:
         - Collection management (create, delete, list) via PostgreSQL
         - Vector operations (upsert, delete, search) via pgvector
-        - IVFFlat indexes with configurable lists/probes
+        - IVFFlat (lists/probes) or HNSW (m/ef_search) partial indexes
+        - Online reindex with CREATE INDEX CONCURRENTLY and progress reporting
         - Batch operations for performance
         - Optional local or cloud embedding generation
     """
@@ -204,14 +374,33 @@ class VectorService:
         self._cloud_api_url = None
         # IVFFlat default recall target
         self._target_recall = 0.95
+        # Binary COPY ingestion
+        self._vector_type_schema = None
+        self._bulk_threshold = BULK_UPSERT_THRESHOLD
+        if config is not None:
+            self._bulk_threshold = config.get("vectors.bulk_threshold", BULK_UPSERT_THRESHOLD)
+        self._bulk_stats = BulkIngestStats()
+        # Local model runs on its own thread behind a micro-batching queue
+        self._embedding_executor = None
+        # Online reindex state
+        self._pgvector_version: Tuple[int, ...] = ()
+        self._reindex_progress: Dict[str, ReindexProgress] = {}
+        self._reindex_poll_interval = 1.0
+        self._reindex_work_mem = None
+        if config is not None:
+            self._reindex_poll_interval = config.get("vectors.reindex_poll_interval", 1.0)
+            self._reindex_work_mem = config.get("vectors.reindex_maintenance_work_mem", None)
+        self._meta_cache_ttl = 300.0
+        if config is not None:
+            self._meta_cache_ttl = config.get("vectors.metadata_cache_ttl", 300.0)
 
     async def initialize(self) -> None:
         """Initialize PostgreSQL/pgvector connection and optional embedding model."""
         import asyncpg
 
-        # JSON codec setup for asyncpg
+        # JSON and vector codec setup for asyncpg
         async def init_connection(conn):
-            """Initialize connection with JSON codecs."""
+            """Initialize connection with JSON and binary vector codecs."""
             await conn.set_type_codec(
                 'jsonb',
                 encoder=json.dumps,
@@ -224,6 +413,7 @@ class VectorService:
                 decoder=json.loads,
                 schema='pg_catalog'
             )
+            await register_vector_codec(conn)
 
         # Initialize PostgreSQL connection pool
         try:
@@ -236,7 +426,7 @@ class VectorService:
                 min_size=2,
                 max_size=10,
                 command_timeout=60,
-                init=init_connection,  # Set up JSON codecs for each connection
+                init=init_connection,  # Set up codecs once for each connection
             )
 
             # Verify pgvector extension is available
@@ -250,6 +440,23 @@ class VectorService:
                 # Register vector type
                 await conn.execute("SELECT '[1,2,3]'::vector")  # Test vector type
 
+                # Schema the extension put the type in; binary COPY needs
+                # the vector codec registered there
+                self._vector_type_schema = await conn.fetchval(VECTOR_TYPE_SCHEMA_SQL)
+
+                version = await conn.fetchval(
+                    "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+                )
+                self._pgvector_version = self._parse_version(version)
+
+                # HNSW tuning columns (absent on databases created by 001_consolidation)
+                await conn.execute("""
+                    ALTER TABLE arkham_vectors.collections
+                        ADD COLUMN IF NOT EXISTS hnsw_m INTEGER,
+                        ADD COLUMN IF NOT EXISTS hnsw_ef_construction INTEGER,
+                        ADD COLUMN IF NOT EXISTS hnsw_ef_search INTEGER
+                """)
+
             self._available = True
             logger.info(f"pgvector connected: {database_url.split('@')[-1]}")
 
@@ -340,6 +547,7 @@ class VectorService:
 
             self._embedding_available = True
             self._use_cloud_embeddings = False
+            self._start_embedding_executor()
             logger.info(f"Local embedding model loaded: {model_name} (dim={self._default_dimension})")
 
         except ImportError:
@@ -444,8 +652,37 @@ class VectorService:
             except Exception as e:
                 logger.warning(f"Failed to ensure collection {collection_name}: {e}")
 
+    def _start_embedding_executor(self) -> None:
+        """Create the executor that owns local model inference."""
+        if self._embedding_executor is not None:
+            return
+
+        from .embedding_executor import (
+            EmbeddingExecutor,
+            DEFAULT_MAX_BATCH_SIZE,
+            DEFAULT_MAX_WAIT_MS,
+            DEFAULT_MAX_QUEUE_SIZE,
+        )
+
+        get = self.config.get if self.config is not None else (lambda key, default=None: default)
+        self._embedding_executor = EmbeddingExecutor(
+            self._encode_local,
+            max_batch_size=get("vectors.embed_max_batch_size", DEFAULT_MAX_BATCH_SIZE),
+            max_wait_ms=get("vectors.embed_max_wait_ms", DEFAULT_MAX_WAIT_MS),
+            max_queue_size=get("vectors.embed_max_queue_size", DEFAULT_MAX_QUEUE_SIZE),
+            name="vector-embed",
+        )
+
+    def _encode_local(self, texts: List[str]) -> List[List[float]]:
+        """Encode with the local model. Runs on the executor thread."""
+        embeddings = self._embedding_model.encode(texts, convert_to_numpy=True)
+        return [e.tolist() for e in embeddings]
+
     async def shutdown(self) -> None:
         """Close PostgreSQL connection pool."""
+        if self._embedding_executor:
+            await self._embedding_executor.close()
+            self._embedding_executor = None
         if self._pool:
             await self._pool.close()
         self._pool = None
@@ -463,7 +700,7 @@ class VectorService:
         return self._embedding_available
 
     # =========================================================================
-    # IVFFlat Parameter Helpers
+    # Index Parameter Helpers
     # =========================================================================
 
     def _optimal_lists(self, expected_rows: int) -> int:
@@ -487,6 +724,78 @@ class VectorService:
         else:
             return max(5, lists // 10)
 
+    def _optimal_hnsw_params(self, expected_rows: int) -> Tuple[int, int]:
+        """Calculate HNSW (m, ef_construction) for the expected collection size."""
+        if expected_rows < 100_000:
+            m = 16
+        elif expected_rows < 1_000_000:
+            m = 24
+        else:
+            m = 32
+        return m, max(64, m * 4)
+
+    def _optimal_ef_search(self, m: int, target_recall: float = None) -> int:
+        """Calculate HNSW ef_search for target recall."""
+        if target_recall is None:
+            target_recall = self._target_recall
+
+        if target_recall >= 0.99:
+            return max(200, m * 10)
+        elif target_recall >= 0.95:
+            return max(100, m * 5)
+        else:
+            return max(40, m * 2)
+
+    @staticmethod
+    def _parse_version(version: Optional[str]) -> Tuple[int, ...]:
+        """Parse an extension version string like '0.7.4'."""
+        if not version:
+            return ()
+        parts = []
+        for part in version.split("."):
+            digits = "".join(ch for ch in part if ch.isdigit())
+            parts.append(int(digits) if digits else 0)
+        return tuple(parts)
+
+    def supports_hnsw(self) -> bool:
+        """Whether the installed pgvector can build HNSW indexes."""
+        return self._pgvector_version >= HNSW_MIN_PGVECTOR_VERSION
+
+    @staticmethod
+    def _safe_index_name(collection: str) -> str:
+        return collection.replace("-", "_").replace(".", "_")
+
+    def _index_ddl(
+        self,
+        index_name: str,
+        collection: str,
+        index_type: str,
+        distance_metric: str,
+        lists: int = None,
+        m: int = None,
+        ef_construction: int = None,
+        concurrently: bool = False,
+    ) -> str:
+        """Build the CREATE INDEX statement for a collection's partial index."""
+        ops = DISTANCE_OPS.get(distance_metric, "vector_cosine_ops")
+        if index_type == "hnsw":
+            using = f"hnsw (embedding {ops})"
+            params = f"m = {int(m)}, ef_construction = {int(ef_construction)}"
+        else:
+            using = f"ivfflat (embedding {ops})"
+            params = f"lists = {int(lists)}"
+
+        # DDL statements don't support parameters, use escaped literal
+        escaped_name = collection.replace("'", "''")
+        concurrent = "CONCURRENTLY " if concurrently else ""
+        return f"""
+            CREATE INDEX {concurrent}IF NOT EXISTS {index_name}
+            ON arkham_vectors.embeddings
+            USING {using}
+            WITH ({params})
+            WHERE collection = '{escaped_name}'
+        """
+
     # =========================================================================
     # Collection Management
     # =========================================================================
@@ -499,27 +808,28 @@ class VectorService:
         lists: int = None,
         expected_rows: int = 100000,
         project_id: str = None,
+        index_type: str = "ivfflat",
     ) -> CollectionInfo:
-        """Create a new vector collection with IVFFlat index."""
+        """Create a new vector collection with an IVFFlat or HNSW index."""
         if not self._available:
             raise VectorStoreUnavailableError("pgvector not available")
+        if index_type not in INDEX_TYPES:
+            raise VectorServiceError(f"Unsupported index type: {index_type}")
+        if index_type == "hnsw" and not self.supports_hnsw():
+            raise VectorServiceError("HNSW indexes require pgvector 0.5.0 or newer")
 
         # Apply project prefix if provided
         collection_name = f"project_{project_id}_{name}" if project_id else name
-        safe_name = collection_name.replace("-", "_").replace(".", "_")
+        safe_name = self._safe_index_name(collection_name)
 
-        # Calculate optimal IVFFlat parameters
+        # Calculate optimal index parameters
         if lists is None:
             lists = self._optimal_lists(expected_rows)
         probes = self._optimal_probes(lists)
-
-        # Map distance metric to pgvector operator class
-        ops_map = {
-            DistanceMetric.COSINE: "vector_cosine_ops",
-            DistanceMetric.EUCLIDEAN: "vector_l2_ops",
-            DistanceMetric.DOT: "vector_ip_ops",
-        }
-        ops = ops_map.get(distance, "vector_cosine_ops")
+        m = ef_construction = ef_search = None
+        if index_type == "hnsw":
+            m, ef_construction = self._optimal_hnsw_params(expected_rows)
+            ef_search = self._optimal_ef_search(m)
 
         try:
             async with self._pool.acquire() as conn:
@@ -535,31 +845,40 @@ class VectorService:
                     # Insert collection metadata
                     await conn.execute("""
                         INSERT INTO arkham_vectors.collections
-                            (name, vector_size, distance_metric, index_type, lists, probes)
-                        VALUES ($1, $2, $3, 'ivfflat', $4, $5)
-                    """, collection_name, vector_size, distance.value, lists, probes)
-
-                    # Create IVFFlat partial index
-                    # DDL statements don't support parameters, use escaped literal
-                    escaped_name = collection_name.replace("'", "''")
-                    await conn.execute(f"""
-                        CREATE INDEX IF NOT EXISTS idx_ivfflat_{safe_name}
-                        ON arkham_vectors.embeddings
-                        USING ivfflat (embedding {ops})
-                        WITH (lists = {lists})
-                        WHERE collection = '{escaped_name}'
-                    """)
-
-            logger.info(f"Created collection: {collection_name} (size={vector_size}, lists={lists})")
+                            (name, vector_size, distance_metric, index_type, lists, probes,
+                             hnsw_m, hnsw_ef_construction, hnsw_ef_search)
+                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+                    """, collection_name, vector_size, distance.value, index_type, lists, probes,
+                        m, ef_construction, ef_search)
+
+                    # Create partial index (empty, so building it inline is cheap)
+                    await conn.execute(self._index_ddl(
+                        f"idx_{index_type}_{safe_name}",
+                        collection_name,
+                        index_type,
+                        distance.value,
+                        lists=lists,
+                        m=m,
+                        ef_construction=ef_construction,
+                    ))
+
+            invalidate_collection_cache(collection_name)
+            logger.info(
+                f"Created collection: {collection_name} "
+                f"(size={vector_size}, index={index_type}, lists={lists}, m={m})"
+            )
 
             return CollectionInfo(
                 name=collection_name,
                 vector_size=vector_size,
                 distance=distance,
                 created_at=datetime.utcnow(),
-                index_type="ivfflat",
+                index_type=index_type,
                 lists=lists,
                 probes=probes,
+                m=m,
+                ef_construction=ef_construction,
+                ef_search=ef_search,
             )
 
         except CollectionExistsError:
@@ -572,7 +891,7 @@ class VectorService:
         if not self._available:
             raise VectorStoreUnavailableError("pgvector not available")
 
-        safe_name = name.replace("-", "_").replace(".", "_")
+        safe_name = self._safe_index_name(name)
 
         try:
             async with self._pool.acquire() as conn:
@@ -583,8 +902,9 @@ class VectorService:
                         name
                     )
 
-                    # Drop index
-                    await conn.execute(f"DROP INDEX IF EXISTS arkham_vectors.idx_ivfflat_{safe_name}")
+                    # Drop indexes
+                    for index_type in INDEX_TYPES:
+                        await conn.execute(f"DROP INDEX IF EXISTS arkham_vectors.idx_{index_type}_{safe_name}")
 
                     # Delete metadata
                     result = await conn.execute(
@@ -592,6 +912,7 @@ class VectorService:
                         name
                     )
 
+            invalidate_collection_cache(name)
             deleted = "DELETE 1" in result
             if deleted:
                 logger.info(f"Deleted collection: {name}")
@@ -652,6 +973,9 @@ class VectorService:
                     lists=row['lists'] or 100,
                     probes=row['probes'] or 10,
                     last_reindex=row['last_reindex'],
+                    m=row.get('hnsw_m'),
+                    ef_construction=row.get('hnsw_ef_construction'),
+                    ef_search=row.get('hnsw_ef_search'),
                 )
 
         except CollectionNotFoundError:
@@ -659,6 +983,10 @@ class VectorService:
         except Exception as e:
             raise VectorServiceError(f"Failed to get collection info: {e}")
 
+    async def get_collection_info(self, name: str) -> CollectionInfo:
+        """Alias for get_collection() used by maintenance and settings."""
+        return await self.get_collection(name)
+
     async def list_collections(self) -> List[CollectionInfo]:
         """List all collections."""
         if not self._available:
@@ -692,6 +1020,9 @@ class VectorService:
                         lists=row['lists'] or 100,
                         probes=row['probes'] or 10,
                         last_reindex=row['last_reindex'],
+                        m=row.get('hnsw_m'),
+                        ef_construction=row.get('hnsw_ef_construction'),
+                        ef_search=row.get('hnsw_ef_search'),
                     ))
 
                 return result
@@ -716,6 +1047,15 @@ class VectorService:
         if not points:
             return 0
 
+        if len(points) >= self._bulk_threshold and self._vector_type_schema:
+            try:
+                return await self.upsert_bulk(collection, points)
+            except (CollectionNotFoundError, VectorStoreUnavailableError):
+                raise
+            except Exception as e:
+                self._bulk_stats.fallbacks += 1
+                logger.warning(f"Binary COPY upsert failed, falling back to executemany: {e}")
+
         try:
             async with self._pool.acquire() as conn:
                 # Verify collection exists
@@ -753,6 +1093,85 @@ class VectorService:
         except Exception as e:
             raise VectorServiceError(f"Failed to upsert vectors: {e}")
 
+    async def upsert_bulk(
+        self,
+        collection: str,
+        points: List[VectorPoint],
+    ) -> int:
+        """
+        Upsert vectors by streaming them with binary COPY.
+
+        Rows are copied into a per-connection temp staging table using
+        pgvector's binary format (no float text formatting or parsing; the
+        codec is registered when the pool opens each connection), then
+        merged into the embeddings table with a single
+        INSERT ... ON CONFLICT. If the same id appears more than once in
+        the batch, the last occurrence wins.
+        """
+        if not self._available:
+            raise VectorStoreUnavailableError("pgvector not available")
+
+        if not points:
+            return 0
+
+        def serialize_payload(payload):
+            if isinstance(payload, str):
+                return payload
+            return json.dumps(payload or {})
+
+        records = []
+        nbytes = 0
+        for ordinal, p in enumerate(points):
+            payload = serialize_payload(p.payload)
+            records.append((ordinal, p.id, p.vector, payload))
+            nbytes += 8 + len(p.id) + 4 + 4 * len(p.vector) + len(payload)
+
+        started = time.perf_counter()
+        async with self._pool.acquire() as conn:
+            exists = await conn.fetchval(
+                "SELECT 1 FROM arkham_vectors.collections WHERE name = $1",
+                collection
+            )
+            if not exists:
+                raise CollectionNotFoundError(collection)
+
+            async with conn.transaction():
+                await conn.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS arkham_vector_stage (
+                        ord INTEGER,
+                        id VARCHAR(36),
+                        embedding vector,
+                        payload TEXT
+                    ) ON COMMIT DELETE ROWS
+                """)
+                await conn.copy_records_to_table(
+                    "arkham_vector_stage",
+                    records=records,
+                    columns=["ord", "id", "embedding", "payload"],
+                )
+                await conn.execute("""
+                    INSERT INTO arkham_vectors.embeddings (id, collection, embedding, payload)
+                    SELECT DISTINCT ON (id) id, $1, embedding, payload::jsonb
+                    FROM arkham_vector_stage
+                    ORDER BY id, ord DESC
+                    ON CONFLICT (id) DO UPDATE SET
+                        embedding = EXCLUDED.embedding,
+                        payload = EXCLUDED.payload,
+                        updated_at = CURRENT_TIMESTAMP
+                """, collection)
+
+        elapsed = time.perf_counter() - started
+        self._bulk_stats.record(len(points), nbytes, elapsed)
+        logger.debug(
+            f"Bulk upserted {len(points)} vectors to {collection} "
+            f"in {elapsed * 1000:.0f}ms ({len(points) / max(elapsed, 1e-9):.0f} rows/s)"
+        )
+        return len(points)
+
+    def get_bulk_stats(self) -> Dict[str, Any]:
+        """Get binary COPY ingestion throughput statistics."""
+        return self._bulk_stats.to_dict()
+
     async def upsert_single(
         self,
         collection: str,
@@ -863,45 +1282,17 @@ class VectorService:
         with_vectors: bool = False,
         recall_target: Optional[float] = None,
     ) -> List[SearchResult]:
-        """Search for similar vectors using IVFFlat."""
+        """Search for similar vectors using the collection's IVFFlat or HNSW index."""
         if not self._available:
             raise VectorStoreUnavailableError("pgvector not available")
 
         try:
             async with self._pool.acquire() as conn:
-                # Get collection info for probes setting
-                coll = await conn.fetchrow(
-                    "SELECT lists, probes, distance_metric FROM arkham_vectors.collections WHERE name = $1",
-                    collection
-                )
-                if not coll:
-                    raise CollectionNotFoundError(collection)
-
-                # Calculate probes for this search
-                if recall_target:
-                    probes = self._optimal_probes(coll['lists'], recall_target)
-                else:
-                    probes = coll['probes']
+                coll = await self._get_collection_meta(conn, collection)
+                await self._set_search_params(conn, coll, limit, recall_target)
 
-                # Set probes for this query
-                await conn.execute(f"SET LOCAL ivfflat.probes = {probes}")
-
-                # Determine distance operator
                 distance_metric = coll['distance_metric'] or 'cosine'
-                distance_ops = {
-                    'cosine': '<=>',
-                    'euclidean': '<->',
-                    'dot': '<#>',
-                }
-                op = distance_ops.get(distance_metric, '<=>')
-
-                # Build score expression (higher = better)
-                if distance_metric == 'cosine':
-                    score_expr = f"1 - (embedding {op} $1::vector)"
-                elif distance_metric == 'dot':
-                    score_expr = f"-(embedding {op} $1::vector)"
-                else:
-                    score_expr = f"embedding {op} $1::vector"
+                op, score_expr = self._distance_sql(distance_metric, "$1::vector")
 
                 # Build select columns
                 select_cols = f"id, payload, {score_expr} AS score"
@@ -935,21 +1326,85 @@ class VectorService:
 
                 rows = await conn.fetch(sql, *params)
 
-                return [
-                    SearchResult(
-                        id=r['id'],
-                        score=float(r['score']),
-                        payload=r['payload'] or {},
-                        vector=list(r['embedding']) if with_vectors and r.get('embedding') else None,
-                    )
-                    for r in rows
-                ]
+                return [self._row_to_result(r, with_vectors) for r in rows]
 
         except CollectionNotFoundError:
             raise
         except Exception as e:
             raise VectorServiceError(f"Search failed: {e}")
 
+    async def _get_collection_meta(self, conn, collection: str) -> Dict[str, Any]:
+        """Collection row from the process-wide cache, loading it on a miss."""
+        cached = _collection_meta_cache.get(collection)
+        now = time.monotonic()
+        if cached and now - cached[0] < self._meta_cache_ttl:
+            return cached[1]
+
+        row = await conn.fetchrow(
+            "SELECT * FROM arkham_vectors.collections WHERE name = $1",
+            collection
+        )
+        if not row:
+            raise CollectionNotFoundError(collection)
+
+        meta = dict(row)
+        _collection_meta_cache[collection] = (now, meta)
+        return meta
+
+    @staticmethod
+    def _distance_sql(distance_metric: str, vector_ref: str) -> Tuple[str, str]:
+        """Distance operator and score expression (higher = better)."""
+        distance_ops = {
+            'cosine': '<=>',
+            'euclidean': '<->',
+            'dot': '<#>',
+        }
+        op = distance_ops.get(distance_metric, '<=>')
+        if distance_metric == 'cosine':
+            score_expr = f"1 - (embedding {op} {vector_ref})"
+        elif distance_metric == 'dot':
+            score_expr = f"-(embedding {op} {vector_ref})"
+        else:
+            score_expr = f"embedding {op} {vector_ref}"
+        return op, score_expr
+
+    @staticmethod
+    def _row_to_result(r, with_vectors: bool = False) -> SearchResult:
+        return SearchResult(
+            id=r['id'],
+            score=float(r['score']),
+            payload=r['payload'] or {},
+            vector=list(r['embedding']) if with_vectors and r.get('embedding') else None,
+        )
+
+    async def _set_search_params(
+        self,
+        conn,
+        coll,
+        limit: int,
+        recall_target: Optional[float] = None,
+    ) -> None:
+        """
+        Apply per-query index settings for a collection row.
+
+        Plain SET rather than SET LOCAL so no transaction is needed; the
+        asyncpg pool runs RESET ALL when the connection is released.
+        """
+        if coll['index_type'] == 'hnsw':
+            m = coll.get('hnsw_m') or 16
+            if recall_target:
+                ef_search = self._optimal_ef_search(m, recall_target)
+            else:
+                ef_search = coll.get('hnsw_ef_search') or self._optimal_ef_search(m)
+            # HNSW returns at most ef_search candidates
+            await conn.execute(f"SET hnsw.ef_search = {max(int(ef_search), int(limit))}")
+        else:
+            if recall_target:
+                probes = self._optimal_probes(coll['lists'], recall_target)
+            else:
+                probes = coll['probes']
+            await conn.execute(f"SET ivfflat.probes = {int(probes)}")
+
     async def search_text(
         self,
         collection: str,
@@ -977,20 +1432,76 @@ class VectorService:
         query_vectors: List[List[float]],
         limit: int = 10,
         filter: Optional[Dict[str, Any]] = None,
+        score_threshold: Optional[float] = None,
+        with_vectors: bool = False,
+        recall_target: Optional[float] = None,
     ) -> List[List[SearchResult]]:
-        """Batch search for multiple query vectors."""
-        # For simplicity, execute searches sequentially
-        # Could be optimized with LATERAL join for better performance
-        results = []
-        for query_vector in query_vectors:
-            result = await self.search(
-                collection=collection,
-                query_vector=query_vector,
-                limit=limit,
-                filter=filter,
-            )
-            results.append(result)
-        return results
+        """
+        Search for several query vectors in one statement.
+
+        The query vectors are unnested and each drives an index-ordered
+        top-k scan through a LATERAL join, so N queries cost one round trip
+        (per SEARCH_BATCH_MAX_QUERIES) instead of N. Results are returned in
+        the same order as query_vectors.
+        """
+        if not query_vectors:
+            return []
+        if not self._available:
+            raise VectorStoreUnavailableError("pgvector not available")
+
+        try:
+            async with self._pool.acquire() as conn:
+                coll = await self._get_collection_meta(conn, collection)
+                await self._set_search_params(conn, coll, limit, recall_target)
+
+                distance_metric = coll['distance_metric'] or 'cosine'
+                op, score_expr = self._distance_sql(distance_metric, "q.vec")
+
+                select_cols = f"id, payload, {score_expr} AS score, embedding {op} q.vec AS distance"
+                if with_vectors:
+                    select_cols += ", embedding"
+
+                conditions = ["collection = $2"]
+                params = [None, collection]
+                if filter:
+                    params.append(json.dumps(filter))
+                    conditions.append(f"payload @> ${len(params)}::jsonb")
+                if score_threshold and distance_metric == 'cosine':
+                    params.append(score_threshold)
+                    conditions.append(f"{score_expr} >= ${len(params)}")
+                params.append(limit)
+
+                sql = f"""
+                    WITH q AS (
+                        SELECT u.ord, u.vec::vector AS vec
+                        FROM unnest($1::text[]) WITH ORDINALITY AS u(vec, ord)
+                    )
+                    SELECT q.ord, r.*
+                    FROM q
+                    CROSS JOIN LATERAL (
+                        SELECT {select_cols}
+                        FROM arkham_vectors.embeddings
+                        WHERE {" AND ".join(conditions)}
+                        ORDER BY embedding {op} q.vec
+                        LIMIT ${len(params)}
+                    ) r
+                    ORDER BY q.ord, r.distance
+                """
+
+                results: List[List[SearchResult]] = [[] for _ in query_vectors]
+                for offset in range(0, len(query_vectors), SEARCH_BATCH_MAX_QUERIES):
+                    batch = query_vectors[offset:offset + SEARCH_BATCH_MAX_QUERIES]
+                    params[0] = [str([float(x) for x in v]) for v in batch]
+                    rows = await conn.fetch(sql, *params)
+                    for r in rows:
+                        results[offset + r['ord'] - 1].append(self._row_to_result(r, with_vectors))
+
+                return results
+
+        except CollectionNotFoundError:
+            raise
+        except Exception as e:
+            raise VectorServiceError(f"Batch search failed: {e}")
 
     # =========================================================================
     # Embedding Operations
@@ -1008,8 +1519,8 @@ class VectorService:
 
         # Use local model
         try:
-            embedding = self._embedding_model.encode(text, convert_to_numpy=True)
-            return embedding.tolist()
+            self._start_embedding_executor()
+            return await self._embedding_executor.embed(text)
         except Exception as e:
             raise EmbeddingError(f"Failed to generate embedding: {e}")
 
@@ -1027,8 +1538,8 @@ class VectorService:
 
         # Use local model
         try:
-            embeddings = self._embedding_model.encode(texts, convert_to_numpy=True)
-            return [e.tolist() for e in embeddings]
+            self._start_embedding_executor()
+            return await self._embedding_executor.embed_many(texts)
         except Exception as e:
             raise EmbeddingError(f"Failed to generate embeddings: {e}")
 
@@ -1217,6 +1728,8 @@ class VectorService:
             "embedding_dimension": self._default_dimension if self._embedding_available else None,
             "embedding_model": embedding_model_name,
             "is_cloud_embedding": self._use_cloud_embeddings,
+            "bulk_ingest": self._bulk_stats.to_dict(),
+            "embedding_executor": self._embedding_executor.get_stats() if self._embedding_executor else None,
             "collections": [],
         }
 
@@ -1234,15 +1747,37 @@ class VectorService:
     # Maintenance Operations (for Settings UI)
     # =========================================================================
 
-    async def reindex_collection(self, name: str) -> Dict[str, Any]:
+    async def reindex_collection(
+        self,
+        name: str,
+        index_type: Optional[str] = None,
+        concurrently: bool = True,
+        progress_callback: Optional[Callable[[ReindexProgress], Any]] = None,
+    ) -> Dict[str, Any]:
         """
-        Rebuild IVFFlat index for a collection.
+        Rebuild a collection's index with parameters sized to its current data.
 
         Call this from Settings UI when user requests manual reindex.
+
+        By default the replacement is built online: CREATE INDEX CONCURRENTLY
+        under a shadow name while searches and writes keep using the old
+        index, then the two are swapped by rename in one short transaction
+        and the old index is dropped concurrently. Progress is read from
+        pg_stat_progress_create_index (see get_reindex_progress()).
+
+        Args:
+            name: Collection name
+            index_type: "ivfflat" or "hnsw"; defaults to the current type
+            concurrently: Build online; False drops and rebuilds under lock
+            progress_callback: Called (sync or async) with each progress update
         """
         if not self._available:
             raise VectorStoreUnavailableError("pgvector not available")
 
+        current = self._reindex_progress.get(name)
+        if current and current.status in ("running", "swapping"):
+            raise VectorServiceError(f"Reindex already running for '{name}'")
+
         logger.info(f"Starting reindex for collection '{name}'")
 
         try:
@@ -1255,6 +1790,12 @@ class VectorService:
                 if not coll:
                     raise CollectionNotFoundError(name)
 
+                index_type = index_type or coll['index_type'] or 'ivfflat'
+                if index_type not in INDEX_TYPES:
+                    raise VectorServiceError(f"Unsupported index type: {index_type}")
+                if index_type == "hnsw" and not self.supports_hnsw():
+                    raise VectorServiceError("HNSW indexes require pgvector 0.5.0 or newer")
+
                 # Get actual count
                 count = await conn.fetchval(
                     "SELECT COUNT(*) FROM arkham_vectors.embeddings WHERE collection = $1",
@@ -1264,51 +1805,209 @@ class VectorService:
                 # Calculate new optimal parameters
                 new_lists = self._optimal_lists(count)
                 new_probes = self._optimal_probes(new_lists, self._target_recall)
+                m = ef_construction = ef_search = None
+                if index_type == "hnsw":
+                    m, ef_construction = self._optimal_hnsw_params(count)
+                    ef_search = self._optimal_ef_search(m, self._target_recall)
+
+                safe_name = self._safe_index_name(name)
+                final_name = f"idx_{index_type}_{safe_name}"
+                old_names = [f"idx_{t}_{safe_name}" for t in INDEX_TYPES]
+
+                progress = ReindexProgress(
+                    collection=name,
+                    index_type=index_type,
+                    index_name=final_name,
+                )
+                self._reindex_progress[name] = progress
+
+                def build_ddl(index_name: str) -> str:
+                    return self._index_ddl(
+                        index_name,
+                        name,
+                        index_type,
+                        coll['distance_metric'],
+                        lists=new_lists,
+                        m=m,
+                        ef_construction=ef_construction,
+                        concurrently=concurrently,
+                    )
 
-                safe_name = name.replace("-", "_").replace(".", "_")
-
-                # Determine operator class
-                ops_map = {
-                    'cosine': 'vector_cosine_ops',
-                    'euclidean': 'vector_l2_ops',
-                    'dot': 'vector_ip_ops',
-                }
-                ops = ops_map.get(coll['distance_metric'], 'vector_cosine_ops')
-
-                # Drop and recreate index
-                await conn.execute(f"DROP INDEX IF EXISTS arkham_vectors.idx_ivfflat_{safe_name}")
-
-                await conn.execute(f"""
-                    CREATE INDEX idx_ivfflat_{safe_name}
-                    ON arkham_vectors.embeddings
-                    USING ivfflat (embedding {ops})
-                    WITH (lists = {new_lists})
-                    WHERE collection = $1
-                """, name)
-
-                # Update metadata
-                await conn.execute("""
-                    UPDATE arkham_vectors.collections
-                    SET lists = $2, probes = $3, last_reindex = NOW(), vector_count = $4
-                    WHERE name = $1
-                """, name, new_lists, new_probes, count)
+                metadata_args = (name, index_type, new_lists, new_probes, count, m, ef_construction, ef_search)
 
-            logger.info(f"Reindex complete for '{name}': lists={new_lists}, probes={new_probes}, vectors={count}")
+                if concurrently:
+                    await self._reindex_online(conn, progress, final_name, old_names, build_ddl, metadata_args, progress_callback)
+                else:
+                    async with conn.transaction():
+                        for old_name in old_names:
+                            await conn.execute(f"DROP INDEX IF EXISTS arkham_vectors.{old_name}")
+                        await conn.execute(build_ddl(final_name), timeout=self._reindex_timeout())
+                        await self._update_index_metadata(conn, *metadata_args)
+
+            invalidate_collection_cache(name)
+            progress.status = "completed"
+            progress.phase = "done"
+            await self._report_progress(progress, progress_callback)
+
+            logger.info(
+                f"Reindex complete for '{name}': index={index_type}, lists={new_lists}, "
+                f"probes={new_probes}, m={m}, vectors={count}"
+            )
 
             return {
                 "collection": name,
                 "vectors": count,
+                "index_type": index_type,
+                "index_name": final_name,
                 "lists": new_lists,
                 "probes": new_probes,
+                "m": m,
+                "ef_construction": ef_construction,
+                "ef_search": ef_search,
+                "concurrent": concurrently,
                 "status": "success",
             }
 
         except CollectionNotFoundError:
             raise
         except Exception as e:
+            progress = self._reindex_progress.get(name)
+            if progress and progress.status != "completed":
+                progress.status = "failed"
+                progress.error = str(e)
             logger.error(f"Reindex failed for '{name}': {e}")
+            if isinstance(e, VectorServiceError):
+                raise
             raise VectorServiceError(f"Reindex failed: {e}")
 
+    async def _reindex_online(
+        self,
+        conn,
+        progress: ReindexProgress,
+        final_name: str,
+        old_names: List[str],
+        build_ddl: Callable[[str], str],
+        metadata_args: tuple,
+        progress_callback=None,
+    ) -> None:
+        """Build under a shadow name, swap by rename, drop the old index concurrently."""
+        shadow_name = f"{final_name}_shadow"
+        retired = [f"{old_name}_retired" for old_name in old_names]
+
+        # A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind
+        for leftover in [shadow_name] + retired:
+            await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS arkham_vectors.{leftover}")
+
+        if self._reindex_work_mem:
+            work_mem = str(self._reindex_work_mem).replace("'", "''")
+            await conn.execute(f"SET maintenance_work_mem = '{work_mem}'")
+
+        try:
+            progress.phase = "building"
+            await self._report_progress(progress, progress_callback)
+
+            pid = conn.get_server_pid()
+            build = asyncio.ensure_future(
+                conn.execute(build_ddl(shadow_name), timeout=self._reindex_timeout())
+            )
+            try:
+                while not build.done():
+                    await asyncio.wait({build}, timeout=self._reindex_poll_interval)
+                    if not build.done():
+                        await self._poll_index_progress(pid, progress, progress_callback)
+                await build
+            except BaseException:
+                if not build.done():
+                    build.cancel()
+                try:
+                    await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS arkham_vectors.{shadow_name}")
+                except Exception as cleanup_error:
+                    logger.warning(f"Could not drop shadow index {shadow_name}: {cleanup_error}")
+                raise
+
+            # Renames only need a brief lock on the indexes; readers are not blocked
+            progress.status = "swapping"
+            progress.phase = "swapping"
+            await self._report_progress(progress, progress_callback)
+            async with conn.transaction():
+                await conn.execute("SET LOCAL lock_timeout = '10s'")
+                for old_name in old_names:
+                    await conn.execute(
+                        f"ALTER INDEX IF EXISTS arkham_vectors.{old_name} RENAME TO {old_name}_retired"
+                    )
+                await conn.execute(f"ALTER INDEX arkham_vectors.{shadow_name} RENAME TO {final_name}")
+                await self._update_index_metadata(conn, *metadata_args)
+
+            progress.phase = "dropping old index"
+            for old_index in retired:
+                await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS arkham_vectors.{old_index}")
+        finally:
+            if self._reindex_work_mem:
+                await conn.execute("RESET maintenance_work_mem")
+
+    async def _poll_index_progress(self, pid: int, progress: ReindexProgress, progress_callback=None) -> None:
+        """Refresh progress from the builder backend's pg_stat_progress_create_index row."""
+        try:
+            async with self._pool.acquire() as conn:
+                row = await conn.fetchrow("""
+                    SELECT phase, blocks_done, blocks_total, tuples_done, tuples_total
+                    FROM pg_stat_progress_create_index
+                    WHERE pid = $1
+                """, pid)
+        except Exception as e:
+            logger.debug(f"Index progress unavailable: {e}")
+            return
+
+        if row:
+            progress.phase = row['phase']
+            progress.blocks_done = row['blocks_done'] or 0
+            progress.blocks_total = row['blocks_total'] or 0
+            progress.tuples_done = row['tuples_done'] or 0
+            progress.tuples_total = row['tuples_total'] or 0
+            await self._report_progress(progress, progress_callback)
+
+    async def _report_progress(self, progress: ReindexProgress, progress_callback=None) -> None:
+        if progress_callback is None:
+            return
+        try:
+            result = progress_callback(progress)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            logger.warning(f"Reindex progress callback failed: {e}")
+
+    async def _update_index_metadata(
+        self,
+        conn,
+        name: str,
+        index_type: str,
+        lists: int,
+        probes: int,
+        count: int,
+        m: Optional[int],
+        ef_construction: Optional[int],
+        ef_search: Optional[int],
+    ) -> None:
+        await conn.execute("""
+            UPDATE arkham_vectors.collections
+            SET index_type = $2, lists = $3, probes = $4, last_reindex = NOW(), vector_count = $5,
+                hnsw_m = $6, hnsw_ef_construction = $7, hnsw_ef_search = $8
+            WHERE name = $1
+        """, name, index_type, lists, probes, count, m, ef_construction, ef_search)
+
+    def _reindex_timeout(self) -> float:
+        """Index builds outlast the pool's command_timeout on large collections."""
+        if self.config is None:
+            return 6 * 3600.0
+        return self.config.get("vectors.reindex_timeout", 6 * 3600.0)
+
+    def get_reindex_progress(self, name: Optional[str] = None) -> Any:
+        """Progress of the current or last reindex, for one collection or all."""
+        if name is not None:
+            progress = self._reindex_progress.get(name)
+            return progress.to_dict() if progress else None
+        return {coll: p.to_dict() for coll, p in self._reindex_progress.items()}
+
     async def reindex_all(self) -> List[Dict[str, Any]]:
         """Reindex all collections. Called from Settings UI or scheduled task."""
         results = []
@@ -8,6 +8,9 @@ Key features:
 - Priority queue using PostgreSQL ORDER BY priority, created_at
 - Concurrent dequeue using SELECT ... FOR UPDATE SKIP LOCKED
 - Real-time notifications via LISTEN/NOTIFY
+- Push-based result waiting (arkham_job_finished), polling only as fallback
+- Bulk enqueue and batch dequeue (one round-trip for many jobs)
+- Periodic promotion of scheduled jobs (not per dequeue)
 - Worker heartbeat and stale worker recovery
 - Dead letter queue for failed jobs
 """
@@ -27,6 +30,55 @@ import asyncio
 logger = logging.getLogger(__name__)
 
 
+# Max rows per multi-row INSERT in enqueue_many
+ENQUEUE_BATCH_SIZE = 5000
+
+# Advisory lock key guarding scheduled-job promotion, so concurrent
+# promoters (Frame and standalone workers) never contend on the same rows.
+PROMOTE_LOCK_KEY = 0x41524B48  # "ARKH"
+
+# Promote scheduled jobs whose time has come. A no-op when another
+# session already holds the promotion lock for this transaction.
+PROMOTE_SCHEDULED_SQL = """
+    WITH promoter AS (
+        SELECT pg_try_advisory_xact_lock($1) AS held
+    )
+    UPDATE arkham_jobs.jobs
+    SET status = 'pending'
+    WHERE status = 'scheduled'
+      AND scheduled_at <= NOW()
+      AND (SELECT held FROM promoter)
+"""
+
+
+# Terminal job states reported on the arkham_job_finished channel
+TERMINAL_JOB_STATUSES = ("completed", "failed", "dead")
+
+# Trigger announcing every transition into a terminal state. Unlike
+# arkham_job_completed/arkham_job_failed it also fires for jobs that never
+# reached 'processing' (e.g. cancelled), and carries the final status.
+JOB_FINISHED_TRIGGER_SQL = """
+    CREATE OR REPLACE FUNCTION arkham_jobs.notify_job_finished()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF NEW.status IN ('completed', 'failed', 'dead')
+           AND OLD.status IS DISTINCT FROM NEW.status THEN
+            PERFORM pg_notify('arkham_job_finished', json_build_object(
+                'job_id', NEW.id,
+                'status', NEW.status
+            )::text);
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE TRIGGER trg_job_finished
+        AFTER UPDATE OF status ON arkham_jobs.jobs
+        FOR EACH ROW
+        EXECUTE FUNCTION arkham_jobs.notify_job_finished();
+"""
+
+
 class WorkerError(Exception):
     """Base worker error."""
     pass
@@ -88,6 +140,48 @@ WORKER_POOLS = {
 }
 
 
+class JobWaiterRegistry:
+    """
+    In-process registry of callers waiting for jobs to finish.
+
+    wait_for_result registers a future per job; the arkham_job_finished
+    listener resolves every future registered for that job with the
+    terminal status. Several callers may wait on the same job.
+    """
+
+    def __init__(self):
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+
+    def register(self, job_id: str) -> asyncio.Future:
+        """Register a waiter and return the future resolved on completion."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(job_id, []).append(future)
+        return future
+
+    def discard(self, job_id: str, future: asyncio.Future) -> None:
+        """Remove a waiter (after it resolved, timed out or was cancelled)."""
+        futures = self._waiters.get(job_id)
+        if not futures:
+            return
+        if future in futures:
+            futures.remove(future)
+        if not futures:
+            del self._waiters[job_id]
+
+    def resolve(self, job_id: str, status: str) -> int:
+        """Resolve all waiters for a job. Returns the number woken."""
+        futures = self._waiters.pop(job_id, [])
+        woken = 0
+        for future in futures:
+            if not future.done():
+                future.set_result(status)
+                woken += 1
+        return woken
+
+    def __len__(self) -> int:
+        return sum(len(f) for f in self._waiters.values())
+
+
 @dataclass
 class WorkerInfo:
     """Information about a running worker."""
@@ -144,6 +238,10 @@ class WorkerService:
         self._listener_running = False
         self._heartbeat_task = None  # Background task for worker heartbeat
         self._heartbeat_running = False
+        self._promoter_task = None  # Background task promoting scheduled jobs
+        self._promoter_running = False
+        self._promote_interval = 1.0  # Seconds between scheduled-job sweeps
+        self._waiters = JobWaiterRegistry()  # Futures resolved by arkham_job_finished
 
     def set_event_bus(self, event_bus) -> None:
         """Set event bus for job notifications."""
@@ -214,6 +312,12 @@ class WorkerService:
                     self._available = False
                     return
 
+                # Install the terminal-state notification used by wait_for_result
+                try:
+                    await conn.execute(JOB_FINISHED_TRIGGER_SQL)
+                except Exception as e:
+                    logger.warning(f"Could not install job finished trigger: {e}")
+
             self._available = True
             logger.info("WorkerService initialized with PostgreSQL SKIP LOCKED")
 
@@ -223,6 +327,9 @@ class WorkerService:
             # Start heartbeat task
             await self._start_heartbeat_task()
 
+            # Start scheduled-job promoter
+            await self._start_promoter_task()
+
         except Exception as e:
             logger.warning(f"WorkerService initialization failed: {e}")
             self._available = False
@@ -243,6 +350,7 @@ class WorkerService:
                 await conn.add_listener('arkham_job_available', self._handle_job_available)
                 await conn.add_listener('arkham_job_completed', self._handle_job_completed)
                 await conn.add_listener('arkham_job_failed', self._handle_job_failed)
+                await conn.add_listener('arkham_job_finished', self._handle_job_finished)
                 await conn.add_listener('arkham_worker_event', self._handle_worker_event)
 
                 logger.info("Subscribed to PostgreSQL NOTIFY channels")
@@ -257,6 +365,7 @@ class WorkerService:
                     await conn.remove_listener('arkham_job_available', self._handle_job_available)
                     await conn.remove_listener('arkham_job_completed', self._handle_job_completed)
                     await conn.remove_listener('arkham_job_failed', self._handle_job_failed)
+                    await conn.remove_listener('arkham_job_finished', self._handle_job_finished)
                     await conn.remove_listener('arkham_worker_event', self._handle_worker_event)
                 except:
                     pass
@@ -328,6 +437,17 @@ class WorkerService:
         except Exception as e:
             logger.warning(f"Failed to handle job failed: {e}")
 
+    def _handle_job_finished(self, conn, pid, channel, payload):
+        """Handle terminal job state notification by waking result waiters."""
+        try:
+            data = json.loads(payload)
+            job_id = data.get('job_id')
+            woken = self._waiters.resolve(job_id, data.get('status'))
+            if woken:
+                logger.debug(f"Job finished: {job_id} ({data.get('status')}), woke {woken} waiter(s)")
+        except Exception as e:
+            logger.warning(f"Failed to handle job finished: {e}")
+
     def _handle_worker_event(self, conn, pid, channel, payload):
         """Handle worker state change notification."""
         try:
@@ -383,6 +503,41 @@ class WorkerService:
                 logger.warning(f"Heartbeat error: {e}")
                 await asyncio.sleep(5)
 
+    async def _start_promoter_task(self) -> None:
+        """Start background task that promotes due scheduled jobs."""
+        self._promoter_running = True
+        self._promoter_task = asyncio.create_task(self._promoter_loop())
+        logger.info("Started scheduled job promoter")
+
+    async def _promoter_loop(self) -> None:
+        """Background loop that moves due scheduled jobs to pending."""
+        while self._promoter_running:
+            try:
+                promoted = await self.promote_scheduled_jobs()
+                if promoted:
+                    logger.debug(f"Promoted {promoted} scheduled jobs")
+            except Exception as e:
+                logger.warning(f"Scheduled job promotion error: {e}")
+            await asyncio.sleep(self._promote_interval)
+
+    async def promote_scheduled_jobs(self) -> int:
+        """
+        Move scheduled jobs whose scheduled_at has passed to pending.
+
+        Runs periodically from the promoter task rather than on every
+        dequeue, so workers only pay for the claim query.
+
+        Returns:
+            Number of jobs promoted
+        """
+        if not self._available or not self._db_pool:
+            return 0
+
+        async with self._db_pool.acquire() as conn:
+            result = await conn.execute(PROMOTE_SCHEDULED_SQL, PROMOTE_LOCK_KEY)
+            # Parse "UPDATE N" result
+            return int(result.split()[-1])
+
     async def shutdown(self) -> None:
         """Gracefully shutdown all workers and close connections."""
         # Stop listener
@@ -405,6 +560,16 @@ class WorkerService:
                 pass
             self._heartbeat_task = None
 
+        # Stop promoter
+        self._promoter_running = False
+        if self._promoter_task:
+            self._promoter_task.cancel()
+            try:
+                await self._promoter_task
+            except:
+                pass
+            self._promoter_task = None
+
         # Stop all running workers gracefully
         if self._processes:
             logger.info(f"Shutting down {len(self._processes)} worker(s)...")
@@ -545,6 +710,97 @@ class WorkerService:
 
         return job
 
+    async def enqueue_many(
+        self,
+        pool: str,
+        jobs: List[Dict[str, Any]],
+        priority: int = 5,
+        job_type: str = "default",
+        max_retries: int = 3,
+    ) -> List[Job]:
+        """
+        Enqueue many jobs to a worker pool in as few statements as possible.
+
+        Each item needs "job_id" and "payload"; "priority", "job_type",
+        "max_retries" and "scheduled_at" are optional and default to the
+        arguments given here. Rows are written with a multi-row INSERT over
+        unnest() arrays, ENQUEUE_BATCH_SIZE rows per statement, inside a
+        single transaction.
+
+        Args:
+            pool: Worker pool name (e.g., "cpu-light", "gpu-embed")
+            jobs: Job specs
+            priority: Default priority (1-10, lower = higher priority)
+            job_type: Default job type identifier
+            max_retries: Default maximum retry attempts
+
+        Returns:
+            Created Job objects, in input order (duplicate ids keep the last spec)
+        """
+        if pool not in WORKER_POOLS:
+            raise WorkerError(f"Unknown worker pool: {pool}")
+
+        created: Dict[str, Job] = {}
+        for spec in jobs:
+            job_id = spec.get("job_id") or spec.get("id")
+            if not job_id:
+                raise WorkerError("enqueue_many job spec is missing job_id")
+            scheduled_at = spec.get("scheduled_at")
+            created[job_id] = Job(
+                id=job_id,
+                pool=pool,
+                payload=spec.get("payload") or {},
+                job_type=spec.get("job_type", job_type),
+                priority=max(1, min(10, spec.get("priority", priority))),
+                status="scheduled" if scheduled_at else "pending",
+                max_retries=spec.get("max_retries", max_retries),
+                scheduled_at=scheduled_at,
+            )
+
+        if not created:
+            return []
+
+        self._jobs.update(created)
+        batch = list(created.values())
+
+        if self._available and self._db_pool:
+            async with self._db_pool.acquire() as conn:
+                async with conn.transaction():
+                    for start in range(0, len(batch), ENQUEUE_BATCH_SIZE):
+                        chunk = batch[start:start + ENQUEUE_BATCH_SIZE]
+                        await conn.execute("""
+                            INSERT INTO arkham_jobs.jobs
+                            (id, pool, job_type, payload, priority, status, scheduled_at, max_retries)
+                            SELECT j.id, $1, j.job_type, j.payload::jsonb, j.priority,
+                                   j.status, j.scheduled_at, j.max_retries
+                            FROM unnest(
+                                $2::varchar[], $3::varchar[], $4::text[], $5::int[],
+                                $6::varchar[], $7::timestamp[], $8::int[]
+                            ) AS j(id, job_type, payload, priority, status, scheduled_at, max_retries)
+                            ON CONFLICT (id) DO UPDATE SET
+                                pool = EXCLUDED.pool,
+                                payload = EXCLUDED.payload,
+                                priority = EXCLUDED.priority,
+                                status = EXCLUDED.status
+                        """,
+                            pool,
+                            [j.id for j in chunk],
+                            [j.job_type for j in chunk],
+                            [json.dumps(j.payload) for j in chunk],
+                            [j.priority for j in chunk],
+                            [j.status for j in chunk],
+                            [j.scheduled_at for j in chunk],
+                            [j.max_retries for j in chunk],
+                        )
+
+            logger.debug(f"Enqueued {len(batch)} jobs to {pool}")
+        else:
+            logger.warning(f"Database unavailable, {len(batch)} jobs tracked in memory only")
+
+        await self._ensure_worker_for_pool(pool)
+
+        return batch
+
     async def _ensure_worker_for_pool(self, pool: str) -> None:
         """Ensure at least one worker is running for the given pool."""
         running = sum(
@@ -559,12 +815,29 @@ class WorkerService:
             except Exception as e:
                 logger.warning(f"Failed to auto-scale pool {pool}: {e}")
 
+    def _claimed_row_to_job(self, row, worker_id: str) -> Job:
+        """Build a processing Job from a row returned by a claim query."""
+        return Job(
+            id=row['id'],
+            pool=row['pool'],
+            job_type=row['job_type'],
+            payload=json.loads(row['payload']) if isinstance(row['payload'], str) else row['payload'],
+            priority=row['priority'],
+            created_at=row['created_at'],
+            status="processing",
+            started_at=datetime.utcnow(),
+            retry_count=row['retry_count'],
+            max_retries=row['max_retries'],
+            worker_id=worker_id,
+        )
+
     async def dequeue(self, pool: str, worker_id: str) -> Optional[Job]:
         """
         Dequeue the highest priority job from a pool using SKIP LOCKED.
 
         This is the key PostgreSQL pattern for concurrent job processing.
         SKIP LOCKED ensures multiple workers don't get the same job.
+        Scheduled jobs are promoted by the background promoter, not here.
 
         Args:
             pool: Worker pool name
@@ -573,55 +846,51 @@ class WorkerService:
         Returns:
             Job if available, None otherwise
         """
-        if not self._available or not self._db_pool:
-            return None
+        jobs = await self.dequeue_batch(pool, worker_id, 1)
+        return jobs[0] if jobs else None
 
-        async with self._db_pool.acquire() as conn:
-            # First, promote any scheduled jobs that are ready
-            await conn.execute("""
-                UPDATE arkham_jobs.jobs
-                SET status = 'pending'
-                WHERE status = 'scheduled'
-                  AND scheduled_at <= NOW()
-            """)
+    async def dequeue_batch(self, pool: str, worker_id: str, n: int = 10) -> List[Job]:
+        """
+        Claim up to n of the highest priority jobs from a pool in one round-trip.
 
+        Args:
+            pool: Worker pool name
+            worker_id: ID of the worker claiming the jobs
+            n: Maximum number of jobs to claim
+
+        Returns:
+            Claimed jobs in priority order (empty if the queue is empty)
+        """
+        if not self._available or not self._db_pool or n < 1:
+            return []
+
+        async with self._db_pool.acquire() as conn:
             # SKIP LOCKED is the magic - it skips rows locked by other workers
-            row = await conn.fetchrow("""
+            rows = await conn.fetch("""
                 UPDATE arkham_jobs.jobs
                 SET status = 'processing',
                     started_at = NOW(),
                     worker_id = $2
-                WHERE id = (
+                WHERE id IN (
                     SELECT id FROM arkham_jobs.jobs
                     WHERE pool = $1
                       AND status = 'pending'
                     ORDER BY priority ASC, created_at ASC
                     FOR UPDATE SKIP LOCKED
-                    LIMIT 1
+                    LIMIT $3
                 )
                 RETURNING id, pool, job_type, payload, priority, created_at,
                           retry_count, max_retries
-            """, pool, worker_id)
-
-            if not row:
-                return None
-
-            job = Job(
-                id=row['id'],
-                pool=row['pool'],
-                job_type=row['job_type'],
-                payload=json.loads(row['payload']) if isinstance(row['payload'], str) else row['payload'],
-                priority=row['priority'],
-                created_at=row['created_at'],
-                status="processing",
-                started_at=datetime.utcnow(),
-                retry_count=row['retry_count'],
-                max_retries=row['max_retries'],
-                worker_id=worker_id,
-            )
+            """, pool, worker_id, n)
 
+        # RETURNING order is unspecified, restore queue order
+        jobs = sorted(
+            (self._claimed_row_to_job(row, worker_id) for row in rows),
+            key=lambda j: (j.priority, j.created_at),
+        )
+        for job in jobs:
             self._jobs[job.id] = job
-            return job
+        return jobs
 
     async def complete_job(
         self,
@@ -1208,40 +1477,76 @@ class WorkerService:
         job_id: str,
         timeout: float = 300.0,
         poll_interval: float = 0.5,
+        fallback_interval: float = 5.0,
     ) -> Dict[str, Any]:
-        """Wait for a job to complete and return its result."""
-        start_time = asyncio.get_event_loop().time()
+        """
+        Wait for a job to complete and return its result.
 
-        while True:
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed > timeout:
-                raise WorkerError(f"Job {job_id} timed out after {timeout}s")
+        Waiting is push-based: the arkham_job_finished notification wakes
+        the caller, which then reads the result once. The job row is only
+        re-checked every fallback_interval seconds in case a notification
+        was missed, or every poll_interval seconds when the listener is
+        not running.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        interval = fallback_interval if self._listener_running else poll_interval
 
-            # Check in-memory cache for status (not result - result comes from DB)
-            job = self._jobs.get(job_id)
-            if job:
-                if job.status in ("failed", "dead"):
-                    raise WorkerError(f"Job {job_id} failed: {job.error}")
+        future = self._waiters.register(job_id)
+        try:
+            while True:
+                outcome = await self._fetch_job_outcome(job_id)
+                if outcome is not None:
+                    return outcome
 
-            # Check database for status and result
-            # Always fetch result from DB since NOTIFY doesn't include it
-            if self._available and self._db_pool:
-                async with self._db_pool.acquire() as conn:
-                    row = await conn.fetchrow("""
-                        SELECT status, result, last_error
-                        FROM arkham_jobs.jobs WHERE id = $1
-                    """, job_id)
-
-                    if row:
-                        if row['status'] == 'completed':
-                            result = row['result']
-                            if isinstance(result, str):
-                                result = json.loads(result)
-                            return result or {}
-                        elif row['status'] in ('failed', 'dead'):
-                            raise WorkerError(f"Job {job_id} failed: {row['last_error']}")
-
-            await asyncio.sleep(poll_interval)
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise WorkerError(f"Job {job_id} timed out after {timeout}s")
+
+                if future.done():
+                    # Notified but the row did not show a terminal state yet;
+                    # wait for the next notification or fallback poll.
+                    self._waiters.discard(job_id, future)
+                    future = self._waiters.register(job_id)
+
+                try:
+                    await asyncio.wait_for(
+                        asyncio.shield(future),
+                        timeout=min(remaining, interval),
+                    )
+                except asyncio.TimeoutError:
+                    pass  # Fallback poll
+        finally:
+            self._waiters.discard(job_id, future)
+
+    async def _fetch_job_outcome(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a finished job's result, raise if it failed, None if still running.
+        """
+        # Check in-memory cache for status (not result - result comes from DB)
+        job = self._jobs.get(job_id)
+        if job and job.status in ("failed", "dead"):
+            raise WorkerError(f"Job {job_id} failed: {job.error}")
+
+        if not self._available or not self._db_pool:
+            return None
+
+        async with self._db_pool.acquire() as conn:
+            row = await conn.fetchrow("""
+                SELECT status, result, last_error
+                FROM arkham_jobs.jobs WHERE id = $1
+            """, job_id)
+
+        if not row:
+            return None
+        if row['status'] == 'completed':
+            result = row['result']
+            if isinstance(result, str):
+                result = json.loads(result)
+            return result or {}
+        if row['status'] in ('failed', 'dead'):
+            raise WorkerError(f"Job {job_id} failed: {row['last_error']}")
+        return None
 
     async def enqueue_and_wait(
         self,
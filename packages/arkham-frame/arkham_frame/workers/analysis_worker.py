@@ -202,6 +202,7 @@ class AnalysisWorker(BaseWorker):
     pool = "llm-analysis"
     name = "AnalysisWorker"
     job_timeout = 300.0  # Complex analysis takes time
+    max_concurrent_jobs = 2  # Jobs wait on the LLM endpoint, not the CPU
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -2,13 +2,15 @@
 BaseWorker - Abstract base class for all ArkhamFrame workers.
 
 Workers poll a PostgreSQL job queue using SKIP LOCKED, process jobs, and report results.
+I/O-bound workers can set max_concurrent_jobs > 1 to run several jobs at once
+on a single event loop.
 """
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import asyncio
 import json
 import logging
@@ -18,6 +20,8 @@ import socket
 import time
 import uuid
 
+from ..services.workers import PROMOTE_SCHEDULED_SQL, PROMOTE_LOCK_KEY
+
 logger = logging.getLogger(__name__)
 
 
@@ -74,6 +78,13 @@ class BaseWorker(ABC):
     2. Enters main loop: poll queue -> process -> report
     3. Sends heartbeats every 30 seconds
     4. On shutdown signal: finish current job, cleanup, exit
+
+    Concurrent mode (max_concurrent_jobs > 1):
+    Up to max_concurrent_jobs jobs run as tasks on one event loop, free
+    slots are filled with a single batch claim, heartbeats come from a
+    background task so long jobs keep the worker alive, and idle polling
+    backs off exponentially from poll_interval to max_idle_backoff.
+    Only suitable for pools whose jobs mostly wait on network or disk.
     """
 
     # Subclasses must override
@@ -87,6 +98,10 @@ class BaseWorker(ABC):
     job_timeout: float = 300.0  # Max seconds per job
     max_retries: int = 3
 
+    # Concurrency (I/O-bound pools)
+    max_concurrent_jobs: int = 1  # >1 enables concurrent mode
+    max_idle_backoff: float = 5.0  # Max seconds between polls when idle (concurrent mode)
+
     def __init__(self, database_url: str = None, worker_id: str = None):
         """
         Initialize worker.
@@ -106,6 +121,8 @@ class BaseWorker(ABC):
         self._current_job = None
         self._current_job_start = None
         self._last_job_time = None
+        self._active_jobs: Dict[str, datetime] = {}  # Job ID -> start time (concurrent mode)
+        self._job_tasks: Dict[asyncio.Task, str] = {}  # In-flight task -> job ID (concurrent mode)
         self._shutdown_event = asyncio.Event()
         self._running = False
 
@@ -150,7 +167,7 @@ class BaseWorker(ABC):
             self._db_pool = await asyncpg.create_pool(
                 self.database_url,
                 min_size=1,
-                max_size=3,
+                max_size=max(3, self.max_concurrent_jobs + 2),
                 init=init_connection,  # Set up JSON codecs
             )
             logger.info(f"Worker {self.worker_id} connected to PostgreSQL")
@@ -212,54 +229,64 @@ class BaseWorker(ABC):
             """, self.worker_id, self._state.value, self._metrics.jobs_completed,
                 self._metrics.jobs_failed, self._current_job)
 
+            # Fallback promotion of due scheduled jobs for workers running
+            # without the Frame's promoter; the advisory lock makes this a
+            # no-op while another promoter is mid-sweep.
+            await conn.execute(PROMOTE_SCHEDULED_SQL, PROMOTE_LOCK_KEY)
+
     async def dequeue_job(self) -> Optional[Dict[str, Any]]:
         """
         Dequeue a job from the pool's queue using SKIP LOCKED.
 
         This is the key PostgreSQL pattern for concurrent job processing.
         SKIP LOCKED ensures multiple workers don't get the same job.
+        Scheduled jobs are promoted periodically (see heartbeat), not here.
 
         Returns:
             Job data dict or None if queue is empty.
         """
-        if not self._db_pool:
-            return None
+        jobs = await self.dequeue_jobs(1)
+        return jobs[0] if jobs else None
 
-        async with self._db_pool.acquire() as conn:
-            # First, promote any scheduled jobs that are ready
-            await conn.execute("""
-                UPDATE arkham_jobs.jobs
-                SET status = 'pending'
-                WHERE status = 'scheduled'
-                  AND scheduled_at <= NOW()
-            """)
+    async def dequeue_jobs(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Claim up to limit jobs from the pool's queue in one round-trip.
+
+        Args:
+            limit: Maximum number of jobs to claim
+
+        Returns:
+            Job data dicts in priority order (empty if queue is empty).
+        """
+        if not self._db_pool or limit < 1:
+            return []
 
+        async with self._db_pool.acquire() as conn:
             # SKIP LOCKED is the magic - it skips rows locked by other workers
-            row = await conn.fetchrow("""
+            rows = await conn.fetch("""
                 UPDATE arkham_jobs.jobs
                 SET status = 'processing',
                     started_at = NOW(),
                     worker_id = $2
-                WHERE id = (
+                WHERE id IN (
                     SELECT id FROM arkham_jobs.jobs
                     WHERE pool = $1
                       AND status = 'pending'
                     ORDER BY priority ASC, created_at ASC
                     FOR UPDATE SKIP LOCKED
-                    LIMIT 1
+                    LIMIT $3
                 )
                 RETURNING id, pool, job_type, payload, priority, created_at,
                           retry_count, max_retries
-            """, self.pool, self.worker_id)
-
-            if not row:
-                return None
+            """, self.pool, self.worker_id, limit)
 
+        jobs = []
+        for row in sorted(rows, key=lambda r: (r['priority'], r['created_at'])):
             payload = row['payload']
             if isinstance(payload, str):
                 payload = json.loads(payload)
 
-            return {
+            jobs.append({
                 "id": row['id'],
                 "pool": row['pool'],
                 "job_type": row['job_type'],
@@ -267,7 +294,8 @@ class BaseWorker(ABC):
                 "priority": row['priority'],
                 "retry_count": row['retry_count'],
                 "max_retries": row['max_retries'],
-            }
+            })
+        return jobs
 
     async def complete_job(self, job_id: str, result: Dict[str, Any] = None):
         """Mark job as completed."""
@@ -380,6 +408,41 @@ class BaseWorker(ABC):
         except asyncio.TimeoutError:
             raise TimeoutError(f"Job {job_id} timed out after {self.job_timeout}s")
 
+    async def _execute_job(self, job: Dict[str, Any]) -> None:
+        """Process one claimed job and record its outcome."""
+        logger.info(f"Worker {self.worker_id} processing job {job['id']}")
+
+        try:
+            start_time = time.time()
+            result = await self._process_with_timeout(job)
+            elapsed = time.time() - start_time
+
+            await self.complete_job(job["id"], result)
+
+            self._metrics.jobs_completed += 1
+            self._metrics.total_processing_time += elapsed
+            self._metrics.last_job_time = datetime.utcnow()
+
+            logger.info(
+                f"Worker {self.worker_id} completed job {job['id']} "
+                f"in {elapsed:.2f}s"
+            )
+
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(
+                f"Worker {self.worker_id} job {job['id']} failed: {error_msg}"
+            )
+
+            await self.fail_job(job["id"], error_msg, requeue=True)
+
+            self._metrics.jobs_failed += 1
+            self._metrics.errors.append({
+                "job_id": job["id"],
+                "error": error_msg,
+                "time": datetime.utcnow().isoformat(),
+            })
+
     async def run(self):
         """
         Main worker loop.
@@ -401,88 +464,157 @@ class BaseWorker(ABC):
 
         logger.info(f"Worker {self.worker_id} started for pool {self.pool}")
 
-        last_heartbeat = time.time()
-        idle_start = time.time()
-
         try:
-            while self._running and not self._shutdown_event.is_set():
-                # Send heartbeat if needed
-                if time.time() - last_heartbeat >= self.heartbeat_interval:
-                    await self.heartbeat()
-                    last_heartbeat = time.time()
-
-                # Try to get a job
-                job = await self.dequeue_job()
+            if self.max_concurrent_jobs > 1:
+                await self._run_concurrent()
+            else:
+                await self._run_sequential()
+        except Exception as e:
+            logger.error(f"Worker {self.worker_id} error: {e}")
+            self._state = WorkerState.ERROR
+        finally:
+            await self.shutdown()
 
-                if job:
-                    idle_start = time.time()  # Reset idle timer
-                    self._state = WorkerState.PROCESSING
-                    self._current_job = job["id"]
-                    self._current_job_start = datetime.utcnow()
+    async def _run_sequential(self):
+        """Process one job at a time, heartbeating between jobs."""
+        last_heartbeat = time.time()
+        idle_start = time.time()
 
-                    logger.info(f"Worker {self.worker_id} processing job {job['id']}")
+        while self._running and not self._shutdown_event.is_set():
+            # Send heartbeat if needed
+            if time.time() - last_heartbeat >= self.heartbeat_interval:
+                await self.heartbeat()
+                last_heartbeat = time.time()
 
-                    try:
-                        start_time = time.time()
-                        result = await self._process_with_timeout(job)
-                        elapsed = time.time() - start_time
+            # Try to get a job
+            job = await self.dequeue_job()
 
-                        await self.complete_job(job["id"], result)
+            if job:
+                idle_start = time.time()  # Reset idle timer
+                self._state = WorkerState.PROCESSING
+                self._current_job = job["id"]
+                self._current_job_start = datetime.utcnow()
 
-                        self._metrics.jobs_completed += 1
-                        self._metrics.total_processing_time += elapsed
-                        self._metrics.last_job_time = datetime.utcnow()
+                try:
+                    await self._execute_job(job)
+                finally:
+                    self._current_job = None
+                    self._current_job_start = None
+                    self._state = WorkerState.IDLE
 
-                        logger.info(
-                            f"Worker {self.worker_id} completed job {job['id']} "
-                            f"in {elapsed:.2f}s"
-                        )
+            else:
+                # No job available, check idle timeout
+                idle_time = time.time() - idle_start
+                if idle_time >= self.idle_timeout:
+                    logger.info(
+                        f"Worker {self.worker_id} idle for {idle_time:.0f}s, "
+                        "shutting down"
+                    )
+                    break
+
+                # Wait before next poll
+                try:
+                    await asyncio.wait_for(
+                        self._shutdown_event.wait(),
+                        timeout=self.poll_interval,
+                    )
+                    break  # Shutdown requested
+                except asyncio.TimeoutError:
+                    pass  # Normal timeout, continue polling
+
+    async def _heartbeat_loop(self):
+        """Send heartbeats on a fixed interval, independent of job length."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.heartbeat()
+            except Exception as e:
+                logger.warning(f"Worker {self.worker_id} heartbeat failed: {e}")
+
+    def _sync_concurrent_state(self):
+        """Reflect the in-flight job set in state/current_job for heartbeats."""
+        if self._active_jobs:
+            oldest = min(self._active_jobs, key=self._active_jobs.get)
+            self._state = WorkerState.PROCESSING
+            self._current_job = oldest
+            self._current_job_start = self._active_jobs[oldest]
+        else:
+            self._state = WorkerState.IDLE
+            self._current_job = None
+            self._current_job_start = None
+
+    async def _run_concurrent(self):
+        """Run up to max_concurrent_jobs jobs at once on this event loop."""
+        heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        shutdown_wait = asyncio.create_task(self._shutdown_event.wait())
+        tasks = self._job_tasks
+        idle_start = time.time()
+        backoff = self.poll_interval
 
+        try:
+            while self._running and not self._shutdown_event.is_set():
+                free = self.max_concurrent_jobs - len(tasks)
+                claimed = []
+                if free > 0:
+                    try:
+                        claimed = await self.dequeue_jobs(free)
                     except Exception as e:
-                        error_msg = str(e)
-                        logger.error(
-                            f"Worker {self.worker_id} job {job['id']} failed: {error_msg}"
-                        )
-
-                        await self.fail_job(job["id"], error_msg, requeue=True)
-
-                        self._metrics.jobs_failed += 1
-                        self._metrics.errors.append({
-                            "job_id": job["id"],
-                            "error": error_msg,
-                            "time": datetime.utcnow().isoformat(),
-                        })
-
-                    finally:
-                        self._current_job = None
-                        self._current_job_start = None
-                        self._state = WorkerState.IDLE
-
+                        # Keep running jobs going; retry after the idle backoff
+                        logger.warning(f"Worker {self.worker_id} failed to dequeue jobs: {e}")
+
+                for job in claimed:
+                    self._active_jobs[job["id"]] = datetime.utcnow()
+                    tasks[asyncio.create_task(self._execute_job(job))] = job["id"]
+                self._sync_concurrent_state()
+
+                if len(tasks) >= self.max_concurrent_jobs:
+                    timeout = None  # All slots busy, wait for one to free up
+                elif claimed:
+                    timeout = self.poll_interval  # Queue drained, short poll
+                    backoff = self.poll_interval
                 else:
-                    # No job available, check idle timeout
-                    idle_time = time.time() - idle_start
-                    if idle_time >= self.idle_timeout:
-                        logger.info(
-                            f"Worker {self.worker_id} idle for {idle_time:.0f}s, "
-                            "shutting down"
-                        )
-                        break
-
-                    # Wait before next poll
-                    try:
-                        await asyncio.wait_for(
-                            self._shutdown_event.wait(),
-                            timeout=self.poll_interval,
-                        )
-                        break  # Shutdown requested
-                    except asyncio.TimeoutError:
-                        pass  # Normal timeout, continue polling
+                    if not tasks:
+                        idle_time = time.time() - idle_start
+                        if idle_time >= self.idle_timeout:
+                            logger.info(
+                                f"Worker {self.worker_id} idle for {idle_time:.0f}s, "
+                                "shutting down"
+                            )
+                            break
+                    timeout = backoff
+                    backoff = min(backoff * 2, self.max_idle_backoff)
+
+                if claimed or tasks:
+                    idle_start = time.time()
+
+                done, _ = await asyncio.wait(
+                    [*tasks, shutdown_wait],
+                    timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    job_id = tasks.pop(task, None)
+                    # A cancelled job never recorded an outcome; leave it
+                    # active so shutdown requeues it
+                    if job_id and not task.cancelled():
+                        self._active_jobs.pop(job_id, None)
+                        backoff = self.poll_interval
+                self._sync_concurrent_state()
+
+            # Let in-flight jobs finish (each is bounded by job_timeout)
+            if tasks:
+                logger.info(
+                    f"Worker {self.worker_id} waiting for {len(tasks)} in-flight job(s)"
+                )
+                await asyncio.gather(*tasks, return_exceptions=True)
+                for job_id in tasks.values():
+                    self._active_jobs.pop(job_id, None)
+                tasks.clear()
+                self._sync_concurrent_state()
 
-        except Exception as e:
-            logger.error(f"Worker {self.worker_id} error: {e}")
-            self._state = WorkerState.ERROR
         finally:
-            await self.shutdown()
+            heartbeat_task.cancel()
+            shutdown_wait.cancel()
 
     async def shutdown(self):
         """Graceful shutdown."""
@@ -491,17 +623,32 @@ class BaseWorker(ABC):
 
         logger.info(f"Worker {self.worker_id} shutting down...")
 
-        # If we have a current job, try to requeue it
-        if self._current_job:
+        # Stop jobs still running (the loop exited abnormally) before
+        # requeueing them, so none runs twice. Jobs that finished on their
+        # own have already recorded their outcome.
+        if self._job_tasks:
+            for task in self._job_tasks:
+                task.cancel()
+            await asyncio.gather(*self._job_tasks, return_exceptions=True)
+            for task, job_id in self._job_tasks.items():
+                if not task.cancelled():
+                    self._active_jobs.pop(job_id, None)
+            self._job_tasks.clear()
+
+        # If we have incomplete jobs, try to requeue them
+        incomplete = list(self._active_jobs) or ([self._current_job] if self._current_job else [])
+        for job_id in incomplete:
             logger.warning(
-                f"Worker {self.worker_id} has incomplete job {self._current_job}, "
+                f"Worker {self.worker_id} has incomplete job {job_id}, "
                 "requeuing"
             )
             await self.fail_job(
-                self._current_job,
+                job_id,
                 "Worker shutdown while processing",
                 requeue=True,
             )
+        self._active_jobs.clear()
+        self._current_job = None
 
         # Deregister
         await self.deregister()
@@ -524,6 +671,8 @@ class BaseWorker(ABC):
                 (datetime.utcnow() - self._current_job_start).total_seconds()
                 if self._current_job_start else None
             ),
+            "active_jobs": list(self._active_jobs),
+            "max_concurrent_jobs": self.max_concurrent_jobs,
             "metrics": self._metrics.to_dict(),
             "pid": os.getpid(),
         }
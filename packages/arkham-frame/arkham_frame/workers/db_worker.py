@@ -44,6 +44,7 @@ class DBWorker(BaseWorker):
     name = "DBWorker"
     job_timeout = 120.0  # Database operations can take time for bulk ops
     poll_interval = 0.5  # Poll frequently for DB tasks
+    max_concurrent_jobs = 8  # Bounded by the shared pool (max_size=10)
 
     # Class-level connection pool (shared across instances)
     _db_pool = None
@@ -108,6 +108,7 @@ class EnrichWorker(BaseWorker):
     pool = "llm-enrich"
     name = "EnrichWorker"
     job_timeout = 180.0  # LLM calls can be slow
+    max_concurrent_jobs = 4  # Jobs wait on the LLM endpoint, not the CPU
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -0,0 +1,242 @@
+"""
+Unit tests for DatabaseService query translation and pool metrics.
+
+These tests do not require a running PostgreSQL instance.
+
+Run with:
+    cd packages/arkham-frame
+    pytest tests/test_database.py -v
+"""
+
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+
+import pytest
+
+from arkham_frame.services.database import (
+    DatabaseService,
+    PoolMetrics,
+    QueryExecutionError,
+    BACKEND_SQLALCHEMY,
+    _coerce_param,
+    _compile_for_asyncpg,
+    _decode_jsonb,
+    _encode_json,
+    _encode_jsonb,
+)
+
+
+class TestAsyncpgTranslation:
+    """Test :name to $N placeholder rewriting."""
+
+    def test_named_params_become_positional(self):
+        sql, names = _compile_for_asyncpg("SELECT * FROM t WHERE a = :a AND b = :b")
+        assert sql == "SELECT * FROM t WHERE a = $1 AND b = $2"
+        assert names == ("a", "b")
+
+    def test_repeated_name_reuses_placeholder(self):
+        sql, names = _compile_for_asyncpg("UPDATE t SET x = :v WHERE y = :v OR z = :w")
+        assert sql == "UPDATE t SET x = $1 WHERE y = $1 OR z = $2"
+        assert names == ("v", "w")
+
+    def test_casts_and_literals_untouched(self):
+        query = "SELECT data::jsonb, ':skip', \"col:name\" FROM t WHERE id = :id::uuid"
+        sql, names = _compile_for_asyncpg(query)
+        assert sql == "SELECT data::jsonb, ':skip', \"col:name\" FROM t WHERE id = $1::uuid"
+        assert names == ("id",)
+
+    def test_question_mark_params(self):
+        db = DatabaseService(config=None)
+        sql, args = db._asyncpg_args("SELECT * FROM t WHERE a = ? AND b = ?", [1, "x"])
+        assert sql == "SELECT * FROM t WHERE a = $1 AND b = $2"
+        assert args == [1, "x"]
+
+    def test_missing_param_raises(self):
+        db = DatabaseService(config=None)
+        with pytest.raises(QueryExecutionError):
+            db._asyncpg_args("SELECT * FROM t WHERE a = :a", {})
+
+
+class TestAsyncpgParams:
+    """Test parameter adaptation for asyncpg's strict codecs."""
+
+    def test_json_strings_pass_through(self):
+        assert _encode_json('{"a": 1}') == '{"a": 1}'
+        assert _encode_json({"a": 1}) == '{"a": 1}'
+
+    def test_jsonb_binary_codec(self):
+        assert _encode_jsonb({"a": 1}) == b'\x01{"a": 1}'
+        assert _decode_jsonb(_encode_jsonb('["x"]')) == ["x"]
+
+    def test_iso_strings_become_timestamps(self):
+        assert _coerce_param("timestamptz", "2024-01-02T03:04:05Z") == datetime(
+            2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc
+        )
+        assert _coerce_param("timestamp", "2024-01-02T03:04:05+01:00") == datetime(2024, 1, 2, 2, 4, 5)
+        assert _coerce_param("date", "2024-01-02T03:04:05") == date(2024, 1, 2)
+
+    def test_scalars_become_text(self):
+        assert _coerce_param("text", 5) == "5"
+        assert _coerce_param("varchar", True) == "true"
+        assert _coerce_param("text", {"a": 1}) == '{"a": 1}'
+        assert _coerce_param("text", None) is None
+
+    def test_numeric_strings(self):
+        assert _coerce_param("int4", "7") == 7
+        assert _coerce_param("float8", "1.5") == 1.5
+        assert _coerce_param("bool", "false") is False
+
+    def test_invalid_value_raises(self):
+        with pytest.raises(QueryExecutionError, match=r"\$1 \(timestamp\)"):
+            DatabaseService._coerce_args([_PgType("timestamp")], ["not a date"], "SELECT $1")
+
+
+class _PgType:
+    def __init__(self, name: str):
+        self.name = name
+
+
+class TestPoolMetrics:
+    """Test checkout metric accounting."""
+
+    def test_checkout_and_release(self):
+        metrics = PoolMetrics()
+        metrics.record_checkout(2.0)
+        metrics.record_checkout(4.0)
+        assert metrics.in_use == 2
+        metrics.record_release(10.0, failed=False)
+        metrics.record_release(20.0, failed=True)
+
+        data = metrics.to_dict()
+        assert data["checkouts"] == 2
+        assert data["in_use"] == 0
+        assert data["max_in_use"] == 2
+        assert data["avg_wait_ms"] == 3.0
+        assert data["max_wait_ms"] == 4.0
+        assert data["avg_query_ms"] == 15.0
+        assert data["errors"] == 1
+
+    def test_default_backend_is_sqlalchemy(self):
+        db = DatabaseService(config=None)
+        assert db.backend == BACKEND_SQLALCHEMY
+        assert db.get_pool_metrics() == {"backend": BACKEND_SQLALCHEMY}
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.events = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.events.append("begin")
+        yield
+        self.events.append("commit")
+
+    async def fetch(self, sql, *args):
+        self.events.append(("fetch", sql, args))
+        return [{"id": "a"}]
+
+    async def copy_records_to_table(self, table, records, columns, schema_name=None):
+        self.events.append(("copy", schema_name, table, columns, records))
+
+
+class _FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+class _PreparingConnection:
+    """Records whether statements went through prepare() or the cached path."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def prepare(self, sql):
+        self.calls.append(("prepare", sql))
+        conn = self
+
+        class _Statement:
+            def get_parameters(self):
+                return (_PgType("int4"),)
+
+            async def fetch(self, *args):
+                conn.calls.append(("statement.fetch", args))
+                return []
+
+        return _Statement()
+
+    async def fetch(self, sql, *args):
+        self.calls.append(("fetch", args))
+        return []
+
+
+class TestStatementReuse:
+    """Test parameter types are learned once per SQL string."""
+
+    @pytest.mark.asyncio
+    async def test_prepared_once_then_cached_path(self):
+        conn = _PreparingConnection()
+        db = DatabaseService(config=None)
+
+        await db._run_on(conn, "fetch", "SELECT * FROM t WHERE n = :n", {"n": "1"})
+        await db._run_on(conn, "fetch", "SELECT * FROM t WHERE n = :n", {"n": "2"})
+        await db._run_on(conn, "execute", "SELECT * FROM u WHERE n = :n", {"n": "3"})
+
+        assert conn.calls == [
+            ("prepare", "SELECT * FROM t WHERE n = $1"),
+            ("statement.fetch", (1,)),
+            ("fetch", (2,)),
+            ("prepare", "SELECT * FROM u WHERE n = $1"),
+            ("statement.fetch", (3,)),
+        ]
+
+
+class TestTransaction:
+    """Test statements sharing one asyncpg connection and transaction."""
+
+    @pytest.mark.asyncio
+    async def test_statements_and_copy_share_transaction(self):
+        conn = _FakeConnection()
+        db = DatabaseService(config=None)
+        db._connected = True
+        db._pool = _FakePool(conn)
+
+        async with db.transaction() as tx:
+            rows = await tx.fetch_all("SELECT id FROM t")
+            await tx.copy_records("t", ["id", "data"], [("b", {"k": 1})], schema="s")
+            await tx.copy_records("t", ["id"], [])
+
+        assert rows == [{"id": "a"}]
+        assert conn.events == [
+            "begin",
+            ("fetch", "SELECT id FROM t", ()),
+            ("copy", "s", "t", ["id", "data"], [("b", {"k": 1})]),
+            "commit",
+        ]
+        assert db._pool_metrics.to_dict()["checkouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_after_commit_callbacks(self):
+        conn = _FakeConnection()
+        db = DatabaseService(config=None)
+        db._connected = True
+        db._pool = _FakePool(conn)
+        ran = []
+
+        async def notify():
+            ran.append(list(conn.events))
+
+        async with db.transaction() as tx:
+            tx.after_commit(notify)
+            assert ran == []
+        assert ran == [["begin", "commit"]]
+
+        with pytest.raises(RuntimeError):
+            async with db.transaction() as tx:
+                tx.after_commit(notify)
+                raise RuntimeError("rolled back")
+        assert len(ran) == 1
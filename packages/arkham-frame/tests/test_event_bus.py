@@ -10,6 +10,7 @@ Run with:
 """
 
 import asyncio
+import json
 import pytest
 import pytest_asyncio
 from datetime import datetime
@@ -17,9 +18,11 @@ from typing import Dict, Any, List
 
 from arkham_frame.services.events import (
     EventBus,
+    EventOutbox,
     Event,
     EventValidationError,
     EventDeliveryError,
+    _HighWaterMark,
 )
 
 
@@ -613,6 +616,341 @@ class TestIntegrationScenarios:
         assert received_count[0] == 100
 
 
+# =============================================================================
+# Test 6: Subscription Index and Dispatch Modes
+# =============================================================================
+
+class TestSubscriptionIndex:
+    """Test compiled pattern matching and concurrent dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_exact_prefix_and_wildcard_patterns(self):
+        """Index should match the same patterns fnmatch would."""
+        bus = EventBus()
+        await bus.initialize()
+
+        hits = []
+        await bus.subscribe("document.created", lambda e: hits.append("exact"))
+        await bus.subscribe("document.*", lambda e: hits.append("prefix"))
+        await bus.subscribe("*", lambda e: hits.append("all"))
+        await bus.subscribe("*.created", lambda e: hits.append("suffix"))
+        await bus.subscribe("doc?ment.[cd]*", lambda e: hits.append("regex"))
+        await bus.subscribe("entity.*", lambda e: hits.append("other"))
+
+        await bus.emit("document.created", {}, source="test")
+
+        # Delivered in subscription order
+        assert hits == ["exact", "prefix", "all", "suffix", "regex"]
+
+    @pytest.mark.asyncio
+    async def test_index_refreshes_after_unsubscribe(self):
+        """Unsubscribed handlers should stop receiving events."""
+        bus = EventBus()
+        await bus.initialize()
+
+        hits = []
+
+        def handler(event):
+            hits.append(event["event_type"])
+
+        await bus.subscribe("chunks.*", handler)
+        await bus.emit("chunks.chunk.created", {}, source="test")
+        await bus.unsubscribe("chunks.*", handler)
+        await bus.emit("chunks.chunk.created", {}, source="test")
+
+        assert hits == ["chunks.chunk.created"]
+        assert "chunks.*" not in bus._subscribers
+
+    @pytest.mark.asyncio
+    async def test_concurrent_dispatch_runs_handlers_in_parallel(self):
+        """Concurrent mode should overlap slow async handlers."""
+        bus = EventBus(concurrent_dispatch=True)
+        await bus.initialize()
+
+        async def slow(event):
+            await asyncio.sleep(0.1)
+
+        for _ in range(5):
+            await bus.subscribe("slow.event", slow)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await bus.emit("slow.event", {}, source="test")
+        assert loop.time() - start < 0.3
+
+    @pytest.mark.asyncio
+    async def test_handler_timeout_and_error_isolation(self):
+        """A hung or failing handler should not block the others."""
+        bus = EventBus(concurrent_dispatch=True, handler_timeout=0.05)
+        await bus.initialize()
+
+        received = []
+
+        async def hangs(event):
+            await asyncio.sleep(10)
+
+        def fails(event):
+            raise RuntimeError("boom")
+
+        async def works(event):
+            received.append(event["payload"])
+
+        await bus.subscribe("iso.event", hangs)
+        await bus.subscribe("iso.event", fails)
+        await bus.subscribe("iso.event", works)
+
+        await asyncio.wait_for(bus.emit("iso.event", {"ok": 1}, source="test"), timeout=1.0)
+
+        assert received == [{"ok": 1}]
+        stats = bus.get_stats()
+        assert stats["handler_timeouts"] == 1
+        assert stats["handler_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_history_ring_buffer_keeps_most_recent(self):
+        """History should keep only the newest events, newest first."""
+        bus = EventBus()
+        bus._max_history = 3
+        await bus.initialize()
+
+        for i in range(5):
+            await bus.emit(f"ring.{i}", {}, source="test")
+
+        assert [e.event_type for e in bus.get_events(limit=10)] == ["ring.4", "ring.3", "ring.2"]
+        assert bus.get_event_count(event_type="ring.*") == 3
+        assert [e.event_type for e in bus.get_events(limit=1, offset=1)] == ["ring.3"]
+
+
+# =============================================================================
+# Test 7: Durable Outbox
+# =============================================================================
+
+class FakeOutboxPool:
+    """In-memory stand-in for the outbox tables, enough for relay_once()."""
+
+    def __init__(self):
+        self.rows: List[Dict[str, Any]] = []
+        self.cursors: Dict[str, int] = {}
+        self.cursor_age_days: Dict[str, int] = {}
+        self._seq = 0
+
+    def acquire(self):
+        pool = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                return pool
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+    def commit(self, event_type: str, seq: int = None):
+        """Make a row visible, optionally with a pre-allocated sequence."""
+        if seq is None:
+            self._seq += 1
+            seq = self._seq
+        self.rows.append({
+            "seq": seq,
+            "event_type": event_type,
+            "payload": json.dumps({"n": seq}),
+            "source": "test",
+            "created_at": datetime.utcnow(),
+        })
+        self.rows.sort(key=lambda r: r["seq"])
+        return seq
+
+    async def fetchrow(self, query, event_type, payload, source):
+        seq = self.commit(event_type)
+        return {"seq": seq}
+
+    async def fetchval(self, query, consumer):
+        return self.cursors.get(consumer)
+
+    async def fetch(self, query, *args):
+        if "DELETE FROM arkham_frame.event_cursors" in query:
+            expiry_days, registered = args
+            expired = [
+                c for c in self.cursors
+                if self.cursor_age_days.get(c, 0) > expiry_days and c not in registered
+            ]
+            for consumer in expired:
+                del self.cursors[consumer]
+            return [{"consumer": c} for c in expired]
+        if "payload::text" in query:
+            low, high, limit = args
+            return [r for r in self.rows if low < r["seq"] <= high][:limit]
+        if "SELECT seq FROM" in query:
+            low, limit = args
+            return [{"seq": r["seq"]} for r in self.rows if r["seq"] > low][:limit]
+        return [{"consumer": k, "last_seq": v} for k, v in self.cursors.items()]
+
+    async def execute(self, query, *args):
+        if "event_cursors" in query and "INSERT" in query:
+            self.cursors[args[0]] = args[1]
+            self.cursor_age_days[args[0]] = 0
+        if "DELETE FROM arkham_frame.event_outbox" in query:
+            low = min(self.cursors.values(), default=0)
+            kept = [r for r in self.rows if r["seq"] > low]
+            deleted, self.rows = len(self.rows) - len(kept), kept
+            return f"DELETE {deleted}"
+        return "DELETE 0"
+
+
+class TestEventOutbox:
+    """Tests for the transactional outbox relay."""
+
+    def test_high_water_mark_waits_on_holes(self):
+        """A missing sequence blocks delivery until gap_timeout passes."""
+        hwm = _HighWaterMark(start=0, gap_timeout=5.0)
+        assert hwm.advance([1, 2, 4, 5], now=100.0) == 2
+        assert hwm.advance([4, 5], now=102.0) == 2
+        # Late commit of 3 fills the hole
+        assert hwm.advance([3, 4, 5], now=103.0) == 5
+        # A hole that never fills is skipped after the timeout
+        assert hwm.advance([7], now=110.0) == 5
+        assert hwm.advance([7], now=116.0) == 7
+
+    @pytest.mark.asyncio
+    async def test_relay_delivers_matching_batches_and_persists_cursor(self):
+        """Consumers get matching events in order and in batches."""
+        pool = FakeOutboxPool()
+        outbox = EventOutbox(pool=pool, batch_size=2)
+        batches = []
+
+        async def handler(events):
+            batches.append([e.sequence for e in events])
+
+        outbox.register_consumer("indexer", "document.*", handler, start="earliest")
+        for event_type in ["document.a", "entity.x", "document.b", "document.c"]:
+            await outbox.publish(event_type, {}, "test")
+
+        delivered = await outbox.relay_once()
+
+        assert delivered == 3
+        assert batches == [[1, 3], [4]]
+        assert pool.cursors["indexer"] == 4
+        assert await outbox.relay_once() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_and_replay_rewinds(self):
+        """A failing handler keeps its cursor; replay redelivers old events."""
+        pool = FakeOutboxPool()
+        outbox = EventOutbox(pool=pool)
+        seen = []
+        fail = {"on": True}
+
+        def handler(events):
+            if fail["on"]:
+                raise RuntimeError("downstream unavailable")
+            seen.extend(e.sequence for e in events)
+
+        outbox.register_consumer("sync", "*", handler, start="earliest")
+        for i in range(3):
+            await outbox.publish(f"event.{i}", {"i": i}, "test")
+
+        assert await outbox.relay_once() == 0
+        assert pool.cursors["sync"] == 0
+        assert outbox.get_stats()["consumers"]["sync"]["errors"] == 1
+
+        fail["on"] = False
+        assert await outbox.relay_once() == 3
+        assert seen == [1, 2, 3]
+
+        await outbox.replay("sync", from_seq=2)
+        await outbox.relay_once()
+        assert seen == [1, 2, 3, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_latest_consumer_skips_backlog(self):
+        """New consumers start after existing events unless asked otherwise."""
+        pool = FakeOutboxPool()
+        outbox = EventOutbox(pool=pool)
+        await outbox.publish("old.event", {}, "test")
+        await outbox.relay_once()
+
+        seen = []
+        outbox.register_consumer("late", "*", lambda events: seen.extend(events))
+        await outbox.publish("new.event", {}, "test")
+        await outbox.relay_once()
+
+        assert [e.event_type for e in seen] == ["new.event"]
+
+    @pytest.mark.asyncio
+    async def test_prune_expires_dead_cursors(self):
+        """Stale cursors of unregistered consumers stop blocking pruning."""
+        pool = FakeOutboxPool()
+        outbox = EventOutbox(pool=pool, cursor_expiry_days=30)
+        outbox.register_consumer("live", "*", lambda events: None, start="earliest")
+        pool.cursors.update({"gone": 0, "paused": 1})
+        pool.cursor_age_days.update({"gone": 40, "paused": 2})
+        for i in range(3):
+            await outbox.publish(f"event.{i}", {}, "test")
+
+        # The first relay pass prunes: "gone" expires, "paused" still holds seq 2+
+        await outbox.relay_once()
+        assert "gone" not in pool.cursors
+        assert [r["seq"] for r in pool.rows] == [2, 3]
+
+        del pool.cursors["paused"]
+        assert await outbox.prune() == 2
+        # A registered consumer's cursor is never expired
+        pool.cursor_age_days["live"] = 90
+        await outbox.prune()
+        assert "live" in pool.cursors
+
+    @pytest.mark.asyncio
+    async def test_emit_durable_without_outbox_is_plain_emit(self):
+        """Without an outbox, emit_durable still reaches in-process subscribers."""
+        bus = EventBus()
+        received = []
+        await bus.subscribe("durable.*", lambda e: received.append(e["event_type"]))
+
+        seq = await bus.emit_durable("durable.test", {}, source="test")
+
+        assert seq == 0
+        assert received == ["durable.test"]
+        with pytest.raises(EventDeliveryError):
+            bus.consume("x", "*", lambda events: None)
+
+    @pytest.mark.asyncio
+    async def test_emit_durable_in_transaction_waits_for_commit(self):
+        """The outbox row joins the caller's transaction; subscribers hear of it after commit."""
+        pool = FakeOutboxPool()
+        bus = EventBus()
+        bus.outbox = EventOutbox(pool=pool)
+        received = []
+        await bus.subscribe("document.*", lambda e: received.append(e["payload"]))
+
+        class FakeTransaction:
+            def __init__(self):
+                self.statements = []
+                self.callbacks = []
+
+            async def fetch_one(self, query, params):
+                self.statements.append((query, params))
+                return {"seq": 7}
+
+            def after_commit(self, callback):
+                self.callbacks.append(callback)
+
+        tx = FakeTransaction()
+        seq = await bus.emit_durable("document.deleted", {"id": "d1"}, "test", transaction=tx)
+
+        assert seq == 7
+        query, params = tx.statements[0]
+        assert "arkham_frame.event_outbox" in query
+        assert params == {"event_type": "document.deleted", "payload": '{"id": "d1"}', "source": "test"}
+        # Nothing is delivered while the transaction is open (or if it rolls back)
+        assert received == []
+        assert pool.rows == []
+
+        for callback in tx.callbacks:
+            await callback()
+        assert received == [{"id": "d1"}]
+
+
 # =============================================================================
 # Smoke Test (can run directly)
 # =============================================================================
@@ -0,0 +1,89 @@
+"""
+Tests for keyset pagination cursors.
+
+Run with:
+    cd packages/arkham-frame
+    pytest tests/test_pagination.py -v
+"""
+
+from datetime import datetime
+
+import pytest
+
+from arkham_frame.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    keyset_phases,
+    next_cursor,
+)
+
+
+class TestCursorCodec:
+    """Test cursor encoding and validation."""
+
+    def test_round_trip_preserves_datetimes(self):
+        created = datetime(2024, 5, 1, 12, 30, 15, 250000)
+        token = encode_cursor(sort="created_at", value=created, id="doc-9")
+
+        fields = decode_cursor(token)
+
+        assert fields == {"sort": "created_at", "value": created, "id": "doc-9"}
+
+    def test_token_is_url_safe(self):
+        token = encode_cursor(value="a/b+c?d", id="x" * 40)
+        assert all(c.isalnum() or c in "-_" for c in token)
+
+    def test_expected_fields_must_match(self):
+        token = encode_cursor(sort="created_at", id="doc-1")
+
+        assert decode_cursor(token, sort="created_at")["id"] == "doc-1"
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(token, sort="filename")
+
+    @pytest.mark.parametrize("token", ["not base64!", "bm90IGpzb24", "WzEsMl0"])
+    def test_malformed_tokens_rejected(self, token):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(token)
+
+    def test_next_cursor_only_for_full_pages(self):
+        assert next_cursor(19, 20, id="doc-19") is None
+        assert decode_cursor(next_cursor(20, 20, id="doc-20")) == {"id": "doc-20"}
+
+
+class TestKeysetCondition:
+    """Test the generated seek conditions."""
+
+    def test_descending_uses_row_comparison(self):
+        sql, params = keyset_condition("created_at", "id", True, "v", "doc-1")
+        assert sql == "((created_at, id) < (:cursor_value, :cursor_id))"
+        assert params == {"cursor_value": "v", "cursor_id": "doc-1"}
+
+    def test_ascending_excludes_nulls(self):
+        sql, _ = keyset_condition("file_size", "id", False, 10, "doc-1")
+        assert sql == "((file_size, id) > (:cursor_value, :cursor_id))"
+
+    def test_null_position_pages_by_id(self):
+        sql, params = keyset_condition("updated_at", "id", True, None, "doc-1", param_prefix="after")
+        assert sql == "(updated_at IS NULL AND id < :after_id)"
+        assert params == {"after_id": "doc-1"}
+
+
+class TestKeysetPhases:
+    """Test NULLS LAST orderings split into seekable phases."""
+
+    def test_first_page_reads_values_then_nulls(self):
+        phases = keyset_phases("updated_at", "id", True)
+        assert phases == [("(updated_at IS NOT NULL)", {}), ("(updated_at IS NULL)", {})]
+
+    def test_value_position_continues_into_nulls(self):
+        phases = keyset_phases("file_size", "id", False, (10, "doc-1"))
+        assert phases == [
+            ("((file_size, id) > (:cursor_value, :cursor_id))", {"cursor_value": 10, "cursor_id": "doc-1"}),
+            ("(file_size IS NULL)", {}),
+        ]
+
+    def test_null_position_stays_in_nulls(self):
+        phases = keyset_phases("file_size", "id", True, (None, "doc-1"))
+        assert phases == [("(file_size IS NULL AND id < :cursor_id)", {"cursor_id": "doc-1"})]
@@ -0,0 +1,464 @@
+"""
+Unit tests for VectorService bulk ingestion, online reindex and the embedding executor.
+
+These tests do not require PostgreSQL or pgvector.
+
+Run with:
+    cd packages/arkham-frame
+    pytest tests/test_vectors.py -v
+"""
+
+import asyncio
+import struct
+
+import pytest
+
+from arkham_frame.services.vectors import (
+    VectorService,
+    VectorPoint,
+    BulkIngestStats,
+    CollectionNotFoundError,
+    VectorServiceError,
+    encode_vector_binary,
+    decode_vector_binary,
+    invalidate_collection_cache,
+    register_vector_codec,
+)
+from arkham_frame.services.embedding_executor import EmbeddingExecutor, EmbeddingExecutorError
+
+
+class FakeCopyConnection:
+    """Records what the bulk path sends to PostgreSQL."""
+
+    def __init__(self, collection_exists=True):
+        self.collection_exists = collection_exists
+        self.copied = None
+        self.executed = []
+        self.codecs = []
+
+    async def fetchval(self, query, *args):
+        return 1 if self.collection_exists else None
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+
+    async def executemany(self, query, rows):
+        self.executed.append((query, rows))
+
+    async def set_type_codec(self, typename, **kwargs):
+        self.codecs.append(("set", typename, kwargs["format"]))
+
+    async def reset_type_codec(self, typename, **kwargs):
+        self.codecs.append(("reset", typename))
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copied = (table, list(records), columns)
+
+    def transaction(self):
+        class _Tx:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Tx()
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        conn = self.conn
+
+        class _Ctx:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+
+def make_service(conn, threshold=2):
+    service = VectorService(config=None)
+    service._pool = FakePool(conn)
+    service._available = True
+    service._vector_type_schema = "public"
+    service._bulk_threshold = threshold
+    return service
+
+
+class TestVectorBinaryFormat:
+    """Test pgvector binary encoding."""
+
+    def test_roundtrip_list(self):
+        data = encode_vector_binary([1.0, -2.5, 0.125])
+        assert struct.unpack_from(">HH", data) == (3, 0)
+        assert len(data) == 4 + 3 * 4
+        assert decode_vector_binary(data) == [1.0, -2.5, 0.125]
+
+    def test_text_and_numpy_inputs_match_list(self):
+        np = pytest.importorskip("numpy")
+        expected = encode_vector_binary([0.5, 1.5])
+        assert encode_vector_binary("[0.5, 1.5]") == expected
+        assert encode_vector_binary(np.array([0.5, 1.5], dtype=np.float32)) == expected
+
+    @pytest.mark.asyncio
+    async def test_codec_registered_where_pgvector_lives(self):
+        class FakeCodecConnection:
+            def __init__(self, schema):
+                self.schema = schema
+                self.codecs = []
+
+            async def fetchval(self, query, *args):
+                return self.schema
+
+            async def set_type_codec(self, typename, **kwargs):
+                self.codecs.append((typename, kwargs["schema"], kwargs["format"]))
+
+        conn = FakeCodecConnection("extensions")
+        assert await register_vector_codec(conn) == "extensions"
+        assert conn.codecs == [("vector", "extensions", "binary")]
+
+        conn = FakeCodecConnection(None)
+        assert await register_vector_codec(conn) is None
+        assert conn.codecs == []
+
+
+class TestBulkUpsert:
+    """Test the COPY upsert path and its routing."""
+
+    @pytest.mark.asyncio
+    async def test_large_batch_uses_copy_and_merge(self):
+        conn = FakeCopyConnection()
+        service = make_service(conn)
+        points = [
+            VectorPoint(id="a", vector=[0.1, 0.2], payload={"doc": 1}),
+            VectorPoint(id="b", vector=[0.3, 0.4], payload='{"doc": 2}'),
+        ]
+
+        assert await service.upsert("arkham_chunks", points) == 2
+
+        table, records, columns = conn.copied
+        assert table == "arkham_vector_stage"
+        assert columns == ["ord", "id", "embedding", "payload"]
+        assert records[0] == (0, "a", [0.1, 0.2], '{"doc": 1}')
+        assert records[1][3] == '{"doc": 2}'
+        merge_sql, merge_args = conn.executed[-1]
+        assert "DISTINCT ON (id)" in merge_sql and "ON CONFLICT (id)" in merge_sql
+        assert merge_args == ("arkham_chunks",)
+        # The codec is registered once per pool connection, not per batch
+        assert conn.codecs == []
+
+        stats = service.get_bulk_stats()
+        assert stats["rows"] == 2
+        assert stats["batches"] == 1
+        assert stats["bytes"] > 0
+
+    @pytest.mark.asyncio
+    async def test_small_batch_keeps_executemany(self):
+        conn = FakeCopyConnection()
+        service = make_service(conn, threshold=10)
+
+        await service.upsert("arkham_chunks", [VectorPoint(id="a", vector=[1.0], payload={})])
+
+        assert conn.copied is None
+        assert "VALUES ($1, $2, $3::vector, $4::jsonb)" in conn.executed[-1][0]
+
+    @pytest.mark.asyncio
+    async def test_missing_collection_raises(self):
+        service = make_service(FakeCopyConnection(collection_exists=False))
+        with pytest.raises(CollectionNotFoundError):
+            await service.upsert_bulk("missing", [VectorPoint(id="a", vector=[1.0], payload={})])
+
+    def test_stats_rates(self):
+        stats = BulkIngestStats()
+        stats.record(rows=1000, nbytes=4000, seconds=0.5)
+        data = stats.to_dict()
+        assert data["rows_per_sec"] == 2000.0
+        assert data["bytes_per_sec"] == 8000.0
+
+
+class FakeSearchConnection:
+    """Serves collection metadata and canned LATERAL search rows."""
+
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.metadata_reads = 0
+        self.fetched = []
+        self.executed = []
+
+    async def fetchrow(self, query, *args):
+        self.metadata_reads += 1
+        return {
+            "name": args[0],
+            "distance_metric": "cosine",
+            "index_type": "ivfflat",
+            "lists": 100,
+            "probes": 10,
+        }
+
+    async def fetch(self, query, *args):
+        self.fetched.append((" ".join(query.split()), args))
+        return self.rows
+
+    async def execute(self, query, *args):
+        self.executed.append(query)
+
+
+class TestSearchBatch:
+    """Test single-statement batched search and the metadata cache."""
+
+    def setup_method(self):
+        invalidate_collection_cache()
+
+    @pytest.mark.asyncio
+    async def test_one_statement_for_all_queries(self):
+        conn = FakeSearchConnection(rows=[
+            {"ord": 1, "id": "a", "payload": {"n": 1}, "score": 0.9, "distance": 0.1},
+            {"ord": 1, "id": "b", "payload": None, "score": 0.8, "distance": 0.2},
+            {"ord": 3, "id": "c", "payload": {}, "score": 0.7, "distance": 0.3},
+        ])
+        service = make_service(conn)
+
+        results = await service.search_batch(
+            "arkham_chunks",
+            [[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]],
+            limit=2,
+            filter={"document_id": "d1"},
+        )
+
+        assert [[r.id for r in hits] for hits in results] == [["a", "b"], [], ["c"]]
+        assert results[0][1].payload == {}
+        assert len(conn.fetched) == 1
+        sql, args = conn.fetched[0]
+        assert "unnest($1::text[]) WITH ORDINALITY" in sql
+        assert "CROSS JOIN LATERAL" in sql
+        assert "payload @> $3::jsonb" in sql and "LIMIT $4" in sql
+        assert args[0] == ["[0.1, 0.2]", "[0.3, 0.4]", "[0.5, 0.6]"]
+        assert args[1:] == ("arkham_chunks", '{"document_id": "d1"}', 2)
+        assert conn.executed == ["SET ivfflat.probes = 10"]
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_skips_database(self):
+        conn = FakeSearchConnection()
+        service = make_service(conn)
+        assert await service.search_batch("arkham_chunks", []) == []
+        assert conn.fetched == [] and conn.metadata_reads == 0
+
+    @pytest.mark.asyncio
+    async def test_collection_metadata_is_cached_until_invalidated(self):
+        conn = FakeSearchConnection()
+        service = make_service(conn)
+
+        await service.search("arkham_chunks", [0.1, 0.2])
+        await service.search_batch("arkham_chunks", [[0.1, 0.2]])
+        assert conn.metadata_reads == 1
+
+        invalidate_collection_cache("arkham_chunks")
+        await service.search("arkham_chunks", [0.1, 0.2])
+        assert conn.metadata_reads == 2
+
+        service._meta_cache_ttl = 0
+        await service.search("arkham_chunks", [0.1, 0.2])
+        assert conn.metadata_reads == 3
+
+
+class TestEmbeddingExecutor:
+    """Test micro-batching of embedding requests."""
+
+    @staticmethod
+    def make_encoder(calls):
+        def encode(texts):
+            calls.append(list(texts))
+            return [[float(len(t))] for t in texts]
+        return encode
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_a_batch(self):
+        calls = []
+        executor = EmbeddingExecutor(self.make_encoder(calls), max_batch_size=8, max_wait_ms=20)
+        try:
+            results = await asyncio.gather(*(executor.embed("x" * n) for n in range(1, 6)))
+        finally:
+            await executor.close()
+
+        assert results == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        assert len(calls) == 1
+        assert executor.get_stats()["avg_batch_size"] == 5
+
+    @pytest.mark.asyncio
+    async def test_bulk_is_split_and_interactive_goes_first(self):
+        calls = []
+        executor = EmbeddingExecutor(self.make_encoder(calls), max_batch_size=2, max_wait_ms=20)
+        try:
+            bulk = asyncio.ensure_future(executor.embed_many(["b1", "b2", "b3", "b4"]))
+            await asyncio.sleep(0)
+            query = await executor.embed("query!")
+            vectors = await bulk
+        finally:
+            await executor.close()
+
+        assert query == [6.0]
+        assert vectors == [[2.0]] * 4
+        assert calls[0] == ["query!"]
+        assert all(len(call) <= 2 for call in calls)
+
+    @pytest.mark.asyncio
+    async def test_encode_errors_reach_callers(self):
+        def broken(texts):
+            raise RuntimeError("model exploded")
+
+        executor = EmbeddingExecutor(broken, max_wait_ms=0)
+        try:
+            with pytest.raises(RuntimeError, match="model exploded"):
+                await executor.embed("text")
+            assert executor.get_stats()["errors"] == 1
+        finally:
+            await executor.close()
+
+    @pytest.mark.asyncio
+    async def test_closed_executor_rejects_work(self):
+        executor = EmbeddingExecutor(self.make_encoder([]))
+        await executor.close()
+        with pytest.raises(EmbeddingExecutorError):
+            await executor.embed("late")
+
+
+class FakeReindexConnection:
+    """Serves one collection row and records index DDL."""
+
+    def __init__(self, index_type="ivfflat", count=5000, build_delay=0.0, fail_build=False):
+        self.collection = {
+            "name": "arkham_chunks",
+            "distance_metric": "cosine",
+            "index_type": index_type,
+            "lists": 10,
+            "probes": 5,
+            "hnsw_m": None,
+            "hnsw_ef_search": None,
+        }
+        self.count = count
+        self.build_delay = build_delay
+        self.fail_build = fail_build
+        self.executed = []
+
+    async def fetchrow(self, query, *args):
+        if "pg_stat_progress_create_index" in query:
+            return {
+                "phase": "building index: loading tuples in tree",
+                "blocks_done": 10,
+                "blocks_total": 40,
+                "tuples_done": 50,
+                "tuples_total": 100,
+            }
+        return self.collection
+
+    async def fetchval(self, query, *args):
+        return self.count
+
+    async def execute(self, query, *args, timeout=None):
+        self.executed.append(" ".join(query.split()))
+        if query.lstrip().startswith("CREATE INDEX"):
+            await asyncio.sleep(self.build_delay)
+            if self.fail_build:
+                raise RuntimeError("out of maintenance_work_mem")
+
+    def get_server_pid(self):
+        return 4242
+
+    def transaction(self):
+        return FakeCopyConnection().transaction()
+
+
+class TestOnlineReindex:
+    """Test concurrent index rebuild, swap and HNSW selection."""
+
+    @staticmethod
+    def make_service(conn, pgvector_version=(0, 7, 0)):
+        service = make_service(conn)
+        service._pgvector_version = pgvector_version
+        service._reindex_poll_interval = 0.01
+        return service
+
+    @pytest.mark.asyncio
+    async def test_switch_to_hnsw_builds_shadow_and_swaps(self):
+        conn = FakeReindexConnection()
+        service = self.make_service(conn)
+
+        result = await service.reindex_collection("arkham_chunks", index_type="hnsw")
+
+        assert result["index_type"] == "hnsw"
+        assert result["m"] == 16 and result["ef_construction"] == 64
+        sql = conn.executed
+        build = next(i for i, q in enumerate(sql) if q.startswith("CREATE INDEX"))
+        assert "CONCURRENTLY IF NOT EXISTS idx_hnsw_arkham_chunks_shadow" in sql[build]
+        assert "USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)" in sql[build]
+        assert "WHERE collection = 'arkham_chunks'" in sql[build]
+        # Leftovers from failed builds are cleared first
+        assert all(q.startswith("DROP INDEX CONCURRENTLY") for q in sql[:build])
+
+        swap = sql.index("ALTER INDEX arkham_vectors.idx_hnsw_arkham_chunks_shadow RENAME TO idx_hnsw_arkham_chunks")
+        assert "ALTER INDEX IF EXISTS arkham_vectors.idx_ivfflat_arkham_chunks RENAME TO idx_ivfflat_arkham_chunks_retired" in sql[build:swap]
+        assert "UPDATE arkham_vectors.collections" in sql[swap + 1]
+        assert "DROP INDEX CONCURRENTLY IF EXISTS arkham_vectors.idx_ivfflat_arkham_chunks_retired" in sql[swap + 2:]
+
+        progress = service.get_reindex_progress("arkham_chunks")
+        assert progress["status"] == "completed"
+        assert progress["percent"] == 100.0
+
+    @pytest.mark.asyncio
+    async def test_progress_is_polled_while_building(self):
+        conn = FakeReindexConnection(build_delay=0.05)
+        service = self.make_service(conn)
+        seen = []
+
+        async def on_progress(progress):
+            seen.append((progress.status, progress.percent))
+
+        await service.reindex_collection("arkham_chunks", progress_callback=on_progress)
+
+        assert ("running", 50.0) in seen
+        assert seen[-1] == ("completed", 100.0)
+
+    @pytest.mark.asyncio
+    async def test_failed_build_drops_shadow_and_keeps_old_index(self):
+        conn = FakeReindexConnection(fail_build=True)
+        service = self.make_service(conn)
+
+        with pytest.raises(VectorServiceError, match="maintenance_work_mem"):
+            await service.reindex_collection("arkham_chunks")
+
+        assert conn.executed[-1] == "DROP INDEX CONCURRENTLY IF EXISTS arkham_vectors.idx_ivfflat_arkham_chunks_shadow"
+        assert not any(q.startswith("ALTER INDEX") for q in conn.executed)
+        assert service.get_reindex_progress("arkham_chunks")["status"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_hnsw_requires_recent_pgvector(self):
+        service = self.make_service(FakeReindexConnection(), pgvector_version=(0, 4, 4))
+        with pytest.raises(VectorServiceError, match="0.5.0"):
+            await service.reindex_collection("arkham_chunks", index_type="hnsw")
+
+    @pytest.mark.asyncio
+    async def test_hnsw_search_sets_ef_search_at_least_limit(self):
+        conn = FakeReindexConnection()
+        service = self.make_service(conn)
+        coll = {"index_type": "hnsw", "hnsw_m": 16, "hnsw_ef_search": 100}
+
+        await service._set_search_params(conn, coll, limit=10)
+        await service._set_search_params(conn, coll, limit=500)
+        await service._set_search_params(conn, {"index_type": "ivfflat", "lists": 100, "probes": 7}, limit=10)
+
+        assert conn.executed == [
+            "SET hnsw.ef_search = 100",
+            "SET hnsw.ef_search = 500",
+            "SET ivfflat.probes = 7",
+        ]
+
+    def test_version_parsing(self):
+        assert VectorService._parse_version("0.7.4") == (0, 7, 4)
+        assert VectorService._parse_version("0.5.0-dev") == (0, 5, 0)
+        assert VectorService._parse_version(None) == ()
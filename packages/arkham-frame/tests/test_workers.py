@@ -593,6 +593,285 @@ class TestWorkerRegistry:
         await cleanup_test_queues(db_pool)
 
 
+# =============================================================================
+# Test 6: Bulk Enqueue / Batch Dequeue (WorkerService)
+# =============================================================================
+
+async def make_worker_service(pool):
+    """WorkerService bound to the test pool, with auto-scaling disabled."""
+    from arkham_frame.services.workers import WorkerService
+
+    service = WorkerService(config=None)
+    service.set_db_pool(pool)
+
+    async def no_autoscale(pool_name):
+        return None
+
+    service._ensure_worker_for_pool = no_autoscale
+    return service
+
+
+class TestBulkQueueing:
+    """Test enqueue_many, dequeue_batch and scheduled job promotion."""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_many_and_dequeue_batch(self, db_pool):
+        """Bulk-enqueued jobs should be claimed in priority order."""
+        await cleanup_test_queues(db_pool)
+        service = await make_worker_service(db_pool)
+
+        specs = [
+            {"job_id": f"test-bulk-{i}", "payload": {"n": i}, "priority": 10 - i}
+            for i in range(6)
+        ]
+        jobs = await service.enqueue_many("cpu-light", specs)
+        assert [j.id for j in jobs] == [s["job_id"] for s in specs]
+
+        claimed = await service.dequeue_batch("cpu-light", "test-bulk-worker", 4)
+        claimed = [j for j in claimed if j.id.startswith("test-bulk-")]
+        assert [j.id for j in claimed] == ["test-bulk-5", "test-bulk-4", "test-bulk-3", "test-bulk-2"]
+        assert claimed[0].payload == {"n": 5}
+
+        async with db_pool.acquire() as conn:
+            processing = await conn.fetchval("""
+                SELECT COUNT(*) FROM arkham_jobs.jobs
+                WHERE id LIKE 'test-bulk-%' AND status = 'processing'
+            """)
+        assert processing == 4
+
+        await cleanup_test_queues(db_pool)
+
+    @pytest.mark.asyncio
+    async def test_scheduled_jobs_promoted_by_promoter(self, db_pool):
+        """Due scheduled jobs stay scheduled until the promoter runs."""
+        await cleanup_test_queues(db_pool)
+        service = await make_worker_service(db_pool)
+
+        due = datetime.utcnow() - timedelta(seconds=5)
+        await service.enqueue_many("cpu-light", [
+            {"job_id": "test-sched-1", "payload": {}, "scheduled_at": due},
+        ])
+
+        claimed = await service.dequeue_batch("cpu-light", "test-sched-worker", 10)
+        assert "test-sched-1" not in [j.id for j in claimed]
+
+        promoted = await service.promote_scheduled_jobs()
+        assert promoted >= 1
+
+        claimed = await service.dequeue_batch("cpu-light", "test-sched-worker", 10)
+        assert "test-sched-1" in [j.id for j in claimed]
+
+        await cleanup_test_queues(db_pool)
+
+
+# =============================================================================
+# Test 7: Push-based Result Waiting (no database required)
+# =============================================================================
+
+class FakeJobsPool:
+    """Minimal stand-in for an asyncpg pool serving arkham_jobs.jobs rows."""
+
+    def __init__(self):
+        self.rows = {}
+        self.queries = 0
+
+    def acquire(self):
+        pool = self
+
+        class _Conn:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def fetchrow(self, query, job_id):
+                pool.queries += 1
+                return pool.rows.get(job_id)
+
+        return _Conn()
+
+
+class TestResultWaiting:
+    """Test JobWaiterRegistry and notification-driven wait_for_result."""
+
+    @pytest.mark.asyncio
+    async def test_registry_resolves_all_waiters(self):
+        from arkham_frame.services.workers import JobWaiterRegistry
+
+        registry = JobWaiterRegistry()
+        first = registry.register("job-1")
+        second = registry.register("job-1")
+        assert len(registry) == 2
+
+        assert registry.resolve("job-1", "completed") == 2
+        assert await first == "completed"
+        assert await second == "completed"
+        assert len(registry) == 0
+
+    @pytest.mark.asyncio
+    async def test_wait_for_result_woken_by_notification(self):
+        from arkham_frame.services.workers import WorkerService
+
+        pool = FakeJobsPool()
+        pool.rows["job-1"] = {"status": "processing", "result": None, "last_error": None}
+        service = WorkerService(config=None)
+        service.set_db_pool(pool)
+        service._listener_running = True  # Pretend LISTEN is active
+
+        waiter = asyncio.create_task(
+            service.wait_for_result("job-1", timeout=5.0, fallback_interval=60.0)
+        )
+        await asyncio.sleep(0.05)
+        assert pool.queries == 1
+
+        pool.rows["job-1"] = {"status": "completed", "result": {"ok": True}, "last_error": None}
+        service._handle_job_finished(None, 0, "arkham_job_finished",
+                                     json.dumps({"job_id": "job-1", "status": "completed"}))
+
+        result = await asyncio.wait_for(waiter, timeout=1.0)
+        assert result == {"ok": True}
+        assert pool.queries == 2
+        assert len(service._waiters) == 0
+
+    @pytest.mark.asyncio
+    async def test_wait_for_result_fallback_poll_on_missed_notification(self):
+        from arkham_frame.services.workers import WorkerService, WorkerError
+
+        pool = FakeJobsPool()
+        pool.rows["job-2"] = {"status": "processing", "result": None, "last_error": None}
+        service = WorkerService(config=None)
+        service.set_db_pool(pool)
+        service._listener_running = True
+
+        waiter = asyncio.create_task(
+            service.wait_for_result("job-2", timeout=5.0, fallback_interval=0.1)
+        )
+        await asyncio.sleep(0.05)
+        pool.rows["job-2"] = {"status": "dead", "result": None, "last_error": "boom"}
+
+        with pytest.raises(WorkerError, match="boom"):
+            await asyncio.wait_for(waiter, timeout=1.0)
+
+
+# =============================================================================
+# Test 8: Concurrent Worker Mode (no database required)
+# =============================================================================
+
+def make_in_memory_worker(job_count: int, concurrency: int, delay: float):
+    """BaseWorker subclass fed from an in-memory queue."""
+    from arkham_frame.workers.base import BaseWorker
+
+    class InMemoryWorker(BaseWorker):
+        pool = "io-file"
+        name = "InMemoryWorker"
+        max_concurrent_jobs = concurrency
+        poll_interval = 0.01
+        max_idle_backoff = 0.05
+        heartbeat_interval = 0.02
+        idle_timeout = 0.2
+
+        def __init__(self):
+            super().__init__(database_url="postgresql://unused", worker_id="test-inmem")
+            self.queue = [{"id": f"job-{i}", "payload": {}} for i in range(job_count)]
+            self.completed = []
+            self.requeued = []
+            self.heartbeats = 0
+            self.running_now = 0
+            self.peak_running = 0
+
+        async def connect(self):
+            return True
+
+        async def disconnect(self):
+            pass
+
+        async def register(self):
+            pass
+
+        async def deregister(self):
+            pass
+
+        async def heartbeat(self):
+            self.heartbeats += 1
+
+        async def dequeue_jobs(self, limit):
+            claimed, self.queue = self.queue[:limit], self.queue[limit:]
+            return claimed
+
+        async def complete_job(self, job_id, result=None):
+            self.completed.append(job_id)
+
+        async def fail_job(self, job_id, error, requeue=False):
+            if requeue:
+                self.requeued.append(job_id)
+
+        async def process_job(self, job_id, payload):
+            self.running_now += 1
+            self.peak_running = max(self.peak_running, self.running_now)
+            await asyncio.sleep(delay)
+            self.running_now -= 1
+            return {}
+
+    return InMemoryWorker()
+
+
+class TestConcurrentMode:
+    """Test bounded in-process concurrency in BaseWorker."""
+
+    @pytest.mark.asyncio
+    async def test_runs_jobs_concurrently_within_bound(self):
+        worker = make_in_memory_worker(job_count=10, concurrency=4, delay=0.1)
+        await asyncio.wait_for(worker.run(), timeout=5)
+
+        assert sorted(worker.completed) == sorted(f"job-{i}" for i in range(10))
+        assert worker.peak_running == 4
+        assert worker._metrics.jobs_completed == 10
+
+    @pytest.mark.asyncio
+    async def test_heartbeats_during_long_job(self):
+        worker = make_in_memory_worker(job_count=1, concurrency=2, delay=0.15)
+        await asyncio.wait_for(worker.run(), timeout=5)
+
+        assert worker.completed == ["job-0"]
+        assert worker.heartbeats >= 3
+
+    @pytest.mark.asyncio
+    async def test_dequeue_errors_do_not_stop_the_loop(self):
+        worker = make_in_memory_worker(job_count=4, concurrency=2, delay=0.05)
+        dequeue = worker.dequeue_jobs
+        failures = {"left": 2}
+
+        async def flaky_dequeue(limit):
+            if failures["left"]:
+                failures["left"] -= 1
+                raise ConnectionError("connection reset")
+            return await dequeue(limit)
+
+        worker.dequeue_jobs = flaky_dequeue
+        await asyncio.wait_for(worker.run(), timeout=5)
+
+        assert sorted(worker.completed) == [f"job-{i}" for i in range(4)]
+        assert worker.requeued == []
+
+    @pytest.mark.asyncio
+    async def test_shutdown_stops_jobs_before_requeueing(self):
+        worker = make_in_memory_worker(job_count=2, concurrency=2, delay=10)
+        run = asyncio.create_task(worker.run())
+        while worker.running_now < 2:
+            await asyncio.sleep(0.01)
+        job_tasks = list(worker._job_tasks)
+
+        # The loop dies with both jobs in flight
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(run, timeout=5)
+
+        assert all(task.cancelled() for task in job_tasks)
+        assert sorted(worker.requeued) == ["job-0", "job-1"]
+        assert worker.completed == []
+
+
 # =============================================================================
 # Quick Smoke Test (run without pytest)
 # =============================================================================
@@ -7,6 +7,8 @@ from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from arkham_frame.pagination import InvalidCursorError
+
 if TYPE_CHECKING:
     from .shard import DocumentsShard
 
@@ -79,9 +81,10 @@ class DocumentEntity(BaseModel):
 class DocumentListResponse(BaseModel):
     """Paginated document list response."""
     items: List[DocumentMetadata]
-    total: int
+    total: Optional[int]  # Not recounted on cursor pages
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 class UpdateMetadataRequest(BaseModel):
@@ -164,11 +167,14 @@ async def list_documents(
     status: Optional[str] = Query(None, description="Filter by status"),
     file_type: Optional[str] = Query(None, description="Filter by file type"),
     project_id: Optional[str] = Query(None, description="Filter by project"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
 ):
     """
     List documents with pagination and filtering.
 
-    Supports filtering by status, file type, and project.
+    Supports filtering by status, file type, and project. Pass the
+    returned next_cursor to fetch the following page in constant time
+    (page is then ignored and total is not recounted).
     """
     try:
         shard = get_shard(request)
@@ -184,19 +190,27 @@ async def list_documents(
             offset=offset,
             sort=sort,
             order=order,
+            cursor=cursor,
         )
 
-        # Get total count for pagination
-        total = await shard.get_document_count(status=status)
+        # Get total count for pagination on the first request only
+        total = None if cursor else await shard.get_document_count(status=status)
+
+        next_cursor = None
+        if len(documents) == page_size:
+            next_cursor = shard.document_cursor(documents[-1], sort=sort, order=order)
 
         response = DocumentListResponse(
             items=[document_to_response(doc) for doc in documents],
             total=total,
             page=page,
             page_size=page_size,
+            next_cursor=next_cursor,
         )
         logger.info(f"list_documents returning {len(documents)} documents, total={total}")
         return response
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"list_documents failed: {e}", exc_info=True)
         # Return empty response on error instead of crashing
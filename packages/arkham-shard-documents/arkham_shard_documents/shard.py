@@ -5,6 +5,7 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from arkham_frame.pagination import decode_cursor, encode_cursor, keyset_phases
 from arkham_frame.shard_interface import ArkhamShard
 
 from .api import router
@@ -13,6 +14,15 @@ from .services import DeduplicationService
 
 logger = logging.getLogger(__name__)
 
+# Sortable columns for list_documents, each backed by a (column, id) index
+# so keyset cursors can seek instead of scanning skipped rows
+SORT_FIELDS = ["created_at", "updated_at", "filename", "file_size", "status"]
+
+
+def _like_escape(text: str) -> str:
+    """Escape LIKE wildcards so user input matches literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
 
 class DocumentsShard(ArkhamShard):
     """
@@ -173,6 +183,29 @@ class DocumentsShard(ArkhamShard):
             ON arkham_frame.documents(status)
         """)
 
+        # Keyset pagination indexes: (sort column, id) for every sort field,
+        # plus the project-scoped default ordering
+        for field in SORT_FIELDS:
+            await self._db.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_arkham_frame_documents_{field}_id
+                ON arkham_frame.documents({field}, id)
+            """)
+        await self._db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_arkham_frame_documents_project_created_id
+            ON arkham_frame.documents(project_id, created_at, id)
+        """)
+
+        # Trigram index so filename substring search doesn't scan the table.
+        # pg_trgm may need elevated privileges; without it ILIKE still works.
+        try:
+            await self._db.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            await self._db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_arkham_frame_documents_filename_trgm
+                ON arkham_frame.documents USING gin (filename gin_trgm_ops)
+            """)
+        except Exception as e:
+            logger.warning(f"Filename trigram index unavailable: {e}")
+
         # Create viewing history table
         # Note: No FK constraint on document_id since documents are in arkham_frame.documents
         await self._db.execute("""
@@ -460,6 +493,7 @@ class DocumentsShard(ArkhamShard):
         offset: int = 0,
         sort: str = "created_at",
         order: str = "desc",
+        cursor: Optional[str] = None,
     ) -> List[DocumentRecord]:
         """
         List documents with optional filtering.
@@ -470,16 +504,27 @@ class DocumentsShard(ArkhamShard):
             file_type: Filter by file type
             project_id: Filter by project
             limit: Maximum results
-            offset: Result offset for pagination
+            offset: Result offset for pagination (ignored with a cursor)
             sort: Sort field
             order: Sort order (asc/desc)
+            cursor: Token from document_cursor(); the page starts after
+                that document without scanning earlier rows
 
         Returns:
             List of DocumentRecord objects
+
+        Raises:
+            InvalidCursorError: cursor is malformed or was issued for a
+                different sort
         """
         if not self._db:
             raise RuntimeError("Shard not initialized")
 
+        if sort not in SORT_FIELDS:
+            sort = "created_at"
+        descending = order.lower() == "desc"
+        position = decode_cursor(cursor, sort=sort, desc=descending) if cursor else None
+
         # Query Frame's arkham_frame.documents table (canonical document registry)
         query = "SELECT * FROM arkham_frame.documents WHERE 1=1"
         params: Dict[str, Any] = {}
@@ -492,7 +537,7 @@ class DocumentsShard(ArkhamShard):
 
         if search:
             query += " AND (filename ILIKE :search)"
-            params["search"] = f"%{search}%"
+            params["search"] = f"%{_like_escape(search)}%"
 
         if status:
             query += " AND status = :status"
@@ -506,21 +551,28 @@ class DocumentsShard(ArkhamShard):
             query += " AND project_id = :project_id"
             params["project_id"] = project_id
 
-        # Add sorting
-        valid_sort_fields = ["created_at", "updated_at", "filename", "file_size", "status"]
-        if sort not in valid_sort_fields:
-            sort = "created_at"
-
-        order_clause = "DESC" if order.lower() == "desc" else "ASC"
-        query += f" ORDER BY {sort} {order_clause}"
-
-        # Add pagination
-        query += " LIMIT :limit OFFSET :offset"
-        params["limit"] = limit
-        params["offset"] = offset
+        # Sort NULLS LAST; id breaks ties so cursors are stable
+        order_clause = "DESC" if descending else "ASC"
 
         try:
-            rows = await self._db.fetch_all(query, params)
+            if offset and not position:
+                rows = await self._db.fetch_all(
+                    f"{query} ORDER BY {sort} {order_clause} NULLS LAST, id {order_clause}"
+                    " LIMIT :limit OFFSET :offset",
+                    {**params, "limit": limit, "offset": offset},
+                )
+            else:
+                # Seek through the rows with a value, then the NULL rows
+                rows = []
+                after = (position.get("value"), position.get("id")) if position else None
+                for condition, cursor_params in keyset_phases(sort, "id", descending, after):
+                    rows += await self._db.fetch_all(
+                        f"{query} AND {condition} ORDER BY {sort} {order_clause}, id {order_clause}"
+                        " LIMIT :limit",
+                        {**params, **cursor_params, "limit": limit - len(rows)},
+                    )
+                    if len(rows) >= limit:
+                        break
 
             # Get entity counts for all documents in one query
             doc_ids = [row["id"] for row in rows]
@@ -535,6 +587,22 @@ class DocumentsShard(ArkhamShard):
             # Return empty list on error instead of crashing
             return []
 
+    def document_cursor(self, doc: DocumentRecord, sort: str = "created_at", order: str = "desc") -> str:
+        """
+        Cursor for the page after doc in a list_documents ordering.
+
+        Args:
+            doc: Last document of the current page
+            sort: Sort field the page was listed with
+            order: Sort order the page was listed with
+        """
+        if sort not in SORT_FIELDS:
+            sort = "created_at"
+        value = getattr(doc, sort)
+        if isinstance(value, DocumentStatus):
+            value = value.value
+        return encode_cursor(sort=sort, desc=order.lower() == "desc", value=value, id=doc.id)
+
     async def get_document(self, document_id: str) -> Optional[DocumentRecord]:
         """
         Get a document by ID.
@@ -653,11 +721,19 @@ class DocumentsShard(ArkhamShard):
         if not existing:
             return False
 
-        # Delete from Frame's arkham_frame.documents table (cascade will handle chunks/pages)
-        await self._db.execute(
-            "DELETE FROM arkham_frame.documents WHERE id = :id",
-            {"id": document_id}
-        )
+        # Delete from Frame's arkham_frame.documents table (cascade will handle chunks/pages).
+        # The deleted event is recorded in the same transaction, so durable
+        # consumers see it if and only if the delete committed
+        async with self._db.transaction() as tx:
+            await tx.execute(
+                "DELETE FROM arkham_frame.documents WHERE id = :id",
+                {"id": document_id}
+            )
+            if self._events:
+                await self._events.emit_durable("documents.document.deleted", {
+                    "document_id": document_id,
+                    "project_id": existing.project_id,
+                }, source="documents-shard", transaction=tx)
 
         # Emit event
         if self._events:
@@ -10,6 +10,7 @@ Run with:
 
 import pytest
 import pytest_asyncio
+from contextlib import asynccontextmanager
 from unittest.mock import Mock, AsyncMock, MagicMock, patch
 from pathlib import Path
 
@@ -337,6 +338,30 @@ class TestEventHandlers:
         # Should not raise an error (currently a stub)
         await shard._on_document_deleted(event)
 
+    @pytest.mark.asyncio
+    async def test_delete_document_emits_deleted_event(self, shard, mock_frame, mock_events):
+        """Test deleting a document announces it to other shards."""
+        await shard.initialize(mock_frame)
+        shard.get_document = AsyncMock(return_value=Mock(project_id="proj-1"))
+        tx = AsyncMock()
+
+        @asynccontextmanager
+        async def transaction():
+            yield tx
+
+        shard._db.transaction = transaction
+
+        assert await shard.delete_document("doc-456") is True
+
+        tx.execute.assert_awaited_once()
+        assert "DELETE FROM arkham_frame.documents" in tx.execute.await_args.args[0]
+        mock_events.emit_durable.assert_awaited_once_with(
+            "documents.document.deleted",
+            {"document_id": "doc-456", "project_id": "proj-1"},
+            source="documents-shard",
+            transaction=tx,
+        )
+
 
 # =============================================================================
 # Public API Tests
@@ -450,6 +475,109 @@ class TestShardIntegration:
         assert shard._db is None
 
 
+class TestCursorPagination:
+    """Test keyset cursor pagination in list_documents."""
+
+    @pytest.fixture
+    def rows(self):
+        from datetime import datetime
+        return [
+            {
+                "id": f"doc-{i}",
+                "filename": f"file-{i}.pdf",
+                "mime_type": "application/pdf",
+                "status": "processed",
+                "created_at": datetime(2024, 1, 10 - i),
+            }
+            for i in range(3)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_first_page_uses_no_cursor_condition(self, shard, mock_database, rows):
+        """First page orders by (sort, id) without a seek condition."""
+        shard._db = mock_database
+        mock_database.fetch_all.return_value = rows
+
+        docs = await shard.list_documents(limit=3)
+
+        query, params = mock_database.fetch_all.call_args_list[0].args
+        assert "created_at IS NOT NULL" in query
+        assert "ORDER BY created_at DESC, id DESC" in query
+        assert "OFFSET" not in query
+        assert "cursor_id" not in params
+        assert [d.id for d in docs] == ["doc-0", "doc-1", "doc-2"]
+
+    @pytest.mark.asyncio
+    async def test_short_page_continues_into_null_rows(self, shard, mock_database, rows):
+        """NULL sort values come last, read by a separate seek phase."""
+        shard._db = mock_database
+        null_row = {**rows[0], "id": "doc-9", "created_at": None}
+        mock_database.fetch_all.side_effect = [rows[:2], [null_row]]
+
+        docs = await shard.list_documents(limit=3)
+
+        assert [d.id for d in docs] == ["doc-0", "doc-1", "doc-9"]
+        query, params = mock_database.fetch_all.call_args_list[1].args
+        assert "created_at IS NULL" in query
+        assert " OR " not in query
+        assert params["limit"] == 1
+
+    @pytest.mark.asyncio
+    async def test_offset_sorts_nulls_last(self, shard, mock_database):
+        """Offset paging uses the same NULLS LAST ordering."""
+        shard._db = mock_database
+        mock_database.fetch_all.return_value = []
+
+        await shard.list_documents(limit=3, offset=6, sort="file_size", order="asc")
+
+        query, params = mock_database.fetch_all.call_args_list[0].args
+        assert "ORDER BY file_size ASC NULLS LAST, id ASC" in query
+        assert params["offset"] == 6
+
+    @pytest.mark.asyncio
+    async def test_cursor_seeks_after_last_document(self, shard, mock_database, rows):
+        """A cursor replaces OFFSET with a row comparison on (sort, id)."""
+        shard._db = mock_database
+        mock_database.fetch_all.return_value = rows
+        docs = await shard.list_documents(limit=3)
+        cursor = shard.document_cursor(docs[-1])
+
+        mock_database.fetch_all.reset_mock()
+        mock_database.fetch_all.return_value = []
+        await shard.list_documents(limit=3, offset=60, cursor=cursor)
+
+        query, params = mock_database.fetch_all.call_args_list[0].args
+        assert "(created_at, id) < (:cursor_value, :cursor_id)" in query
+        assert " OR " not in query
+        assert "OFFSET" not in query
+        assert params["cursor_id"] == "doc-2"
+        assert params["cursor_value"] == rows[-1]["created_at"]
+
+    @pytest.mark.asyncio
+    async def test_cursor_for_other_sort_is_rejected(self, shard, mock_database, rows):
+        """Cursors only apply to the ordering they were issued for."""
+        from arkham_frame.pagination import InvalidCursorError
+
+        shard._db = mock_database
+        mock_database.fetch_all.return_value = rows
+        docs = await shard.list_documents(limit=3)
+        cursor = shard.document_cursor(docs[-1])
+
+        with pytest.raises(InvalidCursorError):
+            await shard.list_documents(limit=3, sort="filename", cursor=cursor)
+
+    @pytest.mark.asyncio
+    async def test_filename_search_escapes_wildcards(self, shard, mock_database):
+        """Filename search matches % and _ literally."""
+        shard._db = mock_database
+        mock_database.fetch_all.return_value = []
+
+        await shard.list_documents(search="100%_final")
+
+        _, params = mock_database.fetch_all.call_args_list[0].args
+        assert params["search"] == "%100\\%\\_final%"
+
+
 # =============================================================================
 # Error Handling Tests
 # =============================================================================
@@ -1,5 +1,6 @@
 """Embed Shard API endpoints."""
 
+import asyncio
 import logging
 import uuid
 import time
@@ -118,7 +119,7 @@ async def embed_text(request: TextEmbedRequest):
     try:
         start_time = time.time()
 
-        embedding = _embedding_manager.embed_text(
+        embedding = await _embedding_manager.aembed_text(
             text=request.text,
             use_cache=request.use_cache
         )
@@ -175,7 +176,7 @@ async def embed_batch(request: BatchTextsRequest):
     try:
         start_time = time.time()
 
-        embeddings = _embedding_manager.embed_batch(
+        embeddings = await _embedding_manager.aembed_batch(
             texts=request.texts,
             batch_size=request.batch_size
         )
@@ -455,6 +456,8 @@ async def embed_documents_batch(request: BatchDocumentEmbedRequestBody):
         "skipped": [],
         "failed": [],
     }
+    jobs = []
+    pending = []
 
     for doc_id in request.doc_ids:
         try:
@@ -491,34 +494,41 @@ async def embed_documents_batch(request: BatchDocumentEmbedRequestBody):
 
             # Build payload for worker
             job_id = str(uuid.uuid4())
-            payload = {
-                "batch": True,
-                "texts": texts,
-                "doc_id": doc_id,
-                "chunk_ids": chunk_ids,
-            }
-
-            await _worker_service.enqueue(
-                pool="gpu-embed",
-                job_id=job_id,
-                payload=payload,
-            )
+            jobs.append({
+                "job_id": job_id,
+                "payload": {
+                    "batch": True,
+                    "texts": texts,
+                    "doc_id": doc_id,
+                    "chunk_ids": chunk_ids,
+                },
+            })
 
-            results["queued"].append({
+            pending.append({
                 "job_id": job_id,
                 "doc_id": doc_id,
                 "chunk_count": len(texts),
             })
 
-            logger.info(f"Queued embedding job {job_id} for doc {doc_id} ({len(texts)} chunks)")
-
         except Exception as e:
-            logger.error(f"Failed to queue embedding for {doc_id}: {e}")
+            logger.error(f"Failed to prepare embedding for {doc_id}: {e}")
             results["failed"].append({
                 "doc_id": doc_id,
                 "error": str(e)
             })
 
+    # Queue all documents in one bulk insert
+    if jobs:
+        try:
+            await _worker_service.enqueue_many(pool="gpu-embed", jobs=jobs)
+            results["queued"].extend(pending)
+            logger.info(f"Queued {len(jobs)} embedding jobs ({sum(p['chunk_count'] for p in pending)} chunks)")
+        except Exception as e:
+            logger.error(f"Failed to queue embedding jobs: {e}")
+            results["failed"].extend(
+                {"doc_id": p["doc_id"], "error": str(e)} for p in pending
+            )
+
     return {
         "success": True,
         "message": f"Queued {len(results['queued'])} documents for embedding",
@@ -546,8 +556,10 @@ async def calculate_similarity(request: SimilarityRequestBody):
 
     try:
         # Embed both texts
-        emb1 = _embedding_manager.embed_text(request.text1)
-        emb2 = _embedding_manager.embed_text(request.text2)
+        emb1, emb2 = await asyncio.gather(
+            _embedding_manager.aembed_text(request.text1),
+            _embedding_manager.aembed_text(request.text2),
+        )
 
         # Calculate similarity
         similarity = _embedding_manager.calculate_similarity(
@@ -587,7 +599,7 @@ async def find_nearest(request: NearestRequestBody):
     try:
         # Convert query to vector if needed
         if isinstance(request.query, str):
-            query_vector = _embedding_manager.embed_text(request.query)
+            query_vector = await _embedding_manager.aembed_text(request.query)
         else:
             query_vector = request.query
 
@@ -1106,7 +1118,7 @@ async def switch_model(request: ModelSwitchRequest):
         _embedding_manager.clear_cache()
 
         # Trigger model load
-        _ = _embedding_manager.embed_text("test")
+        _ = await _embedding_manager.aembed_text("test", use_cache=False)
 
         # Get updated model info
         new_info = _embedding_manager.get_model_info()
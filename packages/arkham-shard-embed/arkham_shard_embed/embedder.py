@@ -1,8 +1,8 @@
 """Core embedding logic for the Embed Shard."""
 
 import logging
+from collections import OrderedDict
 from typing import Any
-from functools import lru_cache
 import numpy as np
 
 from .models import EmbedConfig, ModelInfo
@@ -10,6 +10,39 @@ from .models import EmbedConfig, ModelInfo
 logger = logging.getLogger(__name__)
 
 
+class _EmbeddingCache:
+    """LRU cache of text -> embedding shared by the sync and async paths."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[str, list[float]] = OrderedDict()
+
+    def get(self, text: str) -> list[float] | None:
+        embedding = self._data.get(text)
+        if embedding is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(text)
+        self.hits += 1
+        return embedding
+
+    def put(self, text: str, embedding: list[float]) -> None:
+        self._data[text] = embedding
+        self._data.move_to_end(text)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 class EmbeddingManager:
     """
     Manages embedding model loading and inference.
@@ -20,6 +53,8 @@ class EmbeddingManager:
     - Model caching to avoid reloading
     - Batch processing optimization
     - Multiple model support
+    - Async API (aembed_text/aembed_batch) that runs the model on a
+      dedicated thread and micro-batches concurrent callers
     """
 
     def __init__(self, config: EmbedConfig):
@@ -37,8 +72,10 @@ class EmbeddingManager:
 
         # Cache for embeddings (LRU cache)
         self._cache_enabled = config.cache_size > 0
-        if self._cache_enabled:
-            self._embed_cached = lru_cache(maxsize=config.cache_size)(self._embed_single)
+        self._cache = _EmbeddingCache(config.cache_size) if self._cache_enabled else None
+
+        # Created on first async call; owns all model inference from then on
+        self._executor = None
 
     def _detect_device(self) -> str:
         """
@@ -189,7 +226,12 @@ class EmbeddingManager:
             Embedding as list of floats
         """
         if use_cache and self._cache_enabled:
-            return self._embed_cached(text)
+            cached = self._cache.get(text)
+            if cached is not None:
+                return cached
+            embedding = self._embed_single(text)
+            self._cache.put(text, embedding)
+            return embedding
         else:
             return self._embed_single(text)
 
@@ -224,6 +266,85 @@ class EmbeddingManager:
         # Convert numpy arrays to lists for JSON serialization
         return [emb.tolist() for emb in embeddings]
 
+    def _encode_texts(self, texts: list[str]) -> list[list[float]]:
+        """Encode a micro-batch. Runs on the executor thread."""
+        self._load_model()
+        model = self._model
+        embeddings = model.encode(
+            texts,
+            batch_size=self.config.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=self.config.normalize,
+        )
+        return [emb.tolist() for emb in embeddings]
+
+    def _get_executor(self):
+        """Get the embedding executor, creating it on first use."""
+        if self._executor is None:
+            from arkham_frame.services.embedding_executor import EmbeddingExecutor
+
+            self._executor = EmbeddingExecutor(
+                self._encode_texts,
+                max_batch_size=self.config.batch_size,
+                name="embed-shard",
+            )
+        # Follow runtime config changes (PUT /config)
+        self._executor.max_batch_size = self.config.batch_size
+        return self._executor
+
+    async def aembed_text(self, text: str, use_cache: bool = True) -> list[float]:
+        """
+        Embed a single text without blocking the event loop.
+
+        Concurrent calls are coalesced into one model batch.
+
+        Args:
+            text: Text to embed
+            use_cache: Whether to use cached embeddings
+
+        Returns:
+            Embedding as list of floats
+        """
+        if use_cache and self._cache_enabled:
+            cached = self._cache.get(text)
+            if cached is not None:
+                return cached
+
+        embedding = await self._get_executor().embed(text)
+
+        if use_cache and self._cache_enabled:
+            self._cache.put(text, embedding)
+        return embedding
+
+    async def aembed_batch(self, texts: list[str], batch_size: int | None = None) -> list[list[float]]:
+        """
+        Embed multiple texts without blocking the event loop.
+
+        Texts are split into micro-batches of config.batch_size and
+        queued behind interactive single-text requests.
+
+        Args:
+            texts: List of texts to embed
+            batch_size: Accepted for parity with embed_batch; the executor
+                batches by config.batch_size
+
+        Returns:
+            List of embeddings
+        """
+        executor = self._get_executor()
+        logger.info(f"Embedding batch of {len(texts)} texts (batch_size={executor.max_batch_size})")
+        return await executor.embed_many(texts)
+
+    def get_executor_stats(self) -> dict[str, Any]:
+        """Get micro-batching statistics (empty until the async API is used)."""
+        return self._executor.get_stats() if self._executor else {}
+
+    async def close(self) -> None:
+        """Stop the embedding executor thread."""
+        if self._executor is not None:
+            await self._executor.close()
+            self._executor = None
+
     def calculate_similarity(
         self,
         embedding1: list[float],
@@ -317,7 +438,7 @@ class EmbeddingManager:
     def clear_cache(self):
         """Clear the embedding cache."""
         if self._cache_enabled:
-            self._embed_cached.cache_clear()
+            self._cache.clear()
             logger.info("Embedding cache cleared")
 
     def get_cache_info(self) -> dict[str, Any]:
@@ -337,15 +458,14 @@ class EmbeddingManager:
                 "hit_rate": 0.0,
             }
 
-        cache_info = self._embed_cached.cache_info()
-        total = cache_info.hits + cache_info.misses
-        hit_rate = cache_info.hits / total if total > 0 else 0.0
+        total = self._cache.hits + self._cache.misses
+        hit_rate = self._cache.hits / total if total > 0 else 0.0
 
         return {
             "enabled": True,
-            "hits": cache_info.hits,
-            "misses": cache_info.misses,
-            "size": cache_info.currsize,
-            "max_size": cache_info.maxsize,
+            "hits": self._cache.hits,
+            "misses": self._cache.misses,
+            "size": len(self._cache),
+            "max_size": self._cache.maxsize,
             "hit_rate": hit_rate,
         }
@@ -131,9 +131,10 @@ class EmbedShard(ArkhamShard):
             if event_bus:
                 await event_bus.unsubscribe("parse.document.completed", self._on_parse_completed)
 
-        # Clear cache
+        # Clear cache and stop the model thread
         if self.embedding_manager:
             self.embedding_manager.clear_cache()
+            await self.embedding_manager.close()
 
         self.embedding_manager = None
         self.vector_store = None
@@ -223,7 +224,7 @@ class EmbedShard(ArkhamShard):
 
             # Embed all texts in batches
             logger.info(f"Embedding {len(texts)} chunks for document {doc_id}")
-            embeddings = self.embedding_manager.embed_batch(texts, batch_size=32)
+            embeddings = await self.embedding_manager.aembed_batch(texts, batch_size=32)
 
             if len(embeddings) != len(texts):
                 logger.error(f"Embedding count mismatch: {len(embeddings)} vs {len(texts)}")
@@ -326,7 +327,7 @@ class EmbedShard(ArkhamShard):
             return []
 
         try:
-            return self.embedding_manager.embed_text(text, use_cache=use_cache)
+            return await self.embedding_manager.aembed_text(text, use_cache=use_cache)
         except Exception as e:
             logger.error(f"Text embedding failed: {e}")
             return []
@@ -351,7 +352,7 @@ class EmbedShard(ArkhamShard):
             return []
 
         try:
-            return self.embedding_manager.embed_batch(texts, batch_size=batch_size)
+            return await self.embedding_manager.aembed_batch(texts, batch_size=batch_size)
         except Exception as e:
             logger.error(f"Batch embedding failed: {e}")
             return []
@@ -396,7 +397,7 @@ class EmbedShard(ArkhamShard):
                 if not self.embedding_manager:
                     logger.error("Embedding manager not available")
                     return []
-                query_vector = self.embedding_manager.embed_text(query)
+                query_vector = await self.embedding_manager.aembed_text(query)
             else:
                 query_vector = query
 
@@ -697,10 +697,13 @@ class ExportShard(ArkhamShard):
         documents = []
         page = 1
         page_size = 100
+        cursor = None
         max_records = options.max_records if options else None
 
         while True:
             params = {"page": page, "page_size": page_size}
+            if cursor:
+                params["cursor"] = cursor
             if filters.get("project_id"):
                 params["project_id"] = filters["project_id"]
             if filters.get("status"):
@@ -727,6 +730,8 @@ class ExportShard(ArkhamShard):
             if len(items) < page_size:
                 break
 
+            # Follow the keyset cursor so deep pages don't re-scan skipped rows
+            cursor = data.get("next_cursor")
             page += 1
 
         return documents
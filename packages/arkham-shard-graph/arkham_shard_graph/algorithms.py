@@ -1,10 +1,24 @@
 """Graph algorithms - path finding, centrality, community detection."""
 
 import logging
-from collections import defaultdict, deque
+from collections import defaultdict
 from typing import Any
 import math
 
+import numpy as np
+
+from .csr import (
+    BETWEENNESS_DEFAULT_SAMPLES,
+    BETWEENNESS_EXACT_MAX_NODES,
+    CSRGraph,
+    betweenness_centrality,
+    bfs_distances,
+    eigenvector_centrality,
+    get_csr,
+    hits,
+    pagerank,
+)
+from .communities import build_communities, detect_communities
 from .models import (
     Graph,
     GraphEdge,
@@ -13,15 +27,30 @@ from .models import (
     Community,
     GraphStatistics,
 )
+from .paths import (
+    PathIndex,
+    SearchBudget,
+    bfs_tree,
+    bidirectional_bfs,
+    constrained_path,
+    get_path_index,
+    k_shortest_paths,
+)
 
 logger = logging.getLogger(__name__)
 
+# Exact distance metrics up to this many nodes; sample BFS sources above it
+DISTANCE_EXACT_MAX_NODES = 2000
+DISTANCE_SAMPLES = 256
+
 
 class GraphAlgorithms:
     """
     Graph analysis algorithms.
 
-    Implements pure Python versions of common graph algorithms.
+    Path searches run on the graph's path index under a time budget (see
+    paths.py); centrality and communities run on its CSR form (see csr.py
+    and communities.py).
     """
 
     def __init__(self):
@@ -34,55 +63,32 @@ class GraphAlgorithms:
         source_entity_id: str,
         target_entity_id: str,
         max_depth: int = 6,
+        budget: SearchBudget | None = None,
     ) -> GraphPath | None:
         """
-        Find shortest path between two entities using BFS.
+        Find shortest path between two entities using bidirectional BFS.
 
         Args:
             graph: Graph to search
             source_entity_id: Source entity ID
             target_entity_id: Target entity ID
             max_depth: Maximum path length
+            budget: Time budget / cancellation (default: DEFAULT_TIME_LIMIT)
 
         Returns:
             GraphPath if found, None otherwise
         """
-        # Build adjacency list
-        adjacency = self._build_adjacency_dict(graph.edges)
-
-        # BFS
-        queue = deque([(source_entity_id, [source_entity_id])])
-        visited = {source_entity_id}
-
-        while queue:
-            current, path = queue.popleft()
-
-            # Check depth limit
-            if len(path) > max_depth:
-                continue
-
-            # Found target
-            if current == target_entity_id:
-                # Reconstruct edges
-                edges = self._get_path_edges(graph.edges, path)
-                total_weight = sum(e.weight for e in edges)
-
-                return GraphPath(
-                    source_entity_id=source_entity_id,
-                    target_entity_id=target_entity_id,
-                    path=path,
-                    edges=edges,
-                    total_weight=total_weight,
-                    path_length=len(path) - 1,
-                )
-
-            # Explore neighbors
-            for neighbor in adjacency.get(current, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [neighbor]))
-
-        return None
+        idx = get_path_index(graph)
+        source = idx.index.get(source_entity_id)
+        target = idx.index.get(target_entity_id)
+        if source is None or target is None:
+            return None
+
+        budget = budget or SearchBudget()
+        path = bidirectional_bfs(idx, source, target, max_depth, budget)
+        if budget.exhausted:
+            logger.warning(f"Shortest path search {source_entity_id} -> {target_entity_id} ran out of budget")
+        return self._to_graph_path(idx, path) if path else None
 
     def find_all_paths(
         self,
@@ -91,11 +97,13 @@ class GraphAlgorithms:
         target_entity_id: str,
         max_depth: int = 6,
         max_paths: int = 10,
+        budget: SearchBudget | None = None,
     ) -> list[GraphPath]:
         """
-        Find all paths between two entities up to max_depth.
+        Find the shortest simple paths between two entities up to max_depth.
 
-        Uses DFS with backtracking to enumerate paths.
+        Uses Yen's k-shortest-paths algorithm with bidirectional BFS spur
+        searches, so only as many paths as requested are ever built.
 
         Args:
             graph: Graph to search
@@ -103,49 +111,22 @@ class GraphAlgorithms:
             target_entity_id: Target entity ID
             max_depth: Maximum path length
             max_paths: Maximum number of paths to return
+            budget: Time budget / cancellation (default: DEFAULT_TIME_LIMIT)
 
         Returns:
             List of GraphPath objects, shortest first
         """
-        adjacency = self._build_adjacency_dict(graph.edges)
-        all_paths: list[GraphPath] = []
-
-        def dfs(current: str, target: str, path: list[str], visited: set[str]):
-            if len(all_paths) >= max_paths:
-                return
-
-            if len(path) > max_depth + 1:
-                return
-
-            if current == target:
-                # Found a path
-                edges = self._get_path_edges(graph.edges, path)
-                total_weight = sum(e.weight for e in edges)
-                all_paths.append(GraphPath(
-                    source_entity_id=source_entity_id,
-                    target_entity_id=target_entity_id,
-                    path=path.copy(),
-                    edges=edges,
-                    total_weight=total_weight,
-                    path_length=len(path) - 1,
-                ))
-                return
-
-            for neighbor in adjacency.get(current, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    path.append(neighbor)
-                    dfs(neighbor, target, path, visited)
-                    path.pop()
-                    visited.remove(neighbor)
-
-        # Start DFS
-        dfs(source_entity_id, target_entity_id, [source_entity_id], {source_entity_id})
-
-        # Sort by path length (shortest first)
-        all_paths.sort(key=lambda p: p.path_length)
+        idx = get_path_index(graph)
+        source = idx.index.get(source_entity_id)
+        target = idx.index.get(target_entity_id)
+        if source is None or target is None or max_paths <= 0:
+            return []
 
-        return all_paths
+        budget = budget or SearchBudget()
+        paths = k_shortest_paths(idx, source, target, max_paths, max_depth, budget)
+        if budget.exhausted:
+            logger.warning(f"All-paths search returned {len(paths)} paths before running out of budget")
+        return [self._to_graph_path(idx, path) for path in paths]
 
     def find_weighted_path(
         self,
@@ -154,72 +135,74 @@ class GraphAlgorithms:
         target_entity_id: str,
         max_depth: int = 10,
         use_max_weight: bool = True,
+        budget: SearchBudget | None = None,
     ) -> GraphPath | None:
         """
         Find optimal weighted path using Dijkstra's algorithm.
 
-        Can find either maximum weight path (strongest connections)
-        or minimum weight path (weakest connections).
+        Can find either the strongest path (edge cost 1/weight, so strong
+        connections are cheap) or the weakest (edge cost = weight).
 
         Args:
             graph: Graph to search
             source_entity_id: Source entity ID
             target_entity_id: Target entity ID
             max_depth: Maximum path length
-            use_max_weight: If True, find path with maximum total weight
+            use_max_weight: If True, find the strongest path
+            budget: Time budget / cancellation (default: DEFAULT_TIME_LIMIT)
 
         Returns:
             GraphPath if found, None otherwise
         """
-        import heapq
-
-        # Build weighted adjacency
-        adjacency = self._build_weighted_adjacency(graph.edges)
-
-        # For max weight, we negate weights and use min-heap
-        # For min weight, we use positive weights
-        def get_edge_cost(weight: float) -> float:
-            if use_max_weight:
-                return -weight  # Negate for max-heap behavior
-            return weight
-
-        # Dijkstra's algorithm
-        # heap entries: (cost, path_length, node_id, path)
-        heap = [(0.0, 0, source_entity_id, [source_entity_id])]
-        visited: dict[str, float] = {}
+        paths = self.find_weighted_paths(
+            graph, source_entity_id, target_entity_id,
+            k=1, max_depth=max_depth, use_max_weight=use_max_weight, budget=budget,
+        )
+        return paths[0] if paths else None
 
-        while heap:
-            cost, path_len, current, path = heapq.heappop(heap)
+    def find_weighted_paths(
+        self,
+        graph: Graph,
+        source_entity_id: str,
+        target_entity_id: str,
+        k: int = 5,
+        max_depth: int = 10,
+        use_max_weight: bool = True,
+        budget: SearchBudget | None = None,
+    ) -> list[GraphPath]:
+        """
+        Find the k best weighted paths using Yen's algorithm over Dijkstra.
 
-            if path_len > max_depth:
-                continue
+        Args:
+            graph: Graph to search
+            source_entity_id: Source entity ID
+            target_entity_id: Target entity ID
+            k: Number of paths to return
+            max_depth: Maximum path length (longer paths are skipped)
+            use_max_weight: If True, rank by strength; otherwise by weakness
+            budget: Time budget / cancellation (default: DEFAULT_TIME_LIMIT)
 
-            if current in visited:
-                continue
-            visited[current] = cost
-
-            if current == target_entity_id:
-                # Found target - reconstruct path
-                edges = self._get_path_edges(graph.edges, path)
-                total_weight = sum(e.weight for e in edges)
-                return GraphPath(
-                    source_entity_id=source_entity_id,
-                    target_entity_id=target_entity_id,
-                    path=path,
-                    edges=edges,
-                    total_weight=total_weight,
-                    path_length=len(path) - 1,
-                )
+        Returns:
+            List of GraphPath objects, best first
+        """
+        idx = get_path_index(graph)
+        source = idx.index.get(source_entity_id)
+        target = idx.index.get(target_entity_id)
+        if source is None or target is None or k <= 0:
+            return []
 
-            for neighbor, weight in adjacency.get(current, []):
-                if neighbor not in visited:
-                    new_cost = cost + get_edge_cost(weight)
-                    heapq.heappush(
-                        heap,
-                        (new_cost, path_len + 1, neighbor, path + [neighbor])
-                    )
+        if use_max_weight:
+            def cost(edge: GraphEdge) -> float | None:
+                return 1.0 / edge.weight if edge.weight and edge.weight > 0 else None
+        else:
+            def cost(edge: GraphEdge) -> float | None:
+                return max(edge.weight or 0.0, 0.0)
 
-        return None
+        budget = budget or SearchBudget()
+        paths = k_shortest_paths(idx, source, target, k, max_depth, budget, cost=cost)
+        if budget.exhausted:
+            logger.warning(f"Weighted path search returned {len(paths)} paths before running out of budget")
+        return [self._to_graph_path(idx, path) for path in paths]
 
     def find_constrained_path(
         self,
@@ -231,9 +214,10 @@ class GraphAlgorithms:
         required_relationship_types: list[str] | None = None,
         min_edge_weight: float = 0.0,
         max_depth: int = 8,
+        budget: SearchBudget | None = None,
     ) -> GraphPath | None:
         """
-        Find path with constraints on nodes and edges.
+        Find the shortest path satisfying constraints on nodes and edges.
 
         Args:
             graph: Graph to search
@@ -244,72 +228,37 @@ class GraphAlgorithms:
             required_relationship_types: Only traverse these relationship types
             min_edge_weight: Minimum weight for edges to traverse
             max_depth: Maximum path length
+            budget: Time budget / cancellation (default: DEFAULT_TIME_LIMIT)
 
         Returns:
             GraphPath if found, None otherwise
         """
-        required = set(required_entities or [])
-        excluded = set(excluded_entities or [])
-        required_types = set(required_relationship_types) if required_relationship_types else None
-
-        # Build filtered adjacency
-        adjacency: dict[str, list[tuple[str, float, str]]] = defaultdict(list)
-        for edge in graph.edges:
-            # Filter by relationship type
-            if required_types and edge.relationship_type not in required_types:
-                continue
-            # Filter by weight
-            if edge.weight < min_edge_weight:
-                continue
-
-            adjacency[edge.source].append((edge.target, edge.weight, edge.relationship_type))
-            adjacency[edge.target].append((edge.source, edge.weight, edge.relationship_type))
-
-        # Use BFS with required entity tracking
-        # State: (current_node, path, required_visited)
-        from collections import deque
-
-        initial_required = required & {source_entity_id}
-        queue = deque([(source_entity_id, [source_entity_id], initial_required)])
-        visited: dict[tuple[str, frozenset], bool] = {(source_entity_id, frozenset(initial_required)): True}
-
-        while queue:
-            current, path, req_visited = queue.popleft()
-
-            if len(path) > max_depth + 1:
-                continue
-
-            # Check if we found the target with all required nodes visited
-            if current == target_entity_id and req_visited >= required:
-                edges = self._get_path_edges(graph.edges, path)
-                total_weight = sum(e.weight for e in edges)
-                return GraphPath(
-                    source_entity_id=source_entity_id,
-                    target_entity_id=target_entity_id,
-                    path=path,
-                    edges=edges,
-                    total_weight=total_weight,
-                    path_length=len(path) - 1,
-                )
-
-            for neighbor, weight, rel_type in adjacency.get(current, []):
-                # Skip excluded entities
-                if neighbor in excluded:
-                    continue
-
-                # Skip already visited in this path
-                if neighbor in path:
-                    continue
-
-                # Update required visited
-                new_req = req_visited | ({neighbor} & required)
-                state_key = (neighbor, frozenset(new_req))
-
-                if state_key not in visited:
-                    visited[state_key] = True
-                    queue.append((neighbor, path + [neighbor], new_req))
-
-        return None
+        idx = get_path_index(graph)
+        source = idx.index.get(source_entity_id)
+        target = idx.index.get(target_entity_id)
+        if source is None or target is None:
+            return None
+
+        required = set()
+        for entity_id in required_entities or []:
+            if entity_id not in idx.index:
+                return None
+            required.add(idx.index[entity_id])
+        excluded = {idx.index[e] for e in excluded_entities or [] if e in idx.index}
+
+        allowed = None
+        if required_relationship_types or min_edge_weight > 0:
+            types = set(required_relationship_types) if required_relationship_types else None
+            allowed = [
+                (types is None or e.relationship_type in types) and e.weight >= min_edge_weight
+                for e in idx.edges
+            ]
+
+        budget = budget or SearchBudget()
+        path = constrained_path(idx, source, target, max_depth, budget, required, excluded, allowed)
+        if budget.exhausted:
+            logger.warning(f"Constrained path search {source_entity_id} -> {target_entity_id} ran out of budget")
+        return self._to_graph_path(idx, path, allowed) if path else None
 
     def find_paths_through(
         self,
@@ -318,11 +267,16 @@ class GraphAlgorithms:
         max_sources: int = 5,
         max_targets: int = 5,
         max_depth: int = 3,
+        budget: SearchBudget | None = None,
     ) -> list[GraphPath]:
         """
         Find paths that pass through a specific entity.
 
-        Useful for finding what connections an entity bridges.
+        Useful for finding what connections an entity bridges. One BFS tree
+        from the intermediate gives the shortest route to every candidate;
+        two candidates reached through different first hops join into a
+        shortest path through it. Pairs sharing a first hop fall back to a
+        constrained search.
 
         Args:
             graph: Graph to search
@@ -330,65 +284,55 @@ class GraphAlgorithms:
             max_sources: Maximum source entities to consider
             max_targets: Maximum target entities to consider
             max_depth: Maximum hops on each side of intermediate
+            budget: Time budget / cancellation (default: DEFAULT_TIME_LIMIT)
 
         Returns:
             List of paths passing through the intermediate entity
         """
-        adjacency = self._build_adjacency_dict(graph.edges)
-
-        # Find entities reachable from intermediate (potential targets)
-        reachable_from: dict[str, int] = {}  # entity_id -> distance
-        queue = deque([(intermediate_entity_id, 0)])
-        visited = {intermediate_entity_id}
-
-        while queue:
-            current, dist = queue.popleft()
-            if dist > max_depth:
-                continue
-            if current != intermediate_entity_id:
-                reachable_from[current] = dist
+        idx = get_path_index(graph)
+        middle = idx.index.get(intermediate_entity_id)
+        if middle is None:
+            return []
 
-            for neighbor in adjacency.get(current, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, dist + 1))
+        parent, dist = bfs_tree(idx, middle, max_depth)
+        reachable = [i for i in range(idx.n) if dist[i] > 0]
 
-        # Find entities that can reach intermediate (potential sources)
-        # (Same search since graph is undirected)
-        can_reach: dict[str, int] = reachable_from.copy()
+        # First hop out of the intermediate on each node's tree path
+        branch: dict[int, int] = {}
+        for i in sorted(reachable, key=lambda i: dist[i]):
+            branch[i] = i if parent[i] == middle else branch[parent[i]]
 
         # Select top sources and targets by degree (most connected)
         node_degrees = {n.id: n.degree for n in graph.nodes}
+        ranked = sorted(reachable, key=lambda i: node_degrees.get(idx.node_ids[i], 0), reverse=True)
+        source_candidates = ranked[:max_sources]
+        target_candidates = ranked[:max_targets]
 
-        source_candidates = sorted(
-            can_reach.keys(),
-            key=lambda x: node_degrees.get(x, 0),
-            reverse=True
-        )[:max_sources]
-
-        target_candidates = sorted(
-            reachable_from.keys(),
-            key=lambda x: node_degrees.get(x, 0),
-            reverse=True
-        )[:max_targets]
+        def to_middle(i: int) -> list[int]:
+            path = [i]
+            while path[-1] != middle:
+                path.append(parent[path[-1]])
+            return path
 
-        # Find paths between sources and targets that pass through intermediate
+        budget = budget or SearchBudget()
         paths = []
         for source in source_candidates:
             for target in target_candidates:
                 if source == target:
                     continue
-
-                # Find path requiring intermediate
-                path = self.find_constrained_path(
-                    graph,
-                    source,
-                    target,
-                    required_entities=[intermediate_entity_id],
-                    max_depth=max_depth * 2 + 1,
-                )
+                if branch[source] != branch[target]:
+                    path = to_middle(source) + to_middle(target)[::-1][1:]
+                else:
+                    path = constrained_path(
+                        idx, source, target, max_depth * 2 + 1, budget, required={middle}
+                    )
                 if path:
-                    paths.append(path)
+                    paths.append(self._to_graph_path(idx, path))
+                if budget.exhausted:
+                    logger.warning("Paths-through search ran out of budget")
+                    break
+            if budget.exhausted:
+                break
 
         # Sort by total weight descending
         paths.sort(key=lambda p: p.total_weight, reverse=True)
@@ -434,64 +378,30 @@ class GraphAlgorithms:
         return results
 
     def calculate_betweenness_centrality(
-        self, graph: Graph, limit: int = 50
+        self, graph: Graph, limit: int = 50, k: int | None = None
     ) -> list[CentralityResult]:
         """
         Calculate betweenness centrality.
 
-        Measures how often a node appears on shortest paths.
+        Measures how often a node appears on shortest paths. Uses Brandes'
+        algorithm over the graph's CSR form; graphs larger than
+        BETWEENNESS_EXACT_MAX_NODES are estimated from sampled sources.
 
         Args:
             graph: Graph to analyze
             limit: Top N results
+            k: Number of sampled source nodes (None = exact for small
+                graphs, BETWEENNESS_DEFAULT_SAMPLES for large ones)
 
         Returns:
             List of CentralityResult objects
         """
-        node_ids = [n.id for n in graph.nodes]
-        betweenness = defaultdict(float)
-
-        # Build adjacency
-        adjacency = self._build_adjacency_dict(graph.edges)
-
-        # For each pair of nodes, find all shortest paths
-        for source in node_ids:
-            # BFS from source
-            paths_through = self._count_paths_through(adjacency, source, node_ids)
-
-            for node_id, count in paths_through.items():
-                betweenness[node_id] += count
-
-        # Normalize
-        n = len(node_ids)
-        max_betweenness = (n - 1) * (n - 2) / 2 if n > 2 else 1
-
-        # Sort by betweenness
-        sorted_items = sorted(
-            betweenness.items(), key=lambda x: x[1], reverse=True
-        )
-
-        node_map = {n.id: n for n in graph.nodes}
-
-        results = []
-        for rank, (node_id, value) in enumerate(sorted_items[:limit], start=1):
-            node = node_map.get(node_id)
-            if not node:
-                continue
-
-            score = value / max_betweenness if max_betweenness > 0 else 0.0
-
-            results.append(
-                CentralityResult(
-                    entity_id=node.entity_id,
-                    label=node.label,
-                    score=score,
-                    rank=rank,
-                    entity_type=node.entity_type,
-                )
-            )
+        csr = get_csr(graph)
+        if k is None and csr.n > BETWEENNESS_EXACT_MAX_NODES:
+            k = BETWEENNESS_DEFAULT_SAMPLES
 
-        return results
+        scores = betweenness_centrality(csr, k=k)
+        return self._rank_centrality(graph, csr, scores, limit)
 
     def calculate_pagerank(
         self,
@@ -502,7 +412,7 @@ class GraphAlgorithms:
         tolerance: float = 1e-6,
     ) -> list[CentralityResult]:
         """
-        Calculate PageRank using power iteration method.
+        Calculate PageRank using sparse power iteration.
 
         Args:
             graph: Graph to analyze
@@ -514,71 +424,42 @@ class GraphAlgorithms:
         Returns:
             List of CentralityResult objects
         """
-        node_ids = [n.id for n in graph.nodes]
-        n = len(node_ids)
-
-        if n == 0:
-            return []
-
-        # Build adjacency with out-degree
-        adjacency = self._build_adjacency_dict(graph.edges)
-        out_degree = {node_id: len(adjacency.get(node_id, [])) for node_id in node_ids}
-
-        # Initialize PageRank
-        pagerank = {node_id: 1.0 / n for node_id in node_ids}
+        csr = get_csr(graph)
+        scores = pagerank(csr, damping, max_iterations, tolerance)
+        return self._rank_centrality(graph, csr, scores, limit)
 
-        # Power iteration
-        for iteration in range(max_iterations):
-            new_pagerank = {}
-            max_diff = 0.0
-
-            for node_id in node_ids:
-                # Sum contributions from incoming edges
-                rank_sum = 0.0
-
-                for other_id in node_ids:
-                    if node_id in adjacency.get(other_id, []):
-                        if out_degree[other_id] > 0:
-                            rank_sum += pagerank[other_id] / out_degree[other_id]
-
-                # Apply damping factor
-                new_rank = (1 - damping) / n + damping * rank_sum
-                new_pagerank[node_id] = new_rank
-
-                # Track convergence
-                max_diff = max(max_diff, abs(new_rank - pagerank[node_id]))
-
-            pagerank = new_pagerank
-
-            # Check convergence
-            if max_diff < tolerance:
-                logger.info(f"PageRank converged after {iteration + 1} iterations")
-                break
+    def calculate_eigenvector_centrality(
+        self, graph: Graph, limit: int = 50
+    ) -> list[CentralityResult]:
+        """
+        Calculate weighted eigenvector centrality.
 
-        # Sort by PageRank
-        sorted_items = sorted(
-            pagerank.items(), key=lambda x: x[1], reverse=True
-        )
+        Args:
+            graph: Graph to analyze
+            limit: Top N results
 
-        node_map = {n.id: n for n in graph.nodes}
+        Returns:
+            List of CentralityResult objects
+        """
+        csr = get_csr(graph)
+        return self._rank_centrality(graph, csr, eigenvector_centrality(csr), limit)
 
-        results = []
-        for rank, (node_id, score) in enumerate(sorted_items[:limit], start=1):
-            node = node_map.get(node_id)
-            if not node:
-                continue
+    def calculate_hits(
+        self, graph: Graph, limit: int = 50
+    ) -> list[CentralityResult]:
+        """
+        Calculate HITS authority scores.
 
-            results.append(
-                CentralityResult(
-                    entity_id=node.entity_id,
-                    label=node.label,
-                    score=score,
-                    rank=rank,
-                    entity_type=node.entity_type,
-                )
-            )
+        Args:
+            graph: Graph to analyze
+            limit: Top N results
 
-        return results
+        Returns:
+            List of CentralityResult objects
+        """
+        csr = get_csr(graph)
+        _, authorities = hits(csr)
+        return self._rank_centrality(graph, csr, authorities, limit)
 
     def detect_communities_louvain(
         self,
@@ -587,9 +468,11 @@ class GraphAlgorithms:
         resolution: float = 1.0,
     ) -> tuple[list[Community], float]:
         """
-        Detect communities using Louvain-style modularity optimization.
+        Detect communities using Louvain modularity optimization.
 
-        Simplified implementation without hierarchical levels.
+        Multi-level Louvain over the graph's CSR form, computed from
+        scratch; CommunityIndex keeps results across graph versions and
+        refreshes them incrementally (see communities.py).
 
         Args:
             graph: Graph to analyze
@@ -599,110 +482,14 @@ class GraphAlgorithms:
         Returns:
             Tuple of (communities list, modularity score)
         """
-        node_ids = [n.id for n in graph.nodes]
-        node_map = {n.id: n for n in graph.nodes}
-
-        # Initialize each node in its own community
-        community_map = {node_id: node_id for node_id in node_ids}
-
-        # Build adjacency with weights
-        adjacency = self._build_weighted_adjacency(graph.edges)
-
-        # Calculate total edge weight
-        total_weight = sum(e.weight for e in graph.edges)
-
-        if total_weight == 0:
-            return [], 0.0
-
-        # Iterative optimization
-        improved = True
-        iterations = 0
-        max_iterations = 50
-
-        while improved and iterations < max_iterations:
-            improved = False
-            iterations += 1
-
-            for node_id in node_ids:
-                current_community = community_map[node_id]
-
-                # Calculate modularity gain for moving to neighbor communities
-                best_community = current_community
-                best_gain = 0.0
-
-                neighbor_communities = set()
-                for neighbor, _ in adjacency.get(node_id, []):
-                    neighbor_communities.add(community_map[neighbor])
-
-                for candidate_community in neighbor_communities:
-                    if candidate_community == current_community:
-                        continue
-
-                    gain = self._modularity_gain(
-                        node_id,
-                        current_community,
-                        candidate_community,
-                        community_map,
-                        adjacency,
-                        total_weight,
-                        resolution,
-                    )
-
-                    if gain > best_gain:
-                        best_gain = gain
-                        best_community = candidate_community
-
-                if best_community != current_community:
-                    community_map[node_id] = best_community
-                    improved = True
-
-        # Build communities
-        community_members = defaultdict(list)
-        for node_id, comm_id in community_map.items():
-            community_members[comm_id].append(node_id)
-
-        # Create Community objects
-        communities = []
-        for comm_id, members in community_members.items():
-            if len(members) < min_community_size:
-                continue
-
-            # Calculate community metrics
-            internal_edges = 0
-            external_edges = 0
-
-            for member in members:
-                for neighbor, weight in adjacency.get(member, []):
-                    if neighbor in members:
-                        internal_edges += 1
-                    else:
-                        external_edges += 1
-
-            # Density
-            n_members = len(members)
-            max_edges = n_members * (n_members - 1)
-            density = internal_edges / max_edges if max_edges > 0 else 0.0
-
-            community = Community(
-                id=f"comm_{comm_id}",
-                entity_ids=members,
-                size=len(members),
-                density=density,
-                internal_edges=internal_edges // 2,  # Each edge counted twice
-                external_edges=external_edges,
-            )
-            communities.append(community)
-
-        # Calculate overall modularity
-        modularity = self._calculate_modularity(
-            community_map, adjacency, total_weight
-        )
+        assignment = detect_communities(graph, resolution=resolution)
+        communities = build_communities(graph, assignment, min_community_size)
 
         logger.info(
-            f"Detected {len(communities)} communities (modularity: {modularity:.3f})"
+            f"Detected {len(communities)} communities (modularity: {assignment.modularity:.3f})"
         )
 
-        return communities, modularity
+        return communities, assignment.modularity
 
     def calculate_statistics(self, graph: Graph) -> GraphStatistics:
         """
@@ -840,6 +627,31 @@ class GraphAlgorithms:
 
     # --- Helper Methods ---
 
+    def _rank_centrality(
+        self, graph: Graph, csr: CSRGraph, scores: np.ndarray, limit: int
+    ) -> list[CentralityResult]:
+        """Top-N CentralityResults from a per-node score vector."""
+        if not scores.size:
+            return []
+
+        top = np.argsort(-scores, kind="stable")[:limit]
+        node_map = {n.id: n for n in graph.nodes}
+
+        results = []
+        for rank, i in enumerate(top, start=1):
+            node = node_map[csr.node_ids[i]]
+            results.append(
+                CentralityResult(
+                    entity_id=node.entity_id,
+                    label=node.label,
+                    score=float(scores[i]),
+                    rank=rank,
+                    entity_type=node.entity_type,
+                )
+            )
+
+        return results
+
     def _build_adjacency_dict(
         self, edges: list[GraphEdge]
     ) -> dict[str, list[str]]:
@@ -864,134 +676,24 @@ class GraphAlgorithms:
 
         return adjacency
 
-    def _get_path_edges(
-        self, edges: list[GraphEdge], path: list[str]
-    ) -> list[GraphEdge]:
-        """Get edges along a path."""
-        # Build edge lookup
-        edge_map = {}
-        for edge in edges:
-            key1 = (edge.source, edge.target)
-            key2 = (edge.target, edge.source)
-            edge_map[key1] = edge
-            edge_map[key2] = edge
-
-        path_edges = []
-        for i in range(len(path) - 1):
-            key = (path[i], path[i + 1])
-            edge = edge_map.get(key)
+    def _to_graph_path(
+        self, idx: PathIndex, path: list[int], allowed: list[bool] | None = None
+    ) -> GraphPath:
+        """Convert an index path to a GraphPath with its edges."""
+        edges = []
+        for u, v in zip(path, path[1:]):
+            edge = idx.edge_between(u, v, allowed)
             if edge:
-                path_edges.append(edge)
-
-        return path_edges
-
-    def _count_paths_through(
-        self,
-        adjacency: dict[str, list[str]],
-        source: str,
-        all_nodes: list[str],
-    ) -> dict[str, int]:
-        """Count how many shortest paths pass through each node."""
-        paths_through = defaultdict(int)
-
-        # BFS from source to all other nodes
-        for target in all_nodes:
-            if target == source:
-                continue
-
-            # Find all shortest paths
-            queue = deque([(source, [source])])
-            visited_distances = {source: 0}
-            all_shortest_paths = []
-            shortest_length = None
-
-            while queue:
-                current, path = queue.popleft()
-                current_dist = len(path) - 1
-
-                if shortest_length is not None and current_dist > shortest_length:
-                    break
-
-                if current == target:
-                    if shortest_length is None:
-                        shortest_length = current_dist
-                    all_shortest_paths.append(path)
-                    continue
-
-                for neighbor in adjacency.get(current, []):
-                    new_dist = current_dist + 1
-
-                    if neighbor not in visited_distances or visited_distances[neighbor] == new_dist:
-                        visited_distances[neighbor] = new_dist
-                        queue.append((neighbor, path + [neighbor]))
-
-            # Count nodes on shortest paths
-            for path in all_shortest_paths:
-                for node in path[1:-1]:  # Exclude source and target
-                    paths_through[node] += 1
-
-        return paths_through
-
-    def _modularity_gain(
-        self,
-        node_id: str,
-        from_community: str,
-        to_community: str,
-        community_map: dict[str, str],
-        adjacency: dict[str, list[tuple[str, float]]],
-        total_weight: float,
-        resolution: float,
-    ) -> float:
-        """Calculate modularity gain for moving a node."""
-        # Simplified calculation
-        # Count edges to nodes in target community vs current community
-        edges_to_target = 0.0
-        edges_to_current = 0.0
-
-        for neighbor, weight in adjacency.get(node_id, []):
-            if community_map[neighbor] == to_community:
-                edges_to_target += weight
-            elif community_map[neighbor] == from_community:
-                edges_to_current += weight
-
-        gain = (edges_to_target - edges_to_current) * resolution
-
-        return gain
-
-    def _calculate_modularity(
-        self,
-        community_map: dict[str, str],
-        adjacency: dict[str, list[tuple[str, float]]],
-        total_weight: float,
-    ) -> float:
-        """Calculate modularity of community structure."""
-        if total_weight == 0:
-            return 0.0
-
-        modularity = 0.0
-
-        # For each node pair in same community
-        communities = defaultdict(list)
-        for node_id, comm_id in community_map.items():
-            communities[comm_id].append(node_id)
-
-        for members in communities.values():
-            for i, node_a in enumerate(members):
-                for node_b in members[i:]:
-                    # Actual edges
-                    actual_weight = 0.0
-                    for neighbor, weight in adjacency.get(node_a, []):
-                        if neighbor == node_b:
-                            actual_weight += weight
-
-                    # Expected edges (degree product / total weight)
-                    degree_a = sum(w for _, w in adjacency.get(node_a, []))
-                    degree_b = sum(w for _, w in adjacency.get(node_b, []))
-                    expected = (degree_a * degree_b) / (2 * total_weight)
-
-                    modularity += (actual_weight - expected) / total_weight
-
-        return modularity
+                edges.append(edge)
+        node_ids = idx.to_ids(path)
+        return GraphPath(
+            source_entity_id=node_ids[0],
+            target_entity_id=node_ids[-1],
+            path=node_ids,
+            edges=edges,
+            total_weight=sum(e.weight for e in edges),
+            path_length=len(path) - 1,
+        )
 
     def _calculate_avg_clustering(self, graph: Graph) -> float:
         """Calculate average clustering coefficient."""
@@ -1053,46 +755,35 @@ class GraphAlgorithms:
     def _calculate_distance_metrics(
         self, graph: Graph
     ) -> tuple[int, float]:
-        """Calculate diameter and average path length."""
-        node_ids = [n.id for n in graph.nodes]
-        adjacency = self._build_adjacency_dict(graph.edges)
-
-        all_distances = []
-        max_distance = 0
-
-        # BFS from each node
-        for source in node_ids[:50]:  # Sample for performance
-            distances = self._bfs_distances(source, adjacency, node_ids)
-            for dist in distances.values():
-                if dist < float('inf'):
-                    all_distances.append(dist)
-                    max_distance = max(max_distance, dist)
-
-        diameter = max_distance if all_distances else 0
-        avg_path_length = (
-            sum(all_distances) / len(all_distances) if all_distances else 0.0
-        )
-
-        return diameter, avg_path_length
-
-    def _bfs_distances(
-        self, source: str, adjacency: dict, all_nodes: list[str]
-    ) -> dict[str, float]:
-        """BFS to calculate distances from source."""
-        distances = {node: float('inf') for node in all_nodes}
-        distances[source] = 0
+        """
+        Calculate diameter and average path length.
 
-        queue = deque([source])
-        while queue:
-            current = queue.popleft()
-            current_dist = distances[current]
+        Exact up to DISTANCE_EXACT_MAX_NODES nodes; above that, BFS runs
+        from a seeded sample of DISTANCE_SAMPLES sources, so the diameter
+        is a lower bound and the average an unbiased estimate.
+        """
+        csr = get_csr(graph)
+        if csr.n == 0:
+            return 0, 0.0
 
-            for neighbor in adjacency.get(current, []):
-                if distances[neighbor] == float('inf'):
-                    distances[neighbor] = current_dist + 1
-                    queue.append(neighbor)
+        if csr.n > DISTANCE_EXACT_MAX_NODES:
+            sources = np.random.default_rng(0).choice(csr.n, size=DISTANCE_SAMPLES, replace=False)
+        else:
+            sources = np.arange(csr.n)
 
-        return distances
+        max_distance = 0
+        total = 0
+        count = 0
+        for source in sources:
+            dist = bfs_distances(csr, int(source))
+            reached = dist[dist >= 0]
+            if reached.size:
+                max_distance = max(max_distance, int(reached.max()))
+                total += int(reached.sum())
+                count += int(reached.size)
+
+        avg_path_length = total / count if count else 0.0
+        return max_distance, avg_path_length
 
     # === Ego Network Analysis ===
 
@@ -1,6 +1,9 @@
 """API endpoints for the Graph Shard."""
 
+import asyncio
+import json
 import logging
+import threading
 from datetime import datetime
 from typing import Any, TYPE_CHECKING
 
@@ -28,14 +31,20 @@ from .models import (
 )
 from .scoring import CompositeScorer, ScoreConfig
 from .layouts import LayoutEngine, LayoutType, HierarchicalDirection
+from .layout_service import LayoutService
 from .temporal import TemporalGraphEngine, TemporalSnapshot, EvolutionMetrics
 from .flows import FlowAnalyzer
+from .communities import CommunityIndex
+from .paths import SearchBudget, search_snapshot
 
 if TYPE_CHECKING:
     from .shard import GraphShard
 
 logger = logging.getLogger(__name__)
 
+# How often a running path search checks whether its client went away
+DISCONNECT_POLL_SECONDS = 0.1
+
 # Router
 router = APIRouter(prefix="/api/graph", tags=["graph"])
 
@@ -47,9 +56,11 @@ _storage = None
 _event_bus = None
 _scorer = None
 _layout_engine = None
+_layout_service = None
 _temporal_engine = None
 _db_service = None
 _flow_analyzer = None
+_community_index = None
 
 
 # === Helper to get shard instance ===
@@ -62,7 +73,7 @@ def get_shard(request: Request) -> "GraphShard":
     return shard
 
 
-def init_api(builder, algorithms, exporter, storage=None, event_bus=None, scorer=None, layout_engine=None, db_service=None):
+def init_api(builder, algorithms, exporter, storage=None, event_bus=None, scorer=None, layout_engine=None, db_service=None, community_index=None, layout_service=None):
     """
     Initialize API with shard components.
 
@@ -75,8 +86,10 @@ def init_api(builder, algorithms, exporter, storage=None, event_bus=None, scorer
         scorer: Optional CompositeScorer instance
         layout_engine: Optional LayoutEngine instance
         db_service: Optional database service for temporal queries
+        community_index: Optional CommunityIndex (in-memory one if omitted)
+        layout_service: Optional LayoutService (wraps layout_engine if omitted)
     """
-    global _builder, _algorithms, _exporter, _storage, _event_bus, _scorer, _layout_engine, _temporal_engine, _db_service, _flow_analyzer
+    global _builder, _algorithms, _exporter, _storage, _event_bus, _scorer, _layout_engine, _temporal_engine, _db_service, _flow_analyzer, _community_index, _layout_service
 
     _builder = builder
     _algorithms = algorithms
@@ -85,9 +98,11 @@ def init_api(builder, algorithms, exporter, storage=None, event_bus=None, scorer
     _event_bus = event_bus
     _scorer = scorer or CompositeScorer()
     _layout_engine = layout_engine or LayoutEngine()
+    _layout_service = layout_service or LayoutService(_layout_engine)
     _db_service = db_service
     _temporal_engine = TemporalGraphEngine(db_service=db_service) if db_service else None
     _flow_analyzer = FlowAnalyzer()
+    _community_index = community_index or CommunityIndex()
 
     logger.info("Graph API initialized")
 
@@ -452,6 +467,56 @@ class LayoutRequest(BaseModel):
     columns: int | None = None
     cell_width: float = 100
     cell_height: float = 100
+    recompute: bool = False  # Ignore cached layouts
+
+
+async def _prepare_layout(request: LayoutRequest) -> tuple[Any, LayoutType, dict[str, Any]]:
+    """Load the graph and validate layout type and options for a layout request."""
+    # Get graph
+    if _storage:
+        graph = await _storage.load_graph(request.project_id)
+    elif _builder:
+        graph = await _builder.build_graph(project_id=request.project_id)
+    else:
+        raise HTTPException(status_code=503, detail="Graph service not available")
+
+    # Validate layout type
+    try:
+        layout_type = LayoutType(request.layout_type)
+    except ValueError:
+        valid_types = [lt.value for lt in LayoutType if lt != LayoutType.FORCE_DIRECTED]
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid layout type: {request.layout_type}. Valid types: {valid_types}"
+        )
+
+    # Force-directed should be handled by frontend
+    if layout_type == LayoutType.FORCE_DIRECTED:
+        raise HTTPException(
+            status_code=400,
+            detail="Force-directed layout is handled by the frontend"
+        )
+
+    # Build options dict
+    options = {
+        "root_node_id": request.root_node_id,
+        "direction": request.direction,
+        "layer_spacing": request.layer_spacing,
+        "node_spacing": request.node_spacing,
+        "radius": request.radius,
+        "radius_step": request.radius_step,
+        "left_types": request.left_types or ["document"],
+        "right_types": request.right_types or ["person", "organization", "location"],
+        "columns": request.columns,
+        "cell_width": request.cell_width,
+        "cell_height": request.cell_height,
+        "level_spacing": request.layer_spacing,  # For tree layout
+        "sibling_spacing": request.node_spacing,  # For tree layout
+        "vertical_spacing": request.node_spacing,  # For bipartite layout
+        "spacing": request.layer_spacing * 3,  # Column spacing for bipartite
+    }
+
+    return graph, layout_type, options
 
 
 @router.post("/layout")
@@ -460,7 +525,9 @@ async def calculate_layout(request: LayoutRequest) -> dict[str, Any]:
     Calculate node positions for specified layout algorithm.
 
     Returns pre-calculated positions that the frontend can use
-    instead of force simulation.
+    instead of force simulation. Layouts run off the event loop and are
+    cached per graph version; when nodes were added since the cached
+    layout, existing positions are kept and only new nodes are placed.
 
     Layout types:
     - hierarchical: Sugiyama-style layered layout (good for org charts)
@@ -470,58 +537,16 @@ async def calculate_layout(request: LayoutRequest) -> dict[str, Any]:
     - bipartite: Two-column layout by entity type (good for document-entity)
     - grid: Simple grid layout (good for overview)
     """
-    if not _layout_engine:
+    if not _layout_service:
         raise HTTPException(status_code=503, detail="Layout engine not available")
 
     try:
         start_time = datetime.utcnow()
 
-        # Get graph
-        if _storage:
-            graph = await _storage.load_graph(request.project_id)
-        elif _builder:
-            graph = await _builder.build_graph(project_id=request.project_id)
-        else:
-            raise HTTPException(status_code=503, detail="Graph service not available")
-
-        # Validate layout type
-        try:
-            layout_type = LayoutType(request.layout_type)
-        except ValueError:
-            valid_types = [lt.value for lt in LayoutType if lt != LayoutType.FORCE_DIRECTED]
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid layout type: {request.layout_type}. Valid types: {valid_types}"
-            )
-
-        # Force-directed should be handled by frontend
-        if layout_type == LayoutType.FORCE_DIRECTED:
-            raise HTTPException(
-                status_code=400,
-                detail="Force-directed layout is handled by the frontend"
-            )
-
-        # Build options dict
-        options = {
-            "root_node_id": request.root_node_id,
-            "direction": request.direction,
-            "layer_spacing": request.layer_spacing,
-            "node_spacing": request.node_spacing,
-            "radius": request.radius,
-            "radius_step": request.radius_step,
-            "left_types": request.left_types or ["document"],
-            "right_types": request.right_types or ["person", "organization", "location"],
-            "columns": request.columns,
-            "cell_width": request.cell_width,
-            "cell_height": request.cell_height,
-            "level_spacing": request.layer_spacing,  # For tree layout
-            "sibling_spacing": request.node_spacing,  # For tree layout
-            "vertical_spacing": request.node_spacing,  # For bipartite layout
-            "spacing": request.layer_spacing * 3,  # Column spacing for bipartite
-        }
+        graph, layout_type, options = await _prepare_layout(request)
 
         # Calculate layout
-        result = _layout_engine.calculate_layout(graph, layout_type, options)
+        result = await _layout_service.get_layout(graph, layout_type, options, recompute=request.recompute)
 
         calculation_time = (datetime.utcnow() - start_time).total_seconds() * 1000
 
@@ -538,6 +563,40 @@ async def calculate_layout(request: LayoutRequest) -> dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/layout/stream")
+async def stream_layout(request: LayoutRequest):
+    """
+    Stream node positions coarse-then-refined as newline-delimited JSON.
+
+    For large graphs that need a fresh layout, the first line holds a
+    coarse layout (the highest-degree nodes laid out, the rest placed
+    around them) and the second the refined layout. Cached or
+    incrementally updated layouts arrive as a single refined line.
+    Each line is a layout object with an added "stage" field.
+    """
+    from fastapi.responses import StreamingResponse
+
+    if not _layout_service:
+        raise HTTPException(status_code=503, detail="Layout engine not available")
+
+    graph, layout_type, options = await _prepare_layout(request)
+
+    async def generate():
+        try:
+            async for stage, result in _layout_service.stream_layout(
+                graph, layout_type, options, recompute=request.recompute,
+            ):
+                line = result.to_dict()
+                line["stage"] = stage
+                line["node_count"] = len(result.positions)
+                yield json.dumps(line) + "\n"
+        except Exception as e:
+            logger.error(f"Error streaming layout: {e}", exc_info=True)
+            yield json.dumps({"stage": "error", "error": str(e)}) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.get("/layout/types")
 async def get_layout_types() -> dict[str, Any]:
     """
@@ -602,6 +661,7 @@ class TemporalSnapshotsRequest(BaseModel):
     interval_days: int = 7
     cumulative: bool = True
     max_snapshots: int = 50
+    include_degree_deltas: bool = False  # Per-node degree change between snapshots
 
 
 @router.get("/temporal/range")
@@ -674,6 +734,7 @@ async def get_temporal_snapshots(request: TemporalSnapshotsRequest) -> dict[str,
             interval=interval,
             cumulative=request.cumulative,
             max_snapshots=request.max_snapshots,
+            include_degree_deltas=request.include_degree_deltas,
         )
 
         # Calculate evolution metrics
@@ -1578,6 +1639,7 @@ async def build_graph(request: BuildGraphRequest) -> dict[str, Any]:
             include_temporal=request.include_temporal,
             include_document_entities=request.include_document_entities,
             include_cooccurrences=request.include_cooccurrences,
+            max_edges_per_node=request.max_edges_per_node,
         )
 
         # Enrich with cross-shard data if any source is enabled
@@ -1689,6 +1751,19 @@ async def get_statistics(project_id: str = Query(...)) -> dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/cache/stats")
+async def get_cache_statistics() -> dict[str, Any]:
+    """
+    Get graph cache statistics.
+
+    Returns occupancy, memory budget and hit/miss/eviction counters.
+    """
+    if not _storage:
+        raise HTTPException(status_code=503, detail="Graph storage not available")
+
+    return _storage.get_cache_stats()
+
+
 @router.get("/{project_id}")
 async def get_graph(project_id: str) -> GraphResponse:
     """
@@ -1900,8 +1975,32 @@ async def get_ego_metrics(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _run_path_search(request: Request, search, graph, **kwargs):
+    """
+    Run a path search in a worker thread on a snapshot of the graph.
+
+    The search's budget is cancelled when the client disconnects, so an
+    abandoned search stops at its next budget check instead of running on.
+    Returns the result and whether the budget ran out, in which case the
+    result is partial and a missing path may still exist.
+    """
+    budget = SearchBudget(cancel_event=threading.Event())
+    task = asyncio.ensure_future(
+        asyncio.to_thread(search, graph=search_snapshot(graph), budget=budget, **kwargs)
+    )
+    try:
+        while not task.done():
+            await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if not task.done() and await request.is_disconnected():
+                budget.cancel_event.set()
+        return task.result(), budget.exhausted
+    except asyncio.CancelledError:
+        budget.cancel_event.set()
+        raise
+
+
 @router.post("/path")
-async def find_path(request: PathRequest) -> PathResponse:
+async def find_path(request: Request, body: PathRequest) -> PathResponse:
     """
     Find shortest path between two entities.
 
@@ -1913,18 +2012,18 @@ async def find_path(request: PathRequest) -> PathResponse:
     try:
         # Get graph
         if _storage:
-            graph = await _storage.load_graph(request.project_id)
+            graph = await _storage.load_graph(body.project_id)
         elif _builder:
-            graph = await _builder.build_graph(project_id=request.project_id)
+            graph = await _builder.build_graph(project_id=body.project_id)
         else:
             raise HTTPException(status_code=503, detail="Graph service not available")
 
         # Find path
-        path = _algorithms.find_shortest_path(
-            graph=graph,
-            source_entity_id=request.source_entity_id,
-            target_entity_id=request.target_entity_id,
-            max_depth=request.max_depth,
+        path, truncated = await _run_path_search(
+            request, _algorithms.find_shortest_path, graph,
+            source_entity_id=body.source_entity_id,
+            target_entity_id=body.target_entity_id,
+            max_depth=body.max_depth,
         )
 
         if not path:
@@ -1934,6 +2033,7 @@ async def find_path(request: PathRequest) -> PathResponse:
                 path=[],
                 edges=[],
                 total_weight=0.0,
+                truncated=truncated,
             )
 
         return PathResponse(
@@ -1942,6 +2042,7 @@ async def find_path(request: PathRequest) -> PathResponse:
             path=path.path,
             edges=[e.to_dict() for e in path.edges],
             total_weight=path.total_weight,
+            truncated=truncated,
         )
 
     except Exception as e:
@@ -1965,6 +2066,7 @@ class AllPathsResponse(BaseModel):
     """Response for all paths query."""
     paths_found: int
     paths: list[dict[str, Any]]
+    truncated: bool = False  # Search ran out of time before it finished
 
 
 class WeightedPathRequest(BaseModel):
@@ -1998,7 +2100,7 @@ class PathsThroughRequest(BaseModel):
 
 
 @router.post("/paths/all")
-async def find_all_paths(request: AllPathsRequest) -> AllPathsResponse:
+async def find_all_paths(request: Request, body: AllPathsRequest) -> AllPathsResponse:
     """
     Find all paths between two entities.
 
@@ -2011,24 +2113,25 @@ async def find_all_paths(request: AllPathsRequest) -> AllPathsResponse:
     try:
         # Get graph
         if _storage:
-            graph = await _storage.load_graph(request.project_id)
+            graph = await _storage.load_graph(body.project_id)
         elif _builder:
-            graph = await _builder.build_graph(project_id=request.project_id)
+            graph = await _builder.build_graph(project_id=body.project_id)
         else:
             raise HTTPException(status_code=503, detail="Graph service not available")
 
         # Find all paths
-        paths = _algorithms.find_all_paths(
-            graph=graph,
-            source_entity_id=request.source_entity_id,
-            target_entity_id=request.target_entity_id,
-            max_depth=request.max_depth,
-            max_paths=request.max_paths,
+        paths, truncated = await _run_path_search(
+            request, _algorithms.find_all_paths, graph,
+            source_entity_id=body.source_entity_id,
+            target_entity_id=body.target_entity_id,
+            max_depth=body.max_depth,
+            max_paths=body.max_paths,
         )
 
         return AllPathsResponse(
             paths_found=len(paths),
             paths=[p.to_dict() for p in paths],
+            truncated=truncated,
         )
 
     except Exception as e:
@@ -2037,7 +2140,7 @@ async def find_all_paths(request: AllPathsRequest) -> AllPathsResponse:
 
 
 @router.post("/paths/weighted")
-async def find_weighted_path(request: WeightedPathRequest) -> PathResponse:
+async def find_weighted_path(request: Request, body: WeightedPathRequest) -> PathResponse:
     """
     Find optimal weighted path between entities.
 
@@ -2051,19 +2154,19 @@ async def find_weighted_path(request: WeightedPathRequest) -> PathResponse:
     try:
         # Get graph
         if _storage:
-            graph = await _storage.load_graph(request.project_id)
+            graph = await _storage.load_graph(body.project_id)
         elif _builder:
-            graph = await _builder.build_graph(project_id=request.project_id)
+            graph = await _builder.build_graph(project_id=body.project_id)
         else:
             raise HTTPException(status_code=503, detail="Graph service not available")
 
         # Find weighted path
-        path = _algorithms.find_weighted_path(
-            graph=graph,
-            source_entity_id=request.source_entity_id,
-            target_entity_id=request.target_entity_id,
-            max_depth=request.max_depth,
-            use_max_weight=request.use_max_weight,
+        path, truncated = await _run_path_search(
+            request, _algorithms.find_weighted_path, graph,
+            source_entity_id=body.source_entity_id,
+            target_entity_id=body.target_entity_id,
+            max_depth=body.max_depth,
+            use_max_weight=body.use_max_weight,
         )
 
         if not path:
@@ -2073,6 +2176,7 @@ async def find_weighted_path(request: WeightedPathRequest) -> PathResponse:
                 path=[],
                 edges=[],
                 total_weight=0.0,
+                truncated=truncated,
             )
 
         return PathResponse(
@@ -2081,6 +2185,7 @@ async def find_weighted_path(request: WeightedPathRequest) -> PathResponse:
             path=path.path,
             edges=[e.to_dict() for e in path.edges],
             total_weight=path.total_weight,
+            truncated=truncated,
         )
 
     except Exception as e:
@@ -2089,7 +2194,7 @@ async def find_weighted_path(request: WeightedPathRequest) -> PathResponse:
 
 
 @router.post("/paths/constrained")
-async def find_constrained_path(request: ConstrainedPathRequest) -> PathResponse:
+async def find_constrained_path(request: Request, body: ConstrainedPathRequest) -> PathResponse:
     """
     Find path with constraints on nodes and edges.
 
@@ -2105,22 +2210,22 @@ async def find_constrained_path(request: ConstrainedPathRequest) -> PathResponse
     try:
         # Get graph
         if _storage:
-            graph = await _storage.load_graph(request.project_id)
+            graph = await _storage.load_graph(body.project_id)
         elif _builder:
-            graph = await _builder.build_graph(project_id=request.project_id)
+            graph = await _builder.build_graph(project_id=body.project_id)
         else:
             raise HTTPException(status_code=503, detail="Graph service not available")
 
         # Find constrained path
-        path = _algorithms.find_constrained_path(
-            graph=graph,
-            source_entity_id=request.source_entity_id,
-            target_entity_id=request.target_entity_id,
-            required_entities=request.required_entities,
-            excluded_entities=request.excluded_entities,
-            required_relationship_types=request.required_relationship_types,
-            min_edge_weight=request.min_edge_weight,
-            max_depth=request.max_depth,
+        path, truncated = await _run_path_search(
+            request, _algorithms.find_constrained_path, graph,
+            source_entity_id=body.source_entity_id,
+            target_entity_id=body.target_entity_id,
+            required_entities=body.required_entities,
+            excluded_entities=body.excluded_entities,
+            required_relationship_types=body.required_relationship_types,
+            min_edge_weight=body.min_edge_weight,
+            max_depth=body.max_depth,
         )
 
         if not path:
@@ -2130,6 +2235,7 @@ async def find_constrained_path(request: ConstrainedPathRequest) -> PathResponse
                 path=[],
                 edges=[],
                 total_weight=0.0,
+                truncated=truncated,
             )
 
         return PathResponse(
@@ -2138,6 +2244,7 @@ async def find_constrained_path(request: ConstrainedPathRequest) -> PathResponse
             path=path.path,
             edges=[e.to_dict() for e in path.edges],
             total_weight=path.total_weight,
+            truncated=truncated,
         )
 
     except Exception as e:
@@ -2146,7 +2253,7 @@ async def find_constrained_path(request: ConstrainedPathRequest) -> PathResponse
 
 
 @router.post("/paths/through")
-async def find_paths_through_entity(request: PathsThroughRequest) -> AllPathsResponse:
+async def find_paths_through_entity(request: Request, body: PathsThroughRequest) -> AllPathsResponse:
     """
     Find paths that pass through a specific entity.
 
@@ -2159,24 +2266,25 @@ async def find_paths_through_entity(request: PathsThroughRequest) -> AllPathsRes
     try:
         # Get graph
         if _storage:
-            graph = await _storage.load_graph(request.project_id)
+            graph = await _storage.load_graph(body.project_id)
         elif _builder:
-            graph = await _builder.build_graph(project_id=request.project_id)
+            graph = await _builder.build_graph(project_id=body.project_id)
         else:
             raise HTTPException(status_code=503, detail="Graph service not available")
 
         # Find paths through entity
-        paths = _algorithms.find_paths_through(
-            graph=graph,
-            intermediate_entity_id=request.intermediate_entity_id,
-            max_sources=request.max_sources,
-            max_targets=request.max_targets,
-            max_depth=request.max_depth,
+        paths, truncated = await _run_path_search(
+            request, _algorithms.find_paths_through, graph,
+            intermediate_entity_id=body.intermediate_entity_id,
+            max_sources=body.max_sources,
+            max_targets=body.max_targets,
+            max_depth=body.max_depth,
         )
 
         return AllPathsResponse(
             paths_found=len(paths),
             paths=[p.to_dict() for p in paths],
+            truncated=truncated,
         )
 
     except Exception as e:
@@ -2187,8 +2295,9 @@ async def find_paths_through_entity(request: PathsThroughRequest) -> AllPathsRes
 @router.get("/centrality/{project_id}")
 async def calculate_centrality(
     project_id: str,
-    metric: str = Query("all", description="Centrality metric: degree, betweenness, pagerank, all"),
+    metric: str = Query("all", description="Centrality metric: degree, betweenness, pagerank, eigenvector, hits, all"),
     limit: int = Query(50, ge=1, le=200),
+    samples: int | None = Query(None, ge=1, description="Betweenness source samples (default: exact on small graphs)"),
 ) -> CentralityResponse:
     """
     Calculate centrality metrics.
@@ -2219,13 +2328,17 @@ async def calculate_centrality(
         if metric_enum == CentralityMetric.DEGREE:
             results = _algorithms.calculate_degree_centrality(graph, limit)
         elif metric_enum == CentralityMetric.BETWEENNESS:
-            results = _algorithms.calculate_betweenness_centrality(graph, limit)
+            results = _algorithms.calculate_betweenness_centrality(graph, limit, k=samples)
         elif metric_enum == CentralityMetric.PAGERANK:
             results = _algorithms.calculate_pagerank(graph, limit)
+        elif metric_enum == CentralityMetric.EIGENVECTOR:
+            results = _algorithms.calculate_eigenvector_centrality(graph, limit)
+        elif metric_enum == CentralityMetric.HITS:
+            results = _algorithms.calculate_hits(graph, limit)
         elif metric_enum == CentralityMetric.ALL:
             # Calculate all metrics and merge
             degree = _algorithms.calculate_degree_centrality(graph, limit * 2)
-            betweenness = _algorithms.calculate_betweenness_centrality(graph, limit * 2)
+            betweenness = _algorithms.calculate_betweenness_centrality(graph, limit * 2, k=samples)
             pagerank = _algorithms.calculate_pagerank(graph, limit * 2)
 
             # Build maps for quick lookup
@@ -2288,9 +2401,11 @@ async def detect_communities(request: CommunityRequest) -> CommunityResponse:
     """
     Detect communities in graph.
 
-    Identifies clusters of closely connected entities.
+    Identifies clusters of closely connected entities. Assignments are
+    stored per graph version: an unchanged graph is answered from the
+    stored result, a changed one is refreshed incrementally.
     """
-    if not _algorithms:
+    if not _algorithms or not _community_index:
         raise HTTPException(status_code=503, detail="Graph algorithms not available")
 
     try:
@@ -2303,17 +2418,20 @@ async def detect_communities(request: CommunityRequest) -> CommunityResponse:
             raise HTTPException(status_code=503, detail="Graph service not available")
 
         # Detect communities
-        communities, modularity = _algorithms.detect_communities_louvain(
+        communities, assignment = await _community_index.get_communities(
             graph=graph,
-            min_community_size=request.min_community_size,
             resolution=request.resolution,
+            min_community_size=request.min_community_size,
+            recompute=request.recompute,
         )
 
         return CommunityResponse(
             project_id=request.project_id,
             community_count=len(communities),
             communities=[c.to_dict() for c in communities],
-            modularity=modularity,
+            modularity=assignment.modularity,
+            graph_version=assignment.version,
+            mode=assignment.mode,
         )
 
     except Exception as e:
@@ -3530,6 +3648,55 @@ async def find_causal_paths(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/causal/{project_id}/reachable")
+async def check_causal_chain(
+    project_id: str,
+    cause: str = Query(..., description="Source node ID"),
+    effect: str = Query(..., description="Target node ID"),
+) -> dict[str, Any]:
+    """
+    Check whether a causal chain leads from one variable to another.
+
+    Answered from the reachability index instead of enumerating paths.
+
+    Args:
+        project_id: Project to search
+        cause: Source node (cause)
+        effect: Target node (effect)
+
+    Returns:
+        Whether the effect is reachable, with one shortest chain
+    """
+    if not _db_service:
+        raise HTTPException(status_code=503, detail="Database service not available")
+
+    try:
+        graph = await _get_or_build_graph(project_id)
+
+        if not graph:
+            return {
+                "success": False,
+                "error": "No graph data available",
+            }
+
+        engine = _get_causal_engine()
+        causal_graph = engine.build_causal_graph(graph)
+        reachable = engine.chain_exists(causal_graph, cause, effect)
+        chain = engine.shortest_chain(causal_graph, cause, effect) if reachable else []
+
+        return {
+            "success": True,
+            "cause": cause,
+            "effect": effect,
+            "reachable": reachable,
+            "chain": chain,
+        }
+
+    except Exception as e:
+        logger.error(f"Error checking causal chain: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/causal/{project_id}/confounders")
 async def identify_confounders(
     project_id: str,
@@ -3722,6 +3889,7 @@ async def get_geo_graph(
     document_ids: str | None = Query(None, description="Comma-separated document IDs"),
     cluster_radius_km: float | None = Query(None, description="Cluster nearby nodes within radius"),
     format: str = Query("json", description="Output format: json or geojson"),
+    bbox: str | None = Query(None, description="Viewport filter: min_lat,min_lng,max_lat,max_lng"),
 ) -> dict[str, Any]:
     """
     Get geographic graph data for map visualization.
@@ -3734,6 +3902,7 @@ async def get_geo_graph(
         document_ids: Optional filter to specific documents
         cluster_radius_km: Optional clustering radius in km
         format: Output format (json or geojson)
+        bbox: Optional bounding box; only nodes inside it are returned
 
     Returns:
         Geographic graph data with coordinates and distances
@@ -3762,7 +3931,16 @@ async def get_geo_graph(
             }
 
         engine = _get_geo_engine()
-        geo_data = engine.build_geo_graph(graph, cluster_radius_km)
+        bounds = None
+        if bbox:
+            from .geospatial import GeoBounds
+            try:
+                min_lat, min_lng, max_lat, max_lng = (float(v) for v in bbox.split(","))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="bbox must be min_lat,min_lng,max_lat,max_lng")
+            bounds = GeoBounds(min_lat=min_lat, max_lat=max_lat, min_lng=min_lng, max_lng=max_lng)
+
+        geo_data = engine.build_geo_graph(graph, cluster_radius_km, bounds=bounds)
 
         if not geo_data.nodes:
             return {
@@ -3782,6 +3960,8 @@ async def get_geo_graph(
             result["success"] = True
             return result
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error building geo graph: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -3918,6 +4098,63 @@ async def calculate_distance(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/geo/{project_id}/nearest")
+async def get_nearest_geo_nodes(
+    project_id: str,
+    latitude: float = Query(..., ge=-90, le=90, description="Query point latitude"),
+    longitude: float = Query(..., ge=-180, le=180, description="Query point longitude"),
+    k: int = Query(10, ge=1, le=500, description="Number of nodes to return"),
+    max_km: float | None = Query(None, gt=0, description="Only search within this radius"),
+) -> dict[str, Any]:
+    """
+    Find the geolocated nodes closest to a point.
+
+    Args:
+        project_id: Project to search
+        latitude, longitude: Query point
+        k: Number of nodes to return
+        max_km: Optional search radius limit
+
+    Returns:
+        Nodes with distances, nearest first
+    """
+    if not _db_service:
+        raise HTTPException(status_code=503, detail="Database service not available")
+
+    try:
+        graph = await _get_or_build_graph(project_id)
+
+        if not graph:
+            return {
+                "success": False,
+                "error": "No graph data available",
+            }
+
+        engine = _get_geo_engine()
+        geo_nodes = engine.extract_geo_nodes(graph)
+        nearest = engine.nearest_nodes(geo_nodes, latitude, longitude, k=k, max_km=max_km)
+
+        return {
+            "success": True,
+            "point": [latitude, longitude],
+            "nodes": [
+                {
+                    "id": node.entity_id,
+                    "label": node.label,
+                    "entity_type": node.entity_type,
+                    "coordinates": [node.latitude, node.longitude],
+                    "distance_km": distance,
+                }
+                for node, distance in nearest
+            ],
+            "total_nodes": len(geo_nodes),
+        }
+
+    except Exception as e:
+        logger.error(f"Error finding nearest nodes: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/geo/{project_id}/clusters")
 async def get_geo_clusters(
     project_id: str,
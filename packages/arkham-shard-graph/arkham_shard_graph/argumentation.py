@@ -7,6 +7,7 @@ suitable for visualization as an argumentation framework.
 
 from dataclasses import dataclass, field
 from typing import Any
+from collections import defaultdict
 from enum import Enum
 import logging
 
@@ -225,19 +226,23 @@ class ArgumentationBuilder:
         # Only calculate status for hypotheses
         hypothesis_nodes = [n for n in nodes if n.node_type == ArgumentNodeType.HYPOTHESIS]
 
+        # Group incoming edges once instead of scanning all edges per hypothesis
+        incoming: dict[str, list[ArgumentEdge]] = defaultdict(list)
+        for edge in edges:
+            incoming[edge.target].append(edge)
+
         for node in hypothesis_nodes:
             support_count = 0
             attack_count = 0
             net_score = 0.0
 
-            for edge in edges:
-                if edge.target == node.id:
-                    if edge.edge_type == ArgumentEdgeType.SUPPORTS:
-                        support_count += 1
-                        net_score += edge.strength * edge.confidence
-                    elif edge.edge_type == ArgumentEdgeType.ATTACKS:
-                        attack_count += 1
-                        net_score += edge.strength * edge.confidence  # Already negative
+            for edge in incoming.get(node.id, ()):
+                if edge.edge_type == ArgumentEdgeType.SUPPORTS:
+                    support_count += 1
+                    net_score += edge.strength * edge.confidence
+                elif edge.edge_type == ArgumentEdgeType.ATTACKS:
+                    attack_count += 1
+                    net_score += edge.strength * edge.confidence  # Already negative
 
             # Determine status
             if attack_count == 0 and support_count > 0:
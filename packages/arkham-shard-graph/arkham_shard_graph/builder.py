@@ -10,6 +10,26 @@ from .models import Graph, GraphNode, GraphEdge, RelationshipType
 logger = logging.getLogger(__name__)
 
 
+def _merge_co_occurrences(
+    indexed: dict[tuple[str, str], dict[str, Any]],
+    unindexed: dict[tuple[str, str], dict[str, Any]],
+    min_count: int,
+) -> dict[tuple[str, str], dict[str, Any]]:
+    """Add pairs counted outside the index to indexed ones, then apply min_count."""
+    merged = dict(indexed)
+    for key, data in unindexed.items():
+        if key in merged:
+            existing = merged[key]
+            merged[key] = {
+                **existing,
+                "count": existing["count"] + data["count"],
+                "document_ids": sorted(set(existing["document_ids"]) | set(data["document_ids"])),
+            }
+        else:
+            merged[key] = data
+    return {key: data for key, data in merged.items() if data["count"] >= min_count}
+
+
 class GraphBuilder:
     """
     Builds entity relationship graphs from document data.
@@ -18,7 +38,13 @@ class GraphBuilder:
     entity connections.
     """
 
-    def __init__(self, entities_service=None, documents_service=None, db_service=None):
+    def __init__(
+        self,
+        entities_service=None,
+        documents_service=None,
+        db_service=None,
+        cooccurrence_index=None,
+    ):
         """
         Initialize graph builder.
 
@@ -26,10 +52,12 @@ class GraphBuilder:
             entities_service: Service for entity data
             documents_service: Service for document data
             db_service: Database service for direct queries
+            cooccurrence_index: Materialized co-occurrence edges (CooccurrenceIndex)
         """
         self.entities_service = entities_service
         self.documents_service = documents_service
         self.db_service = db_service
+        self.cooccurrence_index = cooccurrence_index
 
     async def build_graph(
         self,
@@ -40,6 +68,7 @@ class GraphBuilder:
         include_temporal: bool = False,
         include_document_entities: bool = True,
         include_cooccurrences: bool = True,
+        max_edges_per_node: int | None = None,
     ) -> Graph:
         """
         Build entity relationship graph.
@@ -52,6 +81,8 @@ class GraphBuilder:
             include_temporal: Include temporal relationships
             include_document_entities: Include entities from documents (default True)
             include_cooccurrences: Include co-occurrence edges (default True)
+            max_edges_per_node: Keep only each entity's strongest co-occurrence
+                edges (requires the co-occurrence index)
 
         Returns:
             Constructed Graph object
@@ -69,7 +100,7 @@ class GraphBuilder:
             # Get co-occurrence data from document mentions (if enabled)
             if include_cooccurrences and entities:
                 co_occurrences = await self._get_co_occurrences(
-                    project_id, entities, document_ids, min_co_occurrence
+                    project_id, entities, document_ids, min_co_occurrence, max_edges_per_node
                 )
                 logger.info(f"Found {len(co_occurrences)} entity pairs from co-occurrence")
 
@@ -107,6 +138,7 @@ class GraphBuilder:
                 "include_temporal": include_temporal,
                 "include_document_entities": include_document_entities,
                 "include_cooccurrences": include_cooccurrences,
+                "max_edges_per_node": max_edges_per_node,
                 "entity_types": entity_types or [],
                 "document_ids": document_ids or [],
                 "entity_count": len(entities),
@@ -207,21 +239,92 @@ class GraphBuilder:
         logger.warning("No entities data source available")
         return []
 
+    async def get_document_entities(self, document_id: str) -> list[dict[str, Any]]:
+        """
+        Get the canonical entities extracted from one document.
+
+        Used to apply ingest events to cached graphs as deltas; returns
+        entity dicts shaped like _get_entities().
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            List of entity dictionaries (empty without a database)
+        """
+        if not self.db_service:
+            return []
+
+        try:
+            rows = await self.db_service.fetch_all(
+                """
+                SELECT id, text as label, entity_type, metadata
+                FROM arkham_frame.entities
+                WHERE document_id = :document_id AND canonical_id IS NULL
+                """,
+                {"document_id": document_id},
+            )
+        except Exception as e:
+            logger.warning(f"Failed to get entities for document {document_id}: {e}")
+            return []
+
+        return [
+            {
+                "id": str(row["id"]),
+                "label": row["label"],
+                "entity_type": row["entity_type"],
+                "document_count": 1,
+                "properties": row.get("metadata") or {},
+            }
+            for row in rows
+        ]
+
+    async def get_document_project(self, document_id: str) -> str | None:
+        """
+        Get the project a document belongs to.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            Project ID, or None if unknown
+        """
+        if not self.db_service:
+            return None
+
+        try:
+            row = await self.db_service.fetch_one(
+                "SELECT project_id FROM arkham_frame.documents WHERE id = :document_id",
+                {"document_id": document_id},
+            )
+        except Exception as e:
+            logger.warning(f"Failed to get project of document {document_id}: {e}")
+            return None
+
+        return str(row["project_id"]) if row and row["project_id"] else None
+
     async def _get_co_occurrences(
         self,
         project_id: str,
         entities: list[dict[str, Any]],
         document_ids: list[str] | None,
         min_count: int,
+        top_n: int | None = None,
     ) -> dict[tuple[str, str], dict[str, Any]]:
         """
         Calculate entity co-occurrences from document mentions.
 
+        Reads pre-aggregated pairs from the co-occurrence index when it is
+        ready, otherwise derives them from the entities table. Documents not
+        yet in the index are derived from the entities table and merged in;
+        per-node pruning (top_n) is skipped while any are pending.
+
         Args:
             project_id: Project ID
             entities: List of entities
             document_ids: Optional document filter
             min_count: Minimum co-occurrence count
+            top_n: Optional per-node edge limit (index only)
 
         Returns:
             Dictionary mapping entity pairs to co-occurrence data
@@ -232,58 +335,28 @@ class GraphBuilder:
         if not entity_ids:
             return co_occurrences
 
+        if self.cooccurrence_index and self.cooccurrence_index.ready:
+            try:
+                # Documents the index has not seen yet (e.g. missed events)
+                # are still counted, straight from the entities table
+                unindexed = {}
+                if self.db_service:
+                    unindexed = await self._query_co_occurrences(
+                        entity_ids, document_ids, 1, unindexed_only=True
+                    )
+                if not unindexed:
+                    return await self.cooccurrence_index.get_pairs(
+                        entity_ids, document_ids, min_count, top_n
+                    )
+                indexed = await self.cooccurrence_index.get_pairs(entity_ids, document_ids, 1)
+                return _merge_co_occurrences(indexed, unindexed, min_count)
+            except Exception as e:
+                logger.warning(f"Failed to read co-occurrence index: {e}")
+
         # Try database first
         if self.db_service:
             try:
-                # Query co-occurrences: entities that appear in the same document
-                # Use arkham_frame.entities table directly
-                query = """
-                    SELECT
-                        e1.id as entity_a,
-                        e2.id as entity_b,
-                        COUNT(DISTINCT e1.document_id) as co_occurrence_count,
-                        ARRAY_AGG(DISTINCT e1.document_id::text) as document_ids
-                    FROM arkham_frame.entities e1
-                    JOIN arkham_frame.entities e2
-                        ON e1.document_id = e2.document_id
-                        AND e1.id < e2.id  -- Avoid duplicates
-                    WHERE e1.id = ANY(:entity_ids)
-                      AND e2.id = ANY(:entity_ids)
-                """
-                params: dict[str, Any] = {"entity_ids": entity_ids}
-
-                if document_ids:
-                    query += " AND e1.document_id = ANY(:document_ids)"
-                    params["document_ids"] = document_ids
-
-                query += """
-                    GROUP BY e1.id, e2.id
-                    HAVING COUNT(DISTINCT e1.document_id) >= :min_count
-                    ORDER BY co_occurrence_count DESC
-                    LIMIT 1000
-                """
-                params["min_count"] = min_count
-
-                rows = await self.db_service.fetch_all(query, params)
-
-                for row in rows:
-                    ent_a = str(row["entity_a"])
-                    ent_b = str(row["entity_b"])
-
-                    # Ensure consistent ordering
-                    if ent_a > ent_b:
-                        ent_a, ent_b = ent_b, ent_a
-
-                    doc_ids = row["document_ids"] or []
-                    if isinstance(doc_ids, str):
-                        doc_ids = [doc_ids]
-
-                    co_occurrences[(ent_a, ent_b)] = {
-                        "count": row["co_occurrence_count"],
-                        "document_ids": doc_ids,
-                        "relationship_type": RelationshipType.MENTIONED_WITH.value,
-                    }
-
+                co_occurrences = await self._query_co_occurrences(entity_ids, document_ids, min_count)
                 if co_occurrences:
                     return co_occurrences
 
@@ -313,6 +386,84 @@ class GraphBuilder:
 
         return co_occurrences
 
+    async def _query_co_occurrences(
+        self,
+        entity_ids: list[str],
+        document_ids: list[str] | None,
+        min_count: int,
+        unindexed_only: bool = False,
+    ) -> dict[tuple[str, str], dict[str, Any]]:
+        """
+        Derive co-occurrences by self-joining the entities table.
+
+        Args:
+            entity_ids: Entities to connect
+            document_ids: Optional document filter
+            min_count: Minimum co-occurrence count
+            unindexed_only: Only count documents missing from the co-occurrence index
+
+        Returns:
+            Dictionary mapping entity pairs to co-occurrence data
+        """
+        co_occurrences: dict[tuple[str, str], dict[str, Any]] = {}
+        # Query co-occurrences: entities that appear in the same document
+        # Use arkham_frame.entities table directly
+        query = """
+            SELECT
+                e1.id as entity_a,
+                e2.id as entity_b,
+                COUNT(DISTINCT e1.document_id) as co_occurrence_count,
+                ARRAY_AGG(DISTINCT e1.document_id::text) as document_ids
+            FROM arkham_frame.entities e1
+            JOIN arkham_frame.entities e2
+                ON e1.document_id = e2.document_id
+                AND e1.id < e2.id  -- Avoid duplicates
+            WHERE e1.id = ANY(:entity_ids)
+              AND e2.id = ANY(:entity_ids)
+        """
+        params: dict[str, Any] = {"entity_ids": entity_ids}
+
+        if document_ids:
+            query += " AND e1.document_id = ANY(:document_ids)"
+            params["document_ids"] = document_ids
+
+        if unindexed_only:
+            query += """
+              AND NOT EXISTS (
+                  SELECT 1 FROM arkham_graph.cooccurrence_documents d
+                  WHERE d.document_id = e1.document_id::text
+              )
+            """
+
+        query += """
+            GROUP BY e1.id, e2.id
+            HAVING COUNT(DISTINCT e1.document_id) >= :min_count
+            ORDER BY co_occurrence_count DESC
+        """
+        params["min_count"] = min_count
+
+        rows = await self.db_service.fetch_all(query, params)
+
+        for row in rows:
+            ent_a = str(row["entity_a"])
+            ent_b = str(row["entity_b"])
+
+            # Ensure consistent ordering
+            if ent_a > ent_b:
+                ent_a, ent_b = ent_b, ent_a
+
+            doc_ids = row["document_ids"] or []
+            if isinstance(doc_ids, str):
+                doc_ids = [doc_ids]
+
+            co_occurrences[(ent_a, ent_b)] = {
+                "count": row["co_occurrence_count"],
+                "document_ids": doc_ids,
+                "relationship_type": RelationshipType.MENTIONED_WITH.value,
+            }
+
+        return co_occurrences
+
     async def _get_explicit_relationships(
         self,
         project_id: str,
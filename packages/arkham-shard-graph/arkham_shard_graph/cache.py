@@ -0,0 +1,328 @@
+"""Graph cache - memory-bounded project graph cache with delta updates."""
+
+import logging
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterator, MutableMapping
+from datetime import datetime
+from typing import Any
+
+from .csr import invalidate_csr
+from .models import Graph, GraphEdge, GraphNode, RelationshipType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Rough per-object footprints (dataclass + dicts + strings) used for
+# size accounting; exact sizes would cost a full object walk per update
+NODE_BYTES = 700
+EDGE_BYTES = 500
+DOC_REF_BYTES = 90
+
+
+def estimate_graph_bytes(graph: Graph) -> int:
+    """Estimate the resident size of a graph in bytes."""
+    doc_refs = sum(len(e.document_ids or ()) for e in graph.edges)
+    return (
+        len(graph.nodes) * NODE_BYTES
+        + len(graph.edges) * EDGE_BYTES
+        + doc_refs * DOC_REF_BYTES
+    )
+
+
+def _edge_weight(count: int) -> float:
+    """Co-occurrence weight, normalized the same way GraphBuilder does."""
+    return min(1.0, count / 10.0)
+
+
+def _recount_degrees(graph: Graph) -> None:
+    degree: dict[str, int] = defaultdict(int)
+    for edge in graph.edges:
+        degree[edge.source] += 1
+        degree[edge.target] += 1
+    for node in graph.nodes:
+        node.degree = degree.get(node.id, 0)
+
+
+def add_document_entities(
+    graph: Graph, document_id: str, entities: list[dict[str, Any]]
+) -> bool:
+    """
+    Add newly extracted entities of a document to a graph.
+
+    New entities become nodes, and co-occurrence edges are added between
+    every pair of the document's entities present in the graph, matching
+    what a rebuild would produce. Graph filters recorded in the metadata
+    (document_ids, entity_types) are honoured.
+
+    Args:
+        graph: Graph to update in place
+        document_id: Document the entities were extracted from
+        entities: All current entities of the document, shaped like
+            GraphBuilder entity dicts (id, label, entity_type, ...)
+
+    Returns:
+        True if the graph changed
+    """
+    metadata = graph.metadata or {}
+    if metadata.get("include_document_entities") is False:
+        return False
+    scoped_docs = metadata.get("document_ids") or []
+    if scoped_docs and document_id not in scoped_docs:
+        return False
+    entity_types = metadata.get("entity_types") or []
+    if entity_types:
+        entities = [e for e in entities if e.get("entity_type") in entity_types]
+
+    node_ids = {n.id for n in graph.nodes}
+    new = [e for e in entities if e["id"] not in node_ids]
+    if not new:
+        return False
+
+    for entity in new:
+        graph.nodes.append(GraphNode(
+            id=entity["id"],
+            entity_id=entity["id"],
+            label=entity.get("label", entity["id"]),
+            entity_type=entity.get("entity_type", "unknown"),
+            document_count=entity.get("document_count", 0),
+            properties=entity.get("properties", {}),
+        ))
+        node_ids.add(entity["id"])
+
+    min_count = metadata.get("min_co_occurrence", 1)
+    # Pruned graphs (max_edges_per_node) can't be extended edge by edge
+    if (
+        metadata.get("include_cooccurrences", True)
+        and min_count <= 1
+        and not metadata.get("max_edges_per_node")
+    ):
+        edges = {
+            (min(e.source, e.target), max(e.source, e.target), e.relationship_type): e
+            for e in graph.edges
+        }
+        present = sorted({e["id"] for e in entities if e["id"] in node_ids})
+        new_ids = {e["id"] for e in new}
+        for i, a in enumerate(present):
+            for b in present[i + 1:]:
+                if a not in new_ids and b not in new_ids:
+                    continue
+                key = (a, b, RelationshipType.MENTIONED_WITH.value)
+                edge = edges.get(key)
+                if edge is None:
+                    edge = GraphEdge(
+                        source=a,
+                        target=b,
+                        relationship_type=RelationshipType.MENTIONED_WITH.value,
+                        weight=0.0,
+                    )
+                    graph.edges.append(edge)
+                    edges[key] = edge
+                if document_id not in edge.document_ids:
+                    edge.document_ids.append(document_id)
+                    edge.co_occurrence_count += 1
+                    edge.weight = _edge_weight(edge.co_occurrence_count)
+
+    _recount_degrees(graph)
+    return True
+
+
+def remove_document(graph: Graph, document_id: str) -> bool:
+    """
+    Remove a deleted document's contribution from a graph.
+
+    Edges lose the document and are dropped once their co-occurrence
+    count falls below the graph's minimum. Endpoints of dropped edges
+    lose a document from their count, and nodes left with neither
+    documents nor edges are removed.
+
+    Returns:
+        True if the graph changed
+    """
+    touched = [e for e in graph.edges if document_id in (e.document_ids or ())]
+    if not touched:
+        return False
+
+    min_count = max(1, (graph.metadata or {}).get("min_co_occurrence", 1))
+    dropped: set[int] = set()
+    dropped_endpoints: set[str] = set()
+    for edge in touched:
+        edge.document_ids = [d for d in edge.document_ids if d != document_id]
+        edge.co_occurrence_count = max(0, edge.co_occurrence_count - 1)
+        edge.weight = _edge_weight(edge.co_occurrence_count)
+        if edge.co_occurrence_count < min_count:
+            dropped.add(id(edge))
+            dropped_endpoints.update((edge.source, edge.target))
+
+    graph.edges = [e for e in graph.edges if id(e) not in dropped]
+    _recount_degrees(graph)
+
+    kept = []
+    for node in graph.nodes:
+        if node.id in dropped_endpoints:
+            node.document_count = max(0, node.document_count - 1)
+            if node.document_count == 0 and node.degree == 0:
+                continue
+        kept.append(node)
+    graph.nodes = kept
+    return True
+
+
+def merge_entities(graph: Graph, source_id: str, target_id: str) -> bool:
+    """
+    Fold a merged entity's node into its canonical target.
+
+    Edges are rewired onto the target; parallel edges that result are
+    combined (counts summed, documents unioned) and self-loops dropped.
+
+    Returns:
+        True if the graph changed
+    """
+    nodes = {n.id: n for n in graph.nodes}
+    source = nodes.get(source_id)
+    if source is None or source_id == target_id:
+        return False
+
+    target = nodes.get(target_id)
+    if target is None:
+        # The canonical entity is not in the graph yet - the node takes its id
+        source.id = target_id
+        source.entity_id = target_id
+    else:
+        target.document_count += source.document_count
+        graph.nodes = [n for n in graph.nodes if n is not source]
+
+    merged: dict[tuple[str, str, str], GraphEdge] = {}
+    for edge in graph.edges:
+        if edge.source == source_id:
+            edge.source = target_id
+        if edge.target == source_id:
+            edge.target = target_id
+        if edge.source == edge.target:
+            continue
+        key = (min(edge.source, edge.target), max(edge.source, edge.target), edge.relationship_type)
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = edge
+            continue
+        existing.document_ids = list(dict.fromkeys([*existing.document_ids, *edge.document_ids]))
+        existing.co_occurrence_count += edge.co_occurrence_count
+        existing.weight = max(existing.weight, edge.weight, _edge_weight(existing.co_occurrence_count))
+
+    graph.edges = list(merged.values())
+    _recount_degrees(graph)
+    return True
+
+
+class GraphCache(MutableMapping):
+    """
+    Memory-bounded LRU cache of project graphs.
+
+    Behaves like a dict keyed by project_id. Each entry's size is estimated
+    on insert (and after delta updates via resize()); once the total goes
+    over max_bytes, or the entry count over max_graphs, least recently
+    used graphs are evicted. The most recently stored graph is never
+    evicted by its own insertion, so a single oversized graph still
+    caches. lookup() is the counted read path used by GraphStorage.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_graphs: int | None = None):
+        self.max_bytes = max_bytes
+        self.max_graphs = max_graphs
+        self._graphs: OrderedDict[str, Graph] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.delta_updates = 0
+
+    # --- Mapping protocol ---
+
+    def __getitem__(self, project_id: str) -> Graph:
+        return self._graphs[project_id]
+
+    def __setitem__(self, project_id: str, graph: Graph) -> None:
+        if project_id in self._graphs:
+            self._bytes -= self._sizes[project_id]
+        self._graphs[project_id] = graph
+        self._graphs.move_to_end(project_id)
+        self._sizes[project_id] = estimate_graph_bytes(graph)
+        self._bytes += self._sizes[project_id]
+        self._evict(keep=project_id)
+
+    def __delitem__(self, project_id: str) -> None:
+        del self._graphs[project_id]
+        self._bytes -= self._sizes.pop(project_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._graphs)
+
+    def __len__(self) -> int:
+        return len(self._graphs)
+
+    def clear(self) -> None:
+        self._graphs.clear()
+        self._sizes.clear()
+        self._bytes = 0
+
+    # --- Cache operations ---
+
+    def lookup(self, project_id: str) -> Graph | None:
+        """Get a cached graph, counting the hit or miss and refreshing recency."""
+        graph = self._graphs.get(project_id)
+        if graph is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._graphs.move_to_end(project_id)
+        return graph
+
+    def invalidate(self, project_id: str) -> bool:
+        """Drop a project's graph; returns True if one was cached."""
+        if project_id not in self._graphs:
+            return False
+        del self[project_id]
+        self.invalidations += 1
+        return True
+
+    def mark_updated(self, project_id: str) -> None:
+        """Record an in-place delta update: re-account size, drop derived caches."""
+        graph = self._graphs.get(project_id)
+        if graph is None:
+            return
+        invalidate_csr(graph)
+        graph.updated_at = datetime.utcnow()
+        self.delta_updates += 1
+        self._bytes -= self._sizes[project_id]
+        self._sizes[project_id] = estimate_graph_bytes(graph)
+        self._bytes += self._sizes[project_id]
+        self._evict(keep=project_id)
+
+    def _evict(self, keep: str | None = None) -> None:
+        while len(self._graphs) > 1 and (
+            self._bytes > self.max_bytes
+            or (self.max_graphs is not None and len(self._graphs) > self.max_graphs)
+        ):
+            project_id = next(p for p in self._graphs if p != keep)
+            del self[project_id]
+            self.evictions += 1
+            logger.debug(f"Evicted cached graph for project {project_id}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache occupancy and hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "graphs": len(self._graphs),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "max_graphs": self.max_graphs,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "delta_updates": self.delta_updates,
+        }
@@ -4,6 +4,10 @@ Causal graph analysis and inference.
 Provides tools for modeling cause-effect relationships, validating
 DAG structure, finding causal paths, identifying confounders, and
 estimating intervention effects using simplified do-calculus.
+
+Cycle detection, chain checks and confounder (common ancestor) lookups are
+answered from a ReachabilityIndex built once per causal edge set; see
+reachability.py.
 """
 
 from dataclasses import dataclass, field
@@ -13,6 +17,7 @@ from enum import Enum
 import logging
 
 from .models import Graph, GraphNode, GraphEdge
+from .reachability import get_reachability
 
 logger = logging.getLogger(__name__)
 
@@ -128,6 +133,7 @@ class CausalGraphEngine:
             "causes", "influences", "leads_to", "results_in",
             "precedes", "triggers", "enables"
         ]
+        causal_types = {t.lower() for t in causal_edge_types}
 
         nodes = []
         edges = []
@@ -146,7 +152,7 @@ class CausalGraphEngine:
         # Convert edges (only causal types)
         for edge in graph.edges:
             edge_type = (edge.relationship_type or edge.type or "related").lower()
-            if causal_edge_types and edge_type not in [t.lower() for t in causal_edge_types]:
+            if edge_type not in causal_types:
                 continue
 
             edges.append(CausalEdge(
@@ -166,6 +172,9 @@ class CausalGraphEngine:
             edges=edges,
         )
 
+        # Index reachability (reused while the source graph is unchanged)
+        get_reachability(causal_graph, source=graph, key=tuple(sorted(causal_types)))
+
         # Validate DAG structure
         is_valid, cycles = self.validate_dag(causal_graph)
         causal_graph.is_valid_dag = is_valid
@@ -177,50 +186,16 @@ class CausalGraphEngine:
         """
         Check if graph is a valid DAG (Directed Acyclic Graph).
 
+        Every strongly connected component with more than one node (or a
+        self-loop) is reported as one closed cycle.
+
         Args:
             graph: CausalGraph to validate
 
         Returns:
             Tuple of (is_valid, list_of_cycles)
         """
-        # Build adjacency list
-        adjacency: dict[str, list[str]] = defaultdict(list)
-        for edge in graph.edges:
-            adjacency[edge.cause].append(edge.effect)
-
-        # Detect cycles using DFS
-        cycles: list[list[str]] = []
-        visited: set[str] = set()
-        rec_stack: set[str] = set()
-        path: list[str] = []
-
-        def dfs(node: str) -> bool:
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-
-            for neighbor in adjacency[node]:
-                if neighbor not in visited:
-                    if dfs(neighbor):
-                        return True
-                elif neighbor in rec_stack:
-                    # Found cycle
-                    cycle_start = path.index(neighbor)
-                    cycles.append(path[cycle_start:] + [neighbor])
-                    return True
-
-            path.pop()
-            rec_stack.remove(node)
-            return False
-
-        # Check from all nodes
-        node_ids = [n.id for n in graph.nodes]
-        for node_id in node_ids:
-            if node_id not in visited:
-                path = []
-                rec_stack = set()
-                dfs(node_id)
-
+        cycles = get_reachability(graph).cycles()
         return len(cycles) == 0, cycles
 
     def find_causal_paths(
@@ -242,10 +217,16 @@ class CausalGraphEngine:
         Returns:
             List of CausalPath objects
         """
-        # Build adjacency list
+        index = get_reachability(graph)
+        if not index.reaches(cause, effect):
+            return []
+
+        # Only follow edges into nodes that can still reach the effect
+        can_reach = index.ancestors(effect) | {effect}
         adjacency: dict[str, list[CausalEdge]] = defaultdict(list)
         for edge in graph.edges:
-            adjacency[edge.cause].append(edge)
+            if edge.effect in can_reach:
+                adjacency[edge.cause].append(edge)
 
         paths: list[CausalPath] = []
 
@@ -381,42 +362,24 @@ class CausalGraphEngine:
         Returns:
             List of ConfounderInfo objects
         """
-        # Build adjacency lists
-        children: dict[str, set[str]] = defaultdict(set)
-        parents: dict[str, set[str]] = defaultdict(set)
+        index = get_reachability(graph)
 
-        for edge in graph.edges:
-            children[edge.cause].add(edge.effect)
-            parents[edge.effect].add(edge.cause)
-
-        # Find nodes on causal paths (to exclude)
-        causal_paths = self.find_causal_paths(graph, treatment, outcome)
-        nodes_on_causal_path = set()
-        for path in causal_paths:
-            nodes_on_causal_path.update(path.nodes)
-
-        # Find ancestors of treatment
-        treatment_ancestors = self._find_ancestors(treatment, parents)
-
-        # Find ancestors of outcome
-        outcome_ancestors = self._find_ancestors(outcome, parents)
-
-        # Confounders are common ancestors not on causal path
-        potential_confounders = treatment_ancestors & outcome_ancestors
-        potential_confounders -= nodes_on_causal_path
+        # Confounders are common ancestors not on a causal path
+        potential_confounders = index.common_ancestors(treatment, outcome)
+        potential_confounders -= index.between(treatment, outcome)
         potential_confounders -= {treatment, outcome}
 
         confounders: list[ConfounderInfo] = []
         node_map = {n.id: n for n in graph.nodes}
 
-        for conf_id in potential_confounders:
+        for conf_id in sorted(potential_confounders, key=index.index.__getitem__):
             node = node_map.get(conf_id)
             if not node:
                 continue
 
             # Find paths to treatment and outcome
-            path_to_treatment = self._find_path_to(conf_id, treatment, children)
-            path_to_outcome = self._find_path_to(conf_id, outcome, children)
+            path_to_treatment = index.path(conf_id, treatment)
+            path_to_outcome = index.path(conf_id, outcome)
 
             confounders.append(ConfounderInfo(
                 id=conf_id,
@@ -429,43 +392,28 @@ class CausalGraphEngine:
 
         return confounders
 
-    def _find_ancestors(self, node: str, parents: dict[str, set[str]]) -> set[str]:
-        """Find all ancestors of a node."""
-        ancestors = set()
-        queue = deque(parents[node])
-
-        while queue:
-            current = queue.popleft()
-            if current not in ancestors:
-                ancestors.add(current)
-                queue.extend(parents[current])
-
-        return ancestors
-
-    def _find_path_to(
-        self,
-        start: str,
-        end: str,
-        children: dict[str, set[str]],
-    ) -> list[str]:
-        """Find a path from start to end using BFS."""
-        if start == end:
-            return [start]
+    def chain_exists(self, graph: CausalGraph, cause: str, effect: str) -> bool:
+        """
+        Check whether any causal chain leads from cause to effect.
 
-        queue = deque([(start, [start])])
-        visited = {start}
+        Args:
+            graph: CausalGraph
+            cause: Source node ID
+            effect: Target node ID
 
-        while queue:
-            current, path = queue.popleft()
+        Returns:
+            True if effect is reachable from cause
+        """
+        return get_reachability(graph).reaches(cause, effect)
 
-            for child in children[current]:
-                if child == end:
-                    return path + [child]
-                if child not in visited:
-                    visited.add(child)
-                    queue.append((child, path + [child]))
+    def shortest_chain(self, graph: CausalGraph, cause: str, effect: str) -> list[str]:
+        """
+        Find one shortest causal chain from cause to effect.
 
-        return []
+        Returns:
+            Node IDs from cause to effect, or [] if there is no chain
+        """
+        return get_reachability(graph).path(cause, effect)
 
     def calculate_intervention_effect(
         self,
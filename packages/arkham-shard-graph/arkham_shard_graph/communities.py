@@ -0,0 +1,581 @@
+"""
+Community detection - vectorized Louvain with incremental refresh.
+
+Communities are found by Louvain modularity optimization over the graph's
+CSR arrays. Each local-moving sweep scores every (node, neighbouring
+community) pair at once with sort/bincount operations and moves a random
+half of the improving nodes, so no two neighbours keep swapping. Levels
+are aggregated into community super-nodes until nothing merges, and the
+result is refined Leiden-style by splitting communities that are not
+internally connected.
+
+Assignments are kept per project and resolution together with the graph
+version they were computed for (CommunityIndex, persisted in
+arkham_graph.communities). When the graph changes, communities whose
+internal weight or total strength moved are dissolved into singletons,
+every other community is collapsed into one super-node, and Louvain runs
+on that reduced graph only - so a refresh costs in proportion to the
+change, not to the graph.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+
+from .csr import CSRGraph, get_csr
+from .models import Community, Graph
+
+logger = logging.getLogger(__name__)
+
+# Full recompute when more than this fraction of nodes is affected
+FULL_REFRESH_FRACTION = 0.3
+
+_STAT_TOLERANCE = 1e-9
+
+
+# =============================================================================
+# Louvain
+# =============================================================================
+
+
+def modularity(csr: CSRGraph, labels: np.ndarray, resolution: float = 1.0) -> float:
+    """Newman modularity of a node labelling."""
+    return _modularity(csr.rows, csr.indices, csr.weights, labels, resolution)
+
+
+def _modularity(
+    rows: np.ndarray, cols: np.ndarray, w: np.ndarray, labels: np.ndarray, resolution: float
+) -> float:
+    m2 = w.sum()
+    if m2 == 0 or not labels.size:
+        return 0.0
+    size = int(labels.max()) + 1
+    internal = np.bincount(labels[rows], weights=w * (labels[rows] == labels[cols]), minlength=size)
+    total = np.bincount(labels[rows], weights=w, minlength=size)
+    return float(internal.sum() / m2 - resolution * np.square(total / m2).sum())
+
+
+def _merge_coo(
+    rows: np.ndarray, cols: np.ndarray, w: np.ndarray, n: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sum duplicate (row, col) entries."""
+    if not rows.size:
+        return rows, cols, w
+    keys, inverse = np.unique(rows * n + cols, return_inverse=True)
+    return keys // n, keys % n, np.bincount(inverse, weights=w)
+
+
+def _local_moves(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    w: np.ndarray,
+    n: int,
+    resolution: float,
+    rng: np.random.Generator,
+    movable: np.ndarray | None,
+    max_sweeps: int,
+    tolerance: float,
+) -> np.ndarray:
+    """One Louvain level: synchronous local moving from singletons."""
+    k = np.bincount(rows, weights=w, minlength=n)
+    m2 = k.sum()
+    comm = np.arange(n)
+    if m2 == 0:
+        return comm
+
+    off_diag = rows != cols
+    r, c0, ww = rows[off_diag], cols[off_diag], w[off_diag]
+
+    best_q = _modularity(rows, cols, w, comm, resolution)
+    best = comm.copy()
+    stale = 0
+    for _ in range(max_sweeps):
+        tot = np.bincount(comm, weights=k, minlength=n)
+
+        # Weight from each node to each neighbouring community
+        pr, pc, w_ic = _merge_coo(r, comm[c0], ww, n)
+        own = pc == comm[pr]
+        w_own = np.zeros(n)
+        w_own[pr[own]] = w_ic[own]
+
+        # Modularity gain of moving node i from its community a to b:
+        #   (w_ib - w_ia) - resolution * k_i * (tot_b - (tot_a - k_i)) / m2
+        gain = (w_ic - w_own[pr]) - resolution * k[pr] * (tot[pc] - (tot[comm[pr]] - k[pr])) / m2
+        gain[own] = -np.inf
+        if movable is not None:
+            gain[~movable[pr]] = -np.inf
+
+        # Best candidate per node: order by (node, -gain) and take each run's head
+        order = np.lexsort((-gain, pr))
+        heads = order[np.r_[True, pr[order][1:] != pr[order][:-1]]] if order.size else order
+        heads = heads[gain[heads] > tolerance]
+        if not heads.size:
+            break
+
+        # Move a random half so neighbours do not swap into each other
+        heads = heads[rng.random(heads.size) < 0.5] if heads.size > 1 else heads
+        comm[pr[heads]] = pc[heads]
+
+        q = _modularity(rows, cols, w, comm, resolution)
+        if q > best_q + tolerance:
+            best_q, best, stale = q, comm.copy(), 0
+        else:
+            stale += 1
+            if stale >= 3:
+                break
+    return best
+
+
+def _split_disconnected(rows: np.ndarray, cols: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Relabel so every community is internally connected."""
+    n = labels.size
+    intra = labels[rows] == labels[cols]
+    r, c = rows[intra], cols[intra]
+    component = np.arange(n)
+    while r.size:
+        nxt = component.copy()
+        np.minimum.at(nxt, r, component[c])
+        if np.array_equal(nxt, component):
+            break
+        component = nxt
+    return np.unique(component, return_inverse=True)[1]
+
+
+def louvain(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    w: np.ndarray,
+    n: int,
+    resolution: float = 1.0,
+    seed: int | None = 0,
+    movable: np.ndarray | None = None,
+    max_levels: int = 10,
+    max_sweeps: int = 32,
+    tolerance: float = 1e-9,
+) -> np.ndarray:
+    """
+    Louvain communities of a graph given as symmetric COO arrays.
+
+    Args:
+        rows, cols, w: Edge entries (both directions; self-loops allowed)
+        n: Node count
+        resolution: Higher values give smaller communities
+        seed: RNG seed for the move subsets
+        movable: Only these nodes may move at the first level
+        max_levels: Aggregation levels
+        max_sweeps: Local-moving sweeps per level
+
+    Returns:
+        Compact community label per node
+    """
+    rng = np.random.default_rng(seed)
+    labels = np.arange(n)
+    level_rows, level_cols, level_w, level_n = rows, cols, w, n
+
+    for _ in range(max_levels):
+        comm = _local_moves(
+            level_rows, level_cols, level_w, level_n,
+            resolution, rng, movable, max_sweeps, tolerance,
+        )
+        comm = np.unique(comm, return_inverse=True)[1]
+        count = int(comm.max()) + 1 if comm.size else 0
+        labels = comm[labels]
+        if count == level_n:
+            break
+
+        if movable is not None:
+            # A super-node may move if any of its members could
+            movable = np.bincount(comm, weights=movable, minlength=count) > 0
+        level_rows, level_cols, level_w = _merge_coo(comm[level_rows], comm[level_cols], level_w, count)
+        level_n = count
+
+    return _split_disconnected(rows, cols, labels)
+
+
+# =============================================================================
+# Assignments
+# =============================================================================
+
+
+@dataclass
+class CommunityAssignment:
+    """Community labels for one graph version."""
+    project_id: str
+    resolution: float
+    version: int
+    labels: dict[str, int]
+    modularity: float = 0.0
+    # label -> (internal weight, total strength), used to detect changes
+    stats: dict[int, tuple[float, float]] = field(default_factory=dict)
+    mode: str = "full"  # "full", "incremental" or "cached"
+    computed_at: datetime = field(default_factory=datetime.utcnow)
+
+    def to_record(self) -> dict[str, Any]:
+        """Database row parameters."""
+        return {
+            "project_id": self.project_id,
+            "resolution": self.resolution,
+            "version": self.version,
+            "modularity": self.modularity,
+            "assignments": json.dumps(self.labels),
+            "stats": json.dumps({str(c): list(s) for c, s in self.stats.items()}),
+            "computed_at": self.computed_at,
+        }
+
+    @classmethod
+    def from_record(cls, row: dict[str, Any]) -> "CommunityAssignment":
+        labels = row["assignments"]
+        stats = row["stats"]
+        if isinstance(labels, str):
+            labels = json.loads(labels)
+        if isinstance(stats, str):
+            stats = json.loads(stats)
+        return cls(
+            project_id=row["project_id"],
+            resolution=float(row["resolution"]),
+            version=row["version"],
+            labels={node_id: int(c) for node_id, c in labels.items()},
+            modularity=float(row["modularity"] or 0.0),
+            stats={int(c): (float(s[0]), float(s[1])) for c, s in stats.items()},
+            mode="cached",
+            computed_at=row.get("computed_at") or datetime.utcnow(),
+        )
+
+
+def _community_stats(csr: CSRGraph, labels: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Internal weight and total strength per label."""
+    size = int(labels.max()) + 1 if labels.size else 0
+    lr = labels[csr.rows]
+    same = lr == labels[csr.indices]
+    internal = np.bincount(lr, weights=csr.weights * same, minlength=size)
+    total = np.bincount(lr, weights=csr.weights, minlength=size)
+    return internal, total
+
+
+def _assignment(
+    graph: Graph, csr: CSRGraph, labels: np.ndarray, resolution: float, mode: str
+) -> CommunityAssignment:
+    internal, total = _community_stats(csr, labels)
+    return CommunityAssignment(
+        project_id=graph.project_id,
+        resolution=resolution,
+        version=graph.version,
+        labels={node_id: int(c) for node_id, c in zip(csr.node_ids, labels)},
+        modularity=modularity(csr, labels, resolution),
+        stats={int(c): (float(internal[c]), float(total[c])) for c in np.unique(labels)},
+        mode=mode,
+    )
+
+
+def detect_communities(graph: Graph, resolution: float = 1.0, seed: int | None = 0) -> CommunityAssignment:
+    """Compute communities for a graph from scratch."""
+    csr = get_csr(graph)
+    labels = louvain(csr.rows, csr.indices, csr.weights, csr.n, resolution=resolution, seed=seed)
+    return _assignment(graph, csr, labels, resolution, "full")
+
+
+def affected_nodes(csr: CSRGraph, previous: CommunityAssignment) -> np.ndarray:
+    """
+    Nodes whose community must be re-optimized after the graph changed.
+
+    A node is affected if it is new or its previous community's internal
+    weight or total strength no longer matches what was recorded - which
+    is the case for any added, removed or re-weighted edge touching it.
+    """
+    labels = np.array([previous.labels.get(node_id, -1) for node_id in csr.node_ids], dtype=np.int64)
+    affected = labels < 0
+    known = np.flatnonzero(~affected)
+    if not known.size:
+        return affected
+
+    # Compact the old labels so stats line up with bincount output
+    old, compact = np.unique(labels[known], return_inverse=True)
+    scratch = np.full(csr.n, old.size, dtype=np.int64)  # new nodes share one spare label
+    scratch[known] = compact
+    internal, total = _community_stats(csr, scratch)
+
+    changed = np.zeros(old.size + 1, dtype=bool)
+    changed[old.size] = True
+    for i, c in enumerate(old):
+        stored = previous.stats.get(int(c))
+        if (
+            stored is None
+            or abs(stored[0] - internal[i]) > _STAT_TOLERANCE * max(1.0, stored[0])
+            or abs(stored[1] - total[i]) > _STAT_TOLERANCE * max(1.0, stored[1])
+        ):
+            changed[i] = True
+
+    # Communities that lost members to deletion show up as a smaller total
+    return affected | changed[scratch]
+
+
+def refresh_communities(
+    graph: Graph,
+    previous: CommunityAssignment,
+    seed: int | None = 0,
+) -> CommunityAssignment:
+    """
+    Bring an assignment up to date with a changed graph.
+
+    Unaffected communities are collapsed into super-nodes and keep their
+    labels; only members of affected communities are re-optimized. Falls
+    back to a full recompute when too much of the graph changed.
+    """
+    csr = get_csr(graph)
+    resolution = previous.resolution
+    affected = affected_nodes(csr, previous)
+
+    old = np.array([previous.labels.get(node_id, -1) for node_id in csr.node_ids], dtype=np.int64)
+    if not affected.any():
+        return _assignment(graph, csr, old, resolution, "incremental")
+    if affected.sum() > FULL_REFRESH_FRACTION * csr.n:
+        return detect_communities(graph, resolution=resolution, seed=seed)
+
+    # Seed: unaffected nodes keep their community, affected nodes are singletons
+    kept_labels, kept = np.unique(old[~affected], return_inverse=True)
+    seed_labels = np.empty(csr.n, dtype=np.int64)
+    seed_labels[~affected] = kept
+    seed_labels[affected] = kept_labels.size + np.arange(int(affected.sum()))
+    count = kept_labels.size + int(affected.sum())
+
+    rows, cols, w = _merge_coo(seed_labels[csr.rows], seed_labels[csr.indices], csr.weights, count)
+    movable = np.zeros(count, dtype=bool)
+    movable[kept_labels.size:] = True
+    reduced = louvain(rows, cols, w, count, resolution=resolution, seed=seed, movable=movable)
+    labels = reduced[seed_labels]
+
+    # Keep previous labels for communities built around an unaffected one,
+    # then for re-formed ones by largest overlap with an old community
+    final = np.full(int(labels.max()) + 1, -1, dtype=np.int64)
+    for super_node, old_label in enumerate(kept_labels):
+        if final[reduced[super_node]] < 0:
+            final[reduced[super_node]] = old_label
+    taken = set(final[final >= 0].tolist())
+    moved = affected & (old >= 0)
+    pairs, overlap = np.unique(np.stack([labels[moved], old[moved]]), axis=1, return_counts=True)
+    for i in np.argsort(-overlap, kind="stable"):
+        new_label, old_label = int(pairs[0, i]), int(pairs[1, i])
+        if final[new_label] < 0 and old_label not in taken:
+            final[new_label] = old_label
+            taken.add(old_label)
+    next_label = int(max(previous.stats, default=-1)) + 1
+    next_label = max(next_label, int(kept_labels.max()) + 1 if kept_labels.size else 0)
+    for c in np.flatnonzero(final < 0):
+        final[c] = next_label
+        next_label += 1
+
+    logger.debug(
+        f"Refreshed communities for {graph.project_id}: "
+        f"{int(affected.sum())}/{csr.n} nodes re-optimized"
+    )
+    return _assignment(graph, csr, final[labels], resolution, "incremental")
+
+
+def build_communities(
+    graph: Graph, assignment: CommunityAssignment, min_community_size: int = 3
+) -> list[Community]:
+    """Community objects (largest first) for an assignment."""
+    csr = get_csr(graph)
+    if not csr.n or not assignment.labels:
+        return []
+
+    labels = np.array([assignment.labels.get(node_id, -1) for node_id in csr.node_ids], dtype=np.int64)
+    assigned = labels >= 0
+    uniq, compact = np.unique(labels[assigned], return_inverse=True)
+    index = np.full(csr.n, uniq.size, dtype=np.int64)
+    index[assigned] = compact
+
+    lr, lc = index[csr.rows], index[csr.indices]
+    same = lr == lc
+    internal_entries = np.bincount(lr[same], minlength=uniq.size + 1)
+    external_entries = np.bincount(lr[~same], minlength=uniq.size + 1)
+    internal_weight = np.bincount(lr, weights=csr.weights * same, minlength=uniq.size + 1)
+    total_weight = np.bincount(lr, weights=csr.weights, minlength=uniq.size + 1)
+    sizes = np.bincount(index, minlength=uniq.size + 1)
+    m2 = csr.weights.sum()
+
+    members: dict[int, list[str]] = {}
+    for node_id, c in zip(csr.node_ids, index):
+        members.setdefault(int(c), []).append(node_id)
+
+    communities = []
+    for c in np.argsort(-sizes[:uniq.size], kind="stable"):
+        size = int(sizes[c])
+        if size < min_community_size:
+            continue
+        max_entries = size * (size - 1)
+        contribution = (
+            internal_weight[c] / m2 - assignment.resolution * (total_weight[c] / m2) ** 2
+            if m2 > 0 else 0.0
+        )
+        communities.append(
+            Community(
+                id=f"comm_{int(uniq[c])}",
+                entity_ids=members[int(c)],
+                size=size,
+                density=float(internal_entries[c] / max_entries) if max_entries else 0.0,
+                modularity_contribution=float(contribution),
+                internal_edges=int(internal_entries[c]) // 2,
+                external_edges=int(external_entries[c]),
+            )
+        )
+    return communities
+
+
+# =============================================================================
+# Persistence
+# =============================================================================
+
+
+COMMUNITY_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS arkham_graph.communities (
+        project_id TEXT NOT NULL,
+        resolution DOUBLE PRECISION NOT NULL,
+        version INTEGER NOT NULL DEFAULT 0,
+        modularity REAL DEFAULT 0,
+        assignments JSONB NOT NULL DEFAULT '{}',
+        stats JSONB NOT NULL DEFAULT '{}',
+        computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (project_id, resolution)
+    )
+    """,
+]
+
+
+class CommunityIndex:
+    """
+    Community assignments per project and resolution.
+
+    Results are held in memory and, once initialize() has created the
+    table, persisted with the graph version they describe. A request for
+    the current version is answered from the stored result; a request
+    after the graph changed refreshes it incrementally.
+    """
+
+    def __init__(self, db_service=None, seed: int | None = 0):
+        """
+        Initialize community index.
+
+        Args:
+            db_service: Database service for persistence
+            seed: RNG seed for Louvain move subsets
+        """
+        self.db_service = db_service
+        self.seed = seed
+        self.ready = False
+        self._assignments: dict[tuple[str, float], CommunityAssignment] = {}
+
+    async def initialize(self) -> bool:
+        """Create the communities table. Returns True if persistence is usable."""
+        if not self.db_service:
+            return False
+
+        try:
+            await self.db_service.execute("CREATE SCHEMA IF NOT EXISTS arkham_graph")
+            for statement in COMMUNITY_DDL:
+                await self.db_service.execute(statement)
+        except Exception as e:
+            logger.warning(f"Community persistence unavailable, keeping results in memory: {e}")
+            return False
+
+        self.ready = True
+        return True
+
+    async def get_assignment(
+        self, graph: Graph, resolution: float = 1.0, recompute: bool = False
+    ) -> CommunityAssignment:
+        """
+        Communities for the graph's current version.
+
+        Args:
+            graph: Graph to partition
+            resolution: Louvain resolution
+            recompute: Ignore stored results and start from scratch
+
+        Returns:
+            CommunityAssignment (mode tells how it was obtained)
+        """
+        key = (graph.project_id, float(resolution))
+        previous = None if recompute else self._assignments.get(key) or await self._load(*key)
+
+        if (
+            previous is not None
+            and previous.version == graph.version
+            and len(previous.labels) == len(graph.nodes)
+        ):
+            previous.mode = "cached"
+            self._assignments[key] = previous
+            return previous
+
+        if previous is not None:
+            assignment = refresh_communities(graph, previous, seed=self.seed)
+        else:
+            assignment = detect_communities(graph, resolution=resolution, seed=self.seed)
+
+        self._assignments[key] = assignment
+        await self._save(assignment)
+        logger.info(
+            f"Communities for {graph.project_id} v{graph.version} ({assignment.mode}): "
+            f"modularity {assignment.modularity:.3f}"
+        )
+        return assignment
+
+    async def get_communities(
+        self,
+        graph: Graph,
+        resolution: float = 1.0,
+        min_community_size: int = 3,
+        recompute: bool = False,
+    ) -> tuple[list[Community], CommunityAssignment]:
+        """Community objects and the assignment they came from."""
+        assignment = await self.get_assignment(graph, resolution, recompute)
+        return build_communities(graph, assignment, min_community_size), assignment
+
+    def invalidate(self, project_id: str) -> None:
+        """Forget in-memory results for a project (stored rows are kept)."""
+        for key in [k for k in self._assignments if k[0] == project_id]:
+            del self._assignments[key]
+
+    async def _load(self, project_id: str, resolution: float) -> CommunityAssignment | None:
+        if not self.ready:
+            return None
+        try:
+            row = await self.db_service.fetch_one(
+                """
+                SELECT project_id, resolution, version, modularity, assignments, stats, computed_at
+                FROM arkham_graph.communities
+                WHERE project_id = :project_id AND resolution = :resolution
+                """,
+                {"project_id": project_id, "resolution": resolution},
+            )
+        except Exception as e:
+            logger.warning(f"Could not load communities for {project_id}: {e}")
+            return None
+        return CommunityAssignment.from_record(dict(row)) if row else None
+
+    async def _save(self, assignment: CommunityAssignment) -> None:
+        if not self.ready:
+            return
+        try:
+            await self.db_service.execute(
+                """
+                INSERT INTO arkham_graph.communities
+                    (project_id, resolution, version, modularity, assignments, stats, computed_at)
+                VALUES (:project_id, :resolution, :version, :modularity,
+                        CAST(:assignments AS jsonb), CAST(:stats AS jsonb), :computed_at)
+                ON CONFLICT (project_id, resolution) DO UPDATE SET
+                    version = EXCLUDED.version,
+                    modularity = EXCLUDED.modularity,
+                    assignments = EXCLUDED.assignments,
+                    stats = EXCLUDED.stats,
+                    computed_at = EXCLUDED.computed_at
+                """,
+                assignment.to_record(),
+            )
+        except Exception as e:
+            logger.warning(f"Could not persist communities for {assignment.project_id}: {e}")
@@ -0,0 +1,460 @@
+"""
+Co-occurrence index - materialized entity-pair weights.
+
+Pairs of canonical entities mentioned in the same document are kept in
+arkham_graph.cooccurrences, one row per (pair, document) tagged with the
+narrowest window they share (same chunk, same page or just the same
+document). arkham_graph.cooccurrence_pairs aggregates those rows per pair,
+so graph building reads pre-aggregated edges instead of self-joining the
+entities table.
+
+Both are maintained a document at a time: the graph shard reindexes a
+parsed document's pairs in one statement when entities.batch.created
+arrives, and documents that predate the index (or were missed) are picked
+up by a background backfill. Documents missing from cooccurrence_documents
+are still counted by GraphBuilder, straight from the entities table.
+"""
+
+import asyncio
+import logging
+from typing import Any
+
+from .models import RelationshipType
+
+logger = logging.getLogger(__name__)
+
+# Window levels, narrowest first, and the weight one document contributes
+# to a pair's window_weight when that is the narrowest window shared
+WINDOW_CHUNK = 0
+WINDOW_PAGE = 1
+WINDOW_DOCUMENT = 2
+
+WINDOW_WEIGHTS = {
+    WINDOW_CHUNK: 1.0,
+    WINDOW_PAGE: 0.5,
+    WINDOW_DOCUMENT: 0.25,
+}
+
+_WINDOW_WEIGHT_SQL = (
+    f"CASE window_level WHEN {WINDOW_CHUNK} THEN {WINDOW_WEIGHTS[WINDOW_CHUNK]} "
+    f"WHEN {WINDOW_PAGE} THEN {WINDOW_WEIGHTS[WINDOW_PAGE]} "
+    f"ELSE {WINDOW_WEIGHTS[WINDOW_DOCUMENT]} END"
+)
+
+# Pairs are generated from the canonical mentions of one document; the
+# window is the narrowest one both mentions share.
+_DOCUMENT_PAIRS_SQL = f"""
+        SELECT LEAST(a.id, b.id)::text AS entity_a,
+               GREATEST(a.id, b.id)::text AS entity_b,
+               a.document_id::text AS document_id,
+               CASE
+                   WHEN a.chunk_id IS NOT NULL AND a.chunk_id = b.chunk_id THEN {WINDOW_CHUNK}
+                   WHEN ca.page_number IS NOT NULL AND ca.page_number = cb.page_number THEN {WINDOW_PAGE}
+                   ELSE {WINDOW_DOCUMENT}
+               END AS window_level
+        FROM arkham_frame.entities a
+        JOIN arkham_frame.entities b
+            ON b.document_id = a.document_id AND b.id <> a.id AND b.canonical_id IS NULL
+        LEFT JOIN arkham_frame.chunks ca ON ca.id = a.chunk_id
+        LEFT JOIN arkham_frame.chunks cb ON cb.id = b.chunk_id
+"""
+
+COOCCURRENCE_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS arkham_graph.cooccurrences (
+        entity_a TEXT NOT NULL,
+        entity_b TEXT NOT NULL,
+        document_id TEXT NOT NULL,
+        window_level SMALLINT NOT NULL,
+        PRIMARY KEY (entity_a, entity_b, document_id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_graph_cooccurrences_document
+    ON arkham_graph.cooccurrences(document_id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS arkham_graph.cooccurrence_pairs (
+        entity_a TEXT NOT NULL,
+        entity_b TEXT NOT NULL,
+        document_count INTEGER NOT NULL,
+        chunk_count INTEGER NOT NULL,
+        page_count INTEGER NOT NULL,
+        window_weight REAL NOT NULL,
+        document_ids TEXT[] NOT NULL,
+        PRIMARY KEY (entity_a, entity_b)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_graph_cooccurrence_pairs_b
+    ON arkham_graph.cooccurrence_pairs(entity_b)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS arkham_graph.cooccurrence_documents (
+        document_id TEXT PRIMARY KEY
+    )
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION arkham_graph.cooc_refresh_pairs(p_a TEXT[], p_b TEXT[])
+    RETURNS void AS $$
+    BEGIN
+        INSERT INTO arkham_graph.cooccurrence_pairs AS cp
+            (entity_a, entity_b, document_count, chunk_count, page_count, window_weight, document_ids)
+        SELECT c.entity_a, c.entity_b,
+               COUNT(*),
+               COUNT(*) FILTER (WHERE c.window_level = {WINDOW_CHUNK}),
+               COUNT(*) FILTER (WHERE c.window_level <= {WINDOW_PAGE}),
+               SUM({_WINDOW_WEIGHT_SQL}),
+               array_agg(c.document_id ORDER BY c.document_id)
+        FROM arkham_graph.cooccurrences c
+        JOIN (SELECT DISTINCT * FROM unnest(p_a, p_b) AS t(a, b)) AS k
+            ON c.entity_a = k.a AND c.entity_b = k.b
+        GROUP BY c.entity_a, c.entity_b
+        ORDER BY c.entity_a, c.entity_b
+        ON CONFLICT (entity_a, entity_b) DO UPDATE SET
+            document_count = EXCLUDED.document_count,
+            chunk_count = EXCLUDED.chunk_count,
+            page_count = EXCLUDED.page_count,
+            window_weight = EXCLUDED.window_weight,
+            document_ids = EXCLUDED.document_ids;
+
+        DELETE FROM arkham_graph.cooccurrence_pairs cp
+        USING unnest(p_a, p_b) AS k(a, b)
+        WHERE cp.entity_a = k.a AND cp.entity_b = k.b
+          AND NOT EXISTS (
+              SELECT 1 FROM arkham_graph.cooccurrences c
+              WHERE c.entity_a = k.a AND c.entity_b = k.b
+          );
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION arkham_graph.cooc_index_documents(p_document_ids TEXT[])
+    RETURNS void AS $$
+    DECLARE
+        v_docs TEXT[];
+        v_a TEXT[];
+        v_b TEXT[];
+    BEGIN
+        SELECT array_agg(DISTINCT d ORDER BY d) INTO v_docs
+        FROM unnest(p_document_ids) AS d
+        WHERE d IS NOT NULL;
+        IF v_docs IS NULL THEN
+            RETURN;
+        END IF;
+
+        -- Concurrent reindexes of the same document queue up here; taken
+        -- in sorted order so overlapping batches cannot deadlock
+        PERFORM pg_advisory_xact_lock(hashtext('arkham_graph.cooccurrences'), hashtext(d))
+        FROM unnest(v_docs) AS d;
+
+        INSERT INTO arkham_graph.cooccurrence_documents (document_id)
+        SELECT unnest(v_docs)
+        ON CONFLICT (document_id) DO NOTHING;
+
+        WITH removed AS (
+            DELETE FROM arkham_graph.cooccurrences
+            WHERE document_id = ANY(v_docs)
+            RETURNING entity_a, entity_b
+        )
+        SELECT array_agg(entity_a), array_agg(entity_b) INTO v_a, v_b FROM removed;
+
+        WITH added AS (
+            INSERT INTO arkham_graph.cooccurrences AS c (entity_a, entity_b, document_id, window_level)
+            SELECT p.entity_a, p.entity_b, p.document_id, MIN(p.window_level)
+            FROM ({_DOCUMENT_PAIRS_SQL}
+                WHERE a.document_id = ANY(v_docs) AND a.canonical_id IS NULL AND a.id < b.id
+            ) AS p
+            GROUP BY p.entity_a, p.entity_b, p.document_id
+            ORDER BY p.entity_a, p.entity_b, p.document_id
+            ON CONFLICT (entity_a, entity_b, document_id) DO UPDATE SET
+                window_level = LEAST(c.window_level, EXCLUDED.window_level)
+            RETURNING entity_a, entity_b
+        )
+        SELECT COALESCE(v_a, '{{}}') || array_agg(entity_a), COALESCE(v_b, '{{}}') || array_agg(entity_b)
+        INTO v_a, v_b FROM added;
+
+        IF v_a IS NOT NULL THEN
+            PERFORM arkham_graph.cooc_refresh_pairs(v_a, v_b);
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION arkham_graph.cooc_remove_documents(p_document_ids TEXT[])
+    RETURNS void AS $$
+    DECLARE
+        v_a TEXT[];
+        v_b TEXT[];
+    BEGIN
+        DELETE FROM arkham_graph.cooccurrence_documents
+        WHERE document_id = ANY(p_document_ids);
+
+        WITH removed AS (
+            DELETE FROM arkham_graph.cooccurrences
+            WHERE document_id = ANY(p_document_ids)
+            RETURNING entity_a, entity_b
+        )
+        SELECT array_agg(entity_a), array_agg(entity_b) INTO v_a, v_b FROM removed;
+
+        IF v_a IS NOT NULL THEN
+            PERFORM arkham_graph.cooc_refresh_pairs(v_a, v_b);
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    # Earlier versions kept the index current with a per-row trigger on
+    # arkham_frame.entities; it is replaced by event-driven batches
+    """
+    DO $$
+    BEGIN
+        IF to_regclass('arkham_frame.entities') IS NOT NULL THEN
+            DROP TRIGGER IF EXISTS trg_graph_cooccurrences ON arkham_frame.entities;
+        END IF;
+    END;
+    $$
+    """,
+    "DROP FUNCTION IF EXISTS arkham_graph.cooc_entity_trigger()",
+    "DROP FUNCTION IF EXISTS arkham_graph.cooc_add_mention(TEXT, TEXT)",
+    "DROP FUNCTION IF EXISTS arkham_graph.cooc_remove_mention(TEXT, TEXT)",
+    "DROP FUNCTION IF EXISTS arkham_graph.cooc_index_document(TEXT)",
+]
+
+# Ranks every pair from both endpoints; a pair is kept if it is among the
+# :top_n strongest edges of either one
+_TOP_N_SQL = """
+    ranked AS (
+        SELECT p.entity_a, p.entity_b,
+               ROW_NUMBER() OVER (PARTITION BY v.node ORDER BY p.window_weight DESC, v.other) AS node_rank
+        FROM pairs p
+        CROSS JOIN LATERAL (VALUES (p.entity_a, p.entity_b), (p.entity_b, p.entity_a)) AS v(node, other)
+        WHERE CAST(:top_n AS integer) IS NOT NULL
+    ),
+    kept AS (
+        SELECT entity_a, entity_b
+        FROM ranked
+        GROUP BY entity_a, entity_b
+        HAVING MIN(node_rank) <= CAST(:top_n AS integer)
+    )
+    SELECT p.entity_a, p.entity_b, p.document_count, p.chunk_count, p.page_count,
+           p.window_weight, p.document_ids
+    FROM pairs p
+    WHERE CAST(:top_n AS integer) IS NULL
+       OR (p.entity_a, p.entity_b) IN (SELECT entity_a, entity_b FROM kept)
+"""
+
+# Pairs among :entity_ids, optionally pruned to each node's top :top_n
+# edges by window weight
+PAIRS_SQL = f"""
+    WITH pairs AS (
+        SELECT entity_a, entity_b, document_count, chunk_count, page_count,
+               window_weight, document_ids
+        FROM arkham_graph.cooccurrence_pairs
+        WHERE entity_a = ANY(:entity_ids)
+          AND entity_b = ANY(:entity_ids)
+          AND document_count >= :min_count
+    ),
+{_TOP_N_SQL}"""
+
+# Same as PAIRS_SQL, but aggregated only over :document_ids
+SCOPED_PAIRS_SQL = f"""
+    WITH pairs AS (
+        SELECT entity_a, entity_b,
+               COUNT(*) AS document_count,
+               COUNT(*) FILTER (WHERE window_level = {WINDOW_CHUNK}) AS chunk_count,
+               COUNT(*) FILTER (WHERE window_level <= {WINDOW_PAGE}) AS page_count,
+               SUM({_WINDOW_WEIGHT_SQL}) AS window_weight,
+               array_agg(document_id ORDER BY document_id) AS document_ids
+        FROM arkham_graph.cooccurrences
+        WHERE document_id = ANY(:document_ids)
+          AND entity_a = ANY(:entity_ids)
+          AND entity_b = ANY(:entity_ids)
+        GROUP BY entity_a, entity_b
+        HAVING COUNT(*) >= :min_count
+    ),
+{_TOP_N_SQL}"""
+
+
+class CooccurrenceIndex:
+    """
+    Materialized co-occurrence edges for graph building.
+
+    initialize() creates the tables and starts a background backfill of
+    documents that predate them; until the backfill finishes, ready is
+    False and GraphBuilder falls back to deriving co-occurrences from the
+    entities table directly.
+    """
+
+    def __init__(self, db_service=None):
+        """
+        Initialize co-occurrence index.
+
+        Args:
+            db_service: Database service for queries
+        """
+        self.db_service = db_service
+        self.ready = False
+        self._available = False
+        self._backfill_task: asyncio.Task | None = None
+
+    async def initialize(self, backfill_batch: int = 200) -> bool:
+        """
+        Create the index and start backfilling documents not yet covered.
+
+        Safe to call on every startup: DDL is idempotent and the backfill
+        only touches documents missing from cooccurrence_documents. The
+        backfill runs as a background task so shard startup does not wait
+        on it.
+
+        Returns:
+            True if the index was created
+        """
+        if not self.db_service:
+            return False
+
+        try:
+            await self.db_service.execute("CREATE SCHEMA IF NOT EXISTS arkham_graph")
+            for statement in COOCCURRENCE_DDL:
+                await self.db_service.execute(statement)
+        except Exception as e:
+            logger.warning(f"Co-occurrence index unavailable, using direct queries: {e}")
+            return False
+
+        self._available = True
+        self._backfill_task = asyncio.create_task(self._run_backfill(backfill_batch))
+        return True
+
+    async def shutdown(self) -> None:
+        """Stop a running backfill."""
+        task, self._backfill_task = self._backfill_task, None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run_backfill(self, batch_size: int) -> None:
+        indexed = await self.backfill(batch_size=batch_size)
+        if indexed is None:
+            return
+        if indexed:
+            logger.info(f"Co-occurrence index backfilled {indexed} documents")
+        self.ready = True
+
+    async def backfill(self, batch_size: int = 200) -> int | None:
+        """
+        Index documents missing from the index.
+
+        Returns:
+            Documents indexed, or None if the backfill failed part way
+        """
+        total = 0
+        try:
+            while True:
+                rows = await self.db_service.fetch_all(
+                    """
+                    SELECT DISTINCT e.document_id::text AS document_id
+                    FROM arkham_frame.entities e
+                    WHERE e.canonical_id IS NULL
+                      AND NOT EXISTS (
+                          SELECT 1 FROM arkham_graph.cooccurrence_documents d
+                          WHERE d.document_id = e.document_id::text
+                      )
+                    LIMIT :limit
+                    """,
+                    {"limit": batch_size},
+                )
+                if not rows:
+                    return total
+                await self.index_documents([row["document_id"] for row in rows])
+                total += len(rows)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Co-occurrence backfill stopped after {total} documents: {e}")
+            return None
+
+    async def index_documents(self, document_ids: list[str]) -> None:
+        """Rebuild the pairs of a batch of documents in one statement."""
+        if not self._available or not document_ids:
+            return
+        await self.db_service.execute(
+            "SELECT arkham_graph.cooc_index_documents(CAST(:document_ids AS text[]))",
+            {"document_ids": list(document_ids)},
+        )
+
+    async def reindex_document(self, document_id: str) -> None:
+        """Rebuild one document's pairs (e.g. after its chunks changed pages)."""
+        await self.index_documents([document_id])
+
+    async def reindex_entities(self, entity_ids: list[str]) -> None:
+        """Rebuild the pairs of every document mentioning these entities."""
+        if not self._available or not entity_ids:
+            return
+        rows = await self.db_service.fetch_all(
+            """
+            SELECT DISTINCT document_id::text AS document_id
+            FROM arkham_frame.entities
+            WHERE id = ANY(:entity_ids)
+            """,
+            {"entity_ids": list(entity_ids)},
+        )
+        await self.index_documents([row["document_id"] for row in rows])
+
+    async def remove_documents(self, document_ids: list[str]) -> None:
+        """Drop the pairs contributed by deleted documents."""
+        if not self._available or not document_ids:
+            return
+        await self.db_service.execute(
+            "SELECT arkham_graph.cooc_remove_documents(CAST(:document_ids AS text[]))",
+            {"document_ids": list(document_ids)},
+        )
+
+    async def get_pairs(
+        self,
+        entity_ids: list[str],
+        document_ids: list[str] | None = None,
+        min_count: int = 1,
+        top_n: int | None = None,
+    ) -> dict[tuple[str, str], dict[str, Any]]:
+        """
+        Get co-occurrence edges among a set of entities.
+
+        Args:
+            entity_ids: Entities to connect
+            document_ids: Only count co-occurrences in these documents
+            min_count: Minimum number of shared documents
+            top_n: Keep at most this many strongest edges per node
+
+        Returns:
+            Dictionary mapping (entity_a, entity_b) to co-occurrence data,
+            in the shape GraphBuilder._build_edges expects
+        """
+        if not entity_ids:
+            return {}
+
+        params: dict[str, Any] = {
+            "entity_ids": entity_ids,
+            "min_count": min_count,
+            "top_n": top_n,
+        }
+        if document_ids:
+            params["document_ids"] = document_ids
+            rows = await self.db_service.fetch_all(SCOPED_PAIRS_SQL, params)
+        else:
+            rows = await self.db_service.fetch_all(PAIRS_SQL, params)
+
+        return {
+            (row["entity_a"], row["entity_b"]): {
+                "count": row["document_count"],
+                "document_ids": list(row["document_ids"] or []),
+                "relationship_type": RelationshipType.MENTIONED_WITH.value,
+                "properties": {
+                    "window_weight": float(row["window_weight"]),
+                    "same_chunk_count": row["chunk_count"],
+                    "same_page_count": row["page_count"],
+                },
+            }
+            for row in rows
+        }
@@ -3,18 +3,42 @@ Geospatial graph analysis.
 
 Provides tools for extracting geographic coordinates from entities,
 calculating distances, and preparing data for map-based visualization.
+
+Distance work is vectorized with numpy. Radius clustering, nearest-node
+lookups and bounding-box filters go through GeoIndex, a grid of
+latitude/longitude cells, so they only measure distances to nodes in
+nearby cells instead of comparing every pair of nodes.
 """
 
 from dataclasses import dataclass, field
 from typing import Any
-from math import radians, sin, cos, sqrt, atan2
+from math import radians, sin, cos, sqrt, atan2, asin, ceil, degrees, floor
 import re
 import logging
 
+import numpy as np
+
 from .models import Graph, GraphNode, GraphEdge
 
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_KM = 6371.0
+
+# Grid cell size when no query radius suggests one
+DEFAULT_CELL_KM = 50.0
+
+
+def haversine_km(
+    lat1: np.ndarray | float,
+    lng1: np.ndarray | float,
+    lat2: np.ndarray | float,
+    lng2: np.ndarray | float,
+) -> np.ndarray:
+    """Great-circle distance in km between coordinate arrays (degrees)."""
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
 
 @dataclass
 class GeoCoordinate:
@@ -96,11 +120,143 @@ class GeoGraphData:
     total_distance_km: float = 0.0
 
 
+class GeoIndex:
+    """
+    Grid index over node coordinates.
+
+    Nodes are bucketed into cells of roughly cell_km on a side (in
+    latitude) and kept sorted by cell key, so the nodes of one row of
+    cells are a contiguous slice found by binary search. A radius query
+    visits the rows and longitude span the circle can touch - wrapping
+    at the antimeridian and widening to full rows near the poles - and
+    measures distances only for the nodes found there.
+    """
+
+    def __init__(self, geo_nodes: list[GeoNode], cell_km: float = DEFAULT_CELL_KM):
+        """
+        Build the index.
+
+        Args:
+            geo_nodes: Nodes with coordinates
+            cell_km: Grid cell size; about the typical query radius works best
+        """
+        self.nodes = geo_nodes
+        self.lat = np.array([n.latitude for n in geo_nodes], dtype=np.float64)
+        self.lng = np.array([n.longitude for n in geo_nodes], dtype=np.float64)
+
+        self.cell_km = max(cell_km, 0.1)
+        self.cell_deg = degrees(self.cell_km / EARTH_RADIUS_KM)
+        self.n_rows = ceil(180.0 / self.cell_deg) + 1
+        self.n_cols = ceil(360.0 / self.cell_deg) + 1
+
+        keys = self._row(self.lat) * self.n_cols + self._col(self.lng)
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def _row(self, lat):
+        return np.floor((np.asarray(lat) + 90.0) / self.cell_deg).astype(np.int64)
+
+    def _col(self, lng):
+        return np.floor((np.asarray(lng) + 180.0) / self.cell_deg).astype(np.int64)
+
+    def _candidates(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        """Indices of nodes in cells a circle of radius_km may overlap."""
+        angle = radius_km / EARTH_RADIUS_KM
+        if angle >= np.pi / 2:
+            return np.arange(len(self.nodes))
+
+        dlat = degrees(angle)
+        row_lo = max(int(self._row(lat - dlat)), 0)
+        row_hi = min(int(self._row(lat + dlat)), self.n_rows - 1)
+
+        # Longitude half-width of the circle; the whole row near the poles
+        spans: list[tuple[int, int]]
+        if abs(lat) + dlat >= 90.0 or sin(angle) >= cos(radians(lat)):
+            spans = [(0, self.n_cols - 1)]
+        else:
+            dlng = degrees(asin(sin(angle) / cos(radians(lat))))
+            lo, hi = lng - dlng, lng + dlng
+            if lo < -180.0:
+                spans = [(0, int(self._col(hi))), (int(self._col(lo + 360.0)), self.n_cols - 1)]
+            elif hi > 180.0:
+                spans = [(int(self._col(lo)), self.n_cols - 1), (0, int(self._col(hi - 360.0)))]
+            else:
+                spans = [(int(self._col(lo)), int(self._col(hi)))]
+
+        parts = []
+        for row in range(row_lo, row_hi + 1):
+            for col_lo, col_hi in spans:
+                start = np.searchsorted(self.keys, row * self.n_cols + col_lo, side="left")
+                end = np.searchsorted(self.keys, row * self.n_cols + col_hi, side="right")
+                if end > start:
+                    parts.append(self.order[start:end])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def query_radius(self, lat: float, lng: float, radius_km: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Nodes within radius_km of a point.
+
+        Returns:
+            (indices into nodes, distances in km), in input order
+        """
+        candidates = np.sort(self._candidates(lat, lng, radius_km))
+        distances = haversine_km(lat, lng, self.lat[candidates], self.lng[candidates])
+        within = distances <= radius_km
+        return candidates[within], distances[within]
+
+    def nearest(
+        self, lat: float, lng: float, k: int = 1, max_km: float | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        The k nodes closest to a point, nearest first.
+
+        Searches a growing radius until it holds k nodes, which then
+        contains the k nearest.
+
+        Returns:
+            (indices into nodes, distances in km)
+        """
+        if not len(self.nodes) or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        limit = max_km if max_km is not None else np.pi * EARTH_RADIUS_KM
+        radius = min(self.cell_km, limit)
+        while True:
+            found, distances = self.query_radius(lat, lng, radius)
+            if found.size >= k or radius >= limit:
+                break
+            radius = min(radius * 2, limit)
+
+        top = np.argsort(distances, kind="stable")[:k]
+        return found[top], distances[top]
+
+    def within_bounds(self, bounds: GeoBounds) -> np.ndarray:
+        """Indices of nodes inside a bounding box (see GeoBounds.contains)."""
+        row_lo = max(int(self._row(bounds.min_lat)), 0)
+        row_hi = min(int(self._row(bounds.max_lat)), self.n_rows - 1)
+        if row_hi < row_lo:
+            return np.empty(0, dtype=np.int64)
+
+        # Rows are contiguous in key order, so one slice covers the band
+        start = np.searchsorted(self.keys, row_lo * self.n_cols, side="left")
+        end = np.searchsorted(self.keys, (row_hi + 1) * self.n_cols, side="left")
+        band = np.sort(self.order[start:end])
+        lat, lng = self.lat[band], self.lng[band]
+        inside = (
+            (lat >= bounds.min_lat) & (lat <= bounds.max_lat)
+            & (lng >= bounds.min_lng) & (lng <= bounds.max_lng)
+        )
+        return band[inside]
+
+
 class GeoGraphEngine:
     """Geographic network analysis engine."""
 
     # Earth radius in kilometers
-    EARTH_RADIUS_KM = 6371.0
+    EARTH_RADIUS_KM = EARTH_RADIUS_KM
 
     # Common coordinate patterns
     COORD_PATTERNS = [
@@ -305,32 +461,32 @@ class GeoGraphEngine:
             List of GeoEdge with distances
         """
         # Build coordinate lookup
-        coord_map = {
-            node.entity_id: (node.latitude, node.longitude)
-            for node in geo_nodes
-        }
-
-        geo_edges: list[GeoEdge] = []
-
-        for edge in edges:
-            source_coords = coord_map.get(edge.source)
-            target_coords = coord_map.get(edge.target)
-
-            if source_coords and target_coords:
-                distance = self.calculate_distance(
-                    source_coords[0], source_coords[1],
-                    target_coords[0], target_coords[1],
-                )
-
-                geo_edges.append(GeoEdge(
-                    source_id=edge.source,
-                    target_id=edge.target,
-                    distance_km=distance,
-                    relationship_type=edge.relationship_type or edge.type or "related",
-                    weight=edge.weight,
-                ))
+        index = {node.entity_id: i for i, node in enumerate(geo_nodes)}
+        lat = np.array([n.latitude for n in geo_nodes], dtype=np.float64)
+        lng = np.array([n.longitude for n in geo_nodes], dtype=np.float64)
+
+        located = [
+            (edge, index[edge.source], index[edge.target])
+            for edge in edges
+            if edge.source in index and edge.target in index
+        ]
+        if not located:
+            return []
 
-        return geo_edges
+        sources = np.fromiter((s for _, s, _ in located), dtype=np.int64, count=len(located))
+        targets = np.fromiter((t for _, _, t in located), dtype=np.int64, count=len(located))
+        distances = haversine_km(lat[sources], lng[sources], lat[targets], lng[targets])
+
+        return [
+            GeoEdge(
+                source_id=edge.source,
+                target_id=edge.target,
+                distance_km=float(distance),
+                relationship_type=edge.relationship_type or edge.type or "related",
+                weight=edge.weight,
+            )
+            for (edge, _, _), distance in zip(located, distances)
+        ]
 
     def calculate_bounds(self, geo_nodes: list[GeoNode]) -> GeoBounds | None:
         """Calculate bounding box for all nodes."""
@@ -355,7 +511,10 @@ class GeoGraphEngine:
         """
         Cluster nearby nodes for cleaner visualization.
 
-        Uses simple distance-based clustering.
+        Greedy: each node not yet clustered seeds a cluster of the
+        unclustered nodes within radius_km of it. Neighbours come from a
+        GeoIndex with cells of about radius_km, so each seed only measures
+        distances to nodes in adjacent cells.
 
         Args:
             geo_nodes: Nodes to cluster
@@ -367,55 +526,64 @@ class GeoGraphEngine:
         if not geo_nodes:
             return []
 
+        index = GeoIndex(geo_nodes, cell_km=radius_km)
+        assigned = np.zeros(len(geo_nodes), dtype=bool)
         clusters: list[GeoCluster] = []
-        assigned = set()
 
-        for node in geo_nodes:
-            if node.entity_id in assigned:
+        for seed, node in enumerate(geo_nodes):
+            if assigned[seed]:
                 continue
 
-            # Start new cluster
-            cluster_nodes = [node]
-            assigned.add(node.entity_id)
-
-            # Find nearby nodes
-            for other in geo_nodes:
-                if other.entity_id in assigned:
-                    continue
-
-                distance = self.calculate_distance(
-                    node.latitude, node.longitude,
-                    other.latitude, other.longitude,
-                )
+            # Seed first, then nearby unclustered nodes in input order
+            nearby, _ = index.query_radius(node.latitude, node.longitude, radius_km)
+            nearby = nearby[~assigned[nearby] & (nearby != seed)]
+            members = np.concatenate(([seed], nearby))
+            assigned[members] = True
 
-                if distance <= radius_km:
-                    cluster_nodes.append(other)
-                    assigned.add(other.entity_id)
-
-            # Calculate cluster center
-            center_lat = sum(n.latitude for n in cluster_nodes) / len(cluster_nodes)
-            center_lng = sum(n.longitude for n in cluster_nodes) / len(cluster_nodes)
-
-            # Calculate cluster radius
-            max_dist = 0.0
-            for n in cluster_nodes:
-                dist = self.calculate_distance(center_lat, center_lng, n.latitude, n.longitude)
-                max_dist = max(max_dist, dist)
+            # Cluster center and radius
+            center_lat = float(index.lat[members].mean())
+            center_lng = float(index.lng[members].mean())
+            spread = haversine_km(center_lat, center_lng, index.lat[members], index.lng[members])
 
             clusters.append(GeoCluster(
                 id=f"cluster_{len(clusters)}",
                 center_lat=center_lat,
                 center_lng=center_lng,
-                node_ids=[n.entity_id for n in cluster_nodes],
-                radius_km=max_dist,
+                node_ids=[geo_nodes[i].entity_id for i in members],
+                radius_km=float(spread.max()),
             ))
 
         return clusters
 
+    def nearest_nodes(
+        self,
+        geo_nodes: list[GeoNode],
+        latitude: float,
+        longitude: float,
+        k: int = 10,
+        max_km: float | None = None,
+    ) -> list[tuple[GeoNode, float]]:
+        """
+        Find the nodes closest to a point.
+
+        Args:
+            geo_nodes: Nodes to search
+            latitude, longitude: Query point
+            k: Number of nodes to return
+            max_km: Optional search radius limit
+
+        Returns:
+            List of (node, distance_km), nearest first
+        """
+        index = GeoIndex(geo_nodes, cell_km=max_km or DEFAULT_CELL_KM)
+        found, distances = index.nearest(latitude, longitude, k=k, max_km=max_km)
+        return [(geo_nodes[i], float(d)) for i, d in zip(found, distances)]
+
     def build_geo_graph(
         self,
         graph: Graph,
         cluster_radius_km: float | None = None,
+        bounds: GeoBounds | None = None,
     ) -> GeoGraphData:
         """
         Build complete geographic graph data.
@@ -423,12 +591,15 @@ class GeoGraphEngine:
         Args:
             graph: Source graph
             cluster_radius_km: Optional clustering radius
+            bounds: Optional viewport; nodes outside it are dropped first
 
         Returns:
             GeoGraphData ready for visualization
         """
         # Extract geo nodes
         geo_nodes = self.extract_geo_nodes(graph)
+        if bounds is not None and geo_nodes:
+            geo_nodes = [geo_nodes[i] for i in GeoIndex(geo_nodes).within_bounds(bounds)]
 
         if not geo_nodes:
             return GeoGraphData()
@@ -461,10 +632,8 @@ class GeoGraphEngine:
         bounds: GeoBounds,
     ) -> GeoGraphData:
         """Filter geo data to only include nodes within bounds."""
-        filtered_nodes = [
-            n for n in geo_data.nodes
-            if bounds.contains(n.latitude, n.longitude)
-        ]
+        index = GeoIndex(geo_data.nodes)
+        filtered_nodes = [geo_data.nodes[i] for i in index.within_bounds(bounds)]
 
         node_ids = {n.entity_id for n in filtered_nodes}
 
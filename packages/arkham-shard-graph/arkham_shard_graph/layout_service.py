@@ -0,0 +1,353 @@
+"""
+Layout service - cached, off-loop layout computation.
+
+LayoutEngine algorithms are synchronous pure Python, and the layout
+endpoints used to run them on the event loop for every request. The service
+runs them in worker processes (threads would only contend for the GIL) on a
+snapshot of the graph, since cached graphs are updated in place by entity
+events, and keeps a cache:
+
+- results are cached per project, layout type and options, tagged with the
+  graph's (version, node count, edge count) signature; re-opening an
+  unchanged graph view is a dictionary lookup
+- concurrent requests for the same layout share one computation
+- when the graph has grown since the cached force-directed layout,
+  existing nodes keep their positions and only new nodes are placed (next
+  to their placed neighbours), unless too much of the graph is new;
+  layouts with a global shape (circle, grid, tree, ...) are always
+  recomputed
+- stream_layout yields a coarse layout first (the highest-degree skeleton
+  laid out properly, everything else placed around it), then the refined one
+"""
+
+import asyncio
+import logging
+import math
+from collections import OrderedDict, defaultdict
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Any
+
+from .layouts import LayoutEngine, LayoutPosition, LayoutResult, LayoutType
+from .models import Graph
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_CACHE_ENTRIES = 64
+INCREMENTAL_MAX_FRACTION = 0.3  # Above this share of new nodes, re-layout fully
+SKELETON_SIZE = 200  # Nodes laid out for the coarse streaming stage
+PLACEMENT_SPACING = 50.0
+
+# Layouts without a global shape, so new nodes can be placed by their
+# neighbours (on a circle or grid they would land off it)
+INCREMENTAL_LAYOUTS = {LayoutType.FORCE_DIRECTED}
+
+_GOLDEN_ANGLE = math.pi * (3 - math.sqrt(5))
+
+
+def _graph_signature(graph: Graph) -> tuple[int, int, int]:
+    return (graph.version, len(graph.nodes), len(graph.edges))
+
+
+def _options_key(options: dict[str, Any]) -> tuple:
+    return tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v) for k, v in options.items()
+    ))
+
+
+def _snapshot(graph: Graph) -> Graph:
+    """Copy of a graph's nodes and edges that later in-place updates can't touch."""
+    return Graph(
+        project_id=graph.project_id,
+        nodes=[replace(n) for n in graph.nodes],
+        edges=[replace(e, document_ids=[]) for e in graph.edges],
+        version=graph.version,
+    )
+
+
+def _too_much_new(graph: Graph, previous: LayoutResult) -> bool:
+    added = sum(1 for n in graph.nodes if n.id not in previous.positions)
+    return added > INCREMENTAL_MAX_FRACTION * len(graph.nodes)
+
+
+def place_nodes(
+    graph: Graph,
+    pinned: dict[str, LayoutPosition],
+    spacing: float = PLACEMENT_SPACING,
+) -> dict[str, LayoutPosition]:
+    """
+    Position every node of a graph around a set of pinned positions.
+
+    Pinned nodes keep their coordinates. Unplaced nodes are visited in BFS
+    order outward from the pinned ones and put at the mean position of
+    their placed neighbours, offset along a golden-angle spiral so siblings
+    do not overlap. Nodes with no path to a pinned node go in rows below
+    the layout.
+
+    Args:
+        graph: Graph whose nodes need positions
+        pinned: Existing positions (entries for missing nodes are dropped)
+        spacing: Distance between a placed node and its anchor
+
+    Returns:
+        Positions for all nodes of the graph
+    """
+    node_ids = [n.id for n in graph.nodes]
+    present = set(node_ids)
+    positions = {k: v for k, v in pinned.items() if k in present}
+
+    adjacency: dict[str, list[str]] = defaultdict(list)
+    for edge in graph.edges:
+        if edge.source in present and edge.target in present:
+            adjacency[edge.source].append(edge.target)
+            adjacency[edge.target].append(edge.source)
+
+    frontier = [
+        node_id for node_id in node_ids
+        if node_id not in positions and any(n in positions for n in adjacency[node_id])
+    ]
+    queued = set(frontier)
+    placed = 0
+    while frontier:
+        next_frontier: list[str] = []
+        for node_id in frontier:
+            anchors = [positions[n] for n in adjacency[node_id] if n in positions]
+            x = sum(p.x for p in anchors) / len(anchors)
+            y = sum(p.y for p in anchors) / len(anchors)
+            angle = placed * _GOLDEN_ANGLE
+            radius = spacing * (1 + 0.1 * math.sqrt(placed))
+            placed += 1
+            positions[node_id] = LayoutPosition(
+                node_id=node_id,
+                x=x + radius * math.cos(angle),
+                y=y + radius * math.sin(angle),
+            )
+            for neighbor in adjacency[node_id]:
+                if neighbor not in positions and neighbor not in queued:
+                    queued.add(neighbor)
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+
+    stranded = [node_id for node_id in node_ids if node_id not in positions]
+    if stranded:
+        xs = [p.x for p in positions.values()] or [0.0]
+        ys = [p.y for p in positions.values()] or [0.0]
+        min_x, max_y = min(xs), max(ys)
+        per_row = max(1, int((max(xs) - min_x) / spacing) + 1, math.ceil(math.sqrt(len(stranded))))
+        for i, node_id in enumerate(stranded):
+            positions[node_id] = LayoutPosition(
+                node_id=node_id,
+                x=min_x + (i % per_row) * spacing,
+                y=max_y + (i // per_row + 1) * spacing,
+            )
+
+    return positions
+
+
+def _extend_result(
+    base: LayoutResult,
+    positions: dict[str, LayoutPosition],
+    metadata: dict[str, Any],
+) -> LayoutResult:
+    """A copy of base with new positions, grown to cover them."""
+    width, height = base.width, base.height
+    if positions:
+        xs = [p.x for p in positions.values()]
+        ys = [p.y for p in positions.values()]
+        width = max(width, max(xs) - min(xs))
+        height = max(height, max(ys) - min(ys))
+    return replace(
+        base,
+        positions=positions,
+        width=width,
+        height=height,
+        metadata={**base.metadata, **metadata},
+    )
+
+
+def _compute(
+    engine: LayoutEngine,
+    graph: Graph,
+    layout_type: LayoutType,
+    options: dict[str, Any],
+    previous: LayoutResult | None,
+) -> LayoutResult:
+    """Worker: pin a previous layout when possible, else lay out fully."""
+    if (
+        previous is not None
+        and previous.positions
+        and layout_type in INCREMENTAL_LAYOUTS
+        and not _too_much_new(graph, previous)
+    ):
+        added = sum(1 for n in graph.nodes if n.id not in previous.positions)
+        positions = place_nodes(graph, previous.positions)
+        result = _extend_result(previous, positions, {
+            "pinned": len(positions) - added,
+            "placed": added,
+        })
+        result.mode = "incremental"
+        return result
+
+    result = engine.calculate_layout(graph, layout_type, options)
+    result.mode = "full"
+    return result
+
+
+def _coarse(
+    engine: LayoutEngine,
+    graph: Graph,
+    layout_type: LayoutType,
+    options: dict[str, Any],
+) -> LayoutResult:
+    """Worker: lay out the highest-degree skeleton and place the rest."""
+    degree: dict[str, int] = defaultdict(int)
+    for edge in graph.edges:
+        degree[edge.source] += 1
+        degree[edge.target] += 1
+    skeleton_nodes = sorted(graph.nodes, key=lambda n: degree[n.id], reverse=True)[:SKELETON_SIZE]
+    skeleton_ids = {n.id for n in skeleton_nodes}
+    skeleton = Graph(
+        project_id=graph.project_id,
+        nodes=skeleton_nodes,
+        edges=[e for e in graph.edges if e.source in skeleton_ids and e.target in skeleton_ids],
+        version=graph.version,
+    )
+
+    base = engine.calculate_layout(skeleton, layout_type, options)
+    positions = place_nodes(graph, base.positions)
+    result = _extend_result(base, positions, {"skeleton_size": len(skeleton_nodes)})
+    result.mode = "coarse"
+    return result
+
+
+class LayoutService:
+    """
+    Runs LayoutEngine layouts in worker processes with a per-version cache.
+
+    Args:
+        engine: LayoutEngine to run (a new one if omitted; must be picklable
+            when running in worker processes)
+        max_workers: Layout worker processes (0 runs layouts inline)
+        max_entries: Cached layouts kept (least recently used are evicted)
+    """
+
+    def __init__(
+        self,
+        engine: LayoutEngine | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_entries: int = DEFAULT_CACHE_ENTRIES,
+    ):
+        self.engine = engine or LayoutEngine()
+        self.max_entries = max_entries
+        self._executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 0 else None
+        # (project_id, layout_type, options) -> (graph signature, result)
+        self._cache: OrderedDict[tuple, tuple[tuple[int, int, int], LayoutResult]] = OrderedDict()
+        self._pending: dict[tuple, asyncio.Future] = {}
+
+    async def get_layout(
+        self,
+        graph: Graph,
+        layout_type: LayoutType,
+        options: dict[str, Any] | None = None,
+        recompute: bool = False,
+    ) -> LayoutResult:
+        """
+        Layout of a graph, from cache when its version is unchanged.
+
+        Args:
+            graph: Graph to layout
+            layout_type: Algorithm to use
+            options: Algorithm-specific options
+            recompute: Ignore cached layouts and re-layout from scratch
+
+        Returns:
+            LayoutResult whose mode is "cached", "incremental" or "full"
+        """
+        options = options or {}
+        key = (graph.project_id, layout_type.value, _options_key(options))
+        signature = _graph_signature(graph)
+
+        entry = self._cache.get(key)
+        if entry is not None and not recompute:
+            self._cache.move_to_end(key)
+            if entry[0] == signature:
+                return replace(entry[1], mode="cached")
+
+        previous = None if recompute or entry is None else entry[1]
+        result = await self._run(
+            (key, signature, recompute), _compute, _snapshot(graph), layout_type, options, previous,
+        )
+        result.graph_version = graph.version
+        self._store(key, signature, result)
+        return result
+
+    async def stream_layout(
+        self,
+        graph: Graph,
+        layout_type: LayoutType,
+        options: dict[str, Any] | None = None,
+        recompute: bool = False,
+    ) -> AsyncIterator[tuple[str, LayoutResult]]:
+        """
+        Yield ("coarse", result) then ("refined", result) for a graph.
+
+        The coarse stage is skipped when the refined layout is already
+        cached, can be derived incrementally, or the graph is no larger than
+        the skeleton.
+        """
+        options = options or {}
+        key = (graph.project_id, layout_type.value, _options_key(options))
+        entry = self._cache.get(key)
+        cached = entry is not None and not recompute and entry[0] == _graph_signature(graph)
+        needs_full = not cached and (
+            recompute or entry is None
+            or layout_type not in INCREMENTAL_LAYOUTS or _too_much_new(graph, entry[1])
+        )
+
+        if needs_full and len(graph.nodes) > SKELETON_SIZE:
+            coarse = await self._run(
+                (key, "coarse", _graph_signature(graph)),
+                _coarse, _snapshot(graph), layout_type, options,
+            )
+            coarse.graph_version = graph.version
+            yield "coarse", coarse
+
+        yield "refined", await self.get_layout(graph, layout_type, options, recompute)
+
+    def invalidate(self, project_id: str | None = None) -> None:
+        """Drop cached layouts for one project, or all of them."""
+        if project_id is None:
+            self._cache.clear()
+            return
+        for key in [k for k in self._cache if k[0] == project_id]:
+            del self._cache[key]
+
+    def shutdown(self) -> None:
+        """Stop the worker pool and drop cached layouts."""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._cache.clear()
+
+    async def _run(self, pending_key: tuple, fn, *args) -> LayoutResult:
+        """Run fn on the worker pool, sharing the run with identical callers."""
+        if self._executor is None:
+            return fn(self.engine, *args)
+        future = self._pending.get(pending_key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = asyncio.ensure_future(
+                loop.run_in_executor(self._executor, fn, self.engine, *args)
+            )
+            self._pending[pending_key] = future
+            future.add_done_callback(lambda _: self._pending.pop(pending_key, None))
+        result = await asyncio.shield(future)
+        # Callers may annotate their copy; the shared result stays untouched
+        return replace(result, metadata=dict(result.metadata))
+
+    def _store(self, key: tuple, signature: tuple[int, int, int], result: LayoutResult) -> None:
+        self._cache[key] = (signature, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
@@ -56,6 +56,8 @@ class LayoutResult:
     height: float
     layers: int | None = None
     metadata: dict[str, Any] = field(default_factory=dict)
+    mode: str = "full"  # full, incremental, cached or coarse (see layout_service)
+    graph_version: int | None = None
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for API response."""
@@ -75,6 +77,8 @@ class LayoutResult:
             "height": self.height,
             "layers": self.layers,
             "metadata": self.metadata,
+            "mode": self.mode,
+            "graph_version": self.graph_version,
         }
 
 
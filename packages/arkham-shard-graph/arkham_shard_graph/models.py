@@ -165,6 +165,7 @@ class Graph:
     # Metadata
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
+    version: int = 0  # Bumped on every persisted change
 
     def to_dict(self) -> dict[str, Any]:
         """Convert graph to dictionary."""
@@ -178,6 +179,7 @@ class Graph:
                 "updated_at": self.updated_at.isoformat() if self.updated_at else None,
                 "entity_count": len(self.nodes),
                 "relationship_count": len(self.edges),
+                "version": self.version,
             }
         }
 
@@ -308,6 +310,7 @@ class BuildGraphRequest(BaseModel):
     document_ids: list[str] | None = None
     entity_types: list[str] | None = None
     min_co_occurrence: int = 1
+    max_edges_per_node: int | None = None  # Keep each entity's strongest N co-occurrence edges
     # Primary data sources (base graph)
     include_document_entities: bool = True  # Include entities from documents
     include_cooccurrences: bool = True      # Include co-occurrence edges
@@ -339,6 +342,7 @@ class PathResponse(BaseModel):
     path: list[str]
     edges: list[dict[str, Any]]
     total_weight: float
+    truncated: bool = False  # Search ran out of time before it finished
 
 
 class CentralityRequest(BaseModel):
@@ -362,6 +366,7 @@ class CommunityRequest(BaseModel):
     algorithm: str = "louvain"
     min_community_size: int = 3
     resolution: float = 1.0
+    recompute: bool = False  # Ignore stored assignments and start from scratch
 
 
 class CommunityResponse(BaseModel):
@@ -370,6 +375,8 @@ class CommunityResponse(BaseModel):
     community_count: int
     communities: list[dict[str, Any]]
     modularity: float
+    graph_version: int = 0
+    mode: str = "full"  # "cached", "incremental" or "full"
 
 
 class NeighborsRequest(BaseModel):
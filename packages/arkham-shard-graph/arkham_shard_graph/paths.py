@@ -0,0 +1,528 @@
+"""
+Path engine - bounded path searches on an integer-indexed adjacency.
+
+The path APIs answer "how is A connected to B" questions. Enumerating
+paths with a per-request DFS over a dict adjacency explores exponentially
+many routes on dense co-occurrence graphs, so every search here works on
+a PathIndex (node IDs mapped to ints, neighbours in flat offset/target
+lists, cached on the Graph like the CSR form) and runs under a
+SearchBudget that stops it on a deadline or a cancel event:
+
+- shortest paths: bidirectional BFS
+- k shortest / k strongest paths: Yen's algorithm over BFS or Dijkstra
+- constrained paths: iterative deepening with an on-path bitset, pruned
+  by BFS distance lower bounds to the target and to required nodes
+"""
+
+import heapq
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .csr import _CACHE_ATTR
+from .models import Graph, GraphEdge
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIME_LIMIT = 2.0  # seconds per path query
+
+_INDEX_KEY = "paths"
+_SNAPSHOT_KEY = "paths_snapshot"
+
+
+class SearchBudget:
+    """
+    Time budget and cancellation for one path query.
+
+    Searches call tick() per node expansion; the clock and cancel event are
+    only consulted every check_every ticks. Once exhausted, a search stops
+    and returns what it has found so far.
+    """
+
+    def __init__(
+        self,
+        time_limit: float | None = DEFAULT_TIME_LIMIT,
+        cancel_event: threading.Event | None = None,
+        check_every: int = 256,
+    ):
+        self.deadline = time.monotonic() + time_limit if time_limit else None
+        self.cancel_event = cancel_event
+        self.check_every = check_every
+        self.exhausted = False
+        self._ticks = 0
+
+    def tick(self) -> bool:
+        """Count one expansion; returns True once the search must stop."""
+        self._ticks += 1
+        if not self.exhausted and self._ticks % self.check_every == 0:
+            self.check()
+        return self.exhausted
+
+    def check(self) -> bool:
+        """Check the deadline and cancel event now."""
+        if (self.cancel_event is not None and self.cancel_event.is_set()) or (
+            self.deadline is not None and time.monotonic() >= self.deadline
+        ):
+            self.exhausted = True
+        return self.exhausted
+
+
+@dataclass
+class PathIndex:
+    """
+    Undirected integer adjacency for path searches.
+
+    Neighbour slots of node i are offsets[i]:offsets[i + 1]; each slot
+    holds the neighbour and the index of the GraphEdge it came from, so
+    edge filters and path reconstruction need no string lookups. Edge
+    endpoints missing from graph.nodes still get an index, matching the
+    edge-driven searches this replaces.
+    """
+
+    node_ids: list[str]
+    index: dict[str, int]
+    offsets: list[int]
+    targets: list[int]
+    edge_refs: list[int]
+    edges: list[GraphEdge]
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> "PathIndex":
+        """Build the path index of a graph."""
+        index: dict[str, int] = {}
+        node_ids: list[str] = []
+        for node in graph.nodes:
+            if node.id not in index:
+                index[node.id] = len(node_ids)
+                node_ids.append(node.id)
+
+        pairs: list[tuple[int, int, int]] = []
+        for ref, edge in enumerate(graph.edges):
+            ends = []
+            for node_id in (edge.source, edge.target):
+                i = index.get(node_id)
+                if i is None:
+                    i = index[node_id] = len(node_ids)
+                    node_ids.append(node_id)
+                ends.append(i)
+            s, t = ends
+            if s != t:
+                pairs.append((s, t, ref))
+
+        n = len(node_ids)
+        counts = [0] * (n + 1)
+        for s, t, _ in pairs:
+            counts[s + 1] += 1
+            counts[t + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        offsets = counts
+        fill = offsets[:-1].copy()
+        targets = [0] * (2 * len(pairs))
+        edge_refs = [0] * (2 * len(pairs))
+        for s, t, ref in pairs:
+            targets[fill[s]], edge_refs[fill[s]] = t, ref
+            fill[s] += 1
+            targets[fill[t]], edge_refs[fill[t]] = s, ref
+            fill[t] += 1
+
+        return cls(
+            node_ids=node_ids,
+            index=index,
+            offsets=offsets,
+            targets=targets,
+            edge_refs=edge_refs,
+            edges=graph.edges,
+        )
+
+    @property
+    def n(self) -> int:
+        return len(self.node_ids)
+
+    def slots(self, i: int) -> range:
+        return range(self.offsets[i], self.offsets[i + 1])
+
+    def edge_between(self, u: int, v: int, allowed: list[bool] | None = None) -> GraphEdge | None:
+        """An edge joining u and v (the first allowed one)."""
+        for slot in self.slots(u):
+            if self.targets[slot] == v:
+                ref = self.edge_refs[slot]
+                if allowed is None or allowed[ref]:
+                    return self.edges[ref]
+        return None
+
+    def to_ids(self, path: list[int]) -> list[str]:
+        return [self.node_ids[i] for i in path]
+
+
+def search_snapshot(graph: Graph) -> Graph:
+    """
+    Frozen copy of a graph's node and edge lists for searches in a thread.
+
+    Cached with the CSR form, which in-place edits drop (invalidate_csr),
+    so the copy and its path index are built once per graph state while
+    deltas applied on the event loop never reach a running search.
+    """
+    cache = graph.__dict__.setdefault(_CACHE_ATTR, {})
+    signature = (len(graph.nodes), len(graph.edges))
+    entry = cache.get(_SNAPSHOT_KEY)
+    if entry is None or entry[0] != signature:
+        snapshot = Graph(
+            project_id=graph.project_id,
+            nodes=list(graph.nodes),
+            edges=list(graph.edges),
+            metadata=graph.metadata,
+            version=graph.version,
+        )
+        entry = (signature, snapshot)
+        cache[_SNAPSHOT_KEY] = entry
+    return entry[1]
+
+
+def get_path_index(graph: Graph) -> PathIndex:
+    """Path index of a graph, cached alongside its CSR form."""
+    cache = graph.__dict__.setdefault(_CACHE_ATTR, {})
+    signature = (len(graph.nodes), len(graph.edges))
+    entry = cache.get(_INDEX_KEY)
+    if entry is None or entry[0] != signature or entry[1].edges is not graph.edges:
+        entry = (signature, PathIndex.from_graph(graph))
+        cache[_INDEX_KEY] = entry
+    return entry[1]
+
+
+# =============================================================================
+# Searches
+# =============================================================================
+
+
+def bfs_distances(
+    idx: PathIndex,
+    source: int,
+    max_hops: int | None = None,
+    allowed: list[bool] | None = None,
+    blocked: set[int] | None = None,
+) -> list[int]:
+    """Hop distance from source to every node (-1 if unreachable)."""
+    dist = [-1] * idx.n
+    dist[source] = 0
+    frontier = [source]
+    depth = 0
+    while frontier and (max_hops is None or depth < max_hops):
+        depth += 1
+        next_frontier = []
+        for u in frontier:
+            for slot in idx.slots(u):
+                v = idx.targets[slot]
+                if dist[v] != -1 or (blocked and v in blocked):
+                    continue
+                if allowed is not None and not allowed[idx.edge_refs[slot]]:
+                    continue
+                dist[v] = depth
+                next_frontier.append(v)
+        frontier = next_frontier
+    return dist
+
+
+def bfs_tree(idx: PathIndex, root: int, max_hops: int) -> tuple[list[int], list[int]]:
+    """BFS parents and distances from root, up to max_hops (-1 = unreached)."""
+    parent = [-1] * idx.n
+    dist = [-1] * idx.n
+    dist[root] = 0
+    frontier = [root]
+    for depth in range(1, max_hops + 1):
+        next_frontier = []
+        for u in frontier:
+            for slot in idx.slots(u):
+                v = idx.targets[slot]
+                if dist[v] == -1:
+                    dist[v] = depth
+                    parent[v] = u
+                    next_frontier.append(v)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return parent, dist
+
+
+def bidirectional_bfs(
+    idx: PathIndex,
+    source: int,
+    target: int,
+    max_hops: int,
+    budget: SearchBudget,
+    blocked_nodes: set[int] | None = None,
+    blocked_edges: set[tuple[int, int]] | None = None,
+) -> list[int] | None:
+    """
+    Shortest path by hop count, searching from both ends.
+
+    Each round expands one full level of the smaller frontier, so the two
+    searches meet after visiting roughly the square root of what a
+    one-sided BFS would. blocked_edges are directed (u, v) steps, as Yen's
+    algorithm needs.
+    """
+    if source == target:
+        return [source]
+
+    parents = ({source: -1}, {target: -1})
+    depths = [0, 0]
+    frontiers = [[source], [target]]
+
+    while frontiers[0] and frontiers[1] and depths[0] + depths[1] < max_hops:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own, other = parents[side], parents[1 - side]
+        next_frontier = []
+        best: tuple[int, int] | None = None
+
+        for u in frontiers[side]:
+            if budget.tick():
+                return None
+            for slot in idx.slots(u):
+                v = idx.targets[slot]
+                if v in own or (blocked_nodes and v in blocked_nodes):
+                    continue
+                if blocked_edges:
+                    step = (u, v) if side == 0 else (v, u)
+                    if step in blocked_edges:
+                        continue
+                own[v] = u
+                if v in other and best is None:
+                    best = (v, u)
+                next_frontier.append(v)
+
+        depths[side] += 1
+        frontiers[side] = next_frontier
+        if best is not None:
+            # Every meeting on this level gives the same total length
+            meet = best[0]
+            forward, node = [], meet
+            while node != -1:
+                forward.append(node)
+                node = parents[0][node]
+            forward.reverse()
+            node = parents[1][meet]
+            while node != -1:
+                forward.append(node)
+                node = parents[1][node]
+            return forward
+
+    return None
+
+
+def dijkstra(
+    idx: PathIndex,
+    source: int,
+    target: int,
+    cost: Callable[[GraphEdge], float | None],
+    budget: SearchBudget,
+    blocked_nodes: set[int] | None = None,
+    blocked_edges: set[tuple[int, int]] | None = None,
+    max_hops: int | None = None,
+) -> list[int] | None:
+    """
+    Cheapest path under a non-negative edge cost (None = not traversable),
+    of at most max_hops edges.
+
+    Search states are (node, hops). A node is settled again only when it is
+    reached in fewer hops than before: a later state costs at least as much,
+    so it can only help by leaving more hops for the rest of the path. The
+    cheapest path overall may be too long while a dearer, shorter one fits.
+    """
+    parent: dict[tuple[int, int], tuple[int, int] | None] = {(source, 0): None}
+    dist = {(source, 0): 0.0}
+    heap = [(0.0, 0, source)]
+    fewest_hops: dict[int, int] = {}
+    limit = max_hops if max_hops is not None else idx.n  # simple paths have < n edges
+
+    while heap:
+        d, hops, u = heapq.heappop(heap)
+        if hops >= fewest_hops.get(u, limit + 1):
+            continue
+        fewest_hops[u] = hops
+        if u == target:
+            path, state = [], (u, hops)
+            while state is not None:
+                path.append(state[0])
+                state = parent[state]
+            return path[::-1]
+        if budget.tick():
+            return None
+        if hops == limit:
+            continue
+        for slot in idx.slots(u):
+            v = idx.targets[slot]
+            if blocked_nodes and v in blocked_nodes:
+                continue
+            if blocked_edges and (u, v) in blocked_edges:
+                continue
+            if hops + 1 >= fewest_hops.get(v, limit + 1):
+                continue
+            c = cost(idx.edges[idx.edge_refs[slot]])
+            if c is None:
+                continue
+            nd = d + c
+            state = (v, hops + 1)
+            if nd < dist.get(state, float("inf")):
+                dist[state] = nd
+                parent[state] = (u, hops)
+                heapq.heappush(heap, (nd, hops + 1, v))
+
+    return None
+
+
+def path_cost(
+    idx: PathIndex, path: list[int], cost: Callable[[GraphEdge], float | None] | None
+) -> float:
+    """Total cost of a path (hop count when cost is None)."""
+    if cost is None:
+        return float(len(path) - 1)
+    total = 0.0
+    for u, v in zip(path, path[1:]):
+        best = min(
+            (c for slot in idx.slots(u)
+             if idx.targets[slot] == v
+             and (c := cost(idx.edges[idx.edge_refs[slot]])) is not None),
+            default=float("inf"),
+        )
+        total += best
+    return total
+
+
+def k_shortest_paths(
+    idx: PathIndex,
+    source: int,
+    target: int,
+    k: int,
+    max_hops: int,
+    budget: SearchBudget,
+    cost: Callable[[GraphEdge], float | None] | None = None,
+) -> list[list[int]]:
+    """
+    Yen's k shortest simple paths, cheapest first.
+
+    With cost=None paths are ranked by hop count and spur paths come from
+    bidirectional BFS; otherwise by total cost via hop-bounded Dijkstra.
+    Both searches get the hops left after the root path, so no path longer
+    than max_hops is produced.
+    """
+
+    def spur_search(spur: int, blocked_nodes: set[int], blocked_edges: set[tuple[int, int]], hops: int):
+        if cost is None:
+            return bidirectional_bfs(idx, spur, target, hops, budget, blocked_nodes, blocked_edges)
+        return dijkstra(idx, spur, target, cost, budget, blocked_nodes, blocked_edges, hops)
+
+    first = spur_search(source, set(), set(), max_hops)
+    if first is None:
+        return []
+
+    accepted = [first]
+    seen = {tuple(first)}
+    candidates: list[tuple[float, tuple[int, ...]]] = []
+
+    while len(accepted) < k and not budget.exhausted:
+        previous = accepted[-1]
+        for i in range(len(previous) - 1):
+            root = previous[:i + 1]
+            blocked_edges = {
+                (p[i], p[i + 1]) for p in accepted
+                if len(p) > i + 1 and p[:i + 1] == root
+            }
+            spur_path = spur_search(previous[i], set(root[:-1]), blocked_edges, max_hops - i)
+            if budget.exhausted:
+                break
+            if spur_path is None:
+                continue
+            total = root[:-1] + spur_path
+            key = tuple(total)
+            if key in seen or len(total) - 1 > max_hops:
+                continue
+            seen.add(key)
+            heapq.heappush(candidates, (path_cost(idx, total, cost), key))
+
+        if not candidates:
+            break
+        accepted.append(list(heapq.heappop(candidates)[1]))
+
+    return accepted
+
+
+def constrained_path(
+    idx: PathIndex,
+    source: int,
+    target: int,
+    max_hops: int,
+    budget: SearchBudget,
+    required: set[int] | None = None,
+    excluded: set[int] | None = None,
+    allowed: list[bool] | None = None,
+) -> list[int] | None:
+    """
+    Shortest simple path visiting every required node, avoiding excluded
+    nodes and edges not marked allowed.
+
+    Iterative deepening DFS keeps the current path in a bitset. A branch is
+    cut when its depth plus a lower bound on the remaining hops exceeds the
+    limit; the bound is the BFS distance to the target, or via any required
+    node not yet visited (dist(v, r) + dist(r, target)).
+    """
+    required = set(required or ()) - {source}
+    excluded = set(excluded or ())
+    if source in excluded or target in excluded:
+        return None
+
+    to_target = bfs_distances(idx, target, max_hops, allowed, excluded)
+    if to_target[source] == -1:
+        return None
+    via: dict[int, tuple[list[int], int]] = {}
+    for r in required:
+        d = bfs_distances(idx, r, max_hops, allowed, excluded)
+        if d[source] == -1 or d[target] == -1:
+            return None
+        via[r] = (d, d[target])
+
+    def lower_bound(v: int, pending: set[int]) -> int:
+        bound = to_target[v]
+        if bound == -1:
+            return max_hops + 1
+        for r in pending:
+            d, r_to_target = via[r]
+            if d[v] == -1:
+                return max_hops + 1
+            bound = max(bound, d[v] + r_to_target)
+        return bound
+
+    on_path = bytearray(idx.n)
+    path = [source]
+    on_path[source] = 1
+
+    def dfs(u: int, depth: int, limit: int, pending: set[int]) -> bool:
+        if u == target:
+            return not pending
+        if budget.tick():
+            return False
+        for slot in idx.slots(u):
+            v = idx.targets[slot]
+            if on_path[v] or v in excluded:
+                continue
+            if allowed is not None and not allowed[idx.edge_refs[slot]]:
+                continue
+            next_pending = pending - {v} if v in pending else pending
+            if depth + 1 + lower_bound(v, next_pending) > limit:
+                continue
+            on_path[v] = 1
+            path.append(v)
+            if dfs(v, depth + 1, limit, next_pending):
+                return True
+            path.pop()
+            on_path[v] = 0
+        return False
+
+    start = lower_bound(source, required)
+    for limit in range(start, max_hops + 1):
+        if dfs(source, 0, limit, required):
+            return path
+        if budget.exhausted:
+            break
+    return None
@@ -0,0 +1,347 @@
+"""
+Reachability index - transitive closure over the condensation DAG.
+
+Causal queries keep asking the same question: can X reach Y? Confounders
+are common ancestors of treatment and outcome, chains exist when the cause
+reaches the effect, and every path search is wasted on branches that can
+never arrive at the target. Answering these with a fresh DFS per query is
+linear at best and exponential for path enumeration, so a ReachabilityIndex
+precomputes the closure once per edge set:
+
+- strongly connected components (iterative Tarjan) collapse cycles, giving
+  a DAG of components whose SCCs also report the graph's cycles
+- each component gets descendant and ancestor bitsets (Python ints over
+  node indices), filled in one reverse-topological and one topological pass
+
+Reachability, ancestor sets and common ancestors then become bit lookups
+and ANDs. The index is cached on the causal graph and, when built from an
+entity Graph, in that graph's derived-structure cache next to its CSR form.
+"""
+
+import logging
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .csr import _CACHE_ATTR
+from .models import Graph
+
+if TYPE_CHECKING:
+    from .causal import CausalGraph
+
+logger = logging.getLogger(__name__)
+
+_INDEX_KEY = "reachability"
+_INSTANCE_ATTR = "_reachability"
+
+
+def _strongly_connected(successors: list[list[int]]) -> tuple[list[int], int]:
+    """
+    Tarjan's SCC algorithm without recursion.
+
+    Components are numbered in the order Tarjan completes them, which is a
+    reverse topological order of the condensation: every edge between two
+    components points from a higher to a lower component ID.
+
+    Returns:
+        Tuple of (component ID per node, component count)
+    """
+    n = len(successors)
+    order = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    component = [-1] * n
+    stack: list[int] = []
+    counter = 0
+    count = 0
+
+    for root in range(n):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+
+        while work:
+            v, i = work[-1]
+            if i < len(successors[v]):
+                work[-1] = (v, i + 1)
+                w = successors[v][i]
+                if order[w] == -1:
+                    order[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, 0))
+                elif on_stack[w] and order[w] < low[v]:
+                    low[v] = order[w]
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[v] < low[parent]:
+                    low[parent] = low[v]
+            if low[v] == order[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = count
+                    if w == v:
+                        break
+                count += 1
+
+    return component, count
+
+
+def _bits(mask: int) -> Iterable[int]:
+    """Indices of the set bits of a mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+@dataclass
+class ReachabilityIndex:
+    """Transitive closure of a directed graph, stored per SCC as bitsets."""
+    node_ids: list[str]
+    index: dict[str, int]
+    successors: list[list[int]]
+    component: list[int]
+    members: list[list[int]]
+    cyclic: list[bool]  # component has a cycle (several nodes or a self-loop)
+    descendants_mask: list[int]  # per component, including its own members
+    ancestors_mask: list[int]
+
+    @classmethod
+    def from_edges(
+        cls,
+        node_ids: Iterable[str],
+        edges: Iterable[tuple[str, str]],
+    ) -> "ReachabilityIndex":
+        """
+        Build the index for directed edges.
+
+        Edge endpoints missing from node_ids are added as nodes.
+        """
+        ids: list[str] = []
+        index: dict[str, int] = {}
+
+        def slot(node_id: str) -> int:
+            i = index.get(node_id)
+            if i is None:
+                i = index[node_id] = len(ids)
+                ids.append(node_id)
+            return i
+
+        for node_id in node_ids:
+            slot(node_id)
+        pairs = [(slot(u), slot(v)) for u, v in edges]
+
+        n = len(ids)
+        successors: list[list[int]] = [[] for _ in range(n)]
+        for u, v in pairs:
+            successors[u].append(v)
+
+        component, count = _strongly_connected(successors)
+        members: list[list[int]] = [[] for _ in range(count)]
+        for i in range(n):
+            members[component[i]].append(i)
+
+        cyclic = [len(m) > 1 for m in members]
+        dag_succ: list[set[int]] = [set() for _ in range(count)]
+        for u, v in pairs:
+            cu, cv = component[u], component[v]
+            if cu == cv:
+                if u == v:
+                    cyclic[cu] = True
+            else:
+                dag_succ[cu].add(cv)
+
+        own = [sum(1 << i for i in m) for m in members]
+
+        # Successor components have lower IDs, so ascending IDs visit them first
+        descendants_mask = own[:]
+        for c in range(count):
+            mask = descendants_mask[c]
+            for d in dag_succ[c]:
+                mask |= descendants_mask[d]
+            descendants_mask[c] = mask
+
+        dag_pred: list[list[int]] = [[] for _ in range(count)]
+        for c in range(count):
+            for d in dag_succ[c]:
+                dag_pred[d].append(c)
+        ancestors_mask = own[:]
+        for c in range(count - 1, -1, -1):
+            mask = ancestors_mask[c]
+            for p in dag_pred[c]:
+                mask |= ancestors_mask[p]
+            ancestors_mask[c] = mask
+
+        return cls(
+            node_ids=ids,
+            index=index,
+            successors=successors,
+            component=component,
+            members=members,
+            cyclic=cyclic,
+            descendants_mask=descendants_mask,
+            ancestors_mask=ancestors_mask,
+        )
+
+    def _strict(self, masks: list[int], node_id: str) -> int:
+        """Closure mask of a node over one or more edges."""
+        i = self.index.get(node_id)
+        if i is None:
+            return 0
+        c = self.component[i]
+        mask = masks[c]
+        return mask if self.cyclic[c] else mask & ~(1 << i)
+
+    def _ids(self, mask: int) -> set[str]:
+        return {self.node_ids[i] for i in _bits(mask)}
+
+    def reaches(self, source: str, target: str) -> bool:
+        """Whether a directed path leads from source to target (a node reaches itself)."""
+        s = self.index.get(source)
+        t = self.index.get(target)
+        if s is None or t is None:
+            return False
+        return bool(self.descendants_mask[self.component[s]] >> t & 1)
+
+    def descendants(self, node_id: str) -> set[str]:
+        """Nodes reachable from node_id over at least one edge."""
+        return self._ids(self._strict(self.descendants_mask, node_id))
+
+    def ancestors(self, node_id: str) -> set[str]:
+        """Nodes that reach node_id over at least one edge."""
+        return self._ids(self._strict(self.ancestors_mask, node_id))
+
+    def common_ancestors(self, a: str, b: str) -> set[str]:
+        """Nodes that are ancestors of both a and b."""
+        return self._ids(
+            self._strict(self.ancestors_mask, a) & self._strict(self.ancestors_mask, b)
+        )
+
+    def between(self, source: str, target: str) -> set[str]:
+        """Nodes on some directed walk from source to target, endpoints included."""
+        s = self.index.get(source)
+        t = self.index.get(target)
+        if s is None or t is None or not self.reaches(source, target):
+            return set()
+        return self._ids(
+            self.descendants_mask[self.component[s]] & self.ancestors_mask[self.component[t]]
+        )
+
+    def path(self, source: str, target: str) -> list[str]:
+        """
+        A shortest directed path from source to target.
+
+        The BFS only expands nodes that can still reach the target.
+
+        Returns:
+            Node IDs from source to target, or [] if target is unreachable
+        """
+        if not self.reaches(source, target):
+            return []
+        s, t = self.index[source], self.index[target]
+        if s == t:
+            return [source]
+
+        useful = self.ancestors_mask[self.component[t]]
+        parent = {s: s}
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            for v in self.successors[u]:
+                if v in parent or not useful >> v & 1:
+                    continue
+                parent[v] = u
+                if v == t:
+                    path = [t]
+                    while path[-1] != s:
+                        path.append(parent[path[-1]])
+                    return [self.node_ids[i] for i in reversed(path)]
+                queue.append(v)
+        return []
+
+    def cycles(self) -> list[list[str]]:
+        """
+        One closed cycle per cyclic component.
+
+        Each cycle starts and ends at the component's first node, e.g.
+        ["a", "b", "a"]; a self-loop is reported as ["a", "a"].
+        """
+        cycles: list[list[str]] = []
+        for c, members in enumerate(self.members):
+            if not self.cyclic[c]:
+                continue
+            start = members[0]
+            parent: dict[int, int] = {}
+            queue = deque([start])
+            found = False
+            while queue and not found:
+                u = queue.popleft()
+                for v in self.successors[u]:
+                    if self.component[v] != c:
+                        continue
+                    if v == start:
+                        path = [start, u]
+                        while path[-1] != start:
+                            path.append(parent[path[-1]])
+                        cycles.append([self.node_ids[i] for i in reversed(path)])
+                        found = True
+                        break
+                    if v not in parent:
+                        parent[v] = u
+                        queue.append(v)
+        return cycles
+
+
+def get_reachability(
+    causal_graph: "CausalGraph",
+    source: Graph | None = None,
+    key: tuple[str, ...] = (),
+) -> ReachabilityIndex:
+    """
+    Reachability index of a causal graph, rebuilt when its edges change.
+
+    Args:
+        causal_graph: Graph whose cause -> effect edges are indexed
+        source: Entity graph the causal graph was derived from. The index is
+            also cached there, so rebuilding the causal view of an unchanged
+            graph reuses it.
+        key: Distinguishes causal views of the same source (e.g. the causal
+            edge types used)
+
+    Returns:
+        ReachabilityIndex over the causal graph's nodes and edges
+    """
+    signature = (len(causal_graph.nodes), len(causal_graph.edges))
+    entry = causal_graph.__dict__.get(_INSTANCE_ATTR)
+    if entry is not None and entry[0] == signature and entry[1] is causal_graph.edges:
+        return entry[2]
+
+    index = None
+    if source is not None:
+        cache = source.__dict__.setdefault(_CACHE_ATTR, {})
+        source_signature = (len(source.nodes), len(source.edges))
+        cached = cache.get((_INDEX_KEY, key))
+        if cached is not None and cached[0] == source_signature and cached[1] is source.edges:
+            index = cached[2]
+
+    if index is None:
+        index = ReachabilityIndex.from_edges(
+            (n.id for n in causal_graph.nodes),
+            ((e.cause, e.effect) for e in causal_graph.edges),
+        )
+        if source is not None:
+            cache[(_INDEX_KEY, key)] = (source_signature, source.edges, index)
+
+    causal_graph.__dict__[_INSTANCE_ATTR] = (signature, causal_graph.edges, index)
+    return index
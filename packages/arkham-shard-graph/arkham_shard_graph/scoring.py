@@ -7,11 +7,23 @@ into a unified importance score for graph entities.
 
 import logging
 import math
-from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any
 
+import numpy as np
+
+from .csr import (
+    BETWEENNESS_DEFAULT_SAMPLES,
+    BETWEENNESS_EXACT_MAX_NODES,
+    CSRGraph,
+    betweenness_centrality,
+    closeness_centrality,
+    eigenvector_centrality,
+    get_csr,
+    hits,
+    pagerank,
+)
 from .models import Graph, GraphNode
 
 logger = logging.getLogger(__name__)
@@ -243,30 +255,27 @@ class CompositeScorer:
 
         Supports: pagerank, betweenness, eigenvector, hits, closeness, degree
         """
-        node_ids = [n.id for n in graph.nodes]
-        n = len(node_ids)
-
-        if n == 0:
+        if not graph.nodes:
             return {}
 
-        # Build adjacency
-        adjacency = self._build_adjacency(graph)
+        # One CSR build per graph, shared with GraphAlgorithms
+        csr = get_csr(graph)
 
         if centrality_type == "degree":
             raw_scores = self._degree_centrality(graph)
         elif centrality_type == "betweenness":
-            raw_scores = self._betweenness_centrality(graph, adjacency)
-        elif centrality_type == "pagerank":
-            raw_scores = self._pagerank(graph, adjacency)
+            k = BETWEENNESS_DEFAULT_SAMPLES if csr.n > BETWEENNESS_EXACT_MAX_NODES else None
+            raw_scores = csr.to_dict(betweenness_centrality(csr, k=k))
         elif centrality_type == "eigenvector":
-            raw_scores = self._eigenvector_centrality(graph, adjacency)
+            raw_scores = csr.to_dict(eigenvector_centrality(csr))
         elif centrality_type == "hits":
-            raw_scores = self._hits_centrality(graph, adjacency)
+            # Authority scores are more useful for entity importance
+            raw_scores = csr.to_dict(hits(csr)[1])
         elif centrality_type == "closeness":
-            raw_scores = self._closeness_centrality(graph, adjacency)
+            raw_scores = self._closeness_centrality(csr)
         else:
-            # Default to PageRank
-            raw_scores = self._pagerank(graph, adjacency)
+            # PageRank (default)
+            raw_scores = csr.to_dict(pagerank(csr))
 
         # Normalize to 0-1 range
         max_score = max(raw_scores.values()) if raw_scores else 1.0
@@ -463,252 +472,19 @@ class CompositeScorer:
 
     # --- Centrality Algorithms ---
 
-    def _build_adjacency(self, graph: Graph) -> dict[str, list[tuple[str, float]]]:
-        """Build weighted adjacency list."""
-        adjacency: dict[str, list[tuple[str, float]]] = defaultdict(list)
-        for edge in graph.edges:
-            adjacency[edge.source].append((edge.target, edge.weight))
-            adjacency[edge.target].append((edge.source, edge.weight))
-        return adjacency
-
     def _degree_centrality(self, graph: Graph) -> dict[str, float]:
         """Simple degree centrality."""
         return {n.id: float(n.degree) for n in graph.nodes}
 
-    def _pagerank(
-        self,
-        graph: Graph,
-        adjacency: dict[str, list[tuple[str, float]]],
-        damping: float = 0.85,
-        max_iterations: int = 100,
-        tolerance: float = 1e-6
-    ) -> dict[str, float]:
-        """PageRank using power iteration."""
-        node_ids = [n.id for n in graph.nodes]
-        n = len(node_ids)
-
-        if n == 0:
-            return {}
-
-        # Out-degree
-        out_degree = {nid: len(adjacency.get(nid, [])) for nid in node_ids}
-
-        # Initialize
-        pagerank = {nid: 1.0 / n for nid in node_ids}
-
-        for _ in range(max_iterations):
-            new_pagerank = {}
-            max_diff = 0.0
-
-            for node_id in node_ids:
-                rank_sum = 0.0
-                for other_id in node_ids:
-                    neighbors = [n for n, _ in adjacency.get(other_id, [])]
-                    if node_id in neighbors and out_degree[other_id] > 0:
-                        rank_sum += pagerank[other_id] / out_degree[other_id]
-
-                new_rank = (1 - damping) / n + damping * rank_sum
-                new_pagerank[node_id] = new_rank
-                max_diff = max(max_diff, abs(new_rank - pagerank[node_id]))
-
-            pagerank = new_pagerank
-            if max_diff < tolerance:
-                break
-
-        return pagerank
-
-    def _betweenness_centrality(
-        self,
-        graph: Graph,
-        adjacency: dict[str, list[tuple[str, float]]]
-    ) -> dict[str, float]:
-        """Betweenness centrality (simplified)."""
-        from collections import deque
-
-        node_ids = [n.id for n in graph.nodes]
-        betweenness = defaultdict(float)
-
-        # Unweighted adjacency for BFS
-        adj_simple = {nid: [t for t, _ in neighbors] for nid, neighbors in adjacency.items()}
-
-        # Sample nodes for performance
-        sample_size = min(50, len(node_ids))
-        sample_nodes = node_ids[:sample_size]
-
-        for source in sample_nodes:
-            # BFS
-            queue = deque([source])
-            distances = {source: 0}
-            paths = {source: [[source]]}
-
-            while queue:
-                current = queue.popleft()
-                for neighbor in adj_simple.get(current, []):
-                    if neighbor not in distances:
-                        distances[neighbor] = distances[current] + 1
-                        paths[neighbor] = []
-                        queue.append(neighbor)
-
-                    if distances[neighbor] == distances[current] + 1:
-                        paths[neighbor].extend([p + [neighbor] for p in paths[current]])
-
-            # Count paths through each node
-            for target, target_paths in paths.items():
-                for path in target_paths:
-                    for node in path[1:-1]:  # Exclude source and target
-                        betweenness[node] += 1.0 / len(target_paths)
-
-        return dict(betweenness)
-
-    def _eigenvector_centrality(
-        self,
-        graph: Graph,
-        adjacency: dict[str, list[tuple[str, float]]],
-        max_iterations: int = 100,
-        tolerance: float = 1e-6
-    ) -> dict[str, float]:
-        """Eigenvector centrality using power iteration."""
-        node_ids = [n.id for n in graph.nodes]
-        n = len(node_ids)
-
-        if n == 0:
-            return {}
-
-        # Initialize
-        scores = {nid: 1.0 for nid in node_ids}
-
-        for _ in range(max_iterations):
-            new_scores = {}
-            max_diff = 0.0
-
-            for node_id in node_ids:
-                # Sum of neighbor scores weighted by edge weight
-                score_sum = 0.0
-                for neighbor, weight in adjacency.get(node_id, []):
-                    score_sum += scores.get(neighbor, 0.0) * weight
-
-                new_scores[node_id] = score_sum
-
-            # Normalize
-            norm = math.sqrt(sum(s * s for s in new_scores.values()))
-            if norm > 0:
-                new_scores = {k: v / norm for k, v in new_scores.items()}
-
-            # Check convergence
-            for node_id in node_ids:
-                max_diff = max(max_diff, abs(new_scores[node_id] - scores[node_id]))
-
-            scores = new_scores
-            if max_diff < tolerance:
-                break
-
-        return scores
-
-    def _hits_centrality(
-        self,
-        graph: Graph,
-        adjacency: dict[str, list[tuple[str, float]]],
-        max_iterations: int = 100,
-        tolerance: float = 1e-6
-    ) -> dict[str, float]:
-        """HITS algorithm (Hubs and Authorities) - returns authority scores."""
-        node_ids = [n.id for n in graph.nodes]
-        n = len(node_ids)
-
-        if n == 0:
-            return {}
-
-        # Initialize
-        hub_scores = {nid: 1.0 for nid in node_ids}
-        auth_scores = {nid: 1.0 for nid in node_ids}
-
-        # Build reverse adjacency (incoming edges)
-        reverse_adj: dict[str, list[tuple[str, float]]] = defaultdict(list)
-        for source, neighbors in adjacency.items():
-            for target, weight in neighbors:
-                reverse_adj[target].append((source, weight))
-
-        for _ in range(max_iterations):
-            # Update authority scores
-            new_auth = {}
-            for node_id in node_ids:
-                score = sum(hub_scores.get(src, 0.0) * w for src, w in reverse_adj.get(node_id, []))
-                new_auth[node_id] = score
-
-            # Normalize authority
-            norm = math.sqrt(sum(s * s for s in new_auth.values()))
-            if norm > 0:
-                new_auth = {k: v / norm for k, v in new_auth.items()}
-
-            # Update hub scores
-            new_hub = {}
-            for node_id in node_ids:
-                score = sum(new_auth.get(tgt, 0.0) * w for tgt, w in adjacency.get(node_id, []))
-                new_hub[node_id] = score
-
-            # Normalize hub
-            norm = math.sqrt(sum(s * s for s in new_hub.values()))
-            if norm > 0:
-                new_hub = {k: v / norm for k, v in new_hub.items()}
-
-            # Check convergence
-            max_diff = max(abs(new_auth[n] - auth_scores[n]) for n in node_ids)
-
-            hub_scores = new_hub
-            auth_scores = new_auth
-
-            if max_diff < tolerance:
-                break
-
-        # Return authority scores (more useful for entity importance)
-        return auth_scores
-
-    def _closeness_centrality(
-        self,
-        graph: Graph,
-        adjacency: dict[str, list[tuple[str, float]]]
-    ) -> dict[str, float]:
-        """Closeness centrality (inverse of average distance)."""
-        from collections import deque
-
-        node_ids = [n.id for n in graph.nodes]
-        n = len(node_ids)
-
-        if n == 0:
-            return {}
-
-        # Unweighted adjacency for BFS
-        adj_simple = {nid: [t for t, _ in neighbors] for nid, neighbors in adjacency.items()}
-
-        scores = {}
-
-        # Sample for performance
-        sample_size = min(50, n)
-
-        for node_id in node_ids[:sample_size]:
-            # BFS to find distances
-            distances = {node_id: 0}
-            queue = deque([node_id])
-
-            while queue:
-                current = queue.popleft()
-                for neighbor in adj_simple.get(current, []):
-                    if neighbor not in distances:
-                        distances[neighbor] = distances[current] + 1
-                        queue.append(neighbor)
-
-            # Closeness = (n-1) / sum of distances
-            reachable = len(distances) - 1
-            if reachable > 0:
-                avg_distance = sum(distances.values()) / reachable
-                scores[node_id] = 1.0 / avg_distance if avg_distance > 0 else 0.0
-            else:
-                scores[node_id] = 0.0
+    def _closeness_centrality(self, csr: CSRGraph, sample_size: int = 50) -> dict[str, float]:
+        """Closeness centrality (inverse of average distance), sampled."""
+        n = csr.n
+        sample = np.arange(min(sample_size, n))
+        sampled = closeness_centrality(csr, sample)
 
         # Fill in unsampled nodes with average
-        avg_score = sum(scores.values()) / len(scores) if scores else 0.0
-        for node_id in node_ids:
-            if node_id not in scores:
-                scores[node_id] = avg_score
-
-        return scores
+        avg_score = sum(sampled.values()) / len(sampled) if sampled else 0.0
+        return {
+            node_id: sampled.get(i, avg_score)
+            for i, node_id in enumerate(csr.node_ids)
+        }
@@ -1,7 +1,9 @@
 """Graph Shard - Entity relationship visualization and analysis."""
 
+import asyncio
 import json
 import logging
+from collections import defaultdict
 from datetime import datetime
 from typing import Any
 
@@ -9,12 +11,24 @@ from arkham_frame.shard_interface import ArkhamShard
 
 from .api import init_api, router
 from .builder import GraphBuilder
+from .cache import add_document_entities, merge_entities, remove_document
+from .communities import CommunityIndex
+from .cooccurrence import CooccurrenceIndex
 from .algorithms import GraphAlgorithms
 from .exporter import GraphExporter
+from .layout_service import LayoutService
 from .storage import GraphStorage
 
 logger = logging.getLogger(__name__)
 
+# Parse emits one entities.batch.created per document; documents ingested
+# within this window are applied to a project's cached graph together
+DELTA_DEBOUNCE_SECONDS = 0.5
+
+# Durable outbox consumer for document deletions (see EventBus.consume)
+DELETED_CONSUMER = "graph.documents-deleted"
+DELETED_BATCH_SIZE = 200
+
 # Database schema SQL
 GRAPH_SCHEMA_SQL = """
 -- Graph shard schema
@@ -133,6 +147,14 @@ class GraphShard(ArkhamShard):
         self.algorithms: GraphAlgorithms | None = None
         self.exporter: GraphExporter | None = None
         self.storage: GraphStorage | None = None
+        self.cooccurrence_index: CooccurrenceIndex | None = None
+        self.community_index: CommunityIndex | None = None
+        self.layout_service: LayoutService | None = None
+        self.delta_debounce = DELTA_DEBOUNCE_SECONDS
+
+        # project_id -> documents whose entities await one coalesced delta
+        self._pending_documents: dict[str, set[str]] = defaultdict(set)
+        self._delta_tasks: dict[str, asyncio.Task] = {}
 
         self._frame = None
         self._event_bus = None
@@ -169,17 +191,31 @@ class GraphShard(ArkhamShard):
             # Create database schema
             await self._create_schema()
 
+        # Materialized co-occurrence edges (falls back to direct queries if unavailable)
+        self.cooccurrence_index = CooccurrenceIndex(db_service=self._db_service)
+        if self._db_service:
+            await self.cooccurrence_index.initialize()
+
         # Create components
         self.builder = GraphBuilder(
             entities_service=self._entities_service,
             documents_service=self._documents_service,
             db_service=self._db_service,
+            cooccurrence_index=self.cooccurrence_index,
         )
 
         self.algorithms = GraphAlgorithms()
 
+        # Community assignments, persisted per graph version when possible
+        self.community_index = CommunityIndex(db_service=self._db_service)
+        if self._db_service:
+            await self.community_index.initialize()
+
         self.exporter = GraphExporter()
 
+        # Layouts run on a worker pool, cached per graph version
+        self.layout_service = LayoutService()
+
         self.storage = GraphStorage(
             db_service=self._db_service,
             get_tenant_id=self.get_tenant_id_or_none,
@@ -193,6 +229,8 @@ class GraphShard(ArkhamShard):
             storage=self.storage,
             event_bus=self._event_bus,
             db_service=self._db_service,
+            community_index=self.community_index,
+            layout_service=self.layout_service,
         )
 
         # Subscribe to events
@@ -213,15 +251,29 @@ class GraphShard(ArkhamShard):
         if self._event_bus:
             await self._unsubscribe_from_events()
 
+        for task in self._delta_tasks.values():
+            task.cancel()
+        self._delta_tasks.clear()
+        self._pending_documents.clear()
+
         # Clear storage cache
         if self.storage:
             self.storage.clear_cache()
 
+        if self.layout_service:
+            self.layout_service.shutdown()
+
+        if self.cooccurrence_index:
+            await self.cooccurrence_index.shutdown()
+
         # Clear components
         self.builder = None
         self.algorithms = None
         self.exporter = None
         self.storage = None
+        self.cooccurrence_index = None
+        self.community_index = None
+        self.layout_service = None
 
         logger.info("Graph Shard shutdown complete")
 
@@ -243,17 +295,34 @@ class GraphShard(ArkhamShard):
         )
 
         await self._event_bus.subscribe(
-            "entities.entity.merged",
-            self._on_entities_merged,
+            "entities.batch.created",
+            self._on_entities_batch_created,
         )
 
-        # Subscribe to document events
         await self._event_bus.subscribe(
-            "documents.document.deleted",
-            self._on_document_deleted,
+            "entities.entity.merged",
+            self._on_entities_merged,
         )
 
-        logger.info("Subscribed to events: entities.entity.created, entities.entity.merged, documents.document.deleted")
+        # Deletions are consumed from the outbox when it runs, so a delete
+        # committed while the shard was down is still applied on restart
+        if getattr(self._event_bus, "outbox", None) is not None:
+            self._event_bus.consume(
+                DELETED_CONSUMER,
+                "documents.document.deleted",
+                self._on_documents_deleted,
+                batch_size=DELETED_BATCH_SIZE,
+            )
+        else:
+            await self._event_bus.subscribe(
+                "documents.document.deleted",
+                self._on_document_deleted,
+            )
+
+        logger.info(
+            "Subscribed to events: entities.entity.created, entities.batch.created, "
+            "entities.entity.merged, documents.document.deleted"
+        )
 
     async def _unsubscribe_from_events(self) -> None:
         """Unsubscribe from events."""
@@ -261,8 +330,12 @@ class GraphShard(ArkhamShard):
             return
 
         await self._event_bus.unsubscribe("entities.entity.created", self._on_entity_created)
+        await self._event_bus.unsubscribe("entities.batch.created", self._on_entities_batch_created)
         await self._event_bus.unsubscribe("entities.entity.merged", self._on_entities_merged)
-        await self._event_bus.unsubscribe("documents.document.deleted", self._on_document_deleted)
+        if getattr(self._event_bus, "outbox", None) is not None:
+            self._event_bus.stop_consuming(DELETED_CONSUMER)
+        else:
+            await self._event_bus.unsubscribe("documents.document.deleted", self._on_document_deleted)
 
         logger.info("Unsubscribed from events")
 
@@ -272,45 +345,123 @@ class GraphShard(ArkhamShard):
         """
         Handle entity created event.
 
-        Invalidates graph cache for affected projects.
+        Entities extracted from a document are applied once per document via
+        entities.batch.created, so per-entity events carrying a document_id
+        are ignored; without one, the project's cached graph is dropped.
         """
-        entity_id = event_data.get("entity_id")
-        project_id = event_data.get("project_id")
+        payload = event_data.get("payload", event_data)
+        entity_id = payload.get("entity_id") or payload.get("id")
+        project_id = payload.get("project_id")
 
-        if not entity_id or not project_id:
+        if not entity_id or not self.storage:
             return
 
         logger.debug(f"Entity created: {entity_id} in project {project_id}")
 
-        # Invalidate cached graph
-        if self.storage and project_id in self.storage._cache:
-            del self.storage._cache[project_id]
-            logger.debug(f"Invalidated graph cache for project {project_id}")
+        if not payload.get("document_id") and project_id:
+            self.storage.invalidate(project_id)
+
+    async def _on_entities_batch_created(self, event_data: dict) -> None:
+        """
+        Handle entities batch created event.
+
+        Reindexes the document's co-occurrences and queues its entities for
+        the owning project's cached graph.
+        """
+        payload = event_data.get("payload", event_data)
+        document_id = payload.get("document_id")
+        if not document_id or not self.storage:
+            return
+
+        await self._reindex_cooccurrences(document_ids=[document_id])
+
+        project_id = payload.get("project_id")
+        if not project_id and self.builder:
+            project_id = await self.builder.get_document_project(document_id)
+        if not project_id:
+            logger.debug(f"Document {document_id} has no project; cached graphs left as is")
+            return
+
+        self._queue_document_entities(project_id, document_id)
+
+    def _queue_document_entities(self, project_id: str, document_id: str) -> None:
+        """Schedule a document's entities for the project's next coalesced delta."""
+        if not self.storage.cached_graphs(project_id):
+            return
+        self._pending_documents[project_id].add(document_id)
+        if project_id not in self._delta_tasks:
+            self._delta_tasks[project_id] = asyncio.create_task(
+                self._flush_document_entities(project_id)
+            )
+
+    async def _flush_document_entities(self, project_id: str) -> None:
+        """Apply every queued document of a project as one delta (one persist)."""
+        await asyncio.sleep(self.delta_debounce)
+        self._delta_tasks.pop(project_id, None)
+        document_ids = sorted(self._pending_documents.pop(project_id, ()))
+        if not document_ids or not self.storage or not self.builder:
+            return
+
+        try:
+            entities = {
+                document_id: await self.builder.get_document_entities(document_id)
+                for document_id in document_ids
+            }
+
+            def update(graph) -> bool:
+                changed = False
+                for document_id, document_entities in entities.items():
+                    if document_entities:
+                        changed |= add_document_entities(graph, document_id, document_entities)
+                return changed
+
+            updated = await self.storage.apply_delta(update, project_id)
+        except Exception as e:
+            logger.warning(f"Failed to apply entities of {len(document_ids)} document(s) to graph {project_id}: {e}")
+            return
+        if updated:
+            logger.debug(f"Applied entities of {len(document_ids)} document(s) to graph {project_id}")
+
+    async def _reindex_cooccurrences(
+        self,
+        document_ids: list[str] | None = None,
+        entity_ids: list[str] | None = None,
+    ) -> None:
+        """Rebuild materialized co-occurrences for changed documents or entities."""
+        if not self.cooccurrence_index:
+            return
+        try:
+            if document_ids:
+                await self.cooccurrence_index.index_documents(document_ids)
+            if entity_ids:
+                await self.cooccurrence_index.reindex_entities(entity_ids)
+        except Exception as e:
+            logger.warning(f"Failed to update co-occurrence index: {e}")
 
     async def _on_entities_merged(self, event_data: dict) -> None:
         """
         Handle entities merged event.
 
-        Updates graphs to merge nodes.
+        Folds the merged node into its canonical target in cached graphs.
         """
-        source_entity_id = event_data.get("source_entity_id")
-        target_entity_id = event_data.get("target_entity_id")
-        project_id = event_data.get("project_id")
+        payload = event_data.get("payload", event_data)
+        source_entity_id = payload.get("source_entity_id") or payload.get("source_id")
+        target_entity_id = payload.get("target_entity_id") or payload.get("target_id")
+        project_id = payload.get("project_id")
 
-        if not source_entity_id or not target_entity_id or not project_id:
+        if not source_entity_id or not target_entity_id or not self.storage:
             return
 
         logger.info(
             f"Entities merged: {source_entity_id} -> {target_entity_id} in project {project_id}"
         )
 
-        # Invalidate cached graph (rebuild will merge automatically)
-        if self.storage and project_id in self.storage._cache:
-            del self.storage._cache[project_id]
-            logger.debug(f"Invalidated graph cache for project {project_id}")
+        await self._reindex_cooccurrences(entity_ids=[source_entity_id, target_entity_id])
 
-        # TODO: More sophisticated merge that updates existing graph
-        # instead of invalidating cache
+        await self.storage.apply_delta(
+            lambda graph: merge_entities(graph, source_entity_id, target_entity_id),
+            project_id,
+        )
 
     async def _on_document_deleted(self, event_data: dict) -> None:
         """
@@ -318,18 +469,52 @@ class GraphShard(ArkhamShard):
 
         Updates edge weights and removes orphaned edges.
         """
-        doc_id = event_data.get("document_id")
-        project_id = event_data.get("project_id")
+        payload = event_data.get("payload", event_data)
+        doc_id = payload.get("document_id")
+        project_id = payload.get("project_id")
 
-        if not doc_id or not project_id:
+        if not doc_id or not self.storage:
             return
 
         logger.debug(f"Document deleted: {doc_id} in project {project_id}")
 
-        # Invalidate cached graph (rebuild will exclude deleted document)
-        if self.storage and project_id in self.storage._cache:
-            del self.storage._cache[project_id]
-            logger.debug(f"Invalidated graph cache for project {project_id}")
+        try:
+            await self._remove_documents({project_id: {doc_id}})
+        except Exception as e:
+            logger.warning(f"Failed to remove deleted document {doc_id} from graphs: {e}")
+
+    async def _on_documents_deleted(self, events: list) -> None:
+        """
+        Handle a batch of document deleted events from the outbox.
+
+        Raising leaves the consumer's cursor in place, so the batch is
+        retried.
+        """
+        by_project: dict[str | None, set[str]] = defaultdict(set)
+        for event in events:
+            if event.payload.get("document_id"):
+                by_project[event.payload.get("project_id")].add(event.payload["document_id"])
+
+        if not by_project or not self.storage:
+            return
+
+        logger.debug(f"Documents deleted: {sum(len(d) for d in by_project.values())}")
+        await self._remove_documents(by_project)
+
+    async def _remove_documents(self, by_project: dict[str | None, set[str]]) -> None:
+        """Drop deleted documents from the co-occurrence index and cached graphs."""
+        document_ids = sorted(set().union(*by_project.values()))
+        try:
+            if self.cooccurrence_index:
+                await self.cooccurrence_index.remove_documents(document_ids)
+        finally:
+            for project_id, project_documents in by_project.items():
+                await self.storage.apply_delta(
+                    lambda graph, docs=sorted(project_documents): any(
+                        [remove_document(graph, doc_id) for doc_id in docs]
+                    ),
+                    project_id,
+                )
 
     # --- Public API for other shards ---
 
@@ -414,7 +599,7 @@ class GraphShard(ArkhamShard):
 
         Args:
             project_id: Project ID
-            metric: Centrality metric (degree, betweenness, pagerank)
+            metric: Centrality metric (degree, betweenness, pagerank, eigenvector, hits)
             limit: Top N results
 
         Returns:
@@ -433,6 +618,10 @@ class GraphShard(ArkhamShard):
             results = self.algorithms.calculate_betweenness_centrality(graph, limit)
         elif metric == "pagerank":
             results = self.algorithms.calculate_pagerank(graph, limit)
+        elif metric == "eigenvector":
+            results = self.algorithms.calculate_eigenvector_centrality(graph, limit)
+        elif metric == "hits":
+            results = self.algorithms.calculate_hits(graph, limit)
         else:
             raise ValueError(f"Unknown metric: {metric}")
 
@@ -455,20 +644,20 @@ class GraphShard(ArkhamShard):
         Returns:
             Tuple of (communities list, modularity score)
         """
-        if not self.algorithms or not self.storage:
+        if not self.community_index or not self.storage:
             raise RuntimeError("Graph Shard not initialized")
 
         # Load graph
         graph = await self.storage.load_graph(project_id)
 
-        # Detect communities
-        communities, modularity = self.algorithms.detect_communities_louvain(
+        # Stored assignments are reused or refreshed incrementally
+        communities, assignment = await self.community_index.get_communities(
             graph=graph,
-            min_community_size=min_size,
             resolution=resolution,
+            min_community_size=min_size,
         )
 
-        return communities, modularity
+        return communities, assignment.modularity
 
     async def get_neighbors(
         self,
@@ -636,6 +825,15 @@ class GraphShard(ArkhamShard):
                 ON arkham_graph.annotations(tenant_id)
             """)
 
+            # ===========================================
+            # Incremental Persistence Migration
+            # ===========================================
+            await self._db_service.execute("""
+                ALTER TABLE arkham_graph.graphs ADD COLUMN IF NOT EXISTS version BIGINT DEFAULT 0;
+                ALTER TABLE arkham_graph.nodes ADD COLUMN IF NOT EXISTS row_hash TEXT;
+                ALTER TABLE arkham_graph.edges ADD COLUMN IF NOT EXISTS row_hash TEXT;
+            """)
+
             logger.info("Graph database schema created/verified")
         except Exception as e:
             logger.error(f"Failed to create graph schema: {e}", exc_info=True)
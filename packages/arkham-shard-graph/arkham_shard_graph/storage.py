@@ -1,11 +1,13 @@
 """Graph storage - persist and retrieve graphs from database."""
 
+import hashlib
 import json
 import logging
-import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Callable
 
+from .cache import DEFAULT_MAX_BYTES, GraphCache
 from .models import Graph, GraphNode, GraphEdge
 
 logger = logging.getLogger(__name__)
@@ -27,6 +29,143 @@ def _parse_jsonb(value: Any, default: Any = None) -> Any:
     return default if default is not None else {}
 
 
+# Persisted row layouts; row_hash is always last so diffs can read it by position
+NODE_COLUMNS = [
+    "id", "graph_id", "entity_id", "entity_type", "label", "document_count",
+    "degree", "properties", "created_at", "row_hash",
+]
+EDGE_COLUMNS = [
+    "id", "graph_id", "source_id", "target_id", "relationship_type", "weight",
+    "co_occurrence_count", "document_ids", "properties", "created_at", "row_hash",
+]
+
+
+def _row_hash(*values: Any) -> str:
+    """Fingerprint a row's persisted content (created_at excluded)."""
+    payload = json.dumps(values, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def edge_row_id(graph_id: str, edge: GraphEdge, ordinal: int = 0) -> str:
+    """
+    Deterministic row id for an edge.
+
+    The graph is undirected, so endpoints are ordered before hashing; an
+    unchanged edge keeps its row across rebuilds and saves. Parallel edges
+    of one type are told apart by the record they came from
+    (properties["original_id"]), else by their ordinal among duplicates.
+    """
+    a, b = sorted((edge.source, edge.target))
+    parts = [graph_id, a, b, edge.relationship_type or ""]
+    original_id = (edge.properties or {}).get("original_id")
+    if original_id is not None:
+        parts.append(str(original_id))
+    if ordinal:
+        parts.append(f"#{ordinal}")
+    key = "\x1f".join(parts)
+    return f"edge-{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}"
+
+
+def _columns(columns: list[str], tenant_id: str | None) -> list[str]:
+    """Row columns, with tenant_id appended when tenant context is set."""
+    return [*columns[:-1], "tenant_id", columns[-1]] if tenant_id else list(columns)
+
+
+def _node_rows(graph: Graph, graph_id: str, now: datetime, tenant_id: str | None) -> dict[str, tuple]:
+    """Build node records keyed by row id (last duplicate wins)."""
+    rows: dict[str, tuple] = {}
+    for node in graph.nodes:
+        properties = node.properties or {}
+        row_hash = _row_hash(
+            node.entity_id, node.entity_type, node.label,
+            node.document_count, node.degree, json.dumps(properties, sort_keys=True),
+        )
+        row = (
+            node.id, graph_id, node.entity_id, node.entity_type, node.label,
+            node.document_count, node.degree, properties, node.created_at or now,
+        )
+        rows[node.id] = (*row, tenant_id, row_hash) if tenant_id else (*row, row_hash)
+    return rows
+
+
+def _edge_rows(graph: Graph, graph_id: str, now: datetime, tenant_id: str | None) -> dict[str, tuple]:
+    """Build edge records keyed by deterministic row id."""
+    rows: dict[str, tuple] = {}
+    for edge in graph.edges:
+        edge_id = edge_row_id(graph_id, edge)
+        ordinal = 0
+        while edge_id in rows:
+            ordinal += 1
+            edge_id = edge_row_id(graph_id, edge, ordinal)
+        document_ids = list(edge.document_ids or [])
+        properties = edge.properties or {}
+        row_hash = _row_hash(
+            edge.source, edge.target, edge.relationship_type, edge.weight,
+            edge.co_occurrence_count, json.dumps(document_ids), json.dumps(properties, sort_keys=True),
+        )
+        row = (
+            edge_id, graph_id, edge.source, edge.target, edge.relationship_type,
+            edge.weight, edge.co_occurrence_count, document_ids, properties,
+            edge.created_at or now,
+        )
+        rows[edge_id] = (*row, tenant_id, row_hash) if tenant_id else (*row, row_hash)
+    return rows
+
+
+def _upsert_sql(table: str, columns: list[str], source: str) -> str:
+    """INSERT ... ON CONFLICT statement that refreshes everything but id and created_at."""
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c not in ("id", "created_at"))
+    return (
+        f"INSERT INTO arkham_graph.{table} ({', '.join(columns)}) {source} "
+        f"ON CONFLICT (id) DO UPDATE SET {updates}"
+    )
+
+
+@dataclass
+class GraphDiff:
+    """Row-level changes between an in-memory graph and its stored version."""
+    node_upserts: list[tuple] = field(default_factory=list)
+    node_deletes: list[str] = field(default_factory=list)
+    edge_upserts: list[tuple] = field(default_factory=list)
+    edge_deletes: list[str] = field(default_factory=list)
+    metadata_changed: bool = False
+
+    @classmethod
+    def compute(
+        cls,
+        node_rows: dict[str, tuple],
+        stored_nodes: dict[str, str | None],
+        edge_rows: dict[str, tuple],
+        stored_edges: dict[str, str | None],
+        metadata_changed: bool = False,
+    ) -> "GraphDiff":
+        """Diff new records against stored {row id: row_hash} maps."""
+        return cls(
+            node_upserts=[r for i, r in node_rows.items() if stored_nodes.get(i) != r[-1]],
+            node_deletes=[i for i in stored_nodes if i not in node_rows],
+            edge_upserts=[r for i, r in edge_rows.items() if stored_edges.get(i) != r[-1]],
+            edge_deletes=[i for i in stored_edges if i not in edge_rows],
+            metadata_changed=metadata_changed,
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not (
+            self.node_upserts or self.node_deletes
+            or self.edge_upserts or self.edge_deletes
+            or self.metadata_changed
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "nodes_upserted": len(self.node_upserts),
+            "nodes_deleted": len(self.node_deletes),
+            "edges_upserted": len(self.edge_upserts),
+            "edges_deleted": len(self.edge_deletes),
+            "metadata_changed": self.metadata_changed,
+        }
+
+
 class GraphStorage:
     """
     Storage service for graphs.
@@ -34,16 +173,25 @@ class GraphStorage:
     Provides in-memory caching with database persistence.
     """
 
-    def __init__(self, db_service=None, get_tenant_id: Callable[[], Any] | None = None):
+    def __init__(
+        self,
+        db_service=None,
+        get_tenant_id: Callable[[], Any] | None = None,
+        cache_max_bytes: int = DEFAULT_MAX_BYTES,
+        cache_max_graphs: int | None = None,
+    ):
         """
         Initialize graph storage.
 
         Args:
             db_service: Database service for persistence
             get_tenant_id: Optional callback to get current tenant_id for multi-tenancy
+            cache_max_bytes: Memory budget for cached graphs (LRU eviction beyond it)
+            cache_max_graphs: Optional cap on the number of cached graphs
         """
         self.db_service = db_service
-        self._cache: dict[str, Graph] = {}  # In-memory cache: project_id -> Graph
+        # In-memory cache: project_id -> Graph
+        self._cache = GraphCache(max_bytes=cache_max_bytes, max_graphs=cache_max_graphs)
         self._get_tenant_id = get_tenant_id
 
     def _get_current_tenant_id(self) -> str | None:
@@ -61,16 +209,18 @@ class GraphStorage:
             graph: Graph to save
         """
         # Cache in memory
+        previous = self._cache.get(graph.project_id)
         self._cache[graph.project_id] = graph
 
         # Persist to database if available
         if self.db_service:
             try:
                 await self._persist_graph(graph)
-                logger.info(f"Graph persisted for project {graph.project_id}")
+                logger.info(f"Graph persisted for project {graph.project_id} (v{graph.version})")
             except Exception as e:
                 logger.error(f"Error persisting graph: {e}", exc_info=True)
         else:
+            graph.version = max(graph.version, previous.version if previous else 0) + 1
             logger.debug(f"Graph cached for project {graph.project_id} (no persistence)")
 
     async def load_graph(self, project_id: str) -> Graph:
@@ -87,9 +237,10 @@ class GraphStorage:
             ValueError: If graph not found
         """
         # Check cache first
-        if project_id in self._cache:
+        graph = self._cache.lookup(project_id)
+        if graph is not None:
             logger.debug(f"Graph loaded from cache for project {project_id}")
-            return self._cache[project_id]
+            return graph
 
         # Load from database
         if self.db_service:
@@ -223,15 +374,65 @@ class GraphStorage:
         self._cache.clear()
         logger.info("Graph cache cleared")
 
-    async def _persist_graph(self, graph: Graph) -> None:
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Get graph cache occupancy and hit/miss/eviction metrics."""
+        return self._cache.get_stats()
+
+    def cached_graphs(self, project_id: str | None = None) -> list[Graph]:
+        """Cached graphs for one project, or all of them."""
+        if project_id is not None:
+            graph = self._cache.get(project_id)
+            return [graph] if graph is not None else []
+        return list(self._cache.values())
+
+    def invalidate(self, project_id: str) -> None:
+        """Drop a project's graph from the cache (the stored copy is kept)."""
+        if self._cache.invalidate(project_id):
+            logger.debug(f"Invalidated graph cache for project {project_id}")
+
+    async def apply_delta(
+        self,
+        update: Callable[[Graph], bool],
+        project_id: str | None = None,
+    ) -> int:
+        """
+        Apply an in-place update to cached graphs and persist what changed.
+
+        Args:
+            update: Mutates a graph and returns True if it changed
+            project_id: Limit to one project's graph (default: all cached)
+
+        Returns:
+            Number of graphs updated
         """
-        Persist graph to database.
+        updated = 0
+        for graph in self.cached_graphs(project_id):
+            if not update(graph):
+                continue
+            self._cache.mark_updated(graph.project_id)
+            # Persistence is diff-based, so this only writes the delta
+            await self.save_graph(graph)
+            updated += 1
+        return updated
+
+    async def _persist_graph(self, graph: Graph) -> GraphDiff | None:
+        """
+        Persist graph to database incrementally.
+
+        Rows are diffed against the stored version by content hash, so the
+        write cost is proportional to what changed rather than to graph size.
+        In one transaction, new and changed rows are bulk-loaded into staging
+        tables and merged, removed rows are deleted set-wise, and the graph
+        version is bumped.
 
         Args:
             graph: Graph to persist
+
+        Returns:
+            The applied diff, or None without a database
         """
         if not self.db_service:
-            return
+            return None
 
         graph_id = f"graph-{graph.project_id}"
         now = datetime.utcnow()
@@ -239,122 +440,127 @@ class GraphStorage:
         # Get tenant_id for multi-tenancy
         tenant_id = self._get_current_tenant_id()
 
-        # Build query with optional tenant filtering
-        check_query = "SELECT id FROM arkham_graph.graphs WHERE project_id = :project_id"
-        check_params: dict[str, Any] = {"project_id": graph.project_id}
-        if tenant_id:
-            check_query += " AND tenant_id = :tenant_id"
-            check_params["tenant_id"] = tenant_id
+        node_rows = _node_rows(graph, graph_id, now, tenant_id)
+        edge_rows = _edge_rows(graph, graph_id, now, tenant_id)
+        metadata = graph.metadata or {}
 
-        # Check if graph exists
-        existing = await self.db_service.fetch_one(check_query, check_params)
+        async with self.db_service.transaction() as tx:
+            diff, version = await self._apply_diff(
+                tx, graph, graph_id, node_rows, edge_rows, metadata, now, tenant_id
+            )
 
-        if existing:
-            # Delete existing nodes and edges (cascade will handle it)
-            delete_query = "DELETE FROM arkham_graph.graphs WHERE project_id = :project_id"
-            delete_params: dict[str, Any] = {"project_id": graph.project_id}
+        graph.version = version
+        logger.debug(
+            f"Persisted graph {graph_id} v{version}: {len(node_rows)} nodes, "
+            f"{len(edge_rows)} edges ({diff.to_dict()})"
+        )
+        return diff
+
+    async def _apply_diff(
+        self,
+        tx,
+        graph: Graph,
+        graph_id: str,
+        node_rows: dict[str, tuple],
+        edge_rows: dict[str, tuple],
+        metadata: dict[str, Any],
+        now: datetime,
+        tenant_id: str | None,
+    ) -> tuple["GraphDiff", int]:
+        """Apply the diff inside an open database transaction."""
+        head_query = "SELECT id, version, metadata FROM arkham_graph.graphs WHERE project_id = :project_id"
+        head_params: dict[str, Any] = {"project_id": graph.project_id}
+        if tenant_id:
+            head_query += " AND tenant_id = :tenant_id"
+            head_params["tenant_id"] = tenant_id
+
+        # Lock the graph row so concurrent saves serialize on the diff
+        head = await tx.fetch_one(head_query + " FOR UPDATE", head_params)
+
+        if head:
+            graph_id = head["id"]
+            stored_nodes = {
+                r["id"]: r["row_hash"]
+                for r in await tx.fetch_all(
+                    "SELECT id, row_hash FROM arkham_graph.nodes WHERE graph_id = :graph_id",
+                    {"graph_id": graph_id},
+                )
+            }
+            stored_edges = {
+                r["id"]: r["row_hash"]
+                for r in await tx.fetch_all(
+                    "SELECT id, row_hash FROM arkham_graph.edges WHERE graph_id = :graph_id",
+                    {"graph_id": graph_id},
+                )
+            }
+        else:
+            stored_nodes, stored_edges = {}, {}
+            insert_params: dict[str, Any] = {
+                "id": graph_id,
+                "project_id": graph.project_id,
+                "created_at": graph.created_at or now,
+                "updated_at": now,
+                "metadata": json.dumps(metadata),
+                "version": 0,
+            }
             if tenant_id:
-                delete_query += " AND tenant_id = :tenant_id"
-                delete_params["tenant_id"] = tenant_id
-            await self.db_service.execute(delete_query, delete_params)
-
-        # Insert graph record with tenant_id
-        insert_params: dict[str, Any] = {
-            "id": graph_id,
-            "project_id": graph.project_id,
-            "node_count": len(graph.nodes),
-            "edge_count": len(graph.edges),
-            "created_at": graph.created_at or now,
-            "updated_at": now,
-            "metadata": json.dumps(graph.metadata or {}),
-        }
+                insert_params["tenant_id"] = tenant_id
+            placeholders = ", ".join(
+                "CAST(:metadata AS jsonb)" if k == "metadata" else f":{k}" for k in insert_params
+            )
+            await tx.execute(
+                f"INSERT INTO arkham_graph.graphs ({', '.join(insert_params)}) VALUES ({placeholders})",
+                insert_params,
+            )
 
-        if tenant_id:
-            await self.db_service.execute(
-                """
-                INSERT INTO arkham_graph.graphs (id, project_id, node_count, edge_count, created_at, updated_at, metadata, tenant_id)
-                VALUES (:id, :project_id, :node_count, :edge_count, :created_at, :updated_at, :metadata, :tenant_id)
-                """,
-                {**insert_params, "tenant_id": tenant_id}
+        diff = GraphDiff.compute(
+            node_rows, stored_nodes, edge_rows, stored_edges,
+            metadata_changed=head is None or _parse_jsonb(head["metadata"], {}) != metadata,
+        )
+        if diff.is_empty:
+            return diff, head["version"] or 0
+
+        for table, columns, records in (
+            ("nodes", _columns(NODE_COLUMNS, tenant_id), diff.node_upserts),
+            ("edges", _columns(EDGE_COLUMNS, tenant_id), diff.edge_upserts),
+        ):
+            if not records:
+                continue
+            stage = f"arkham_graph_{table}_stage"
+            await tx.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {stage} "
+                f"(LIKE arkham_graph.{table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
             )
-        else:
-            await self.db_service.execute(
-                """
-                INSERT INTO arkham_graph.graphs (id, project_id, node_count, edge_count, created_at, updated_at, metadata)
-                VALUES (:id, :project_id, :node_count, :edge_count, :created_at, :updated_at, :metadata)
-                """,
-                insert_params
+            await tx.copy_records(stage, columns, records)
+            await tx.execute(
+                _upsert_sql(table, columns, f"SELECT {', '.join(columns)} FROM {stage}")
             )
 
-        # Insert nodes in batches
-        if graph.nodes:
-            for node in graph.nodes:
-                node_params: dict[str, Any] = {
-                    "id": node.id,
-                    "graph_id": graph_id,
-                    "entity_id": node.entity_id,
-                    "entity_type": node.entity_type,
-                    "label": node.label,
-                    "document_count": node.document_count,
-                    "degree": node.degree,
-                    "properties": json.dumps(node.properties or {}),
-                    "created_at": node.created_at or now,
-                }
-                if tenant_id:
-                    await self.db_service.execute(
-                        """
-                        INSERT INTO arkham_graph.nodes
-                        (id, graph_id, entity_id, entity_type, label, document_count, degree, properties, created_at, tenant_id)
-                        VALUES (:id, :graph_id, :entity_id, :entity_type, :label, :document_count, :degree, :properties, :created_at, :tenant_id)
-                        """,
-                        {**node_params, "tenant_id": tenant_id}
-                    )
-                else:
-                    await self.db_service.execute(
-                        """
-                        INSERT INTO arkham_graph.nodes
-                        (id, graph_id, entity_id, entity_type, label, document_count, degree, properties, created_at)
-                        VALUES (:id, :graph_id, :entity_id, :entity_type, :label, :document_count, :degree, :properties, :created_at)
-                        """,
-                        node_params
-                    )
-
-        # Insert edges in batches
-        if graph.edges:
-            for edge in graph.edges:
-                edge_id = f"edge-{uuid.uuid4().hex[:8]}"
-                edge_params: dict[str, Any] = {
-                    "id": edge_id,
-                    "graph_id": graph_id,
-                    "source_id": edge.source,
-                    "target_id": edge.target,
-                    "relationship_type": edge.relationship_type,
-                    "weight": edge.weight,
-                    "co_occurrence_count": edge.co_occurrence_count,
-                    "document_ids": json.dumps(edge.document_ids or []),
-                    "properties": json.dumps(edge.properties or {}),
-                    "created_at": edge.created_at or now,
-                }
-                if tenant_id:
-                    await self.db_service.execute(
-                        """
-                        INSERT INTO arkham_graph.edges
-                        (id, graph_id, source_id, target_id, relationship_type, weight, co_occurrence_count, document_ids, properties, created_at, tenant_id)
-                        VALUES (:id, :graph_id, :source_id, :target_id, :relationship_type, :weight, :co_occurrence_count, :document_ids, :properties, :created_at, :tenant_id)
-                        """,
-                        {**edge_params, "tenant_id": tenant_id}
-                    )
-                else:
-                    await self.db_service.execute(
-                        """
-                        INSERT INTO arkham_graph.edges
-                        (id, graph_id, source_id, target_id, relationship_type, weight, co_occurrence_count, document_ids, properties, created_at)
-                        VALUES (:id, :graph_id, :source_id, :target_id, :relationship_type, :weight, :co_occurrence_count, :document_ids, :properties, :created_at)
-                        """,
-                        edge_params
-                    )
-
-        logger.debug(f"Persisted graph {graph_id}: {len(graph.nodes)} nodes, {len(graph.edges)} edges")
+        for table, ids in (("edges", diff.edge_deletes), ("nodes", diff.node_deletes)):
+            if ids:
+                await tx.execute(
+                    f"DELETE FROM arkham_graph.{table} WHERE graph_id = :graph_id AND id = ANY(:ids)",
+                    {"graph_id": graph_id, "ids": ids},
+                )
+
+        updated = await tx.fetch_one(
+            """
+            UPDATE arkham_graph.graphs
+            SET node_count = :node_count, edge_count = :edge_count,
+                metadata = CAST(:metadata AS jsonb),
+                updated_at = :updated_at, version = COALESCE(version, 0) + 1
+            WHERE id = :id
+            RETURNING version
+            """,
+            {
+                "id": graph_id,
+                "node_count": len(node_rows),
+                "edge_count": len(edge_rows),
+                "metadata": json.dumps(metadata),
+                "updated_at": now,
+            },
+        )
+        return diff, updated["version"]
 
     async def _load_from_db(self, project_id: str) -> Graph | None:
         """
@@ -373,7 +579,7 @@ class GraphStorage:
         tenant_id = self._get_current_tenant_id()
 
         # Load graph metadata with tenant filtering
-        query = "SELECT id, project_id, node_count, edge_count, created_at, updated_at, metadata FROM arkham_graph.graphs WHERE project_id = :project_id"
+        query = "SELECT id, project_id, node_count, edge_count, created_at, updated_at, metadata, version FROM arkham_graph.graphs WHERE project_id = :project_id"
         params: dict[str, Any] = {"project_id": project_id}
 
         if tenant_id:
@@ -451,6 +657,7 @@ class GraphStorage:
             metadata=_parse_jsonb(graph_row["metadata"], {}),
             created_at=graph_row["created_at"],
             updated_at=graph_row["updated_at"],
+            version=graph_row.get("version") or 0,
         )
 
         logger.debug(f"Loaded graph from DB: {len(nodes)} nodes, {len(edges)} edges")
@@ -5,6 +5,10 @@ This module provides functionality to:
 - Track network evolution with added/removed nodes and edges
 - Calculate temporal metrics (growth rate, churn)
 - Support time-slider visualization in the frontend
+
+Series of snapshots are produced by replaying entity mentions in time
+order (TemporalSweep): one scan of the mentions table yields every
+snapshot, instead of one full graph query per snapshot.
 """
 
 import logging
@@ -12,7 +16,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any
 
-from .models import Graph, GraphNode, GraphEdge
+from .models import Graph, GraphNode, GraphEdge, RelationshipType
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +39,9 @@ class TemporalSnapshot:
     edge_count: int = 0
     density: float = 0.0
 
+    # Degree change per node since previous snapshot (only if requested)
+    degree_deltas: dict[str, int] = field(default_factory=dict)
+
     def to_dict(self) -> dict[str, Any]:
         """Convert snapshot to dictionary for API response."""
         return {
@@ -48,9 +55,169 @@ class TemporalSnapshot:
             "node_count": self.node_count,
             "edge_count": self.edge_count,
             "density": self.density,
+            "degree_deltas": self.degree_deltas,
         }
 
 
+def _density(node_count: int, edge_count: int) -> float:
+    max_edges = node_count * (node_count - 1) / 2 if node_count > 1 else 1
+    return edge_count / max_edges if max_edges > 0 else 0.0
+
+
+class TemporalSweep:
+    """
+    Event-sourced co-occurrence graph for sweeping forward in time.
+
+    Mentions are applied with add() as they enter the time window and
+    remove() as they leave it. An entity is a node while it has a mention
+    in the window; two entities are connected while both have a mention in
+    a shared document. snapshot() materializes the current state and the
+    node/edge/degree changes since the previous snapshot, so cost is
+    proportional to the mentions replayed plus the snapshots emitted.
+    """
+
+    def __init__(self, entity_info: dict[str, dict[str, Any]] | None = None):
+        """
+        Args:
+            entity_info: entity_id -> {label, entity_type, document_count, metadata}
+        """
+        self.entity_info = entity_info or {}
+
+        self._mentions: dict[tuple[str, str], int] = {}   # (entity, doc) -> mentions in window
+        self._entity_mentions: dict[str, int] = {}
+        self._doc_entities: dict[str, set[str]] = {}
+        self._pair_docs: dict[tuple[str, str], set[str]] = {}
+        self._degree: dict[str, int] = {}
+        self._node_first_seen: dict[str, datetime] = {}
+        self._edge_first_seen: dict[tuple[str, str], datetime] = {}
+
+        # Pre-change state of everything touched since the last snapshot
+        self._node_was_present: dict[str, bool] = {}
+        self._edge_was_present: dict[tuple[str, str], bool] = {}
+        self._degree_before: dict[str, int] = {}
+
+    def add(self, entity_id: str, document_id: str, seen_at: datetime) -> None:
+        """Apply a mention entering the window."""
+        key = (entity_id, document_id)
+        count = self._mentions.get(key, 0)
+        self._mentions[key] = count + 1
+
+        total = self._entity_mentions.get(entity_id, 0)
+        if total == 0:
+            self._node_was_present.setdefault(entity_id, False)
+            self._node_first_seen[entity_id] = seen_at
+        self._entity_mentions[entity_id] = total + 1
+
+        if count:
+            return
+
+        doc_entities = self._doc_entities.setdefault(document_id, set())
+        for other in doc_entities:
+            pair = (entity_id, other) if entity_id < other else (other, entity_id)
+            docs = self._pair_docs.get(pair)
+            if not docs:
+                docs = self._pair_docs[pair] = set()
+                self._edge_was_present.setdefault(pair, False)
+                self._edge_first_seen[pair] = seen_at
+                self._bump_degree(entity_id, 1)
+                self._bump_degree(other, 1)
+            docs.add(document_id)
+        doc_entities.add(entity_id)
+
+    def remove(self, entity_id: str, document_id: str) -> None:
+        """Apply a mention leaving the window."""
+        key = (entity_id, document_id)
+        count = self._mentions.get(key, 0)
+        if not count:
+            return
+
+        total = self._entity_mentions[entity_id] - 1
+        if total == 0:
+            self._node_was_present.setdefault(entity_id, True)
+            del self._entity_mentions[entity_id]
+            del self._node_first_seen[entity_id]
+        else:
+            self._entity_mentions[entity_id] = total
+
+        if count > 1:
+            self._mentions[key] = count - 1
+            return
+        del self._mentions[key]
+
+        doc_entities = self._doc_entities[document_id]
+        doc_entities.discard(entity_id)
+        for other in doc_entities:
+            pair = (entity_id, other) if entity_id < other else (other, entity_id)
+            docs = self._pair_docs[pair]
+            docs.discard(document_id)
+            if not docs:
+                self._edge_was_present.setdefault(pair, True)
+                del self._pair_docs[pair]
+                del self._edge_first_seen[pair]
+                self._bump_degree(entity_id, -1)
+                self._bump_degree(other, -1)
+        if not doc_entities:
+            del self._doc_entities[document_id]
+
+    def _bump_degree(self, entity_id: str, delta: int) -> None:
+        degree = self._degree.get(entity_id, 0)
+        self._degree_before.setdefault(entity_id, degree)
+        self._degree[entity_id] = degree + delta
+
+    def snapshot(self, timestamp: datetime, degree_deltas: bool = False) -> TemporalSnapshot:
+        """Materialize the current graph and the changes since the last snapshot."""
+        nodes = []
+        for entity_id in self._entity_mentions:
+            info = self.entity_info.get(entity_id, {})
+            nodes.append(GraphNode(
+                id=entity_id,
+                entity_id=entity_id,
+                label=info.get("label") or "Unknown",
+                entity_type=info.get("entity_type") or "unknown",
+                document_count=info.get("document_count") or 0,
+                degree=self._degree.get(entity_id, 0),
+                properties=info.get("metadata") or {},
+                created_at=self._node_first_seen[entity_id],
+            ))
+
+        edges = []
+        for (source, target), docs in self._pair_docs.items():
+            count = len(docs)
+            edges.append(GraphEdge(
+                source=source,
+                target=target,
+                relationship_type=RelationshipType.MENTIONED_WITH.value,
+                weight=min(1.0, count / 10.0),
+                document_ids=sorted(docs),
+                co_occurrence_count=count,
+                created_at=self._edge_first_seen[(source, target)],
+            ))
+
+        snapshot = TemporalSnapshot(
+            timestamp=timestamp,
+            nodes=nodes,
+            edges=edges,
+            added_nodes=[n for n, was in self._node_was_present.items() if not was and n in self._entity_mentions],
+            removed_nodes=[n for n, was in self._node_was_present.items() if was and n not in self._entity_mentions],
+            added_edges=[e for e, was in self._edge_was_present.items() if not was and e in self._pair_docs],
+            removed_edges=[e for e, was in self._edge_was_present.items() if was and e not in self._pair_docs],
+            node_count=len(nodes),
+            edge_count=len(edges),
+            density=_density(len(nodes), len(edges)),
+        )
+        if degree_deltas:
+            snapshot.degree_deltas = {
+                n: self._degree.get(n, 0) - before
+                for n, before in self._degree_before.items()
+                if self._degree.get(n, 0) != before
+            }
+
+        self._node_was_present.clear()
+        self._edge_was_present.clear()
+        self._degree_before.clear()
+        return snapshot
+
+
 @dataclass
 class TemporalRange:
     """Time range for temporal analysis."""
@@ -194,6 +361,7 @@ class TemporalGraphEngine:
         interval: timedelta | None = None,
         cumulative: bool = True,
         max_snapshots: int = 50,
+        include_degree_deltas: bool = False,
     ) -> list[TemporalSnapshot]:
         """
         Generate graph snapshots at regular intervals.
@@ -206,6 +374,7 @@ class TemporalGraphEngine:
             cumulative: If True, each snapshot includes all data up to that point.
                        If False, only data within that interval window.
             max_snapshots: Maximum number of snapshots to generate
+            include_degree_deltas: Record per-node degree changes on each snapshot
 
         Returns:
             List of TemporalSnapshot objects in chronological order
@@ -232,37 +401,94 @@ class TemporalGraphEngine:
             total_days = (end_date - start_date).days
             interval = timedelta(days=max(1, total_days // max_snapshots))
 
+        window = None if cumulative else interval
+        try:
+            mentions, entity_info = await self._load_mentions(
+                start_date - window if window else None, end_date
+            )
+        except Exception as e:
+            logger.error(f"Error loading mentions for temporal snapshots: {e}")
+            return []
+
+        # Sweep forward: mentions enter at their timestamp and, in window
+        # mode, leave once older than the window start
+        sweep = TemporalSweep(entity_info)
         snapshots: list[TemporalSnapshot] = []
+        entering = leaving = 0
         current_date = start_date
-        previous_node_ids: set[str] = set()
-        previous_edge_keys: set[tuple[str, str]] = set()
 
         while current_date <= end_date:
-            # Get snapshot at this point
-            snapshot = await self.get_snapshot_at(
-                project_id=project_id,
-                timestamp=current_date,
-                cumulative=cumulative,
-                window_size=interval if not cumulative else None,
-            )
-
-            # Calculate changes from previous snapshot
-            current_node_ids = {n.id for n in snapshot.nodes}
-            current_edge_keys = {(e.source, e.target) for e in snapshot.edges}
+            while entering < len(mentions) and mentions[entering][2] <= current_date:
+                entity_id, document_id, seen_at = mentions[entering]
+                sweep.add(entity_id, document_id, seen_at)
+                entering += 1
+            if window:
+                window_start = current_date - window
+                while leaving < entering and mentions[leaving][2] < window_start:
+                    sweep.remove(mentions[leaving][0], mentions[leaving][1])
+                    leaving += 1
+
+            snapshots.append(sweep.snapshot(current_date, degree_deltas=include_degree_deltas))
+            current_date += interval
 
-            snapshot.added_nodes = list(current_node_ids - previous_node_ids)
-            snapshot.removed_nodes = list(previous_node_ids - current_node_ids)
-            snapshot.added_edges = list(current_edge_keys - previous_edge_keys)
-            snapshot.removed_edges = list(previous_edge_keys - current_edge_keys)
+        logger.info(
+            f"Generated {len(snapshots)} temporal snapshots for project {project_id} "
+            f"from {len(mentions)} mentions"
+        )
+        return snapshots
 
-            snapshots.append(snapshot)
+    async def _load_mentions(
+        self,
+        since: datetime | None,
+        until: datetime,
+    ) -> tuple[list[tuple[str, str, datetime]], dict[str, dict[str, Any]]]:
+        """
+        Load canonical entity mentions in time order, plus entity attributes.
 
-            previous_node_ids = current_node_ids
-            previous_edge_keys = current_edge_keys
-            current_date += interval
+        Returns:
+            ([(entity_id, document_id, created_at), ...], entity_id -> attributes)
+        """
+        params: dict[str, Any] = {"until": until}
+        since_filter = ""
+        if since:
+            since_filter = "AND m.created_at >= :since"
+            params["since"] = since
+
+        rows = await self.db_service.fetch_all(
+            f"""
+            SELECT m.entity_id::text AS entity_id, m.document_id::text AS document_id, m.created_at
+            FROM arkham_entity_mentions m
+            JOIN arkham_entities e ON e.id = m.entity_id
+            WHERE m.created_at IS NOT NULL
+              AND m.created_at <= :until
+              {since_filter}
+              AND e.canonical_id IS NULL
+            ORDER BY m.created_at
+            """,
+            params,
+        )
+        mentions = [(row["entity_id"], row["document_id"], row["created_at"]) for row in rows]
+        if not mentions:
+            return mentions, {}
 
-        logger.info(f"Generated {len(snapshots)} temporal snapshots for project {project_id}")
-        return snapshots
+        entity_rows = await self.db_service.fetch_all(
+            """
+            SELECT id::text AS id, name AS label, entity_type, metadata, mention_count
+            FROM arkham_entities
+            WHERE id::text = ANY(:entity_ids)
+            """,
+            {"entity_ids": list({m[0] for m in mentions})},
+        )
+        entity_info = {
+            row["id"]: {
+                "label": row["label"],
+                "entity_type": row["entity_type"],
+                "document_count": row["mention_count"],
+                "metadata": row.get("metadata"),
+            }
+            for row in entity_rows
+        }
+        return mentions, entity_info
 
     async def get_snapshot_at(
         self,
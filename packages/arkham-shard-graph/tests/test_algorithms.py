@@ -1,9 +1,14 @@
 """Tests for graph algorithms."""
 
+import threading
+
+import numpy as np
 import pytest
 
 from arkham_shard_graph.algorithms import GraphAlgorithms
+from arkham_shard_graph.csr import CSRGraph, betweenness_centrality, get_csr, hits, invalidate_csr
 from arkham_shard_graph.models import Graph, GraphNode, GraphEdge
+from arkham_shard_graph.paths import SearchBudget, search_snapshot
 
 
 class TestGraphAlgorithmsCreation:
@@ -135,6 +140,140 @@ class TestShortestPath:
         assert path.path_length == 2  # Both paths have length 2
 
 
+class TestPathEngine:
+    """Test k-shortest, weighted, constrained and through-node paths."""
+
+    def _diamond(self):
+        """a-b-d (strong), a-c-d (weak), plus a longer a-e-f-d route."""
+        nodes = [
+            GraphNode(id=n, entity_id=n, label=n.upper(), entity_type="person", degree=d)
+            for n, d in [("a", 3), ("b", 2), ("c", 2), ("d", 3), ("e", 2), ("f", 2)]
+        ]
+        edges = [
+            GraphEdge(source="a", target="b", relationship_type="works_for", weight=0.9),
+            GraphEdge(source="b", target="d", relationship_type="works_for", weight=0.9),
+            GraphEdge(source="a", target="c", relationship_type="related_to", weight=0.1),
+            GraphEdge(source="c", target="d", relationship_type="related_to", weight=0.1),
+            GraphEdge(source="a", target="e", relationship_type="works_for", weight=0.5),
+            GraphEdge(source="e", target="f", relationship_type="works_for", weight=0.5),
+            GraphEdge(source="f", target="d", relationship_type="works_for", weight=0.5),
+        ]
+        return Graph(project_id="proj1", nodes=nodes, edges=edges)
+
+    def test_find_all_paths_shortest_first(self):
+        """Test paths come back in hop order and respect max_depth."""
+        algorithms = GraphAlgorithms()
+        graph = self._diamond()
+
+        paths = algorithms.find_all_paths(graph, "a", "d", max_depth=3)
+        assert [p.path_length for p in paths] == [2, 2, 3]
+        assert paths[2].path == ["a", "e", "f", "d"]
+
+        paths = algorithms.find_all_paths(graph, "a", "d", max_depth=2)
+        assert len(paths) == 2
+
+        paths = algorithms.find_all_paths(graph, "a", "d", max_depth=3, max_paths=1)
+        assert len(paths) == 1
+
+    def test_find_weighted_path(self):
+        """Test strongest and weakest paths."""
+        algorithms = GraphAlgorithms()
+        graph = self._diamond()
+
+        strongest = algorithms.find_weighted_path(graph, "a", "d")
+        assert strongest.path == ["a", "b", "d"]
+        assert strongest.total_weight == pytest.approx(1.8)
+
+        weakest = algorithms.find_weighted_path(graph, "a", "d", use_max_weight=False)
+        assert weakest.path == ["a", "c", "d"]
+
+    def test_weighted_path_respects_max_depth(self):
+        """Test a cheaper route longer than max_depth does not hide a valid one."""
+        algorithms = GraphAlgorithms()
+        chain = ["S", "c1", "c2", "c3", "c4", "c5", "c6", "T"]
+        nodes = [GraphNode(id=n, entity_id=n, label=n, entity_type="person") for n in chain]
+        edges = [GraphEdge(source="S", target="T", relationship_type="related_to", weight=0.01)]
+        edges += [
+            GraphEdge(source=u, target=v, relationship_type="works_for", weight=1.0)
+            for u, v in zip(chain, chain[1:])
+        ]
+        graph = Graph(project_id="proj1", nodes=nodes, edges=edges)
+
+        assert algorithms.find_weighted_path(graph, "S", "T").path == chain
+
+        path = algorithms.find_weighted_path(graph, "S", "T", max_depth=3)
+        assert path.path == ["S", "T"]
+
+        paths = algorithms.find_weighted_paths(graph, "S", "T", k=3, max_depth=7)
+        assert [p.path_length for p in paths] == [7, 1]
+
+    def test_find_constrained_path(self):
+        """Test required and excluded entities and edge filters."""
+        algorithms = GraphAlgorithms()
+        graph = self._diamond()
+
+        path = algorithms.find_constrained_path(graph, "a", "d", required_entities=["e"])
+        assert path.path == ["a", "e", "f", "d"]
+
+        path = algorithms.find_constrained_path(graph, "a", "d", excluded_entities=["b", "c"])
+        assert path.path == ["a", "e", "f", "d"]
+
+        path = algorithms.find_constrained_path(
+            graph, "a", "d", required_relationship_types=["related_to"]
+        )
+        assert path.path == ["a", "c", "d"]
+        assert all(e.relationship_type == "related_to" for e in path.edges)
+
+        path = algorithms.find_constrained_path(graph, "a", "d", min_edge_weight=0.95)
+        assert path is None
+
+        path = algorithms.find_constrained_path(graph, "a", "d", required_entities=["missing"])
+        assert path is None
+
+    def test_find_paths_through(self):
+        """Test every path passes through the intermediate entity."""
+        algorithms = GraphAlgorithms()
+        graph = self._diamond()
+
+        paths = algorithms.find_paths_through(graph, "b", max_depth=2)
+
+        assert paths
+        for path in paths:
+            assert "b" in path.path[1:-1]
+            assert len(set(path.path)) == len(path.path)
+        weights = [p.total_weight for p in paths]
+        assert weights == sorted(weights, reverse=True)
+
+    def test_cancelled_budget_stops_search(self):
+        """Test a set cancel event ends the search without a result."""
+        algorithms = GraphAlgorithms()
+        graph = self._diamond()
+        cancel = threading.Event()
+        cancel.set()
+
+        budget = SearchBudget(cancel_event=cancel, check_every=1)
+        paths = algorithms.find_all_paths(graph, "a", "d", budget=budget)
+
+        assert paths == []
+        assert budget.exhausted
+
+    def test_search_snapshot_tracks_deltas(self):
+        """Test the thread-side snapshot is reused until the graph changes."""
+        graph = self._diamond()
+
+        first = search_snapshot(graph)
+        assert search_snapshot(graph) is first
+        assert first.nodes is not graph.nodes
+
+        graph.edges.append(GraphEdge(source="a", target="d", relationship_type="mentioned_with", weight=1.0))
+        invalidate_csr(graph)
+
+        second = search_snapshot(graph)
+        assert second is not first
+        assert len(first.edges) == len(graph.edges) - 1
+        assert len(second.edges) == len(graph.edges)
+
+
 class TestDegreeCentrality:
     """Test degree centrality calculation."""
 
@@ -295,6 +434,83 @@ class TestPageRank:
         assert len(results) == 0
 
 
+def _path_graph(n: int) -> Graph:
+    nodes = [
+        GraphNode(id=f"n{i}", entity_id=f"e{i}", label=f"E{i}", entity_type="person")
+        for i in range(n)
+    ]
+    edges = [
+        GraphEdge(source=f"n{i}", target=f"n{i+1}", relationship_type="related_to", weight=1.0)
+        for i in range(n - 1)
+    ]
+    return Graph(project_id="proj1", nodes=nodes, edges=edges)
+
+
+class TestCSRCentrality:
+    """Test the CSR graph form and the centrality built on it."""
+
+    def test_csr_merges_parallel_edges_and_drops_self_loops(self):
+        graph = _path_graph(3)
+        graph.edges.append(GraphEdge(source="n1", target="n0", relationship_type="x", weight=2.0))
+        graph.edges.append(GraphEdge(source="n2", target="n2", relationship_type="x", weight=1.0))
+
+        csr = CSRGraph.from_graph(graph)
+
+        assert csr.nnz == 4
+        assert list(csr.neighbors(csr.index["n1"])) == [0, 2]
+        assert csr.strength()[0] == pytest.approx(3.0)
+
+    def test_csr_is_cached_per_graph(self):
+        graph = _path_graph(4)
+        assert get_csr(graph) is get_csr(graph)
+
+        graph.edges.append(GraphEdge(source="n0", target="n3", relationship_type="x", weight=1.0))
+        assert get_csr(graph).nnz == 8
+
+        graph.edges[-1].target = "n2"
+        invalidate_csr(graph)
+        assert 2 in get_csr(graph).neighbors(0)
+
+    def test_exact_betweenness_on_path(self):
+        """Interior nodes of P5 lie on 3, 4 and 3 of the 6 outside pairs."""
+        scores = betweenness_centrality(get_csr(_path_graph(5)))
+        assert scores == pytest.approx([0.0, 0.5, 4 / 6, 0.5, 0.0])
+
+    def test_sampled_betweenness_ranks_center_first(self):
+        graph = _path_graph(101)
+        algorithms = GraphAlgorithms()
+
+        results = algorithms.calculate_betweenness_centrality(graph, limit=5, k=60)
+
+        assert results[0].entity_id in {"e48", "e49", "e50", "e51", "e52"}
+
+    def test_pagerank_handles_isolated_nodes(self):
+        graph = _path_graph(3)
+        graph.nodes.append(GraphNode(id="n9", entity_id="e9", label="E9", entity_type="person"))
+
+        results = GraphAlgorithms().calculate_pagerank(graph)
+
+        assert sum(r.score for r in results) == pytest.approx(1.0)
+        assert results[0].entity_id == "e1"
+
+    def test_eigenvector_and_hits_favor_hub(self):
+        nodes = [
+            GraphNode(id=f"n{i}", entity_id=f"e{i}", label=f"E{i}", entity_type="person")
+            for i in range(5)
+        ]
+        edges = [
+            GraphEdge(source="n0", target=f"n{i}", relationship_type="x", weight=1.0)
+            for i in range(1, 5)
+        ]
+        graph = Graph(project_id="proj1", nodes=nodes, edges=edges)
+        algorithms = GraphAlgorithms()
+
+        assert algorithms.calculate_eigenvector_centrality(graph)[0].entity_id == "e0"
+        assert algorithms.calculate_hits(graph)[0].entity_id == "e0"
+        _, authorities = hits(get_csr(graph))
+        assert np.linalg.norm(authorities) == pytest.approx(1.0)
+
+
 class TestCommunityDetection:
     """Test community detection."""
 
@@ -1,12 +1,14 @@
 """Tests for graph API endpoints."""
 
+import asyncio
+
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
 from fastapi import FastAPI
 from unittest.mock import MagicMock, AsyncMock
 
-from arkham_shard_graph.api import router, init_api
+from arkham_shard_graph.api import router, init_api, _run_path_search
 from arkham_shard_graph.builder import GraphBuilder
 from arkham_shard_graph.algorithms import GraphAlgorithms
 from arkham_shard_graph.exporter import GraphExporter
@@ -638,6 +640,46 @@ class TestFilterGraphEndpoint:
         assert response.status_code == 200
 
 
+class TestPathSearchCancellation:
+    """Test path searches are cancelled with their request."""
+
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_search(self):
+        """Test a client disconnect sets the search's cancel event."""
+        graph = Graph(project_id="proj1", nodes=[], edges=[])
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(return_value=True)
+
+        def search(graph, budget, **kwargs):
+            # Stands in for a long search that only ends when cancelled
+            assert budget.cancel_event.wait(timeout=5)
+            return kwargs["marker"]
+
+        result, truncated = await asyncio.wait_for(
+            _run_path_search(request, search, graph, marker="stopped"), timeout=5
+        )
+
+        assert result == "stopped"
+        assert truncated is False
+        request.is_disconnected.assert_awaited()
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_marks_result_truncated(self):
+        """Test a search that runs out of budget is reported as truncated."""
+        graph = Graph(project_id="proj1", nodes=[], edges=[])
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(return_value=False)
+
+        def search(graph, budget, **kwargs):
+            budget.exhausted = True
+            return None
+
+        result, truncated = await _run_path_search(request, search, graph)
+
+        assert result is None
+        assert truncated is True
+
+
 class TestServiceUnavailable:
     """Test service unavailable scenarios."""
 
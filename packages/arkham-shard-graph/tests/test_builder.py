@@ -1,10 +1,13 @@
 """Tests for the graph builder."""
 
+import asyncio
+
 import pytest
 import pytest_asyncio
 from unittest.mock import MagicMock, AsyncMock
 
 from arkham_shard_graph.builder import GraphBuilder
+from arkham_shard_graph.cooccurrence import CooccurrenceIndex
 from arkham_shard_graph.models import Graph, GraphNode, GraphEdge, RelationshipType
 
 
@@ -157,6 +160,96 @@ class TestNodeBuilding:
         assert nodes[0].document_count == 0
 
 
+def _indexed_pair(a: str, b: str, document_ids: list[str]) -> dict:
+    return {
+        "entity_a": a,
+        "entity_b": b,
+        "document_count": len(document_ids),
+        "chunk_count": 1,
+        "page_count": 2,
+        "window_weight": 1.75,
+        "document_ids": document_ids,
+    }
+
+
+class TestCooccurrenceIndex:
+    """Test reading co-occurrences from the materialized index."""
+
+    @pytest.mark.asyncio
+    async def test_builder_reads_index_when_ready(self):
+        """Test the builder uses pre-aggregated pairs instead of a self-join."""
+        db_service = MagicMock()
+        db_service.fetch_all = AsyncMock(side_effect=[
+            # No documents missing from the index
+            [],
+            [_indexed_pair("e1", "e2", ["d1", "d2", "d3"])],
+        ])
+        index = CooccurrenceIndex(db_service=db_service)
+        index.ready = True
+        builder = GraphBuilder(db_service=db_service, cooccurrence_index=index)
+
+        co_occurrences = await builder._get_co_occurrences(
+            "proj1", [{"id": "e1"}, {"id": "e2"}], None, 2, top_n=10
+        )
+
+        assert co_occurrences[("e1", "e2")]["count"] == 3
+        assert co_occurrences[("e1", "e2")]["properties"]["window_weight"] == 1.75
+        query, _ = db_service.fetch_all.call_args_list[0].args
+        assert "cooccurrence_documents" in query
+        query, params = db_service.fetch_all.call_args.args
+        assert "arkham_graph.cooccurrence_pairs" in query
+        assert params["top_n"] == 10
+        assert params["min_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_unindexed_documents_are_merged(self):
+        """Test documents missing from the index still contribute edges."""
+        db_service = MagicMock()
+        db_service.fetch_all = AsyncMock(side_effect=[
+            [
+                {"entity_a": "e2", "entity_b": "e1", "co_occurrence_count": 1, "document_ids": ["d9"]},
+                {"entity_a": "e1", "entity_b": "e3", "co_occurrence_count": 1, "document_ids": ["d9"]},
+            ],
+            [_indexed_pair("e1", "e2", ["d1"])],
+        ])
+        index = CooccurrenceIndex(db_service=db_service)
+        index.ready = True
+        builder = GraphBuilder(db_service=db_service, cooccurrence_index=index)
+
+        co_occurrences = await builder._get_co_occurrences(
+            "proj1", [{"id": "e1"}, {"id": "e2"}, {"id": "e3"}], None, 2, top_n=10
+        )
+
+        # e1-e3 has a single document and falls below min_count
+        assert list(co_occurrences) == [("e1", "e2")]
+        assert co_occurrences[("e1", "e2")]["count"] == 2
+        assert co_occurrences[("e1", "e2")]["document_ids"] == ["d1", "d9"]
+        _, params = db_service.fetch_all.call_args.args
+        assert params["min_count"] == 1
+        assert params["top_n"] is None
+
+    @pytest.mark.asyncio
+    async def test_index_scoped_to_documents(self):
+        """Test a document filter aggregates per-document rows."""
+        db_service = MagicMock()
+        db_service.fetch_all = AsyncMock(return_value=[])
+        index = CooccurrenceIndex(db_service=db_service)
+
+        await index.get_pairs(["e1", "e2"], document_ids=["d1"])
+
+        query, params = db_service.fetch_all.call_args.args
+        assert "FROM arkham_graph.cooccurrences" in query
+        assert params["document_ids"] == ["d1"]
+
+    @pytest.mark.asyncio
+    async def test_index_not_ready_without_db(self):
+        """Test the index stays unused without a database."""
+        index = CooccurrenceIndex()
+
+        assert await index.initialize() is False
+        assert index.ready is False
+
+
 class TestEdgeBuilding:
     """Test edge building."""
 
@@ -517,3 +610,44 @@ class TestAdjacencyList:
         adjacency = builder._build_adjacency_list([])
 
         assert len(adjacency) == 0
+
+    @pytest.mark.asyncio
+    async def test_backfill_runs_in_background(self):
+        """Test initialize returns before the backfill and ready follows it."""
+        db_service = MagicMock()
+        db_service.execute = AsyncMock()
+        release = asyncio.Event()
+
+        async def fetch_all(query, params=None):
+            await release.wait()
+            return []
+
+        db_service.fetch_all = fetch_all
+        index = CooccurrenceIndex(db_service=db_service)
+
+        assert await index.initialize() is True
+        assert index.ready is False
+
+        release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert index.ready is True
+        await index.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_index_documents_is_one_statement(self):
+        """Test a batch of documents is reindexed by a single call."""
+        db_service = MagicMock()
+        db_service.execute = AsyncMock()
+        db_service.fetch_all = AsyncMock(return_value=[])
+        index = CooccurrenceIndex(db_service=db_service)
+        await index.initialize()
+        await index.shutdown()
+        db_service.execute.reset_mock()
+
+        await index.index_documents(["d1", "d2"])
+
+        db_service.execute.assert_awaited_once()
+        query, params = db_service.execute.call_args.args
+        assert "cooc_index_documents" in query
+        assert params["document_ids"] == ["d1", "d2"]
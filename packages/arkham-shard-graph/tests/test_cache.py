@@ -0,0 +1,191 @@
+"""Tests for the graph cache."""
+
+from arkham_shard_graph.cache import (
+    GraphCache,
+    add_document_entities,
+    estimate_graph_bytes,
+    merge_entities,
+    remove_document,
+)
+from arkham_shard_graph.models import Graph, GraphNode, GraphEdge
+
+
+def _node(node_id: str, document_count: int = 1) -> GraphNode:
+    return GraphNode(
+        id=node_id,
+        entity_id=node_id,
+        label=node_id.upper(),
+        entity_type="person",
+        document_count=document_count,
+    )
+
+
+def _edge(source: str, target: str, *document_ids: str) -> GraphEdge:
+    return GraphEdge(
+        source=source,
+        target=target,
+        relationship_type="mentioned_with",
+        weight=len(document_ids) / 10.0,
+        document_ids=list(document_ids),
+        co_occurrence_count=len(document_ids),
+    )
+
+
+def _graph(project_id: str, node_count: int = 0) -> Graph:
+    return Graph(
+        project_id=project_id,
+        nodes=[_node(f"n{i}") for i in range(node_count)],
+    )
+
+
+class TestGraphCacheEviction:
+    """Test size accounting and LRU eviction."""
+
+    def test_behaves_like_dict(self):
+        """Test mapping protocol and equality with a dict."""
+        cache = GraphCache()
+        assert cache == {}
+
+        graph = _graph("proj1")
+        cache["proj1"] = graph
+
+        assert "proj1" in cache
+        assert cache["proj1"] is graph
+        del cache["proj1"]
+        assert cache == {}
+        assert cache.get_stats()["bytes"] == 0
+
+    def test_evicts_least_recently_used_over_budget(self):
+        """Test graphs are evicted in LRU order once over max_bytes."""
+        size = estimate_graph_bytes(_graph("x", 10))
+        cache = GraphCache(max_bytes=size * 2)
+
+        cache["proj1"] = _graph("proj1", 10)
+        cache["proj2"] = _graph("proj2", 10)
+        assert cache.lookup("proj1") is not None  # proj1 now most recent
+
+        cache["proj3"] = _graph("proj3", 10)
+
+        assert set(cache) == {"proj1", "proj3"}
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_oversized_graph_still_caches(self):
+        """Test a single graph larger than the budget is kept."""
+        cache = GraphCache(max_bytes=1)
+        cache["proj1"] = _graph("proj1", 10)
+
+        assert "proj1" in cache
+
+    def test_max_graphs(self):
+        """Test the optional entry-count cap."""
+        cache = GraphCache(max_graphs=2)
+        for project_id in ("proj1", "proj2", "proj3"):
+            cache[project_id] = _graph(project_id)
+
+        assert list(cache) == ["proj2", "proj3"]
+
+    def test_hit_miss_counters(self):
+        """Test lookup counts hits and misses."""
+        cache = GraphCache()
+        cache["proj1"] = _graph("proj1")
+
+        cache.lookup("proj1")
+        cache.lookup("proj2")
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_mark_updated_resizes(self):
+        """Test delta updates re-account the entry size."""
+        cache = GraphCache()
+        graph = _graph("proj1", 1)
+        cache["proj1"] = graph
+        before = cache.get_stats()["bytes"]
+
+        graph.nodes.append(_node("extra"))
+        cache.mark_updated("proj1")
+
+        assert cache.get_stats()["bytes"] > before
+        assert cache.get_stats()["delta_updates"] == 1
+
+
+class TestGraphDeltas:
+    """Test incremental graph updates."""
+
+    def test_add_document_entities(self):
+        """Test new entities add nodes and co-occurrence edges."""
+        graph = Graph(project_id="proj1", nodes=[_node("a")])
+
+        changed = add_document_entities(graph, "doc1", [
+            {"id": "a", "label": "A", "entity_type": "person"},
+            {"id": "b", "label": "B", "entity_type": "person"},
+        ])
+
+        assert changed
+        assert {n.id for n in graph.nodes} == {"a", "b"}
+        assert len(graph.edges) == 1
+        assert graph.edges[0].document_ids == ["doc1"]
+        assert all(n.degree == 1 for n in graph.nodes)
+
+    def test_add_document_entities_respects_scope(self):
+        """Test graphs scoped to other documents are left alone."""
+        graph = Graph(project_id="proj1", metadata={"document_ids": ["doc2"]})
+
+        changed = add_document_entities(graph, "doc1", [
+            {"id": "a", "label": "A", "entity_type": "person"},
+        ])
+
+        assert not changed
+        assert graph.nodes == []
+
+    def test_add_document_entities_known_entities(self):
+        """Test a document with only known entities is a no-op."""
+        graph = Graph(project_id="proj1", nodes=[_node("a")])
+
+        assert not add_document_entities(graph, "doc1", [{"id": "a"}])
+
+    def test_remove_document(self):
+        """Test deleting a document drops its edges and orphaned nodes."""
+        graph = Graph(
+            project_id="proj1",
+            nodes=[_node("a"), _node("b", 2), _node("c")],
+            edges=[_edge("a", "b", "doc1"), _edge("b", "c", "doc1", "doc2")],
+        )
+
+        assert remove_document(graph, "doc1")
+
+        assert {n.id for n in graph.nodes} == {"b", "c"}
+        assert len(graph.edges) == 1
+        assert graph.edges[0].document_ids == ["doc2"]
+        assert graph.edges[0].co_occurrence_count == 1
+
+    def test_remove_unknown_document(self):
+        """Test deleting an unrelated document is a no-op."""
+        graph = Graph(project_id="proj1", nodes=[_node("a")])
+
+        assert not remove_document(graph, "doc1")
+
+    def test_merge_entities_combines_edges(self):
+        """Test merging rewires edges and combines parallels."""
+        graph = Graph(
+            project_id="proj1",
+            nodes=[_node("a"), _node("b"), _node("c")],
+            edges=[_edge("a", "c", "doc1"), _edge("b", "c", "doc2"), _edge("a", "b", "doc3")],
+        )
+
+        assert merge_entities(graph, "a", "b")
+
+        assert {n.id for n in graph.nodes} == {"b", "c"}
+        assert len(graph.edges) == 1
+        edge = graph.edges[0]
+        assert edge.co_occurrence_count == 2
+        assert set(edge.document_ids) == {"doc1", "doc2"}
+
+    def test_merge_into_missing_target_renames(self):
+        """Test merging into an entity outside the graph renames the node."""
+        graph = Graph(project_id="proj1", nodes=[_node("a")])
+
+        assert merge_entities(graph, "a", "z")
+        assert graph.nodes[0].id == "z"
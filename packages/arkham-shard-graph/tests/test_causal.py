@@ -0,0 +1,163 @@
+"""Tests for causal analysis and the reachability index."""
+
+import random
+
+from arkham_shard_graph.causal import CausalEdge, CausalGraph, CausalGraphEngine, CausalNode
+from arkham_shard_graph.csr import invalidate_csr
+from arkham_shard_graph.models import Graph, GraphNode, GraphEdge
+from arkham_shard_graph.reachability import ReachabilityIndex, get_reachability
+
+
+def _causal(edges: list[tuple[str, str]], extra_nodes: str = "") -> CausalGraph:
+    ids = sorted({n for e in edges for n in e} | set(extra_nodes))
+    return CausalGraph(
+        id="causal_test",
+        name="test",
+        nodes=[CausalNode(id=n, label=n.upper()) for n in ids],
+        edges=[CausalEdge(cause=a, effect=b) for a, b in edges],
+    )
+
+
+def _brute_descendants(edges: list[tuple[str, str]], node: str) -> set[str]:
+    children: dict[str, list[str]] = {}
+    for a, b in edges:
+        children.setdefault(a, []).append(b)
+    seen: set[str] = set()
+    stack = list(children.get(node, []))
+    while stack:
+        current = stack.pop()
+        if current not in seen:
+            seen.add(current)
+            stack.extend(children.get(current, []))
+    return seen
+
+
+# z confounds x -> m -> y; w only causes x
+CONFOUNDED = [("z", "x"), ("z", "y"), ("x", "m"), ("m", "y"), ("w", "x")]
+
+
+class TestReachabilityIndex:
+    """Test closure queries against brute-force search."""
+
+    def test_matches_brute_force(self):
+        """Test descendants and ancestors on random graphs with cycles."""
+        rng = random.Random(3)
+        ids = [f"n{i}" for i in range(60)]
+        edges = [(rng.choice(ids), rng.choice(ids)) for _ in range(90)]
+
+        index = ReachabilityIndex.from_edges(ids, edges)
+
+        reversed_edges = [(b, a) for a, b in edges]
+        for node in ids:
+            assert index.descendants(node) == _brute_descendants(edges, node)
+            assert index.ancestors(node) == _brute_descendants(reversed_edges, node)
+            for other in ids[:10]:
+                expected = node == other or other in _brute_descendants(edges, node)
+                assert index.reaches(node, other) == expected
+
+    def test_common_ancestors_and_between(self):
+        """Test set queries used for confounder detection."""
+        index = ReachabilityIndex.from_edges([], CONFOUNDED)
+
+        assert index.common_ancestors("x", "y") == {"z", "w"}
+        assert index.between("x", "y") == {"x", "m", "y"}
+        assert index.between("y", "x") == set()
+        assert index.path("z", "y") == ["z", "y"]
+        assert index.path("w", "y") == ["w", "x", "m", "y"]
+        assert index.path("y", "w") == []
+
+    def test_cycles(self):
+        """Test each cyclic component yields one closed cycle."""
+        index = ReachabilityIndex.from_edges(
+            [], [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"), ("e", "e")]
+        )
+
+        cycles = sorted(index.cycles())
+
+        assert cycles == [["a", "b", "c", "a"], ["e", "e"]]
+        assert index.reaches("b", "a")
+        assert "a" in index.descendants("a")
+        assert "d" not in index.descendants("d")
+
+    def test_long_chain(self):
+        """Test deep graphs do not hit the recursion limit."""
+        ids = [str(i) for i in range(5000)]
+        index = ReachabilityIndex.from_edges(ids, list(zip(ids, ids[1:])))
+
+        assert index.reaches("0", "4999")
+        assert not index.reaches("4999", "0")
+        assert len(index.ancestors("4999")) == 4999
+
+
+class TestCausalGraphEngine:
+    """Test causal queries answered from the index."""
+
+    def test_validate_dag(self):
+        """Test cycles are reported and DAGs validate."""
+        engine = CausalGraphEngine()
+
+        assert engine.validate_dag(_causal(CONFOUNDED)) == (True, [])
+
+        is_valid, cycles = engine.validate_dag(_causal([("a", "b"), ("b", "a")]))
+        assert not is_valid
+        assert cycles == [["a", "b", "a"]]
+
+    def test_identify_confounders(self):
+        """Test common ancestors off the causal path are confounders."""
+        engine = CausalGraphEngine()
+
+        confounders = engine.identify_confounders(_causal(CONFOUNDED), "x", "y")
+
+        assert [c.id for c in confounders] == ["w", "z"]
+        by_id = {c.id: c for c in confounders}
+        assert by_id["z"].path_to_treatment == ["z", "x"]
+        assert by_id["z"].path_to_outcome == ["z", "y"]
+        assert by_id["w"].path_to_outcome == ["w", "x", "m", "y"]
+
+    def test_find_causal_paths(self):
+        """Test paths are enumerated and unreachable targets short-circuit."""
+        engine = CausalGraphEngine()
+        graph = _causal(CONFOUNDED + [("m", "dead_end")])
+
+        paths = engine.find_causal_paths(graph, "z", "y")
+
+        assert sorted(p.nodes for p in paths) == [["z", "x", "m", "y"], ["z", "y"]]
+        assert engine.find_causal_paths(graph, "y", "z") == []
+        assert engine.chain_exists(graph, "w", "y")
+        assert not engine.chain_exists(graph, "dead_end", "y")
+        assert engine.shortest_chain(graph, "w", "y") == ["w", "x", "m", "y"]
+
+    def test_index_refreshes_when_edges_change(self):
+        """Test appending a causal edge rebuilds the index."""
+        engine = CausalGraphEngine()
+        graph = _causal([("a", "b")], extra_nodes="c")
+
+        assert not engine.chain_exists(graph, "a", "c")
+
+        graph.edges.append(CausalEdge(cause="b", effect="c"))
+
+        assert engine.chain_exists(graph, "a", "c")
+
+    def test_index_reused_for_unchanged_source(self):
+        """Test rebuilding the causal view of the same graph reuses the index."""
+        engine = CausalGraphEngine()
+        source = Graph(
+            project_id="proj1",
+            nodes=[GraphNode(id=n, entity_id=n, label=n, entity_type="event") for n in "abc"],
+            edges=[
+                GraphEdge(source="a", target="b", relationship_type="causes", weight=1.0),
+                GraphEdge(source="b", target="c", relationship_type="mentioned_with", weight=1.0),
+            ],
+        )
+
+        first = engine.build_causal_graph(source)
+        second = engine.build_causal_graph(source)
+        assert get_reachability(first) is get_reachability(second)
+        assert not engine.chain_exists(second, "a", "c")
+
+        source.edges.append(GraphEdge(source="b", target="c", relationship_type="leads_to", weight=1.0))
+        invalidate_csr(source)
+
+        third = engine.build_causal_graph(source)
+        assert get_reachability(third) is not get_reachability(first)
+        assert engine.chain_exists(third, "a", "c")
@@ -0,0 +1,238 @@
+"""Tests for community detection and incremental refresh."""
+
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+
+from arkham_shard_graph.communities import (
+    CommunityIndex,
+    build_communities,
+    detect_communities,
+    refresh_communities,
+)
+from arkham_shard_graph.csr import invalidate_csr
+from arkham_shard_graph.models import Graph, GraphNode, GraphEdge
+
+
+def _node(node_id: str) -> GraphNode:
+    return GraphNode(id=node_id, entity_id=node_id, label=node_id.upper(), entity_type="person")
+
+
+def _edge(a: str, b: str, weight: float = 1.0) -> GraphEdge:
+    return GraphEdge(source=a, target=b, relationship_type="mentioned_with", weight=weight)
+
+
+def _cliques(count: int = 8, size: int = 5) -> Graph:
+    """`count` cliques of `size` nodes joined in a ring by single edges."""
+    nodes, edges = [], []
+    for c in range(count):
+        members = [f"c{c}_{i}" for i in range(size)]
+        nodes.extend(_node(m) for m in members)
+        edges.extend(_edge(a, b) for i, a in enumerate(members) for b in members[i + 1:])
+        edges.append(_edge(members[0], f"c{(c + 1) % count}_1"))
+    return Graph(project_id="proj1", nodes=nodes, edges=edges, version=1)
+
+
+def _groups(assignment) -> list[set[str]]:
+    groups: dict[int, set[str]] = {}
+    for node_id, label in assignment.labels.items():
+        groups.setdefault(label, set()).add(node_id)
+    return sorted(groups.values(), key=min)
+
+
+class TestDetectCommunities:
+    """Test full Louvain detection."""
+
+    def test_finds_cliques(self):
+        """Test each clique becomes one community."""
+        graph = _cliques(count=3)
+
+        assignment = detect_communities(graph)
+
+        assert _groups(assignment) == [{f"c{c}_{i}" for i in range(5)} for c in range(3)]
+        assert assignment.modularity > 0.5
+        assert assignment.version == 1
+
+    def test_communities_are_connected(self):
+        """Test disconnected parts never share a community."""
+        graph = Graph(
+            project_id="proj1",
+            nodes=[_node(n) for n in "abcd"],
+            edges=[_edge("a", "b"), _edge("c", "d")],
+        )
+
+        assignment = detect_communities(graph)
+
+        assert _groups(assignment) == [{"a", "b"}, {"c", "d"}]
+
+    def test_build_communities(self):
+        """Test Community objects carry sizes and edge counts."""
+        graph = _cliques(count=3)
+        assignment = detect_communities(graph)
+
+        communities = build_communities(graph, assignment, min_community_size=3)
+
+        assert len(communities) == 3
+        for community in communities:
+            assert community.size == 5
+            assert community.internal_edges == 10
+            assert community.density == pytest.approx(1.0)
+            assert community.modularity_contribution > 0
+        assert build_communities(graph, assignment, min_community_size=6) == []
+
+    def test_empty_graph(self):
+        """Test an empty graph has no communities."""
+        graph = Graph(project_id="proj1")
+
+        assignment = detect_communities(graph)
+
+        assert assignment.labels == {}
+        assert build_communities(graph, assignment) == []
+
+
+class TestRefreshCommunities:
+    """Test incremental re-optimization."""
+
+    def test_unchanged_graph_keeps_labels(self):
+        """Test a refresh without changes reuses every label."""
+        graph = _cliques()
+        previous = detect_communities(graph)
+
+        refreshed = refresh_communities(graph, previous)
+
+        assert refreshed.mode == "incremental"
+        assert refreshed.labels == previous.labels
+
+    def test_new_node_joins_its_neighbours(self):
+        """Test a new node is placed locally and other labels are stable."""
+        graph = _cliques()
+        previous = detect_communities(graph)
+
+        graph.nodes.append(_node("new"))
+        graph.edges.extend(_edge("new", f"c1_{i}") for i in range(4))
+        graph.version = 2
+        invalidate_csr(graph)
+
+        refreshed = refresh_communities(graph, previous)
+
+        assert refreshed.mode == "incremental"
+        assert refreshed.version == 2
+        assert refreshed.labels["new"] == refreshed.labels["c1_0"]
+        assert all(refreshed.labels[k] == v for k, v in previous.labels.items())
+
+    def test_affected_community_is_reoptimized(self):
+        """Test removing a clique's bridge edges splits it."""
+        graph = _cliques(size=6)
+        previous = detect_communities(graph)
+
+        # Split clique 0 into two triangles
+        left, right = {"c0_0", "c0_1", "c0_2"}, {"c0_3", "c0_4", "c0_5"}
+        graph.edges = [
+            e for e in graph.edges
+            if not ({e.source, e.target} & left and {e.source, e.target} & right)
+        ]
+        invalidate_csr(graph)
+
+        refreshed = refresh_communities(graph, previous)
+
+        groups = _groups(refreshed)
+        assert left in groups or any(left < g for g in groups)
+        assert not any(left & g and right & g for g in groups)
+        assert refreshed.mode == "incremental"
+        for c in range(1, 8):
+            assert refreshed.labels[f"c{c}_0"] == previous.labels[f"c{c}_0"]
+
+
+class TestCommunityIndex:
+    """Test stored assignments per graph version."""
+
+    @pytest.mark.asyncio
+    async def test_cached_then_incremental(self):
+        """Test the same version is served from cache and changes refresh."""
+        index = CommunityIndex()
+        graph = _cliques()
+
+        await index.get_assignment(graph)
+        first = await index.get_assignment(graph)
+        assert first.mode == "cached"
+
+        graph.nodes.append(_node("new"))
+        graph.edges.append(_edge("new", "c0_0"))
+        graph.version = 2
+        invalidate_csr(graph)
+
+        second = await index.get_assignment(graph)
+        assert second.mode == "incremental"
+        assert second.version == 2
+
+        recomputed = await index.get_assignment(graph, recompute=True)
+        assert recomputed.mode == "full"
+
+    @pytest.mark.asyncio
+    async def test_persists_with_version(self):
+        """Test assignments are written and read back with their version."""
+        db_service = MagicMock()
+        db_service.execute = AsyncMock()
+        db_service.fetch_one = AsyncMock(return_value=None)
+        index = CommunityIndex(db_service=db_service)
+        assert await index.initialize()
+
+        graph = _cliques()
+        assignment = await index.get_assignment(graph)
+
+        sql, params = db_service.execute.await_args.args
+        assert "INSERT INTO arkham_graph.communities" in sql
+        assert params["version"] == 1
+
+        # A fresh index reloads the stored row instead of recomputing
+        db_service.fetch_one = AsyncMock(return_value=params)
+        index = CommunityIndex(db_service=db_service)
+        await index.initialize()
+        cached = await index.get_assignment(graph)
+
+        assert cached.mode == "cached"
+        assert cached.labels == assignment.labels
+        assert cached.modularity == pytest.approx(assignment.modularity)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend", ["sqlalchemy", "asyncpg"])
+    async def test_round_trip_on_database_backends(self, backend, monkeypatch):
+        """Test stored assignments are JSON objects with either database backend."""
+        from arkham_frame.services.config import ConfigService
+        from arkham_frame.services.database import DatabaseService
+
+        monkeypatch.setenv("ARKHAM_DB_BACKEND", backend)
+        db_service = DatabaseService(ConfigService())
+        await db_service.initialize()
+        project_id = f"test-communities-{backend}"
+        try:
+            if not await db_service.is_connected() or db_service.backend != backend:
+                pytest.skip(f"PostgreSQL with the {backend} backend is not available")
+            await db_service.execute("CREATE SCHEMA IF NOT EXISTS arkham_graph")
+            index = CommunityIndex(db_service=db_service)
+            assert await index.initialize()
+
+            graph = _cliques()
+            graph.project_id = project_id
+            assignment = await index.get_assignment(graph)
+
+            row = await db_service.fetch_one(
+                """
+                SELECT jsonb_typeof(assignments) AS assignments, jsonb_typeof(stats) AS stats
+                FROM arkham_graph.communities WHERE project_id = :project_id
+                """,
+                {"project_id": project_id},
+            )
+            assert row == {"assignments": "object", "stats": "object"}
+
+            index = CommunityIndex(db_service=db_service)
+            await index.initialize()
+            cached = await index.get_assignment(graph)
+            assert cached.mode == "cached"
+            assert cached.labels == assignment.labels
+        finally:
+            if await db_service.is_connected():
+                await db_service.execute(
+                    "DELETE FROM arkham_graph.communities WHERE project_id = :project_id",
+                    {"project_id": project_id},
+                )
+            await db_service.shutdown()
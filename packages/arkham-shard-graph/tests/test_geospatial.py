@@ -0,0 +1,133 @@
+"""Tests for geospatial graph analysis."""
+
+import numpy as np
+import pytest
+
+from arkham_shard_graph.geospatial import (
+    GeoBounds,
+    GeoGraphEngine,
+    GeoIndex,
+    GeoNode,
+    haversine_km,
+)
+from arkham_shard_graph.models import GraphEdge
+
+
+def _geo(node_id: str, lat: float, lng: float) -> GeoNode:
+    return GeoNode(entity_id=node_id, label=node_id, latitude=lat, longitude=lng)
+
+
+CITIES = [
+    _geo("london", 51.5074, -0.1278),
+    _geo("greenwich", 51.4769, 0.0005),
+    _geo("paris", 48.8566, 2.3522),
+    _geo("new_york", 40.7128, -74.0060),
+    _geo("fiji", -17.7134, 178.0650),
+    _geo("samoa", -13.7590, -172.1046),
+]
+
+
+class TestHaversine:
+    """Test vectorized distances."""
+
+    def test_matches_scalar(self):
+        """Test the numpy formula agrees with calculate_distance."""
+        engine = GeoGraphEngine()
+        a, b = CITIES[0], CITIES[3]
+
+        vectorized = haversine_km(a.latitude, a.longitude, b.latitude, b.longitude)
+
+        assert float(vectorized) == pytest.approx(
+            engine.calculate_distance(a.latitude, a.longitude, b.latitude, b.longitude)
+        )
+
+    def test_edge_distances(self):
+        """Test edges get distances and unlocated endpoints are skipped."""
+        engine = GeoGraphEngine()
+        edges = [
+            GraphEdge(source="london", target="paris", relationship_type="related", weight=1.0),
+            GraphEdge(source="london", target="nowhere", relationship_type="related", weight=1.0),
+        ]
+
+        geo_edges = engine.calculate_edge_distances(CITIES, edges)
+
+        assert len(geo_edges) == 1
+        assert geo_edges[0].distance_km == pytest.approx(343.5, abs=1.0)
+
+
+class TestGeoIndex:
+    """Test grid index queries against brute force."""
+
+    def _points(self, count: int = 500) -> list[GeoNode]:
+        rng = np.random.default_rng(7)
+        lats = np.concatenate([rng.uniform(-89, 89, count // 2), rng.normal(51.5, 0.3, count // 2)])
+        lngs = np.concatenate([rng.uniform(-180, 180, count // 2), rng.normal(0.0, 0.3, count // 2)])
+        return [_geo(str(i), float(lat), float(lng)) for i, (lat, lng) in enumerate(zip(lats, lngs))]
+
+    def test_query_radius(self):
+        """Test radius queries return exactly the nodes within range."""
+        nodes = self._points()
+        index = GeoIndex(nodes, cell_km=25.0)
+        lat = np.array([n.latitude for n in nodes])
+        lng = np.array([n.longitude for n in nodes])
+
+        for point in nodes[::25]:
+            for radius in (5.0, 50.0, 2000.0):
+                found, distances = index.query_radius(point.latitude, point.longitude, radius)
+                expected = np.flatnonzero(haversine_km(point.latitude, point.longitude, lat, lng) <= radius)
+                assert found.tolist() == expected.tolist()
+                assert (distances <= radius).all()
+
+    def test_query_wraps_antimeridian(self):
+        """Test circles crossing 180 degrees find nodes on the other side."""
+        index = GeoIndex([_geo("east", 0.0, 179.9), _geo("west", 0.0, -179.9)], cell_km=10.0)
+
+        found, _ = index.query_radius(0.0, 179.95, 50.0)
+
+        assert sorted(found.tolist()) == [0, 1]
+
+    def test_nearest(self):
+        """Test nearest-node lookup orders by distance."""
+        index = GeoIndex(CITIES)
+
+        found, distances = index.nearest(51.5, -0.1, k=3)
+
+        assert [CITIES[i].entity_id for i in found] == ["london", "greenwich", "paris"]
+        assert list(distances) == sorted(distances)
+
+        found, _ = index.nearest(51.5, -0.1, k=3, max_km=20.0)
+        assert [CITIES[i].entity_id for i in found] == ["london", "greenwich"]
+
+    def test_within_bounds(self):
+        """Test bounding-box filtering matches GeoBounds.contains."""
+        nodes = self._points()
+        index = GeoIndex(nodes)
+        bounds = GeoBounds(min_lat=51.0, max_lat=52.0, min_lng=-0.5, max_lng=0.5)
+
+        found = index.within_bounds(bounds)
+
+        expected = [i for i, n in enumerate(nodes) if bounds.contains(n.latitude, n.longitude)]
+        assert found.tolist() == expected
+
+
+class TestClusterNodes:
+    """Test radius clustering."""
+
+    def test_cluster_nearby_nodes(self):
+        """Test nodes within the radius of a seed share its cluster."""
+        engine = GeoGraphEngine()
+
+        clusters = engine.cluster_nodes(CITIES, radius_km=50.0)
+
+        assert clusters[0].node_ids == ["london", "greenwich"]
+        assert len(clusters) == 5
+        assert clusters[0].radius_km < 50.0
+
+    def test_cluster_across_antimeridian(self):
+        """Test clustering finds neighbours across the antimeridian."""
+        engine = GeoGraphEngine()
+        nodes = [_geo("east", -17.0, 179.95), _geo("west", -17.0, -179.95)]
+
+        clusters = engine.cluster_nodes(nodes, radius_km=20.0)
+
+        assert len(clusters) == 1
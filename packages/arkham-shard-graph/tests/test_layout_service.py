@@ -0,0 +1,196 @@
+"""Tests for the cached, off-loop layout service."""
+
+import asyncio
+import math
+
+import pytest
+from unittest.mock import MagicMock
+
+from arkham_shard_graph.layout_service import SKELETON_SIZE, LayoutService, place_nodes
+from arkham_shard_graph.layouts import LayoutEngine, LayoutPosition, LayoutType
+from arkham_shard_graph.models import Graph, GraphNode, GraphEdge
+
+
+def _node(node_id: str) -> GraphNode:
+    return GraphNode(id=node_id, entity_id=node_id, label=node_id, entity_type="person")
+
+
+def _edge(a: str, b: str) -> GraphEdge:
+    return GraphEdge(source=a, target=b, relationship_type="mentioned_with", weight=1.0)
+
+
+def _star(leaves: int, version: int = 1) -> Graph:
+    """A hub connected to `leaves` leaf nodes."""
+    nodes = [_node("hub")] + [_node(f"n{i}") for i in range(leaves)]
+    edges = [_edge("hub", f"n{i}") for i in range(leaves)]
+    return Graph(project_id="proj1", nodes=nodes, edges=edges, version=version)
+
+
+class _ForceEngine(LayoutEngine):
+    """LayoutEngine that also lays out FORCE_DIRECTED (normally left to the frontend)."""
+
+    def calculate_layout(self, graph, layout_type, options=None):
+        if layout_type == LayoutType.FORCE_DIRECTED:
+            return self.circular_layout(graph)
+        return super().calculate_layout(graph, layout_type, options)
+
+
+def _counting_engine() -> MagicMock:
+    return MagicMock(wraps=_ForceEngine())
+
+
+class TestPlaceNodes:
+    """Test placement around pinned positions."""
+
+    def test_pinned_positions_are_kept(self):
+        """Test pinned nodes stay put and new ones land near neighbours."""
+        graph = _star(3)
+        graph.nodes.append(_node("loner"))
+        pinned = {"hub": LayoutPosition(node_id="hub", x=0.0, y=0.0)}
+
+        positions = place_nodes(graph, pinned, spacing=10.0)
+
+        assert set(positions) == {"hub", "n0", "n1", "n2", "loner"}
+        assert (positions["hub"].x, positions["hub"].y) == (0.0, 0.0)
+        for leaf in ("n0", "n1", "n2"):
+            assert abs(positions[leaf].x) + abs(positions[leaf].y) < 30
+        assert len({(p.x, p.y) for p in positions.values()}) == 5
+        # Unreachable nodes go below the layout
+        assert positions["loner"].y > max(positions[n].y for n in ("hub", "n0", "n1", "n2"))
+
+    def test_removed_nodes_are_dropped(self):
+        """Test pinned positions of nodes no longer in the graph are ignored."""
+        graph = _star(1)
+        pinned = {"gone": LayoutPosition(node_id="gone", x=5.0, y=5.0)}
+
+        positions = place_nodes(graph, pinned)
+
+        assert set(positions) == {"hub", "n0"}
+
+
+class TestLayoutService:
+    """Test caching, incremental re-layout and streaming."""
+
+    @pytest.mark.asyncio
+    async def test_cached_per_version(self):
+        """Test an unchanged graph is served from cache."""
+        engine = _counting_engine()
+        service = LayoutService(engine, max_workers=0)
+        graph = _star(10)
+
+        first = await service.get_layout(graph, LayoutType.RADIAL)
+        second = await service.get_layout(graph, LayoutType.RADIAL)
+
+        assert first.mode == "full"
+        assert second.mode == "cached"
+        assert second.positions == first.positions
+        assert second.graph_version == 1
+        assert engine.calculate_layout.call_count == 1
+
+        # Different options are cached separately
+        await service.get_layout(graph, LayoutType.RADIAL, {"radius_step": 50})
+        assert engine.calculate_layout.call_count == 2
+
+        recomputed = await service.get_layout(graph, LayoutType.RADIAL, recompute=True)
+        assert recomputed.mode == "full"
+        service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_incremental_pins_existing_nodes(self):
+        """Test added nodes are placed without moving existing ones."""
+        engine = _counting_engine()
+        service = LayoutService(engine, max_workers=0)
+        graph = _star(10)
+        first = await service.get_layout(graph, LayoutType.FORCE_DIRECTED)
+
+        graph.nodes.append(_node("new"))
+        graph.edges.append(_edge("n3", "new"))
+        graph.version = 2
+
+        second = await service.get_layout(graph, LayoutType.FORCE_DIRECTED)
+
+        assert second.mode == "incremental"
+        assert second.graph_version == 2
+        assert second.metadata["placed"] == 1
+        assert "new" in second.positions
+        for node_id, pos in first.positions.items():
+            assert (second.positions[node_id].x, second.positions[node_id].y) == (pos.x, pos.y)
+        assert engine.calculate_layout.call_count == 1
+
+        # Mostly-new graphs are laid out from scratch
+        graph.nodes.extend(_node(f"m{i}") for i in range(10))
+        graph.version = 3
+        third = await service.get_layout(graph, LayoutType.FORCE_DIRECTED)
+        assert third.mode == "full"
+        service.shutdown()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("layout_type", [LayoutType.HIERARCHICAL, LayoutType.CIRCULAR])
+    async def test_structured_layouts_are_recomputed(self, layout_type):
+        """Test layouts with a global shape are never extended by placement."""
+        engine = _counting_engine()
+        service = LayoutService(engine, max_workers=0)
+        graph = _star(10)
+        await service.get_layout(graph, layout_type)
+
+        graph.nodes.append(_node("new"))
+        graph.edges.append(_edge("n3", "new"))
+        graph.version = 2
+
+        second = await service.get_layout(graph, layout_type)
+
+        assert second.mode == "full"
+        assert engine.calculate_layout.call_count == 2
+        if layout_type == LayoutType.CIRCULAR:
+            radii = {round(math.hypot(p.x, p.y), 6) for p in second.positions.values()}
+            assert len(radii) == 1
+        service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_worker_process_sees_a_snapshot(self):
+        """Test in-place graph updates after submission don't reach the worker."""
+        service = LayoutService(max_workers=1)
+        graph = _star(20)
+
+        task = asyncio.ensure_future(service.get_layout(graph, LayoutType.CIRCULAR))
+        await asyncio.sleep(0)
+        graph.nodes.append(_node("late"))
+        result = await task
+
+        assert result.mode == "full"
+        assert set(result.positions) == {"hub"} | {f"n{i}" for i in range(20)}
+        service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_work(self):
+        """Test simultaneous requests for one layout compute it once."""
+        engine = _counting_engine()
+        service = LayoutService(engine, max_workers=0)
+        graph = _star(50)
+
+        results = await asyncio.gather(*[
+            service.get_layout(graph, LayoutType.CIRCULAR) for _ in range(5)
+        ])
+
+        assert engine.calculate_layout.call_count == 1
+        assert all(r.positions == results[0].positions for r in results)
+        service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_stream_coarse_then_refined(self):
+        """Test large graphs stream a coarse layout before the refined one."""
+        service = LayoutService()
+        graph = _star(SKELETON_SIZE + 50)
+
+        stages = [(stage, result) async for stage, result in service.stream_layout(graph, LayoutType.RADIAL)]
+
+        assert [stage for stage, _ in stages] == ["coarse", "refined"]
+        coarse, refined = stages[0][1], stages[1][1]
+        assert coarse.mode == "coarse"
+        assert coarse.metadata["skeleton_size"] == SKELETON_SIZE
+        assert set(coarse.positions) == set(refined.positions)
+
+        # Once cached, only the refined layout is sent
+        stages = [stage async for stage, _ in service.stream_layout(graph, LayoutType.RADIAL)]
+        assert stages == ["refined"]
+        service.shutdown()
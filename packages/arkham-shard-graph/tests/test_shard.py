@@ -1,10 +1,14 @@
 """Tests for the Graph shard."""
 
+import asyncio
+
 import pytest
 import pytest_asyncio
 from unittest.mock import MagicMock, AsyncMock, patch
 
-from arkham_shard_graph.shard import GraphShard
+from arkham_frame.services.events import Event, EventBus
+from arkham_shard_graph.cooccurrence import CooccurrenceIndex
+from arkham_shard_graph.shard import DELETED_CONSUMER, GraphShard
 from arkham_shard_graph.models import Graph, GraphNode, GraphEdge
 
 
@@ -105,7 +109,7 @@ class TestGraphShardInitialization:
         # Event subscriptions registered
         events_service = mock_frame_with_services.get_service("events")
         assert events_service.subscribe.called
-        assert events_service.subscribe.call_count == 3
+        assert events_service.subscribe.call_count == 4
 
     @pytest.mark.asyncio
     async def test_shutdown(self, mock_frame_with_services):
@@ -146,9 +150,8 @@ class TestGraphShardEventHandlers:
         shard = GraphShard()
         frame = MagicMock()
 
-        events_service = AsyncMock()
-        events_service.subscribe = AsyncMock()
-        events_service.unsubscribe = AsyncMock()
+        # Handlers receive events through a real bus, wrapped as in production
+        events_service = EventBus()
 
         def get_service(name):
             if name == "events":
@@ -171,7 +174,7 @@ class TestGraphShardEventHandlers:
             "project_id": "proj1",
         }
 
-        await initialized_shard._on_entity_created(event_data)
+        await initialized_shard._event_bus.emit("entities.entity.created", event_data, source="entities")
 
         # Cache should be invalidated
         assert "proj1" not in initialized_shard.storage._cache
@@ -186,36 +189,187 @@ class TestGraphShardEventHandlers:
 
     @pytest.mark.asyncio
     async def test_on_entities_merged(self, initialized_shard):
-        """Test entities merged event handler."""
-        # Add graph to cache
-        initialized_shard.storage._cache["proj1"] = Graph(project_id="proj1")
+        """Test entities merged event folds the node into its target."""
+        initialized_shard.storage._cache["proj1"] = Graph(
+            project_id="proj1",
+            nodes=[
+                GraphNode(id="ent1", entity_id="ent1", label="A", entity_type="person"),
+                GraphNode(id="ent2", entity_id="ent2", label="B", entity_type="person"),
+                GraphNode(id="ent3", entity_id="ent3", label="C", entity_type="person"),
+            ],
+            edges=[
+                GraphEdge(source="ent1", target="ent3", relationship_type="mentioned_with",
+                          weight=0.1, document_ids=["doc1"], co_occurrence_count=1),
+                GraphEdge(source="ent2", target="ent3", relationship_type="mentioned_with",
+                          weight=0.1, document_ids=["doc2"], co_occurrence_count=1),
+            ],
+        )
 
         event_data = {
-            "source_entity_id": "ent1",
-            "target_entity_id": "ent2",
-            "project_id": "proj1",
+            "source_id": "ent1",
+            "target_id": "ent2",
         }
 
-        await initialized_shard._on_entities_merged(event_data)
+        await initialized_shard._event_bus.emit("entities.entity.merged", event_data, source="entities")
 
-        # Cache should be invalidated
-        assert "proj1" not in initialized_shard.storage._cache
+        # Graph stays cached, updated in place
+        graph = initialized_shard.storage._cache["proj1"]
+        assert {n.id for n in graph.nodes} == {"ent2", "ent3"}
+        assert len(graph.edges) == 1
+        assert graph.edges[0].co_occurrence_count == 2
+        assert initialized_shard.storage.get_cache_stats()["delta_updates"] == 1
 
     @pytest.mark.asyncio
     async def test_on_document_deleted(self, initialized_shard):
-        """Test document deleted event handler."""
-        # Add graph to cache
-        initialized_shard.storage._cache["proj1"] = Graph(project_id="proj1")
+        """Test document deleted event removes the document's edges."""
+        initialized_shard.storage._cache["proj1"] = Graph(
+            project_id="proj1",
+            nodes=[
+                GraphNode(id="ent1", entity_id="ent1", label="A", entity_type="person", document_count=1),
+                GraphNode(id="ent2", entity_id="ent2", label="B", entity_type="person", document_count=2),
+                GraphNode(id="ent3", entity_id="ent3", label="C", entity_type="person", document_count=1),
+            ],
+            edges=[
+                GraphEdge(source="ent1", target="ent2", relationship_type="mentioned_with",
+                          weight=0.1, document_ids=["doc1"], co_occurrence_count=1),
+                GraphEdge(source="ent2", target="ent3", relationship_type="mentioned_with",
+                          weight=0.1, document_ids=["doc2"], co_occurrence_count=1),
+            ],
+        )
 
         event_data = {
             "document_id": "doc1",
             "project_id": "proj1",
         }
 
-        await initialized_shard._on_document_deleted(event_data)
+        await initialized_shard._event_bus.emit("documents.document.deleted", event_data, source="documents")
 
-        # Cache should be invalidated
-        assert "proj1" not in initialized_shard.storage._cache
+        graph = initialized_shard.storage._cache["proj1"]
+        assert [(e.source, e.target) for e in graph.edges] == [("ent2", "ent3")]
+        assert {n.id for n in graph.nodes} == {"ent2", "ent3"}
+
+    @pytest.mark.asyncio
+    async def test_on_entities_batch_created(self, initialized_shard):
+        """Test batch created events are coalesced into one delta per project."""
+        shard = initialized_shard
+        shard.delta_debounce = 0.01
+        shard.storage._cache["proj1"] = Graph(
+            project_id="proj1",
+            nodes=[GraphNode(id="ent1", entity_id="ent1", label="A", entity_type="person")],
+        )
+        shard.storage._cache["proj2"] = Graph(project_id="proj2")
+        document_entities = {
+            "doc1": [
+                {"id": "ent1", "label": "A", "entity_type": "person"},
+                {"id": "ent2", "label": "B", "entity_type": "org"},
+            ],
+            "doc2": [{"id": "ent3", "label": "C", "entity_type": "person"}],
+        }
+        shard.builder.get_document_entities = AsyncMock(side_effect=lambda d: document_entities[d])
+        shard.builder.get_document_project = AsyncMock(return_value="proj1")
+        shard.cooccurrence_index.index_documents = AsyncMock()
+        save_graph = shard.storage.save_graph
+        shard.storage.save_graph = AsyncMock(side_effect=save_graph)
+
+        bus = shard._event_bus
+        await bus.emit("entities.batch.created", {"document_id": "doc1"}, source="entities")
+        await bus.emit("entities.batch.created", {"document_id": "doc2"}, source="entities")
+        # Per-entity events for the same documents add no work
+        await bus.emit("entities.entity.created", {"entity_id": "ent2", "document_id": "doc1"}, source="entities")
+        await asyncio.gather(*shard._delta_tasks.values())
+
+        shard.cooccurrence_index.index_documents.assert_any_await(["doc1"])
+        shard.storage.save_graph.assert_awaited_once()
+        graph = shard.storage._cache["proj1"]
+        assert {n.id for n in graph.nodes} == {"ent1", "ent2", "ent3"}
+        assert len(graph.edges) == 1
+        assert graph.edges[0].document_ids == ["doc1"]
+        assert shard.builder.get_document_entities.await_count == 2
+        # Other projects' graphs are untouched
+        assert shard.storage._cache["proj2"].nodes == []
+
+    @pytest.mark.asyncio
+    async def test_batch_without_project_leaves_graphs(self, initialized_shard):
+        """Test a document with no known project is not applied to every graph."""
+        shard = initialized_shard
+        shard.storage._cache["proj1"] = Graph(project_id="proj1")
+        shard.builder.get_document_project = AsyncMock(return_value=None)
+        shard.builder.get_document_entities = AsyncMock()
+        shard.cooccurrence_index.index_documents = AsyncMock()
+
+        await shard._event_bus.emit("entities.batch.created", {"document_id": "doc1"}, source="entities")
+
+        shard.cooccurrence_index.index_documents.assert_awaited_once_with(["doc1"])
+        assert shard._delta_tasks == {}
+        shard.builder.get_document_entities.assert_not_called()
+        assert shard.storage._cache["proj1"].nodes == []
+
+
+    @pytest.mark.asyncio
+    async def test_events_maintain_cooccurrence_index(self, initialized_shard):
+        """Test parsed and deleted documents reindex the pair table."""
+        shard = initialized_shard
+        db_service = MagicMock()
+        db_service.execute = AsyncMock()
+        db_service.fetch_all = AsyncMock(return_value=[])
+        shard.cooccurrence_index = CooccurrenceIndex(db_service=db_service)
+        await shard.cooccurrence_index.initialize()
+        await shard.cooccurrence_index.shutdown()
+        db_service.execute.reset_mock()
+        shard.builder.get_document_project = AsyncMock(return_value=None)
+
+        bus = shard._event_bus
+        await bus.emit("entities.batch.created", {"document_id": "doc1"}, source="entities")
+        await bus.emit("documents.document.deleted", {"document_id": "doc2"}, source="documents")
+
+        calls = [c.args for c in db_service.execute.await_args_list]
+        assert [(sql.split("(")[0], params) for sql, params in calls] == [
+            ("SELECT arkham_graph.cooc_index_documents", {"document_ids": ["doc1"]}),
+            ("SELECT arkham_graph.cooc_remove_documents", {"document_ids": ["doc2"]}),
+        ]
+
+
+class TestGraphShardDurableEvents:
+    """Test deletions consumed from the event outbox."""
+
+    @pytest.mark.asyncio
+    async def test_deletions_consumed_in_batches(self):
+        """Test a batch of deleted documents is removed with one index call."""
+        shard = GraphShard()
+        frame = MagicMock()
+        events_service = EventBus()
+        events_service.outbox = MagicMock()
+        frame.get_service = MagicMock(side_effect=lambda name: events_service if name == "events" else None)
+        await shard.initialize(frame)
+
+        name, pattern, handler = events_service.outbox.register_consumer.call_args.args
+        assert (name, pattern) == (DELETED_CONSUMER, "documents.document.deleted")
+        assert "documents.document.deleted" not in events_service._subscribers
+
+        shard.cooccurrence_index.remove_documents = AsyncMock()
+        shard.storage._cache["proj1"] = Graph(
+            project_id="proj1",
+            nodes=[
+                GraphNode(id="ent1", entity_id="ent1", label="A", entity_type="person", document_count=1),
+                GraphNode(id="ent2", entity_id="ent2", label="B", entity_type="person", document_count=2),
+            ],
+            edges=[
+                GraphEdge(source="ent1", target="ent2", relationship_type="mentioned_with",
+                          weight=0.1, document_ids=["doc1", "doc2"], co_occurrence_count=2),
+            ],
+        )
+
+        await handler([
+            Event(event_type="documents.document.deleted", payload={"document_id": doc_id, "project_id": "proj1"},
+                  source="documents-shard", sequence=seq)
+            for seq, doc_id in enumerate(["doc1", "doc2"], start=1)
+        ])
+
+        shard.cooccurrence_index.remove_documents.assert_awaited_once_with(["doc1", "doc2"])
+        assert shard.storage._cache["proj1"].edges == []
+
+        await shard.shutdown()
+        events_service.outbox.unregister_consumer.assert_called_once_with(DELETED_CONSUMER)
 
 
 class TestGraphShardPublicAPI:
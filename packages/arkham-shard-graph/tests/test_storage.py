@@ -1,10 +1,12 @@
 """Tests for graph storage."""
 
+from contextlib import asynccontextmanager
+
 import pytest
 import pytest_asyncio
 from unittest.mock import MagicMock, AsyncMock
 
-from arkham_shard_graph.storage import GraphStorage
+from arkham_shard_graph.storage import GraphStorage, edge_row_id
 from arkham_shard_graph.models import Graph, GraphNode, GraphEdge
 
 
@@ -92,15 +94,22 @@ class TestGraphPersistence:
     @pytest.mark.asyncio
     async def test_save_graph_with_db(self):
         """Test saving graph with database service."""
-        db_service = MagicMock()
+        tx = FakeTransaction()
+        db_service = FakeDatabase(tx)
         storage = GraphStorage(db_service=db_service)
 
-        graph = Graph(project_id="proj1")
+        graph = Graph(
+            project_id="proj1",
+            nodes=[GraphNode(id="n1", entity_id="e1", label="E1", entity_type="person")],
+        )
 
         await storage.save_graph(graph)
 
-        # Graph should be in cache
+        # Graph should be in cache and written through one transaction
         assert "proj1" in storage._cache
+        assert db_service.transactions == 1
+        assert [r[0] for r in tx.copied["nodes"]] == ["n1"]
+        assert graph.version == 1
 
     @pytest.mark.asyncio
     async def test_save_graph_db_error_handled(self):
@@ -218,3 +227,203 @@ class TestMultipleGraphs:
 
         loaded = await storage.load_graph("proj1")
         assert len(loaded.nodes) == 1
+
+
+class FakeTransaction:
+    """Minimal DatabaseTransaction backed by dicts of row_id -> row_hash."""
+
+    def __init__(self):
+        self.head = None
+        self.tables = {"nodes": {}, "edges": {}}
+        self.copied = {"nodes": [], "edges": []}
+        self.deleted = {"nodes": [], "edges": []}
+        self.staged = []
+
+    async def fetch_one(self, sql, params=None):
+        if sql.lstrip().startswith("UPDATE"):
+            self.head = {**self.head, "version": self.head["version"] + 1, "metadata": params["metadata"]}
+        return self.head
+
+    async def fetch_all(self, sql, params=None):
+        table = "nodes" if "arkham_graph.nodes" in sql else "edges"
+        return [{"id": i, "row_hash": h} for i, h in self.tables[table].items()]
+
+    async def execute(self, sql, params=None):
+        if sql.startswith("INSERT INTO arkham_graph.graphs"):
+            self.head = {"id": params["id"], "version": 0, "metadata": params["metadata"]}
+        elif sql.startswith("INSERT INTO arkham_graph."):
+            table = sql.split()[2].split(".")[1]
+            for record in self.staged:
+                self.tables[table][record[0]] = record[-1]
+            self.staged = []
+        elif sql.startswith("DELETE"):
+            table = sql.split()[2].split(".")[1]
+            for row_id in params["ids"]:
+                self.tables[table].pop(row_id, None)
+            self.deleted[table].extend(params["ids"])
+
+    async def copy_records(self, table, columns, records, schema=None):
+        name = "nodes" if "nodes" in table else "edges"
+        self.copied[name].extend(records)
+        self.staged = list(records)
+
+
+class FakeDatabase:
+    def __init__(self, tx):
+        self.tx = tx
+        self.transactions = 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.transactions += 1
+        yield self.tx
+
+
+def make_graph(node_count: int = 4) -> Graph:
+    nodes = [
+        GraphNode(id=f"n{i}", entity_id=f"e{i}", label=f"E{i}", entity_type="person")
+        for i in range(node_count)
+    ]
+    edges = [
+        GraphEdge(source=f"n{i}", target=f"n{i + 1}", relationship_type="co_occurrence", weight=1.0)
+        for i in range(node_count - 1)
+    ]
+    return Graph(project_id="proj1", nodes=nodes, edges=edges)
+
+
+class TestIncrementalPersistence:
+    """Test diff-based persistence through the bulk (COPY) path."""
+
+    @pytest.fixture
+    def conn(self):
+        return FakeTransaction()
+
+    @pytest.fixture
+    def storage(self, conn):
+        return GraphStorage(db_service=FakeDatabase(conn))
+
+    def test_edge_row_id_is_stable_and_undirected(self):
+        forward = GraphEdge(source="a", target="b", relationship_type="co_occurrence", weight=1.0)
+        backward = GraphEdge(source="b", target="a", relationship_type="co_occurrence", weight=2.0)
+
+        assert edge_row_id("graph-p", forward) == edge_row_id("graph-p", backward)
+        assert edge_row_id("graph-p", forward) != edge_row_id("graph-q", forward)
+
+    def test_parallel_edges_get_their_own_rows(self):
+        first, second = (
+            GraphEdge(source="a", target="b", relationship_type="contradicts", weight=0.5,
+                      properties={"original_id": f"c{i}"})
+            for i in range(2)
+        )
+
+        assert edge_row_id("graph-p", first) != edge_row_id("graph-p", second)
+        assert edge_row_id("graph-p", first) != edge_row_id("graph-p", first, ordinal=1)
+
+    @pytest.mark.asyncio
+    async def test_parallel_edges_are_all_persisted(self, storage, conn):
+        graph = make_graph(2)
+        graph.edges += [
+            GraphEdge(source="n1", target="n0", relationship_type="co_occurrence", weight=0.5),
+            GraphEdge(source="n0", target="n1", relationship_type="contradicts", weight=0.5,
+                      properties={"original_id": "c1"}),
+            GraphEdge(source="n0", target="n1", relationship_type="contradicts", weight=0.5,
+                      properties={"original_id": "c2"}),
+        ]
+
+        await storage._persist_graph(graph)
+
+        assert len(conn.copied["edges"]) == 4
+        assert len(conn.tables["edges"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_first_save_copies_everything(self, storage, conn):
+        graph = make_graph()
+
+        diff = await storage._persist_graph(graph)
+
+        assert len(conn.copied["nodes"]) == 4
+        assert len(conn.copied["edges"]) == 3
+        # jsonb columns are loaded as structures, not JSON text
+        assert conn.copied["nodes"][0][7] == {}
+        assert conn.copied["edges"][0][7] == []
+        assert diff.metadata_changed
+        assert graph.version == 1
+
+    @pytest.mark.asyncio
+    async def test_unchanged_graph_writes_nothing(self, storage, conn):
+        await storage._persist_graph(make_graph())
+        conn.copied = {"nodes": [], "edges": []}
+
+        graph = make_graph()
+        diff = await storage._persist_graph(graph)
+
+        assert diff.is_empty
+        assert conn.copied == {"nodes": [], "edges": []}
+        assert graph.version == 1
+
+    @pytest.mark.asyncio
+    async def test_only_delta_is_written(self, storage, conn):
+        await storage._persist_graph(make_graph())
+        conn.copied = {"nodes": [], "edges": []}
+
+        graph = make_graph()
+        graph.nodes[0].degree = 7
+        removed = graph.edges.pop()
+        diff = await storage._persist_graph(graph)
+
+        assert [r[0] for r in conn.copied["nodes"]] == ["n0"]
+        assert conn.copied["edges"] == []
+        assert conn.deleted["edges"] == [edge_row_id("graph-proj1", removed)]
+        assert diff.to_dict()["nodes_upserted"] == 1
+        assert graph.version == 2
+
+    @pytest.mark.asyncio
+    async def test_save_graph_records_version(self, storage):
+        graph = make_graph()
+
+        await storage.save_graph(graph)
+
+        assert storage._cache["proj1"].version == 1
+
+    @pytest.mark.asyncio
+    async def test_in_memory_saves_bump_version(self):
+        storage = GraphStorage()
+
+        await storage.save_graph(make_graph())
+        await storage.save_graph(make_graph())
+
+        assert (await storage.load_graph("proj1")).version == 2
+
+
+class TestGraphDeltaUpdates:
+    """Test in-place updates of cached graphs."""
+
+    @pytest.mark.asyncio
+    async def test_apply_delta(self):
+        """Test apply_delta updates matching cached graphs only."""
+        storage = GraphStorage()
+        storage._cache["proj1"] = Graph(project_id="proj1")
+        storage._cache["proj2"] = Graph(project_id="proj2")
+
+        def add_node(graph):
+            graph.nodes.append(GraphNode(id="n", entity_id="n", label="N", entity_type="person"))
+            return True
+
+        updated = await storage.apply_delta(add_node, "proj1")
+
+        assert updated == 1
+        assert len(storage._cache["proj1"].nodes) == 1
+        assert storage._cache["proj2"].nodes == []
+        assert storage._cache["proj1"].version == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_stats(self):
+        """Test cache metrics are exposed."""
+        storage = GraphStorage()
+        await storage.save_graph(Graph(project_id="proj1"))
+
+        await storage.load_graph("proj1")
+
+        stats = storage.get_cache_stats()
+        assert stats["graphs"] == 1
+        assert stats["hits"] == 1
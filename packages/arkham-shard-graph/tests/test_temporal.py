@@ -0,0 +1,153 @@
+"""Tests for temporal graph snapshots."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+
+from arkham_shard_graph.temporal import TemporalGraphEngine, TemporalRange, TemporalSweep
+
+
+T0 = datetime(2024, 1, 1)
+
+
+def _day(n: int) -> datetime:
+    return T0 + timedelta(days=n)
+
+
+class TestTemporalSweep:
+    """Test the event-sourced snapshot sweep."""
+
+    def test_cooccurrence_edges_appear(self):
+        """Test entities sharing a document become connected."""
+        sweep = TemporalSweep({"a": {"label": "A", "entity_type": "person"}})
+        sweep.add("a", "d1", _day(0))
+        sweep.add("b", "d1", _day(1))
+        sweep.add("c", "d2", _day(1))
+
+        snapshot = sweep.snapshot(_day(1))
+
+        assert snapshot.node_count == 3
+        assert snapshot.edge_count == 1
+        assert snapshot.edges[0].source == "a"
+        assert snapshot.edges[0].target == "b"
+        assert snapshot.edges[0].created_at == _day(1)
+        assert sorted(snapshot.added_nodes) == ["a", "b", "c"]
+        assert snapshot.added_edges == [("a", "b")]
+        labels = {n.id: n.label for n in snapshot.nodes}
+        assert labels["a"] == "A"
+
+    def test_changes_are_relative_to_previous_snapshot(self):
+        """Test added/removed lists only cover the latest interval."""
+        sweep = TemporalSweep()
+        sweep.add("a", "d1", _day(0))
+        sweep.add("b", "d1", _day(0))
+        sweep.snapshot(_day(0))
+
+        sweep.add("c", "d1", _day(1))
+        snapshot = sweep.snapshot(_day(1))
+
+        assert snapshot.added_nodes == ["c"]
+        assert sorted(snapshot.added_edges) == [("a", "c"), ("b", "c")]
+        assert snapshot.removed_nodes == []
+
+    def test_removal_drops_edges_once_unsupported(self):
+        """Test an edge survives until its last shared document leaves."""
+        sweep = TemporalSweep()
+        sweep.add("a", "d1", _day(0))
+        sweep.add("b", "d1", _day(0))
+        sweep.add("a", "d2", _day(1))
+        sweep.add("b", "d2", _day(1))
+        sweep.snapshot(_day(1))
+
+        sweep.remove("a", "d1")
+        sweep.remove("b", "d1")
+        snapshot = sweep.snapshot(_day(2))
+        assert snapshot.edge_count == 1
+        assert snapshot.edges[0].document_ids == ["d2"]
+        assert snapshot.removed_edges == []
+
+        sweep.remove("a", "d2")
+        snapshot = sweep.snapshot(_day(3))
+        assert snapshot.edge_count == 0
+        assert snapshot.removed_edges == [("a", "b")]
+        assert snapshot.removed_nodes == ["a"]
+
+    def test_transient_changes_cancel_out(self):
+        """Test a node added and removed within one interval is not reported."""
+        sweep = TemporalSweep()
+        sweep.snapshot(_day(0))
+
+        sweep.add("a", "d1", _day(1))
+        sweep.remove("a", "d1")
+        snapshot = sweep.snapshot(_day(1))
+
+        assert snapshot.added_nodes == []
+        assert snapshot.removed_nodes == []
+
+    def test_degree_deltas(self):
+        """Test per-node degree changes are reported when requested."""
+        sweep = TemporalSweep()
+        sweep.add("a", "d1", _day(0))
+        sweep.add("b", "d1", _day(0))
+        sweep.snapshot(_day(0), degree_deltas=True)
+
+        sweep.add("c", "d1", _day(1))
+        snapshot = sweep.snapshot(_day(1), degree_deltas=True)
+
+        assert snapshot.degree_deltas == {"a": 1, "b": 1, "c": 2}
+        degrees = {n.id: n.degree for n in snapshot.nodes}
+        assert degrees == {"a": 2, "b": 2, "c": 2}
+
+
+class TestGenerateSnapshots:
+    """Test snapshot generation from a single mentions scan."""
+
+    def _engine(self, mentions):
+        db_service = MagicMock()
+        db_service.fetch_all = AsyncMock(side_effect=[
+            [
+                {"entity_id": e, "document_id": d, "created_at": t}
+                for e, d, t in mentions
+            ],
+            [],
+        ])
+        engine = TemporalGraphEngine(db_service=db_service)
+        engine.get_temporal_range = AsyncMock(return_value=TemporalRange(
+            start_date=_day(0),
+            end_date=_day(2),
+            interval=timedelta(days=1),
+            snapshot_count=2,
+        ))
+        return engine, db_service
+
+    @pytest.mark.asyncio
+    async def test_cumulative(self):
+        """Test cumulative snapshots accumulate mentions."""
+        engine, db_service = self._engine([
+            ("a", "d1", _day(0)),
+            ("b", "d1", _day(1)),
+            ("c", "d2", _day(2)),
+        ])
+
+        snapshots = await engine.generate_snapshots("proj1")
+
+        assert [s.node_count for s in snapshots] == [1, 2, 3]
+        assert [s.edge_count for s in snapshots] == [0, 1, 1]
+        # One mentions scan plus one entity lookup, regardless of snapshot count
+        assert db_service.fetch_all.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_window(self):
+        """Test window snapshots drop mentions older than the window."""
+        engine, _ = self._engine([
+            ("a", "d1", _day(0)),
+            ("b", "d1", _day(0)),
+            ("c", "d2", _day(2)),
+        ])
+
+        snapshots = await engine.generate_snapshots("proj1", cumulative=False)
+
+        assert [s.node_count for s in snapshots] == [2, 2, 1]
+        assert sorted(snapshots[2].removed_nodes) == ["a", "b"]
+        assert snapshots[2].removed_edges == [("a", "b")]
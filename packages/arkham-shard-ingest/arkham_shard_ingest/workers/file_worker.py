@@ -43,6 +43,7 @@ class FileWorker(BaseWorker):
     name = "FileWorker"
     job_timeout = 60.0  # File ops shouldn't take more than 60s
     poll_interval = 0.5  # Poll frequently for I/O tasks
+    max_concurrent_jobs = 8  # File I/O is async, overlap it
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
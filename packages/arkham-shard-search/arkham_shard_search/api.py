@@ -8,6 +8,8 @@ from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from arkham_frame.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
 if TYPE_CHECKING:
     from .shard import SearchShard
 
@@ -23,6 +25,7 @@ from .models import (
     SimilarityRequest,
 )
 from .filters import FilterBuilder
+from .cache import query_fingerprint, sort_value
 
 logger = logging.getLogger(__name__)
 
@@ -35,17 +38,62 @@ _hybrid_engine = None
 _regex_engine = None
 _filter_optimizer = None
 _event_bus = None
-
-
-def init_api(semantic_engine, keyword_engine, hybrid_engine, regex_engine, filter_optimizer, event_bus):
+_result_cache = None
+_frame = None
+
+
+def init_api(
+    semantic_engine,
+    keyword_engine,
+    hybrid_engine,
+    regex_engine,
+    filter_optimizer,
+    event_bus,
+    result_cache=None,
+    frame=None,
+):
     """Initialize API with shard dependencies."""
     global _semantic_engine, _keyword_engine, _hybrid_engine, _regex_engine, _filter_optimizer, _event_bus
+    global _result_cache, _frame
     _semantic_engine = semantic_engine
     _keyword_engine = keyword_engine
     _hybrid_engine = hybrid_engine
     _regex_engine = regex_engine
     _filter_optimizer = filter_optimizer
     _event_bus = event_bus
+    _result_cache = result_cache
+    _frame = frame
+
+
+def _search_scope() -> tuple:
+    """Active project and the model-aware hybrid weights that shape ranking."""
+    weights = (
+        getattr(_hybrid_engine, "default_semantic_weight", None),
+        getattr(_hybrid_engine, "default_keyword_weight", None),
+    )
+    return getattr(_frame, "active_project_id", None), weights
+
+
+async def _run_search(query: SearchQuery, after: tuple | None = None):
+    """Run a query on its engine, through the result cache when enabled."""
+    if query.mode == SearchMode.SEMANTIC:
+        engine = _semantic_engine
+    elif query.mode == SearchMode.KEYWORD:
+        engine = _keyword_engine
+    else:
+        engine = _hybrid_engine
+
+    if not _result_cache:
+        return await engine.search(query)
+
+    project_id, weights = _search_scope()
+    return await _result_cache.search(
+        query,
+        engine.search,
+        project_id=project_id,
+        weights=weights,
+        after=after,
+    )
 
 
 def get_shard(request: Request) -> "SearchShard":
@@ -69,6 +117,8 @@ class SearchRequest(BaseModel):
     sort_order: str = "desc"
     semantic_weight: float = 0.7
     keyword_weight: float = 0.3
+    highlight: bool = False
+    cursor: str | None = None  # next_cursor from the previous page; overrides offset
 
 
 class SearchResponse(BaseModel):
@@ -81,6 +131,7 @@ class SearchResponse(BaseModel):
     offset: int
     limit: int
     has_more: bool
+    next_cursor: str | None = None
 
 
 class SuggestResponse(BaseModel):
@@ -141,6 +192,22 @@ async def get_search_config():
     return SearchConfigResponse(**config)
 
 
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get search result cache hit-rate and memory statistics."""
+    if not _result_cache:
+        return {"enabled": False}
+    return {"enabled": True, **_result_cache.get_stats()}
+
+
+@router.post("/cache/clear")
+async def clear_cache():
+    """Drop all cached search results."""
+    if _result_cache:
+        _result_cache.clear()
+    return {"success": True}
+
+
 @router.post("/", response_model=SearchResponse)
 async def search(request: SearchRequest):
     """
@@ -189,16 +256,23 @@ async def search(request: SearchRequest):
         sort_order=sort_order,
         semantic_weight=request.semantic_weight,
         keyword_weight=request.keyword_weight,
+        highlight=request.highlight,
     )
 
+    # A cursor pins the ranked list it came from and the sort key of the last item served
+    fingerprint = query_fingerprint(query, *_search_scope())[:16]
+    after = None
+    if request.cursor:
+        try:
+            position = decode_cursor(request.cursor, q=fingerprint)
+            query.offset = int(position["offset"])
+            after = (position["key"], position["doc"], position.get("chunk"))
+        except (InvalidCursorError, KeyError, TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+
     # Execute search
     try:
-        if mode == SearchMode.SEMANTIC:
-            results = await _semantic_engine.search(query)
-        elif mode == SearchMode.KEYWORD:
-            results = await _keyword_engine.search(query)
-        else:  # HYBRID
-            results = await _hybrid_engine.search(query)
+        results = await _run_search(query, after=after)
     except Exception as e:
         logger.error(f"Search failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
@@ -235,6 +309,17 @@ async def search(request: SearchRequest):
             total = max(total, facets["date_ranges"]["last_year"]["count"])
     has_more = len(results) == request.limit
 
+    next_cursor = None
+    if has_more:
+        last = results[-1]
+        next_cursor = encode_cursor(
+            q=fingerprint,
+            offset=query.offset + len(results),
+            key=sort_value(last, query.sort_by),
+            doc=last.doc_id,
+            chunk=last.chunk_id,
+        )
+
     return SearchResponse(
         query=request.query,
         mode=mode.value,
@@ -242,9 +327,10 @@ async def search(request: SearchRequest):
         items=[_result_to_dict(r) for r in results],
         duration_ms=duration_ms,
         facets=facets,
-        offset=request.offset,
+        offset=query.offset,
         limit=request.limit,
         has_more=has_more,
+        next_cursor=next_cursor,
     )
 
 
@@ -768,6 +854,7 @@ class RegexSearchResponse(BaseModel):
     documents_searched: int
     duration_ms: float
     error: str | None = None
+    count_is_estimate: bool = False
 
 
 class ValidatePatternRequest(BaseModel):
@@ -879,6 +966,7 @@ async def search_regex(request: Request, body: RegexSearchRequest):
         documents_searched=result.documents_searched,
         duration_ms=result.duration_ms,
         error=result.error,
+        count_is_estimate=result.count_is_estimate,
     )
 
 
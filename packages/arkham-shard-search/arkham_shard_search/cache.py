@@ -0,0 +1,478 @@
+"""
+Search result cache keyed on corpus version.
+
+Results are cached per normalized query, filters, sort and engine
+weights, together with the corpus version of the project being searched.
+Document and chunk events bump the version (per project when the event
+names one, globally otherwise), so stale entries are never served: they
+simply stop being addressable and age out of the LRU. Searches without a
+project span every project, so any project bump also invalidates them.
+
+Paging is not part of the key. A miss ranks a window of results from
+offset 0 (rounded up to page_window), and later pages inside that window
+are sliced from memory instead of being re-scored. Windows are ordered by
+the query's sort key (score, date or title, missing values last) with
+(doc_id, chunk_id) as tiebreaker, so a search cursor holds the sort key
+of the last item served and the next page starts at the first item after
+it, found by binary search; if the corpus changes between pages, the next
+page still starts after that position. Past max_window, cursor pages run
+the engine from the cursor's offset and keep the items after its position.
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable
+
+from .models import SearchQuery, SearchResultItem, SortBy, SortOrder
+
+logger = logging.getLogger(__name__)
+
+# Events that change what a search can return (all of them are emitted
+# somewhere; an event nobody emits would leave the cache silently stale)
+CORPUS_EVENTS = [
+    "documents.document.created",
+    "documents.document.deleted",
+    "documents.metadata.updated",
+    "documents.duplicates.merged",
+    "chunks.batch.created",
+    "chunks.chunk.created",
+    "embed.document.completed",
+    "embed.batch.completed",
+    "embed.model.switched",
+    "projects.document.added",
+    "projects.document.removed",
+]
+
+# Rough per-item overhead on top of string payloads
+_ITEM_OVERHEAD_BYTES = 512
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+    return str(value)
+
+
+@dataclasses.dataclass
+class _Entry:
+    results: list[SearchResultItem]
+    window: int
+    size: int
+    stored_at: float
+
+    def covers(self, end: int) -> bool:
+        # A short window means the engine ran out of results
+        return end <= self.window or len(self.results) < self.window
+
+
+def query_fingerprint(
+    query: SearchQuery,
+    project_id: str | None = None,
+    weights: tuple[float, ...] = (),
+) -> str:
+    """
+    Identity of a ranked result list, independent of paging and corpus version.
+
+    Args:
+        query: Search query (text is case- and whitespace-normalized;
+            offset and limit are ignored)
+        project_id: Active project
+        weights: Engine weights in effect beyond those on the query
+    """
+    filters = dataclasses.asdict(query.filters) if query.filters else None
+    material = {
+        "q": " ".join(query.query.lower().split()),
+        "mode": query.mode,
+        "filters": filters,
+        "sort": [query.sort_by, query.sort_order],
+        "weights": [query.semantic_weight, query.keyword_weight, *weights],
+        "highlight": query.highlight,
+        "project": project_id,
+    }
+    encoded = json.dumps(material, sort_keys=True, default=_json_default)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def sort_value(item: SearchResultItem, sort_by: SortBy = SortBy.RELEVANCE) -> Any:
+    """
+    The JSON-safe value an item is ordered by.
+
+    Args:
+        item: Search result
+        sort_by: Sort field of the query
+
+    Returns:
+        Score, ISO creation date (None if unknown) or lowercased title
+    """
+    if sort_by == SortBy.DATE:
+        return item.created_at.isoformat() if item.created_at else None
+    if sort_by == SortBy.TITLE:
+        return (item.title or "").lower()
+    return item.score
+
+
+def _tiebreak(item: SearchResultItem) -> tuple[str, str]:
+    return item.doc_id, item.chunk_id or ""
+
+
+def order_results(
+    results: list[SearchResultItem],
+    sort_by: SortBy = SortBy.RELEVANCE,
+    sort_order: SortOrder = SortOrder.DESC,
+) -> list[SearchResultItem]:
+    """
+    Order results by sort value, then (doc_id, chunk_id), missing values last.
+
+    This is the total order cursors seek in.
+    """
+    present = sorted(
+        (r for r in results if sort_value(r, sort_by) is not None), key=_tiebreak
+    )
+    # Stable, so equal values keep their tiebreak order in both directions
+    present.sort(key=lambda r: sort_value(r, sort_by), reverse=sort_order == SortOrder.DESC)
+    missing = sorted((r for r in results if sort_value(r, sort_by) is None), key=_tiebreak)
+    return present + missing
+
+
+def _is_after(
+    item: SearchResultItem,
+    after: tuple,
+    sort_by: SortBy,
+    descending: bool,
+) -> bool:
+    """Keyset predicate: does item come after the cursor position?"""
+    value, doc_id, chunk_id = after
+    item_value = sort_value(item, sort_by)
+    later_tie = _tiebreak(item) > (doc_id, chunk_id or "")
+    if value is None:
+        return item_value is None and later_tie
+    if item_value is None:
+        return True
+    if item_value == value:
+        return later_tie
+    return item_value < value if descending else item_value > value
+
+
+def seek(
+    results: list[SearchResultItem],
+    after: tuple,
+    hint: int = 0,
+    sort_by: SortBy = SortBy.RELEVANCE,
+    sort_order: SortOrder = SortOrder.DESC,
+) -> int:
+    """
+    Index of the first result after a cursor position.
+
+    Args:
+        results: Results in order_results() order
+        after: (sort value, doc_id, chunk_id) of the last item served
+        hint: Offset the cursor was issued at, checked first
+        sort_by: Sort field the results are ordered by
+        sort_order: Sort direction
+
+    Returns:
+        Start index of the next page
+    """
+    descending = sort_order == SortOrder.DESC
+    _, doc_id, chunk_id = after
+    if 0 < hint <= len(results):
+        last = results[hint - 1]
+        if last.doc_id == doc_id and last.chunk_id == chunk_id:
+            return hint
+
+    # The predicate is false then true along the ordering
+    low, high = 0, len(results)
+    while low < high:
+        mid = (low + high) // 2
+        if _is_after(results[mid], after, sort_by, descending):
+            high = mid
+        else:
+            low = mid + 1
+    return low
+
+
+def _estimate_size(results: list[SearchResultItem]) -> int:
+    size = 0
+    for item in results:
+        size += _ITEM_OVERHEAD_BYTES + len(item.title or "") + len(item.excerpt or "")
+        size += sum(len(h) for h in item.highlights)
+    return size
+
+
+class SearchResultCache:
+    """
+    Bounded LRU of ranked search results with corpus-version keys.
+
+    Args:
+        max_entries: Maximum cached queries
+        max_bytes: Approximate memory bound for cached results
+        ttl: Seconds an entry may be served regardless of version
+        page_window: Results ranked per miss; pages inside it are free
+        max_window: Deepest result served from cache; beyond it queries
+            go straight to the engines
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 600.0,
+        page_window: int = 100,
+        max_window: int = 1000,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.page_window = max(1, page_window)
+        self.max_window = max(self.page_window, max_window)
+
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._bytes = 0
+
+        self._global_version = 0
+        self._project_versions: dict[str, int] = {}
+        # Bumped with every project version; unscoped searches key on it
+        self._any_project_version = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # =========================================================================
+    # Corpus versions
+    # =========================================================================
+
+    def bump(self, project_id: str | None = None) -> None:
+        """Record a corpus change for one project, or for all projects."""
+        if project_id:
+            self._project_versions[project_id] = self._project_versions.get(project_id, 0) + 1
+            self._any_project_version += 1
+        else:
+            self._global_version += 1
+        self.invalidations += 1
+
+    async def on_corpus_event(self, event: dict) -> None:
+        """EventBus handler for CORPUS_EVENTS."""
+        payload = event.get("payload", event) if isinstance(event, dict) else {}
+        self.bump(payload.get("project_id") if isinstance(payload, dict) else None)
+
+    def version(self, project_id: str | None = None) -> tuple[int, int]:
+        if project_id:
+            return self._global_version, self._project_versions.get(project_id, 0)
+        return self._global_version, self._any_project_version
+
+    # =========================================================================
+    # Lookup
+    # =========================================================================
+
+    def make_key(
+        self,
+        query: SearchQuery,
+        project_id: str | None = None,
+        weights: tuple[float, ...] = (),
+    ) -> str:
+        """
+        Cache key for a query in the current corpus version.
+
+        Args:
+            query: Search query (text is case- and whitespace-normalized;
+                offset and limit are ignored)
+            project_id: Active project, which scopes the corpus version
+            weights: Engine weights in effect beyond those on the query
+        """
+        fingerprint = query_fingerprint(query, project_id, weights)
+        version = ".".join(str(v) for v in self.version(project_id))
+        return f"{fingerprint}:{version}"
+
+    async def search(
+        self,
+        query: SearchQuery,
+        run: Callable[[SearchQuery], Awaitable[list[SearchResultItem]]],
+        project_id: str | None = None,
+        weights: tuple[float, ...] = (),
+        after: tuple | None = None,
+    ) -> list[SearchResultItem]:
+        """
+        Serve one page of results, running the engine only on a miss.
+
+        Concurrent misses for the same query share one engine call.
+
+        Args:
+            query: The page being requested
+            run: Engine search coroutine
+            project_id: Active project
+            weights: Engine weights in effect beyond those on the query
+            after: Cursor position (sort value, doc_id, chunk_id); the
+                page starts after that position, with query.offset as a
+                hint.
+        """
+        if query.offset + query.limit > self.max_window:
+            self.bypassed += 1
+            if after is None:
+                return await run(query)
+            return await self._search_past_window(query, run, after, query.offset)
+
+        key = self.make_key(query, project_id, weights)
+        start = query.offset
+        end = start + query.limit
+        entry = await self._entry_for(key, query, run, end)
+
+        if after is not None:
+            start = seek(entry.results, after, start, query.sort_by, query.sort_order)
+            end = start + query.limit
+            if end > self.max_window:
+                self.bypassed += 1
+                return await self._search_past_window(query, run, after, start)
+            if not entry.covers(end):
+                entry = await self._entry_for(key, query, run, end)
+                start = seek(entry.results, after, start, query.sort_by, query.sort_order)
+                end = min(start + query.limit, self.max_window)
+
+        return [dataclasses.replace(item) for item in entry.results[start:end]]
+
+    async def _search_past_window(
+        self,
+        query: SearchQuery,
+        run: Callable[[SearchQuery], Awaitable[list[SearchResultItem]]],
+        after: tuple,
+        start: int,
+    ) -> list[SearchResultItem]:
+        """
+        Cursor page beyond max_window, ranked by the engine at its offset.
+
+        A page's worth of extra results covers items the cursor position
+        filters out when the corpus shifted since the previous page.
+        """
+        results = await run(dataclasses.replace(query, offset=start, limit=2 * query.limit))
+        results = order_results(results, query.sort_by, query.sort_order)
+        descending = query.sort_order == SortOrder.DESC
+        return [r for r in results if _is_after(r, after, query.sort_by, descending)][:query.limit]
+
+    async def _entry_for(
+        self,
+        key: str,
+        query: SearchQuery,
+        run: Callable[[SearchQuery], Awaitable[list[SearchResultItem]]],
+        end: int,
+    ) -> _Entry:
+        entry = self._lookup(key, end)
+        if entry is None:
+            pending = self._inflight.get(key)
+            if pending is not None:
+                self.coalesced += 1
+                try:
+                    await asyncio.shield(pending)
+                except Exception:
+                    pass
+                entry = self._lookup(key, end)
+
+        if entry is None:
+            self.misses += 1
+            return await self._compute(key, query, run, end)
+        self.hits += 1
+        return entry
+
+    def _lookup(self, key: str, end: int) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None or not entry.covers(end):
+            return None
+        if time.monotonic() - entry.stored_at > self.ttl:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def _compute(
+        self,
+        key: str,
+        query: SearchQuery,
+        run: Callable[[SearchQuery], Awaitable[list[SearchResultItem]]],
+        end: int,
+    ) -> _Entry:
+        window = min(-(-end // self.page_window) * self.page_window, self.max_window)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            results = await run(dataclasses.replace(query, offset=0, limit=window))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved; there may be no waiters
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        results = order_results(results, query.sort_by, query.sort_order)
+        entry = _Entry(
+            results=[dataclasses.replace(item) for item in results],
+            window=window,
+            size=_estimate_size(results),
+            stored_at=time.monotonic(),
+        )
+        self._store(key, entry)
+        future.set_result(None)
+        return entry
+
+    def _store(self, key: str, entry: _Entry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._bytes -= entry.size
+
+    # =========================================================================
+    # Maintenance
+    # =========================================================================
+
+    def clear(self) -> None:
+        """Drop every cached result (versions are kept)."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get hit-rate and memory statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "bypassed": self.bypassed,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "global_version": self._global_version,
+            "projects_tracked": len(self._project_versions),
+            "page_window": self.page_window,
+        }
@@ -121,6 +121,7 @@ class HybridSearchEngine:
             offset=0,  # Always start at 0 for merging
             sort_by=query.sort_by,
             sort_order=query.sort_order,
+            highlight=query.highlight,
         )
 
         # Execute both searches in parallel
@@ -204,7 +205,7 @@ class HybridSearchEngine:
 
                 # Merge highlights from keyword search
                 if item and kw_item.highlights:
-                    item.highlights.extend(kw_item.highlights)
+                    item.highlights.extend(h for h in kw_item.highlights if h not in item.highlights)
                 elif not item:
                     item = kw_item
 
@@ -1,8 +1,21 @@
-"""Keyword search engine using BM25 ranking."""
+"""
+Keyword search engine using BM25 ranking.
+
+Scoring runs against an inverted index in the arkham_search schema
+(term -> postings with term frequency and chunk length). The index is
+maintained a document at a time: the search shard reindexes a document's
+chunks in one statement when chunks.batch.created arrives, and chunks that
+predate the index are picked up by a backfill. Top-k retrieval uses MaxScore: terms
+whose combined upper-bound contribution cannot lift a chunk past the
+current k-th score are never used to generate candidates, so common
+terms stop driving full postings scans. If the index cannot be created
+the engine falls back to LIKE matching.
+"""
 
 import logging
 import math
 import re
+import time
 from typing import Any
 from collections import Counter
 
@@ -10,6 +23,273 @@ from ..models import SearchQuery, SearchResultItem
 
 logger = logging.getLogger(__name__)
 
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
+    'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that',
+    'the', 'to', 'was', 'were', 'will', 'with', 'this', 'they',
+    'but', 'have', 'had', 'what', 'when', 'where', 'who', 'which',
+})
+
+# Inverted index DDL. Tokenization mirrors BM25Scorer.tokenize: lowercase
+# \w+ runs longer than one character, minus STOP_WORDS.
+_STOP_WORDS_SQL = "ARRAY[" + ", ".join(f"'{w}'" for w in sorted(STOP_WORDS)) + "]::text[]"
+
+BM25_INDEX_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS arkham_search.bm25_postings (
+        term TEXT NOT NULL,
+        chunk_id TEXT NOT NULL,
+        tf INTEGER NOT NULL,
+        doc_length INTEGER NOT NULL,
+        PRIMARY KEY (term, chunk_id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_bm25_postings_chunk
+    ON arkham_search.bm25_postings(chunk_id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS arkham_search.bm25_terms (
+        term TEXT PRIMARY KEY,
+        df INTEGER NOT NULL DEFAULT 0,
+        max_tf INTEGER NOT NULL DEFAULT 0,
+        min_length INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS arkham_search.bm25_chunk_stats (
+        chunk_id TEXT PRIMARY KEY,
+        document_id TEXT,
+        length INTEGER NOT NULL
+    )
+    """,
+    rf"""
+    CREATE OR REPLACE FUNCTION arkham_search.bm25_term_counts(p_text TEXT)
+    RETURNS TABLE (term TEXT, tf INTEGER) AS $$
+        SELECT m[1], COUNT(*)::integer
+        FROM regexp_matches(lower(COALESCE(p_text, '')), '\w+', 'g') AS m
+        WHERE length(m[1]) > 1 AND m[1] <> ALL ({_STOP_WORDS_SQL})
+        GROUP BY m[1]
+        ORDER BY m[1]
+    $$ LANGUAGE sql IMMUTABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION arkham_search.bm25_index_documents(p_document_ids TEXT[])
+    RETURNS void AS $$
+    DECLARE
+        v_docs TEXT[];
+    BEGIN
+        SELECT array_agg(DISTINCT d ORDER BY d) INTO v_docs
+        FROM unnest(p_document_ids) AS d
+        WHERE d IS NOT NULL;
+        IF v_docs IS NULL THEN
+            RETURN;
+        END IF;
+
+        -- Concurrent reindexes of the same document queue up here; taken
+        -- in sorted order so overlapping batches cannot deadlock
+        PERFORM pg_advisory_xact_lock(hashtext('arkham_search.bm25'), hashtext(d))
+        FROM unnest(v_docs) AS d;
+
+        -- Retract the documents' previous postings, one df update per term.
+        -- max_tf/min_length are left as-is: they stay valid (if looser)
+        -- upper bounds. Rows are locked in term order so concurrent
+        -- writers cannot deadlock.
+        UPDATE arkham_search.bm25_terms AS bt
+        SET df = bt.df - locked.df
+        FROM (
+            SELECT t.term, old.df
+            FROM arkham_search.bm25_terms t
+            JOIN (
+                SELECT p.term, COUNT(*)::integer AS df
+                FROM arkham_search.bm25_chunk_stats s
+                JOIN arkham_search.bm25_postings p ON p.chunk_id = s.chunk_id
+                WHERE s.document_id = ANY(v_docs)
+                GROUP BY p.term
+            ) AS old ON old.term = t.term
+            ORDER BY t.term
+            FOR UPDATE OF t
+        ) AS locked
+        WHERE bt.term = locked.term;
+
+        DELETE FROM arkham_search.bm25_postings p
+        USING arkham_search.bm25_chunk_stats s
+        WHERE p.chunk_id = s.chunk_id AND s.document_id = ANY(v_docs);
+        DELETE FROM arkham_search.bm25_chunk_stats WHERE document_id = ANY(v_docs);
+
+        -- Index the documents' current chunks, aggregating term stats
+        -- over the whole batch
+        WITH counts AS (
+            SELECT c.id::text AS chunk_id, t.term, t.tf
+            FROM arkham_frame.chunks c
+            CROSS JOIN LATERAL arkham_search.bm25_term_counts(c.text) AS t
+            WHERE c.document_id = ANY(v_docs)
+        ),
+        lengths AS (
+            SELECT c.id::text AS chunk_id, c.document_id::text AS document_id,
+                   COALESCE(SUM(n.tf), 0)::integer AS length
+            FROM arkham_frame.chunks c
+            LEFT JOIN counts n ON n.chunk_id = c.id::text
+            WHERE c.document_id = ANY(v_docs)
+            GROUP BY c.id, c.document_id
+        ),
+        stats AS (
+            INSERT INTO arkham_search.bm25_chunk_stats (chunk_id, document_id, length)
+            SELECT chunk_id, document_id, length FROM lengths
+            ON CONFLICT (chunk_id) DO NOTHING
+            RETURNING chunk_id, length
+        ),
+        postings AS (
+            INSERT INTO arkham_search.bm25_postings (term, chunk_id, tf, doc_length)
+            SELECT n.term, n.chunk_id, n.tf, s.length
+            FROM counts n
+            JOIN stats s ON s.chunk_id = n.chunk_id
+        )
+        INSERT INTO arkham_search.bm25_terms AS bt (term, df, max_tf, min_length)
+        SELECT n.term, COUNT(*), MAX(n.tf), MIN(s.length)
+        FROM counts n
+        JOIN stats s ON s.chunk_id = n.chunk_id
+        GROUP BY n.term
+        ORDER BY n.term
+        ON CONFLICT (term) DO UPDATE SET
+            df = bt.df + EXCLUDED.df,
+            max_tf = GREATEST(bt.max_tf, EXCLUDED.max_tf),
+            min_length = CASE WHEN bt.df = 0 THEN EXCLUDED.min_length
+                              ELSE LEAST(bt.min_length, EXCLUDED.min_length) END;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    # Earlier versions kept the index current with a per-row trigger on
+    # arkham_frame.chunks; it is replaced by event-driven batches
+    """
+    DO $$
+    BEGIN
+        IF to_regclass('arkham_frame.chunks') IS NOT NULL THEN
+            DROP TRIGGER IF EXISTS trg_bm25_chunks ON arkham_frame.chunks;
+        END IF;
+    END;
+    $$
+    """,
+    "DROP FUNCTION IF EXISTS arkham_search.bm25_chunk_trigger()",
+    "DROP FUNCTION IF EXISTS arkham_search.bm25_add_chunk(TEXT, TEXT, TEXT)",
+    "DROP FUNCTION IF EXISTS arkham_search.bm25_remove_chunk(TEXT)",
+]
+
+# Score every chunk that contains one of :candidate_terms, summing the BM25
+# contribution of all query terms present in it.
+BM25_SCORE_SQL = """
+    WITH k AS (
+        SELECT CAST(:k1 AS float8) AS k1, CAST(:b AS float8) AS b, CAST(:avgdl AS float8) AS avgdl
+    ),
+    q AS (
+        SELECT * FROM unnest(CAST(:terms AS text[]), CAST(:weights AS float8[])) AS q(term, weight)
+    ),
+    cand AS (
+        SELECT DISTINCT chunk_id
+        FROM arkham_search.bm25_postings
+        WHERE term = ANY(CAST(:candidate_terms AS text[]))
+    ),
+    scored AS (
+        SELECT p.chunk_id,
+               SUM(q.weight * (p.tf * (k.k1 + 1))
+                   / (p.tf + k.k1 * (1 - k.b + k.b * p.doc_length / k.avgdl))) AS score
+        FROM cand
+        JOIN arkham_search.bm25_postings p ON p.chunk_id = cand.chunk_id
+        JOIN q ON q.term = p.term
+        CROSS JOIN k
+        GROUP BY p.chunk_id
+    )
+    SELECT chunk_id, score
+    FROM scored
+    WHERE score > CAST(:threshold AS float8)
+    ORDER BY score DESC
+    LIMIT :limit
+"""
+
+
+def maxscore_partition(upper_bounds: dict[str, float], threshold: float) -> tuple[list[str], list[str]]:
+    """
+    Split query terms into essential and non-essential sets (MaxScore).
+
+    Terms are taken in increasing order of upper bound; the longest prefix
+    whose bounds sum to at most `threshold` is non-essential, because a
+    chunk containing only those terms cannot beat the current k-th score.
+    Only essential terms need to generate candidates.
+
+    Args:
+        upper_bounds: term -> maximum possible score contribution
+        threshold: Score of the current k-th result
+
+    Returns:
+        (essential, non_essential) term lists
+    """
+    ordered = sorted(upper_bounds, key=lambda t: upper_bounds[t])
+    running = 0.0
+    split = 0
+    for term in ordered:
+        if running + upper_bounds[term] > threshold:
+            break
+        running += upper_bounds[term]
+        split += 1
+    return ordered[split:], ordered[:split]
+
+
+def extract_highlights(text: str, terms: list[str], max_highlights: int = 3) -> list[str]:
+    """
+    Extract snippets of text around occurrences of the given terms.
+
+    Args:
+        text: Full text
+        terms: Lowercase query terms
+        max_highlights: Maximum number of highlights
+
+    Returns:
+        List of highlighted snippets
+    """
+    highlights = []
+    text_lower = text.lower()
+
+    # Find occurrences of each query term
+    found_positions = []
+    for term in terms:
+        pos = 0
+        while pos < len(text_lower):
+            idx = text_lower.find(term, pos)
+            if idx == -1:
+                break
+            found_positions.append((idx, len(term)))
+            pos = idx + len(term)
+
+    # Sort by position and take first N unique positions
+    found_positions.sort()
+    seen_ranges = set()
+
+    for idx, term_len in found_positions:
+        if len(highlights) >= max_highlights:
+            break
+
+        # Check if this position overlaps with an existing highlight
+        start = max(0, idx - 60)
+        end = min(len(text), idx + term_len + 60)
+        range_key = (start // 100, end // 100)  # Bucket ranges
+
+        if range_key in seen_ranges:
+            continue
+        seen_ranges.add(range_key)
+
+        # Extract context around match
+        snippet = text[start:end]
+
+        # Add ellipsis if needed
+        if start > 0:
+            snippet = "..." + snippet
+        if end < len(text):
+            snippet = snippet + "..."
+
+        highlights.append(snippet)
+
+    return highlights
+
 
 class BM25Scorer:
     """
@@ -40,12 +320,7 @@ class BM25Scorer:
         """
         self.k1 = k1
         self.b = b
-        self._stop_words = {
-            'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
-            'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that',
-            'the', 'to', 'was', 'were', 'will', 'with', 'this', 'they',
-            'but', 'have', 'had', 'what', 'when', 'where', 'who', 'which',
-        }
+        self._stop_words = STOP_WORDS
 
     def tokenize(self, text: str) -> list[str]:
         """
@@ -124,6 +399,18 @@ class BM25Scorer:
 
         return score
 
+    def term_upper_bound(self, idf: float, max_tf: int, min_length: int, avg_doc_length: float) -> float:
+        """
+        Upper bound on one term's contribution to any chunk's score.
+
+        The BM25 term weight grows with tf and shrinks with length, so the
+        largest tf and shortest length seen for the term bound it.
+        """
+        if max_tf <= 0:
+            return 0.0
+        norm = self.k1 * (1 - self.b + self.b * (min_length / avg_doc_length))
+        return idf * (max_tf * (self.k1 + 1)) / (max_tf + norm)
+
 
 class KeywordSearchEngine:
     """
@@ -150,6 +437,84 @@ class KeywordSearchEngine:
         self._avg_doc_length = 500  # Default estimate
         self._cache_timestamp = 0
 
+        # Set once the inverted index tables exist, and once they are
+        # backfilled (searches only use the index after that)
+        self._index_available = False
+        self._index_ready = False
+
+    async def initialize_index(self, backfill_batch: int = 500) -> bool:
+        """
+        Create the inverted index and index any chunks not yet covered.
+
+        Safe to call on every startup: DDL is idempotent and the backfill
+        only touches documents with chunks missing from bm25_chunk_stats.
+        Searches use the
+        LIKE fallback until this completes.
+
+        Returns:
+            True if the index is usable
+        """
+        if not self.db:
+            return False
+
+        try:
+            await self.db.execute("CREATE SCHEMA IF NOT EXISTS arkham_search")
+            for statement in BM25_INDEX_DDL:
+                await self.db.execute(statement)
+        except Exception as e:
+            logger.warning(f"BM25 inverted index unavailable, using LIKE fallback: {e}")
+            return False
+
+        self._index_available = True
+        indexed = await self.backfill_index(batch_size=backfill_batch)
+        if indexed:
+            logger.info(f"BM25 index backfilled {indexed} documents")
+        self._index_ready = True
+        self._cache_timestamp = 0
+        return True
+
+    async def backfill_index(self, batch_size: int = 500) -> int:
+        """Index documents whose chunks are not yet covered. Returns documents indexed."""
+        total = 0
+        try:
+            while True:
+                rows = await self.db.fetch_all(
+                    """
+                    SELECT DISTINCT c.document_id::text AS document_id
+                    FROM arkham_frame.chunks c
+                    WHERE c.document_id IS NOT NULL
+                      AND NOT EXISTS (
+                          SELECT 1 FROM arkham_search.bm25_chunk_stats s
+                          WHERE s.chunk_id = c.id::text
+                      )
+                    LIMIT :limit
+                    """,
+                    {"limit": batch_size},
+                )
+                if not rows:
+                    break
+                await self.index_documents([row["document_id"] for row in rows])
+                total += len(rows)
+                if len(rows) < batch_size:
+                    break
+        except Exception as e:
+            logger.warning(f"BM25 index backfill stopped after {total} documents: {e}")
+        return total
+
+    async def index_documents(self, document_ids: list[str]) -> None:
+        """
+        Rebuild the postings of a batch of documents in one statement.
+
+        Reflects the documents' current chunks, so it also covers re-parsed
+        and deleted documents.
+        """
+        if not self._index_available or not document_ids:
+            return
+        await self.db.execute(
+            "SELECT arkham_search.bm25_index_documents(CAST(:document_ids AS text[]))",
+            {"document_ids": list(document_ids)},
+        )
+
     async def _get_corpus_stats(self) -> tuple[int, float]:
         """
         Get corpus statistics for BM25 scoring.
@@ -157,11 +522,26 @@ class KeywordSearchEngine:
         Returns:
             (total_docs, avg_doc_length) tuple
         """
-        import time
         current_time = time.time()
 
         # Refresh cache every 5 minutes
-        if current_time - self._cache_timestamp > 300:
+        if current_time - self._cache_timestamp > 300 and self._index_ready:
+            try:
+                # Lengths in tokens, matching what the postings store
+                result = await self.db.fetch_one(
+                    """
+                    SELECT COUNT(*) as count, AVG(length) as avg_length
+                    FROM arkham_search.bm25_chunk_stats
+                    WHERE length > 0
+                    """
+                )
+                self._total_docs = result["count"] if result else 0
+                if result and result["avg_length"]:
+                    self._avg_doc_length = float(result["avg_length"])
+                self._cache_timestamp = current_time
+            except Exception as e:
+                logger.warning(f"Failed to get corpus stats: {e}")
+        elif current_time - self._cache_timestamp > 300:
             try:
                 # Get total chunk count
                 count_result = await self.db.fetch_one(
@@ -246,6 +626,9 @@ class KeywordSearchEngine:
         # Get corpus statistics
         total_docs, avg_doc_length = await self._get_corpus_stats()
 
+        if self._index_ready:
+            return await self._search_index(query, query_terms, total_docs, avg_doc_length)
+
         # Get document frequencies for IDF calculation
         doc_freqs = await self._get_document_frequencies(query_terms)
 
@@ -309,23 +692,7 @@ class KeywordSearchEngine:
             if score < 0.01:
                 continue
 
-            highlights = self._extract_highlights(text, query.query)
-
-            item = SearchResultItem(
-                doc_id=row.get("document_id", ""),
-                chunk_id=row.get("chunk_id"),
-                title=row.get("title", ""),
-                excerpt=text[:300] if text else "",
-                score=score,
-                file_type=row.get("mime_type"),
-                created_at=row.get("created_at"),
-                page_number=row.get("page_number"),
-                highlights=highlights,
-                entities=[],
-                project_ids=[],
-                metadata={"bm25_score": score},
-            )
-            scored_results.append(item)
+            scored_results.append(self._to_result_item(row, score, query.query))
 
         # Sort by BM25 score descending
         scored_results.sort(key=lambda x: x.score, reverse=True)
@@ -343,6 +710,145 @@ class KeywordSearchEngine:
 
         return final_results
 
+    async def _search_index(
+        self,
+        query: SearchQuery,
+        query_terms: list[str],
+        total_docs: int,
+        avg_doc_length: float,
+    ) -> list[SearchResultItem]:
+        """
+        Top-k BM25 over the inverted index.
+
+        The rarest term seeds an initial top-k; its k-th score becomes the
+        MaxScore threshold. A second pass generates candidates only from
+        the remaining essential terms and keeps chunks scoring above the
+        threshold.
+        """
+        offset = getattr(query, "offset", 0) or 0
+        k = query.limit + offset
+        term_counts = Counter(query_terms)
+        terms = list(term_counts)
+
+        try:
+            stat_rows = await self.db.fetch_all(
+                """
+                SELECT term, df, max_tf, min_length
+                FROM arkham_search.bm25_terms
+                WHERE term = ANY(:terms) AND df > 0
+                """,
+                {"terms": terms},
+            )
+        except Exception as e:
+            logger.error(f"BM25 term lookup failed: {e}")
+            return []
+
+        if not stat_rows:
+            return []
+
+        stats = {row["term"]: row for row in stat_rows}
+        avgdl = max(avg_doc_length, 1.0)
+        weights = {}
+        upper_bounds = {}
+        for term, row in stats.items():
+            # Repeated query terms count once per occurrence, as score_document does
+            weights[term] = term_counts[term] * self.bm25.compute_idf(term, row["df"], max(total_docs, row["df"]))
+            upper_bounds[term] = self.bm25.term_upper_bound(weights[term], row["max_tf"], row["min_length"], avgdl)
+
+        params = {
+            "terms": list(weights),
+            "weights": [weights[t] for t in weights],
+            "k1": self.bm25.k1,
+            "b": self.bm25.b,
+            "avgdl": avgdl,
+            "limit": k,
+        }
+
+        seed = min(stats, key=lambda t: stats[t]["df"])
+        try:
+            scored = await self.db.fetch_all(
+                BM25_SCORE_SQL, {**params, "candidate_terms": [seed], "threshold": 0.0}
+            )
+            threshold = scored[-1]["score"] if len(scored) >= k else 0.0
+            essential, skipped = maxscore_partition(upper_bounds, threshold)
+            remaining = [t for t in essential if t != seed]
+            if remaining:
+                more = await self.db.fetch_all(
+                    BM25_SCORE_SQL, {**params, "candidate_terms": remaining, "threshold": threshold}
+                )
+                by_chunk = {row["chunk_id"]: row["score"] for row in scored}
+                by_chunk.update((row["chunk_id"], row["score"]) for row in more)
+                scored = [
+                    {"chunk_id": chunk_id, "score": score}
+                    for chunk_id, score in sorted(by_chunk.items(), key=lambda kv: kv[1], reverse=True)[:k]
+                ]
+            logger.debug(f"BM25 MaxScore: seed={seed}, threshold={threshold:.3f}, skipped={skipped}")
+        except Exception as e:
+            logger.error(f"BM25 index query failed: {e}")
+            return []
+
+        page = [row for row in scored[offset:k] if float(row["score"]) >= 0.01]
+        if not page:
+            return []
+
+        rows = await self._fetch_chunk_rows([row["chunk_id"] for row in page])
+        max_score = float(scored[0]["score"])
+        results = []
+        for hit in page:
+            row = rows.get(hit["chunk_id"])
+            if row is None:
+                continue
+            item = self._to_result_item(row, float(hit["score"]), query.query)
+            if max_score > 0:
+                item.score = item.score / max_score
+            results.append(item)
+
+        logger.info(f"BM25 search returned {len(results)} results from index")
+        return results
+
+    async def _fetch_chunk_rows(self, chunk_ids: list[str]) -> dict[str, dict]:
+        """Load chunk text and document metadata for ranked chunk IDs."""
+        try:
+            rows = await self.db.fetch_all(
+                """
+                SELECT
+                    c.id::text as chunk_id,
+                    c.document_id,
+                    c.text,
+                    c.page_number,
+                    c.chunk_index,
+                    d.filename as title,
+                    d.mime_type,
+                    d.created_at
+                FROM arkham_frame.chunks c
+                LEFT JOIN arkham_frame.documents d ON c.document_id = d.id
+                WHERE c.id::text = ANY(:ids)
+                """,
+                {"ids": chunk_ids},
+            )
+        except Exception as e:
+            logger.error(f"Failed to load BM25 result chunks: {e}")
+            return {}
+        return {row["chunk_id"]: row for row in rows}
+
+    def _to_result_item(self, row: dict, score: float, query_text: str) -> SearchResultItem:
+        """Build a SearchResultItem from a chunk row."""
+        text = row.get("text", "") or ""
+        return SearchResultItem(
+            doc_id=row.get("document_id", ""),
+            chunk_id=row.get("chunk_id"),
+            title=row.get("title", ""),
+            excerpt=text[:300] if text else "",
+            score=score,
+            file_type=row.get("mime_type"),
+            created_at=row.get("created_at"),
+            page_number=row.get("page_number"),
+            highlights=self._extract_highlights(text, query_text),
+            entities=[],
+            project_ids=[],
+            metadata={"bm25_score": score},
+        )
+
     async def suggest(self, prefix: str, limit: int = 10) -> list[tuple[str, float]]:
         """
         Generate autocomplete suggestions.
@@ -389,50 +895,7 @@ class KeywordSearchEngine:
         Returns:
             List of highlighted snippets
         """
-        highlights = []
-        query_terms = self.bm25.tokenize(query)
-        text_lower = text.lower()
-
-        # Find occurrences of each query term
-        found_positions = []
-        for term in query_terms:
-            pos = 0
-            while pos < len(text_lower):
-                idx = text_lower.find(term, pos)
-                if idx == -1:
-                    break
-                found_positions.append((idx, len(term)))
-                pos = idx + len(term)
-
-        # Sort by position and take first N unique positions
-        found_positions.sort()
-        seen_ranges = set()
-
-        for idx, term_len in found_positions:
-            if len(highlights) >= max_highlights:
-                break
-
-            # Check if this position overlaps with an existing highlight
-            start = max(0, idx - 60)
-            end = min(len(text), idx + term_len + 60)
-            range_key = (start // 100, end // 100)  # Bucket ranges
-
-            if range_key in seen_ranges:
-                continue
-            seen_ranges.add(range_key)
-
-            # Extract context around match
-            snippet = text[start:end]
-
-            # Add ellipsis if needed
-            if start > 0:
-                snippet = "..." + snippet
-            if end < len(text):
-                snippet = snippet + "..."
-
-            highlights.append(snippet)
-
-        return highlights
+        return extract_highlights(text, self.bm25.tokenize(query), max_highlights)
 
     def _build_where_clause(self, filters) -> tuple[str, list[Any]]:
         """
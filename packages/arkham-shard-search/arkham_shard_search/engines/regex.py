@@ -1,14 +1,55 @@
-"""Regex search engine for pattern matching across documents."""
-
+"""
+Regex search engine for pattern matching across documents.
+
+Patterns run as PostgreSQL regex (~, ~*) over arkham_frame.chunks.text,
+narrowed first by a pg_trgm GIN index: literal strings every match must
+contain are pulled out of the parsed pattern and added as LIKE conditions,
+which the trigram index can answer even when PostgreSQL cannot derive
+trigrams from the regex itself. Matching chunks are streamed in keyset
+order and stop as soon as the requested page is filled; totals for
+unfinished scans come from the planner estimate rather than a COUNT.
+"""
+
+import json
 import re
 import logging
 import time
 from typing import Any
 
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
 from ..models import RegexMatch, RegexSearchQuery, RegexSearchResult
 
 logger = logging.getLogger(__name__)
 
+TRIGRAM_INDEX_NAME = "idx_chunks_text_trgm"
+
+# Built online so chunk writes are not blocked while the index is created;
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+TRIGRAM_INDEX_DDL = f"""
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS {TRIGRAM_INDEX_NAME}
+    ON arkham_frame.chunks USING gin (text gin_trgm_ops)
+"""
+
+# Whether the index exists, is valid, and is still being built (an
+# unfinished or failed concurrent build leaves an INVALID index behind)
+TRIGRAM_INDEX_STATE_SQL = f"""
+    SELECT i.indisvalid AS valid,
+           EXISTS (
+               SELECT 1 FROM pg_stat_progress_create_index p
+               WHERE p.index_relid = i.indexrelid
+           ) AS building
+    FROM pg_index i
+    WHERE i.indexrelid = to_regclass('arkham_frame.{TRIGRAM_INDEX_NAME}')
+"""
+
+# Trigram index lookups need at least three characters
+MIN_PREFILTER_LENGTH = 3
+MAX_PREFILTER_CLAUSES = 4
+
 
 # Built-in presets (following codebase constant pattern)
 REGEX_PRESETS = [
@@ -71,6 +112,99 @@ REGEX_PRESETS = [
 ]
 
 
+def _pure_literal(items) -> str | None:
+    """The exact string a parsed subpattern matches, if it is only literals."""
+    chars = []
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            chars.append(chr(av))
+        elif op is sre_parse.SUBPATTERN:
+            inner = _pure_literal(av[3])
+            if inner is None:
+                return None
+            chars.append(inner)
+        else:
+            return None
+    return "".join(chars)
+
+
+def _collect_required(items, clauses: list[list[str]]) -> None:
+    """Append literal clauses (alternatives OR'd) that every match must contain."""
+    run: list[str] = []
+
+    def flush():
+        if run:
+            clauses.append(["".join(run)])
+            run.clear()
+
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+        elif op is sre_parse.AT:
+            continue  # Zero-width anchors don't break a literal run
+        elif op is sre_parse.SUBPATTERN:
+            literal = _pure_literal(av[3])
+            if literal is not None:
+                run.append(literal)
+            else:
+                flush()
+                _collect_required(av[3], clauses)
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            min_count, max_count, sub = av
+            literal = _pure_literal(sub)
+            if literal is not None and min_count == max_count:
+                run.append(literal * min_count)
+                continue
+            flush()
+            if min_count >= 1:
+                _collect_required(sub, clauses)
+        elif op is sre_parse.BRANCH:
+            flush()
+            best = []
+            for branch in av[1]:
+                branch_clauses: list[list[str]] = []
+                _collect_required(branch, branch_clauses)
+                singles = [c[0] for c in branch_clauses if len(c) == 1]
+                if not singles:
+                    best = []
+                    break
+                best.append(max(singles, key=len))
+            if best:
+                clauses.append(best)
+        else:
+            flush()
+    flush()
+
+
+def required_literals(pattern: str) -> list[list[str]]:
+    """
+    Literal strings any match of pattern must contain, for index prefiltering.
+
+    Returns a list of clauses; each clause is a list of alternatives of
+    which at least one must appear (alternation), and every clause must
+    hold. Only literals long enough to produce trigrams are kept. An empty
+    list means the pattern cannot be prefiltered.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return []
+
+    clauses: list[list[str]] = []
+    _collect_required(list(parsed), clauses)
+
+    usable = []
+    for clause in clauses:
+        if all(len(alt) >= MIN_PREFILTER_LENGTH for alt in clause) and clause not in usable:
+            usable.append(clause)
+    usable.sort(key=lambda c: min(len(alt) for alt in c), reverse=True)
+    return usable[:MAX_PREFILTER_CLAUSES]
+
+
+def _like_escape(literal: str) -> str:
+    return literal.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 class RegexSearchEngine:
     """
     Regex search engine that searches across document content.
@@ -133,6 +267,38 @@ class RegexSearchEngine:
         else:
             return True, None, "slow"
 
+    async def initialize_index(self) -> bool:
+        """
+        Create the trigram index used to prefilter regex searches.
+
+        Safe to call on every startup. The index is built concurrently so
+        chunk writes are not blocked; an INVALID index left by an
+        interrupted build is dropped and rebuilt. Without it searches still
+        work, as sequential scans.
+
+        Returns:
+            True if the index is usable
+        """
+        if not self._db:
+            return False
+        try:
+            await self._db.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            state = await self._db.fetch_one(TRIGRAM_INDEX_STATE_SQL)
+            if state and state["building"]:
+                logger.info("Regex trigram index is being built by another process")
+                return False
+            if state and not state["valid"]:
+                logger.warning("Dropping invalid regex trigram index left by an interrupted build")
+                await self._db.execute_autocommit(
+                    f"DROP INDEX CONCURRENTLY IF EXISTS arkham_frame.{TRIGRAM_INDEX_NAME}"
+                )
+            await self._db.execute_autocommit(TRIGRAM_INDEX_DDL)
+        except Exception as e:
+            logger.warning(f"Trigram index unavailable, regex search will scan chunks: {e}")
+            return False
+        logger.info("Regex trigram index ready")
+        return True
+
     async def search(self, query: RegexSearchQuery) -> RegexSearchResult:
         """
         Search for regex pattern across document content.
@@ -141,6 +307,10 @@ class RegexSearchEngine:
         Pattern matching happens in the database, not in Python memory.
         This prevents memory blowup on large corpora.
 
+        Chunks are fetched in keyset-ordered batches and scanning stops once
+        offset + limit matches are found. If the scan finishes, totals are
+        exact; otherwise they are planner estimates (count_is_estimate).
+
         Args:
             query: RegexSearchQuery with pattern and filters
 
@@ -172,126 +342,69 @@ class RegexSearchEngine:
         # PostgreSQL regex uses different syntax for some features:
         # - DOTALL (s flag) not directly supported, but newlines match . in bracket expressions
         # - MULTILINE (m flag) is default behavior in PostgreSQL
-        pg_pattern = query.pattern
-
-        # First, get total count (for pagination info) - uses COUNT with regex
-        count_sql = f"""
-            SELECT COUNT(DISTINCT c.id) as match_count,
-                   COUNT(DISTINCT c.document_id) as doc_count
-            FROM arkham_frame.chunks c
-            JOIN arkham_frame.documents d ON c.document_id = d.id
-            WHERE c.text {regex_op} :pattern
-        """
-        params: dict[str, Any] = {"pattern": pg_pattern}
+        params: dict[str, Any] = {"pattern": query.pattern}
+        where_sql = f"c.text {regex_op} :pattern"
+
+        # Required literals let the trigram index discard most chunks before
+        # the regex runs. ILIKE is used whenever any part of the pattern may
+        # be case-insensitive, which only widens the candidate set.
+        like_op = "ILIKE" if case_insensitive or "(?i" in query.pattern else "LIKE"
+        for i, clause in enumerate(required_literals(query.pattern)):
+            alternatives = []
+            for j, literal in enumerate(clause):
+                params[f"lit_{i}_{j}"] = f"%{_like_escape(literal)}%"
+                alternatives.append(f"c.text {like_op} :lit_{i}_{j}")
+            where_sql += f" AND ({' OR '.join(alternatives)})"
 
         if query.project_id:
-            count_sql += " AND d.project_id = :project_id"
+            where_sql += " AND d.project_id = :project_id"
             params["project_id"] = query.project_id
 
         if query.document_ids:
-            count_sql += " AND d.id = ANY(:document_ids)"
+            where_sql += " AND d.id = ANY(:document_ids)"
             params["document_ids"] = query.document_ids
 
-        try:
-            count_row = await self._db.fetch_one(count_sql, params)
-            total_chunks_with_matches = count_row["match_count"] if count_row else 0
-            documents_searched = count_row["doc_count"] if count_row else 0
-        except Exception as e:
-            logger.error(f"Regex count query failed: {e}", exc_info=True)
-            return RegexSearchResult(
-                pattern=query.pattern,
-                matches=[],
-                total_matches=0,
-                documents_searched=0,
-                duration_ms=(time.time() - start_time) * 1000,
-                error=f"Database error: {e}",
-            )
-
-        # Now fetch actual matches with pagination
-        # Use subquery for matching chunks, then extract match positions in Python
-        # (PostgreSQL regexp_matches with 'g' flag returns multiple rows per match,
-        # which can be complex to handle in SQL - we'll extract in Python)
-        search_sql = f"""
-            SELECT c.id as chunk_id, c.document_id, c.text, c.chunk_index,
-                   d.filename as document_title, c.page_number
-            FROM arkham_frame.chunks c
-            JOIN arkham_frame.documents d ON c.document_id = d.id
-            WHERE c.text {regex_op} :pattern
-        """
+        # Build Python regex for match extraction with flags
+        py_flags = 0
+        if case_insensitive:
+            py_flags |= re.IGNORECASE
+        if "multiline" in query.flags:
+            py_flags |= re.MULTILINE
+        if "dotall" in query.flags:
+            py_flags |= re.DOTALL
+        compiled_pattern = re.compile(query.pattern, py_flags)
 
-        if query.project_id:
-            search_sql += " AND d.project_id = :project_id"
-
-        if query.document_ids:
-            search_sql += " AND d.id = ANY(:document_ids)"
-
-        search_sql += """
-            ORDER BY d.id, c.chunk_index
-            LIMIT :chunk_limit
-        """
-
-        params["chunk_limit"] = min(1000, self._max_results)  # Cap chunks to prevent memory issues
+        wanted = min(query.offset + query.limit, self._max_results)
+        batch_size = self._config.get("scan_batch_size", 200)
 
         matches = []
+        chunks_with_matches = 0
+        documents = set()
+        exhausted = False
+        cursor: tuple | None = None
+
         try:
-            rows = await self._db.fetch_all(search_sql, params)
-
-            # Build Python regex for match extraction with flags
-            py_flags = 0
-            if case_insensitive:
-                py_flags |= re.IGNORECASE
-            if "multiline" in query.flags:
-                py_flags |= re.MULTILINE
-            if "dotall" in query.flags:
-                py_flags |= re.DOTALL
-
-            compiled_pattern = re.compile(query.pattern, py_flags)
-
-            for row in rows:
-                text = row["text"] or ""
-                document_id = row["document_id"]
-                document_title = row["document_title"] or ""
-                page_number = row["page_number"]
-                chunk_id = row["chunk_id"]
-
-                # Find all matches in this chunk's text
-                for match in compiled_pattern.finditer(text):
-                    match_text = match.group(0)
-                    match_start = match.start()
-                    match_end = match.end()
-
-                    # Extract context around match
-                    context_chars = query.context_chars
-                    ctx_start = max(0, match_start - context_chars)
-                    ctx_end = min(len(text), match_end + context_chars)
-                    context = text[ctx_start:ctx_end]
-
-                    # Add ellipsis if truncated
-                    if ctx_start > 0:
-                        context = "..." + context
-                    if ctx_end < len(text):
-                        context = context + "..."
-
-                    # Calculate line number
-                    line_number = text[:match_start].count('\n') + 1
-
-                    matches.append(RegexMatch(
-                        document_id=document_id,
-                        document_title=document_title,
-                        page_number=page_number,
-                        chunk_id=chunk_id,
-                        match_text=match_text,
-                        context=context,
-                        start_offset=match_start,
-                        end_offset=match_end,
-                        line_number=line_number,
-                    ))
-
-                    if len(matches) >= self._max_results:
+            while len(matches) < wanted:
+                rows = await self._fetch_candidates(where_sql, params, cursor, batch_size)
+
+                scanned = 0
+                for row in rows:
+                    scanned += 1
+                    chunk_matches = self._extract_matches(row, compiled_pattern, query.context_chars)
+                    if chunk_matches:
+                        chunks_with_matches += 1
+                        documents.add(row["document_id"])
+                        matches.extend(chunk_matches)
+                    if len(matches) >= wanted:
                         break
 
-                if len(matches) >= self._max_results:
+                if len(rows) < batch_size:
+                    # A short batch is the end of the candidates; the counts
+                    # are exact unless the page filled before its last row
+                    exhausted = scanned == len(rows)
                     break
+                last = rows[-1]
+                cursor = (last["document_id"], last["chunk_index"], last["chunk_id"])
 
         except Exception as e:
             logger.error(f"Regex search failed: {e}", exc_info=True)
@@ -304,6 +417,18 @@ class RegexSearchEngine:
                 error=f"Search failed: {e}",
             )
 
+        total_matches = len(matches)
+        total_chunks = chunks_with_matches
+        documents_searched = len(documents)
+        count_is_estimate = not exhausted
+
+        if count_is_estimate:
+            estimated_chunks = await self._estimate_rows(where_sql, params)
+            if estimated_chunks > total_chunks:
+                matches_per_chunk = total_matches / chunks_with_matches if chunks_with_matches else 1.0
+                total_chunks = estimated_chunks
+                total_matches = max(total_matches, int(estimated_chunks * matches_per_chunk))
+
         # Apply pagination to results
         paginated_matches = matches[query.offset:query.offset + query.limit]
 
@@ -311,19 +436,108 @@ class RegexSearchEngine:
 
         logger.info(
             f"Regex search '{query.pattern}' found {len(matches)} matches "
-            f"in {total_chunks_with_matches} chunks across {documents_searched} documents "
-            f"({duration_ms:.1f}ms)"
+            f"in {chunks_with_matches} chunks across {documents_searched} documents "
+            f"({'estimated total ' + str(total_chunks) + ' chunks, ' if count_is_estimate else ''}"
+            f"{duration_ms:.1f}ms)"
         )
 
         return RegexSearchResult(
             pattern=query.pattern,
             matches=paginated_matches,
-            total_matches=len(matches),  # Total from this batch
-            total_chunks_with_matches=total_chunks_with_matches,  # True total
+            total_matches=total_matches,
+            total_chunks_with_matches=total_chunks,
             documents_searched=documents_searched,
             duration_ms=duration_ms,
+            count_is_estimate=count_is_estimate,
         )
 
+    async def _fetch_candidates(
+        self,
+        where_sql: str,
+        params: dict[str, Any],
+        cursor: tuple | None,
+        batch_size: int,
+    ) -> list:
+        """Next batch of matching chunks after cursor, in (document, chunk) order."""
+        sql = f"""
+            SELECT c.id as chunk_id, c.document_id, c.text, c.chunk_index,
+                   d.filename as document_title, c.page_number
+            FROM arkham_frame.chunks c
+            JOIN arkham_frame.documents d ON c.document_id = d.id
+            WHERE {where_sql}
+        """
+        batch_params = dict(params)
+        if cursor:
+            sql += " AND (c.document_id, c.chunk_index, c.id) > (:after_doc, :after_index, :after_id)"
+            batch_params["after_doc"], batch_params["after_index"], batch_params["after_id"] = cursor
+        sql += """
+            ORDER BY c.document_id, c.chunk_index, c.id
+            LIMIT :batch_size
+        """
+        batch_params["batch_size"] = batch_size
+        return await self._db.fetch_all(sql, batch_params)
+
+    def _extract_matches(self, row, compiled_pattern, context_chars: int) -> list[RegexMatch]:
+        """Match offsets and context for one chunk."""
+        text = row["text"] or ""
+        matches = []
+        line_number = 1
+        line_pos = 0
+
+        for match in compiled_pattern.finditer(text):
+            match_start = match.start()
+            match_end = match.end()
+
+            # Extract context around match
+            ctx_start = max(0, match_start - context_chars)
+            ctx_end = min(len(text), match_end + context_chars)
+            context = text[ctx_start:ctx_end]
+
+            # Add ellipsis if truncated
+            if ctx_start > 0:
+                context = "..." + context
+            if ctx_end < len(text):
+                context = context + "..."
+
+            # Line numbers counted incrementally (matches arrive in order)
+            line_number += text.count('\n', line_pos, match_start)
+            line_pos = match_start
+
+            matches.append(RegexMatch(
+                document_id=row["document_id"],
+                document_title=row["document_title"] or "",
+                page_number=row["page_number"],
+                chunk_id=row["chunk_id"],
+                match_text=match.group(0),
+                context=context,
+                start_offset=match_start,
+                end_offset=match_end,
+                line_number=line_number,
+            ))
+
+        return matches
+
+    async def _estimate_rows(self, where_sql: str, params: dict[str, Any]) -> int:
+        """Planner estimate of matching chunks, instead of an exact COUNT."""
+        sql = f"""
+            EXPLAIN (FORMAT JSON)
+            SELECT c.id
+            FROM arkham_frame.chunks c
+            JOIN arkham_frame.documents d ON c.document_id = d.id
+            WHERE {where_sql}
+        """
+        try:
+            row = await self._db.fetch_one(sql, params)
+            if not row:
+                return 0
+            plan = row["QUERY PLAN"] if "QUERY PLAN" in row else list(row.values())[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except Exception as e:
+            logger.debug(f"Regex row estimate failed: {e}")
+            return 0
+
     async def get_presets(self, category: str | None = None) -> list[dict]:
         """
         Get available regex presets (system + custom from database).
@@ -355,7 +569,6 @@ class RegexSearchEngine:
 
                 rows = await self._db.fetch_all(query, params)
                 for row in rows:
-                    import json
                     presets.append({
                         "id": row["id"],
                         "name": row["name"],
@@ -398,7 +611,6 @@ class RegexSearchEngine:
             Created preset dictionary
         """
         import uuid
-        import json
 
         preset_id = str(uuid.uuid4())[:8]
 
@@ -1,49 +1,100 @@
-"""Semantic search engine using vector similarity."""
+"""
+Semantic search engine using vector similarity.
+
+Vector hits usually carry only IDs in their payload. A result page is
+hydrated with one query for chunk text and one for document metadata
+(`= ANY($1)`), and document metadata is kept in a small LRU because the
+same documents keep coming back across queries.
+"""
 
 import logging
+import time
 import uuid
+from collections import OrderedDict
 from typing import Any
 
 from ..models import SearchQuery, SearchResultItem
+from .keyword import BM25Scorer, extract_highlights
 
 logger = logging.getLogger(__name__)
 
 
-async def _fetch_chunk_text(db, chunk_id: str) -> dict | None:
-    """Fetch chunk text and metadata from database."""
-    if not db or not chunk_id:
-        return None
+async def _fetch_chunks(db, chunk_ids: list[str]) -> dict[str, dict]:
+    """Fetch chunk text and position for many chunks in one query."""
+    if not db or not chunk_ids:
+        return {}
     try:
-        row = await db.fetchrow(
-            """SELECT c.id, c.text, c.chunk_index, c.page_number,
-                      d.id as doc_id, d.filename, d.mime_type
-               FROM arkham_frame.chunks c
-               LEFT JOIN arkham_frame.documents d ON c.document_id = d.id
-               WHERE c.id = $1""",
-            chunk_id
+        rows = await db.fetch(
+            """SELECT id, text, chunk_index, page_number, document_id AS doc_id
+               FROM arkham_frame.chunks
+               WHERE id = ANY($1::text[])""",
+            list(chunk_ids)
         )
-        if row:
-            return dict(row)
+        return {row["id"]: dict(row) for row in rows}
     except Exception as e:
-        logger.debug(f"Could not fetch chunk {chunk_id}: {e}")
-    return None
+        logger.debug(f"Could not fetch {len(chunk_ids)} chunks: {e}")
+    return {}
 
 
-async def _fetch_document_info(db, doc_id: str) -> dict | None:
-    """Fetch document metadata from database."""
-    if not db or not doc_id:
-        return None
+async def _fetch_documents(db, doc_ids: list[str]) -> dict[str, dict]:
+    """Fetch document metadata for many documents in one query."""
+    if not db or not doc_ids:
+        return {}
     try:
-        row = await db.fetchrow(
+        rows = await db.fetch(
             """SELECT id, filename, mime_type, file_size, created_at
-               FROM arkham_frame.documents WHERE id = $1""",
-            doc_id
+               FROM arkham_frame.documents
+               WHERE id = ANY($1::text[])""",
+            list(doc_ids)
         )
-        if row:
-            return dict(row)
+        return {row["id"]: dict(row) for row in rows}
     except Exception as e:
-        logger.debug(f"Could not fetch document {doc_id}: {e}")
-    return None
+        logger.debug(f"Could not fetch {len(doc_ids)} documents: {e}")
+    return {}
+
+
+class _DocumentInfoCache:
+    """LRU of document metadata with a TTL so renames and deletes show up."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def get_many(self, doc_ids) -> tuple[dict[str, dict], list[str]]:
+        """Split doc_ids into cached metadata and IDs that need fetching."""
+        found = {}
+        missing = []
+        now = time.monotonic()
+        for doc_id in doc_ids:
+            entry = self._data.get(doc_id)
+            if entry and now - entry[0] < self.ttl:
+                self._data.move_to_end(doc_id)
+                found[doc_id] = entry[1]
+                self.hits += 1
+            else:
+                missing.append(doc_id)
+                self.misses += 1
+        return found, missing
+
+    def put_many(self, docs: dict[str, dict]) -> None:
+        now = time.monotonic()
+        for doc_id, info in docs.items():
+            self._data[doc_id] = (now, info)
+            self._data.move_to_end(doc_id)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, doc_id: str | None = None) -> None:
+        if doc_id is None:
+            self._data.clear()
+        else:
+            self._data.pop(doc_id, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
 
 
 class SemanticSearchEngine:
@@ -76,6 +127,8 @@ class SemanticSearchEngine:
         self.embedding_service = embedding_service
         self.worker_service = worker_service
         self.frame = frame
+        self._doc_cache = _DocumentInfoCache()
+        self._tokenizer = BM25Scorer()
 
     def _get_db_pool(self):
         """Get database pool dynamically from vectors service."""
@@ -126,73 +179,109 @@ class SemanticSearchEngine:
             logger.error(f"Vector search failed: {e}")
             results = []
 
-        # Convert SearchResult objects to SearchResultItem with enrichment
-        search_items = []
-        db_conn = None
+        return await self._hydrate(results, query.query if query.highlight else None)
+
+    async def _hydrate(self, results: list, highlight_query: str | None = None) -> list[SearchResultItem]:
+        """
+        Convert vector hits to SearchResultItems, filling in what the payload lacks.
+
+        Chunk text and document metadata for the whole page are resolved
+        with at most two queries, whatever the number of hits.
+
+        Args:
+            results: Vector search results
+            highlight_query: If set, add snippets around this query's terms
+
+        Returns:
+            List of SearchResultItem
+        """
+        hits = []
+        for result in results:
+            payload = (result.payload if hasattr(result, 'payload') else result) or {}
+            hits.append({
+                "doc_id": payload.get("document_id", payload.get("doc_id", "")),
+                "chunk_id": payload.get("chunk_id") or (result.id if hasattr(result, 'id') else None),
+                "title": payload.get("title", payload.get("filename", "")),
+                "excerpt": payload.get("text", payload.get("content", "")),
+                "file_type": payload.get("file_type", payload.get("mime_type")),
+                "page_number": payload.get("page_number"),
+                "created_at": payload.get("created_at"),
+                "score": result.score if hasattr(result, 'score') else payload.get("score", 0.0),
+                "payload": payload,
+            })
+
+        # Chunks with minimal payload (just IDs) need their text
+        chunk_ids = list(dict.fromkeys(h["chunk_id"] for h in hits if h["chunk_id"] and not h["excerpt"]))
+
         db_pool = self._get_db_pool()
-        if db_pool:
-            try:
-                db_conn = await db_pool.acquire()
-            except Exception as e:
-                logger.debug(f"Could not acquire db connection for enrichment: {e}")
+        if db_pool and (chunk_ids or any(self._needs_document_info(h) for h in hits)):
+            await self._enrich(db_pool, hits, chunk_ids)
 
-        try:
-            for result in results:
-                payload = result.payload if hasattr(result, 'payload') else {}
-                doc_id = payload.get("document_id", payload.get("doc_id", ""))
-                chunk_id = payload.get("chunk_id") or (result.id if hasattr(result, 'id') else None)
-
-                # Default values from payload
-                title = payload.get("title", payload.get("filename", ""))
-                excerpt = payload.get("text", payload.get("content", ""))
-                file_type = payload.get("file_type", payload.get("mime_type"))
-                page_number = payload.get("page_number")
-                created_at = payload.get("created_at")
-
-                # Enrich from database if we have minimal payload (just IDs)
-                if db_conn and chunk_id and not excerpt:
-                    chunk_info = await _fetch_chunk_text(db_conn, chunk_id)
-                    if chunk_info:
-                        excerpt = chunk_info.get("text", "")
-                        page_number = chunk_info.get("page_number") or page_number
-                        if not title:
-                            title = chunk_info.get("filename", "")
-                        if not file_type:
-                            file_type = chunk_info.get("mime_type")
-                        if not doc_id:
-                            doc_id = chunk_info.get("doc_id", "")
-
-                # If still no title, try fetching document info
-                if db_conn and doc_id and not title:
-                    doc_info = await _fetch_document_info(db_conn, doc_id)
-                    if doc_info:
-                        title = doc_info.get("filename", "")
-                        if not file_type:
-                            file_type = doc_info.get("mime_type")
-                        if not created_at:
-                            created_at = str(doc_info.get("created_at", "")) if doc_info.get("created_at") else None
-
-                item = SearchResultItem(
-                    doc_id=doc_id,
-                    chunk_id=chunk_id,
-                    title=title,
-                    excerpt=excerpt[:500] if excerpt else "",
-                    score=result.score if hasattr(result, 'score') else 0.0,
-                    file_type=file_type,
-                    created_at=created_at,
-                    page_number=page_number,
-                    highlights=[],
-                    entities=payload.get("entities", []),
-                    project_ids=payload.get("project_ids", []),
-                    metadata=payload.get("metadata", {}),
-                )
-                search_items.append(item)
-        finally:
-            if db_conn and db_pool:
-                await db_pool.release(db_conn)
+        terms = self._tokenizer.tokenize(highlight_query) if highlight_query else []
+
+        search_items = []
+        for h in hits:
+            excerpt = h["excerpt"] or ""
+            payload = h["payload"]
+            search_items.append(SearchResultItem(
+                doc_id=h["doc_id"],
+                chunk_id=h["chunk_id"],
+                title=h["title"],
+                excerpt=excerpt[:500],
+                score=h["score"],
+                file_type=h["file_type"],
+                created_at=h["created_at"],
+                page_number=h["page_number"],
+                highlights=extract_highlights(excerpt, terms) if terms else [],
+                entities=payload.get("entities", []),
+                project_ids=payload.get("project_ids", []),
+                metadata=payload.get("metadata", {}),
+            ))
 
         return search_items
 
+    @staticmethod
+    def _needs_document_info(hit: dict) -> bool:
+        return not hit["title"] or not hit["file_type"] or not hit["created_at"]
+
+    async def _enrich(self, db_pool, hits: list[dict], chunk_ids: list[str]) -> None:
+        """Fill chunk text and document metadata into hits in place."""
+        try:
+            db_conn = await db_pool.acquire()
+        except Exception as e:
+            logger.debug(f"Could not acquire db connection for enrichment: {e}")
+            return
+
+        try:
+            chunks = await _fetch_chunks(db_conn, chunk_ids)
+            for h in hits:
+                chunk_info = chunks.get(h["chunk_id"]) if not h["excerpt"] else None
+                if chunk_info:
+                    h["excerpt"] = chunk_info.get("text") or ""
+                    h["page_number"] = chunk_info.get("page_number") or h["page_number"]
+                    if not h["doc_id"]:
+                        h["doc_id"] = chunk_info.get("doc_id") or ""
+
+            doc_ids = list(dict.fromkeys(h["doc_id"] for h in hits if h["doc_id"] and self._needs_document_info(h)))
+            docs, missing = self._doc_cache.get_many(doc_ids)
+            if missing:
+                fetched = await _fetch_documents(db_conn, missing)
+                self._doc_cache.put_many(fetched)
+                docs.update(fetched)
+
+            for h in hits:
+                doc_info = docs.get(h["doc_id"])
+                if not doc_info:
+                    continue
+                if not h["title"]:
+                    h["title"] = doc_info.get("filename") or ""
+                if not h["file_type"]:
+                    h["file_type"] = doc_info.get("mime_type")
+                if not h["created_at"] and doc_info.get("created_at"):
+                    h["created_at"] = str(doc_info["created_at"])
+        finally:
+            await db_pool.release(db_conn)
+
     async def find_similar(self, doc_id: str, limit: int = 10, min_similarity: float = 0.5) -> list[SearchResultItem]:
         """
         Find documents similar to a given document.
@@ -67,6 +67,9 @@ class SearchQuery:
     semantic_weight: float = 0.7
     keyword_weight: float = 0.3
 
+    # Add snippets around query terms to semantic results
+    highlight: bool = False
+
 
 @dataclass
 class SearchResultItem:
@@ -169,6 +172,7 @@ class RegexSearchResult:
     documents_searched: int = 0
     duration_ms: float = 0.0
     error: str | None = None
+    count_is_estimate: bool = False  # Totals are planner estimates (scan stopped early)
 
 
 @dataclass
@@ -1,16 +1,53 @@
 """Search Shard - Semantic and keyword search for documents."""
 
+import asyncio
 import logging
 
+from arkham_frame.services.database import BACKEND_ASYNCPG
 from arkham_frame.shard_interface import ArkhamShard
 
 from .api import init_api, router
+from .cache import CORPUS_EVENTS, SearchResultCache
 from .engines import SemanticSearchEngine, KeywordSearchEngine, HybridSearchEngine, RegexSearchEngine
 from .filters import FilterOptimizer
 
 logger = logging.getLogger(__name__)
 
 
+async def _run_in_thread(coro):
+    """
+    Run a coroutine on its own event loop in a worker thread.
+
+    Cancelling the caller cancels the coroutine at its next await.
+    """
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(coro)
+
+    def run():
+        try:
+            return loop.run_until_complete(task)
+        finally:
+            loop.close()
+
+    try:
+        return await asyncio.to_thread(run)
+    except asyncio.CancelledError:
+        loop.call_soon_threadsafe(task.cancel)
+        raise
+
+
+def _background_db_task(db, coro) -> asyncio.Task:
+    """
+    Start long-running database work without stalling the event loop.
+
+    The asyncpg backend is natively async; the default SQLAlchemy backend
+    blocks on every query, so the work runs in a worker thread instead.
+    """
+    if getattr(db, "backend", None) == BACKEND_ASYNCPG:
+        return asyncio.create_task(coro)
+    return asyncio.create_task(_run_in_thread(coro))
+
+
 class SearchShard(ArkhamShard):
     """
     Search shard for ArkhamFrame.
@@ -35,7 +72,10 @@ class SearchShard(ArkhamShard):
         self.hybrid_engine = None
         self.regex_engine = None
         self.filter_optimizer = None
+        self.result_cache = None
         self._db = None
+        self._index_task = None
+        self._regex_index_task = None
 
     async def initialize(self, frame) -> None:
         """
@@ -108,6 +148,29 @@ class SearchShard(ArkhamShard):
         if database_service:
             await self._create_schema(database_service)
 
+        # Build the BM25 inverted index in the background; keyword search
+        # falls back to LIKE matching until it is ready
+        if self.keyword_engine:
+            self._index_task = _background_db_task(
+                database_service, self.keyword_engine.initialize_index()
+            )
+
+        # Trigram index for regex prefiltering, also built in the background
+        if self.regex_engine:
+            self._regex_index_task = _background_db_task(
+                database_service, self.regex_engine.initialize_index()
+            )
+
+        # Ranked results are cached until a document or chunk event bumps
+        # the corpus version
+        config = frame.config
+        if config.get("search.result_cache_enabled", True):
+            self.result_cache = SearchResultCache(
+                max_entries=int(config.get("search.result_cache_max_entries", 1000)),
+                max_bytes=int(config.get("search.result_cache_max_bytes", 64 * 1024 * 1024)),
+                ttl=float(config.get("search.result_cache_ttl", 600.0)),
+            )
+
         # Initialize API
         init_api(
             semantic_engine=self.semantic_engine,
@@ -116,12 +179,18 @@ class SearchShard(ArkhamShard):
             regex_engine=self.regex_engine,
             filter_optimizer=self.filter_optimizer,
             event_bus=event_bus,
+            result_cache=self.result_cache,
+            frame=frame,
         )
 
         # Subscribe to document events
         if event_bus:
+            if self.result_cache:
+                for event_type in CORPUS_EVENTS:
+                    await event_bus.subscribe(event_type, self.result_cache.on_corpus_event)
             await event_bus.subscribe("documents.indexed", self._on_document_indexed)
-            await event_bus.subscribe("documents.deleted", self._on_document_deleted)
+            await event_bus.subscribe("documents.document.deleted", self._on_document_deleted)
+            await event_bus.subscribe("chunks.batch.created", self._on_chunks_created)
             # Subscribe to parse completion for auto-extraction of regex patterns
             await event_bus.subscribe("parse.document.completed", self._on_parse_completed)
 
@@ -135,12 +204,21 @@ class SearchShard(ArkhamShard):
         """Clean up shard resources."""
         logger.info("Shutting down Search Shard...")
 
+        if self._index_task and not self._index_task.done():
+            self._index_task.cancel()
+        if self._regex_index_task and not self._regex_index_task.done():
+            self._regex_index_task.cancel()
+
         # Unsubscribe from events
         if self.frame:
             event_bus = self.frame.get_service("events")
             if event_bus:
+                if self.result_cache:
+                    for event_type in CORPUS_EVENTS:
+                        await event_bus.unsubscribe(event_type, self.result_cache.on_corpus_event)
                 await event_bus.unsubscribe("documents.indexed", self._on_document_indexed)
-                await event_bus.unsubscribe("documents.deleted", self._on_document_deleted)
+                await event_bus.unsubscribe("documents.document.deleted", self._on_document_deleted)
+                await event_bus.unsubscribe("chunks.batch.created", self._on_chunks_created)
                 await event_bus.unsubscribe("parse.document.completed", self._on_parse_completed)
 
         self.semantic_engine = None
@@ -148,6 +226,7 @@ class SearchShard(ArkhamShard):
         self.hybrid_engine = None
         self.regex_engine = None
         self.filter_optimizer = None
+        self.result_cache = None
 
         logger.info("Search Shard shutdown complete")
 
@@ -332,15 +411,33 @@ class SearchShard(ArkhamShard):
         """
         Handle document indexed event.
 
-        Could be used to:
-        - Update search indexes
-        - Invalidate caches
-        - Trigger reindexing
+        Cached search results are invalidated by the corpus version bump
+        the result cache receives for the same event.
         """
-        doc_id = event.get("doc_id")
+        payload = event.get("payload", event)
+        doc_id = payload.get("doc_id") or payload.get("document_id")
         logger.debug(f"Document indexed: {doc_id}")
 
-        # TODO: Invalidate any caches for this document
+    async def _on_chunks_created(self, event: dict) -> None:
+        """
+        Handle chunks batch created event.
+
+        Reindexes the document's BM25 postings in one statement.
+        """
+        payload = event.get("payload", event)
+        doc_id = payload.get("document_id")
+        if not doc_id or not self.keyword_engine:
+            return
+
+        try:
+            await self.keyword_engine.index_documents([doc_id])
+        except Exception as e:
+            logger.warning(f"Failed to update BM25 index for {doc_id}: {e}")
+            return
+
+        # Results cached while the postings were being rebuilt are stale
+        if self.result_cache:
+            self.result_cache.bump()
 
     async def _on_document_deleted(self, event: dict) -> None:
         """
@@ -350,9 +447,17 @@ class SearchShard(ArkhamShard):
         - Remove from search indexes
         - Clean up cache entries
         """
-        doc_id = event.get("doc_id") or event.get("document_id")
+        payload = event.get("payload", event)
+        doc_id = payload.get("doc_id") or payload.get("document_id")
         logger.debug(f"Document deleted: {doc_id}")
 
+        # Reindexing a document without chunks drops its BM25 postings
+        if self.keyword_engine and doc_id:
+            try:
+                await self.keyword_engine.index_documents([doc_id])
+            except Exception as e:
+                logger.warning(f"Failed to drop BM25 postings for {doc_id}: {e}")
+
         # Clean up pattern extractions for deleted document
         if self._db and doc_id:
             try:
@@ -517,15 +622,29 @@ class SearchShard(ArkhamShard):
         )
 
         if search_mode == SearchMode.SEMANTIC and self.semantic_engine:
-            return await self.semantic_engine.search(search_query)
+            engine = self.semantic_engine
         elif search_mode == SearchMode.KEYWORD and self.keyword_engine:
-            return await self.keyword_engine.search(search_query)
+            engine = self.keyword_engine
         elif self.hybrid_engine:
-            return await self.hybrid_engine.search(search_query)
+            engine = self.hybrid_engine
         else:
             logger.error("No search engine available")
             return []
 
+        if not self.result_cache:
+            return await engine.search(search_query)
+
+        weights = (
+            getattr(self.hybrid_engine, "default_semantic_weight", None),
+            getattr(self.hybrid_engine, "default_keyword_weight", None),
+        )
+        return await self.result_cache.search(
+            search_query,
+            engine.search,
+            project_id=getattr(self.frame, "active_project_id", None),
+            weights=weights,
+        )
+
     async def find_similar(self, doc_id: str, limit: int = 10, min_similarity: float = 0.5):
         """
         Public method to find similar documents.
@@ -0,0 +1,379 @@
+"""
+Search Shard - Result Cache Tests
+
+Tests for SearchResultCache keys, paging windows, invalidation and bounds.
+"""
+
+import asyncio
+import dataclasses
+from datetime import datetime, timedelta
+
+import pytest
+
+from arkham_shard_search.cache import (
+    SearchResultCache,
+    order_results,
+    query_fingerprint,
+    seek,
+    sort_value,
+)
+from arkham_shard_search.models import SearchMode, SearchQuery, SearchResultItem, SortBy, SortOrder
+
+
+def make_results(count: int, excerpt: str = "...") -> list[SearchResultItem]:
+    return [
+        SearchResultItem(
+            doc_id=f"doc-{i}",
+            chunk_id=f"chunk-{i}",
+            title=f"Document {i}",
+            excerpt=excerpt,
+            score=1.0 - i / 1000,
+        )
+        for i in range(count)
+    ]
+
+
+class CountingEngine:
+    """Engine stub that ranks `total` results and counts calls."""
+
+    def __init__(self, total: int = 500, delay: float = 0.0):
+        self.total = total
+        self.delay = delay
+        self.calls: list[SearchQuery] = []
+
+    async def search(self, query: SearchQuery) -> list[SearchResultItem]:
+        self.calls.append(query)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return make_results(self.total)[query.offset:query.offset + query.limit]
+
+
+class TestCacheKeys:
+    """Tests for SearchResultCache.make_key."""
+
+    def test_query_text_is_normalized(self):
+        cache = SearchResultCache()
+        a = cache.make_key(SearchQuery(query="Offshore  Accounts"))
+        b = cache.make_key(SearchQuery(query=" offshore accounts "))
+        assert a == b
+
+    def test_paging_is_not_part_of_key(self):
+        cache = SearchResultCache()
+        a = cache.make_key(SearchQuery(query="q", limit=20, offset=0))
+        b = cache.make_key(SearchQuery(query="q", limit=50, offset=40))
+        assert a == b
+
+    def test_mode_weights_and_project_change_key(self):
+        cache = SearchResultCache()
+        base = cache.make_key(SearchQuery(query="q"))
+        assert cache.make_key(SearchQuery(query="q", mode=SearchMode.KEYWORD)) != base
+        assert cache.make_key(SearchQuery(query="q", semantic_weight=0.5, keyword_weight=0.5)) != base
+        assert cache.make_key(SearchQuery(query="q"), weights=(0.6, 0.4)) != base
+        assert cache.make_key(SearchQuery(query="q"), project_id="p1") != base
+
+
+class TestCachePaging:
+    """Tests for serving pages from a cached window."""
+
+    @pytest.mark.asyncio
+    async def test_later_pages_served_from_window(self):
+        cache = SearchResultCache(page_window=100)
+        engine = CountingEngine()
+
+        page1 = await cache.search(SearchQuery(query="q", limit=20), engine.search)
+        page2 = await cache.search(SearchQuery(query="q", limit=20, offset=20), engine.search)
+
+        assert len(engine.calls) == 1
+        assert engine.calls[0].offset == 0
+        assert engine.calls[0].limit == 100
+        assert [r.doc_id for r in page1] == [f"doc-{i}" for i in range(20)]
+        assert [r.doc_id for r in page2] == [f"doc-{i}" for i in range(20, 40)]
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_page_past_window_reranks_larger_window(self):
+        cache = SearchResultCache(page_window=100)
+        engine = CountingEngine()
+
+        await cache.search(SearchQuery(query="q", limit=20), engine.search)
+        page = await cache.search(SearchQuery(query="q", limit=20, offset=100), engine.search)
+
+        assert len(engine.calls) == 2
+        assert engine.calls[1].limit == 200
+        assert page[0].doc_id == "doc-100"
+
+    @pytest.mark.asyncio
+    async def test_exhausted_window_covers_any_page(self):
+        cache = SearchResultCache(page_window=100)
+        engine = CountingEngine(total=30)
+
+        await cache.search(SearchQuery(query="q", limit=20), engine.search)
+        page = await cache.search(SearchQuery(query="q", limit=20, offset=120), engine.search)
+
+        assert len(engine.calls) == 1
+        assert page == []
+
+    @pytest.mark.asyncio
+    async def test_deep_pages_bypass_cache(self):
+        cache = SearchResultCache(page_window=100, max_window=200)
+        engine = CountingEngine()
+
+        await cache.search(SearchQuery(query="q", limit=20, offset=300), engine.search)
+
+        assert engine.calls[0].offset == 300
+        assert cache.get_stats()["bypassed"] == 1
+        assert cache.get_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_served_items_are_copies(self):
+        cache = SearchResultCache()
+        engine = CountingEngine()
+
+        first = await cache.search(SearchQuery(query="q"), engine.search)
+        first[0].score = -1.0
+        second = await cache.search(SearchQuery(query="q"), engine.search)
+
+        assert second[0].score == 1.0
+
+
+class TestCursorSeek:
+    """Tests for cursor positions within a ranked window."""
+
+    def test_fingerprint_ignores_paging(self):
+        a = query_fingerprint(SearchQuery(query="q", offset=0))
+        b = query_fingerprint(SearchQuery(query="Q", offset=40, limit=5))
+        assert a == b
+
+    def test_seek_uses_hint_then_keyset(self):
+        results = make_results(10)
+        last = results[4]
+        after = (last.score, last.doc_id, last.chunk_id)
+
+        assert seek(results, after, hint=5) == 5
+        assert seek(results, after, hint=8) == 5
+        # A removed item still resumes after its position
+        assert seek(results[:4] + results[5:], after, hint=5) == 4
+        # Equal scores are ordered by (doc_id, chunk_id)
+        assert seek(results, (last.score, "doc-3", "chunk-9"), hint=0) == 4
+
+    def test_seek_by_date_with_missing_dates_last(self):
+        base = datetime(2024, 1, 1)
+        results = make_results(6)
+        for i, item in enumerate(results):
+            item.created_at = base + timedelta(days=i % 3) if i < 4 else None
+        ordered = order_results(results, SortBy.DATE, SortOrder.ASC)
+
+        assert [r.doc_id for r in ordered] == ["doc-0", "doc-3", "doc-1", "doc-2", "doc-4", "doc-5"]
+
+        last = ordered[1]
+        after = (sort_value(last, SortBy.DATE), last.doc_id, last.chunk_id)
+        assert seek(ordered, after, 0, SortBy.DATE, SortOrder.ASC) == 2
+
+        # The last dated item resumes at the undated ones, which page by id
+        after = (sort_value(ordered[3], SortBy.DATE), "doc-2", "chunk-2")
+        assert seek(ordered, after, 0, SortBy.DATE, SortOrder.ASC) == 4
+        assert seek(ordered, (None, "doc-4", "chunk-4"), 0, SortBy.DATE, SortOrder.ASC) == 5
+
+        descending = order_results(results, SortBy.DATE, SortOrder.DESC)
+        assert [r.doc_id for r in descending] == ["doc-2", "doc-1", "doc-0", "doc-3", "doc-4", "doc-5"]
+
+    def test_seek_by_title(self):
+        results = make_results(3)
+        results[0].title, results[1].title, results[2].title = "beta", "Alpha", "gamma"
+        ordered = order_results(results, SortBy.TITLE, SortOrder.ASC)
+        after = ("beta", "doc-0", "chunk-0")
+
+        assert [r.title for r in ordered] == ["Alpha", "beta", "gamma"]
+        assert seek(ordered, after, 0, SortBy.TITLE, SortOrder.ASC) == 2
+
+    @pytest.mark.asyncio
+    async def test_cursor_survives_corpus_change(self):
+        cache = SearchResultCache(page_window=100)
+        engine = CountingEngine()
+
+        page1 = await cache.search(SearchQuery(query="q", limit=10), engine.search)
+        last = page1[-1]
+
+        # A new top hit shifts every position by one
+        await cache.on_corpus_event({"payload": {}})
+        original = engine.search
+
+        async def shifted(query):
+            results = await original(query)
+            new = make_results(1)[0]
+            new.doc_id, new.score = "doc-new", 2.0
+            return [new] + results
+
+        page2 = await cache.search(
+            SearchQuery(query="q", limit=10, offset=10),
+            shifted,
+            after=(last.score, last.doc_id, last.chunk_id),
+        )
+
+        assert page2[0].doc_id == "doc-10"
+
+    @pytest.mark.asyncio
+    async def test_cursor_past_window_widens_it(self):
+        cache = SearchResultCache(page_window=100)
+        engine = CountingEngine()
+
+        await cache.search(SearchQuery(query="q", limit=100), engine.search)
+        page = await cache.search(
+            SearchQuery(query="q", limit=20, offset=100),
+            engine.search,
+            after=(make_results(100)[99].score, "doc-99", "chunk-99"),
+        )
+
+        assert page[0].doc_id == "doc-100"
+        assert engine.calls[-1].limit == 200
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_continue_past_max_window(self):
+        cache = SearchResultCache(page_window=100, max_window=200)
+        engine = CountingEngine()
+
+        page = await cache.search(
+            SearchQuery(query="q", limit=20, offset=190),
+            engine.search,
+            after=(make_results(190)[189].score, "doc-189", "chunk-189"),
+        )
+
+        assert [r.doc_id for r in page] == [f"doc-{i}" for i in range(190, 210)]
+        assert engine.calls[-1].offset == 190
+        assert cache.get_stats()["bypassed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cursor_past_max_window_skips_served_items(self):
+        cache = SearchResultCache(page_window=100, max_window=200)
+        engine = CountingEngine()
+        original = engine.search
+
+        async def shifted(query):
+            # A new top hit pushes doc-249 back to offset 250
+            return await original(dataclasses.replace(query, offset=query.offset - 1))
+
+        page = await cache.search(
+            SearchQuery(query="q", limit=20, offset=250),
+            shifted,
+            after=(make_results(250)[249].score, "doc-249", "chunk-249"),
+        )
+
+        assert [r.doc_id for r in page] == [f"doc-{i}" for i in range(250, 270)]
+
+
+class TestCacheInvalidation:
+    """Tests for corpus-version invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_global_event_invalidates(self):
+        cache = SearchResultCache()
+        engine = CountingEngine()
+
+        await cache.search(SearchQuery(query="q"), engine.search, project_id="p1")
+        await cache.on_corpus_event({"event_type": "chunks.batch.created", "payload": {"document_id": "d1"}})
+        await cache.search(SearchQuery(query="q"), engine.search, project_id="p1")
+
+        assert len(engine.calls) == 2
+        assert cache.get_stats()["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_project_event_only_invalidates_that_project(self):
+        cache = SearchResultCache()
+        engine = CountingEngine()
+
+        await cache.search(SearchQuery(query="q"), engine.search, project_id="p1")
+        await cache.search(SearchQuery(query="q"), engine.search, project_id="p2")
+        await cache.on_corpus_event({"payload": {"project_id": "p1", "document_id": "d1"}})
+        await cache.search(SearchQuery(query="q"), engine.search, project_id="p1")
+        await cache.search(SearchQuery(query="q"), engine.search, project_id="p2")
+
+        assert len(engine.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_project_event_invalidates_unscoped_searches(self):
+        cache = SearchResultCache()
+        engine = CountingEngine()
+
+        await cache.search(SearchQuery(query="q"), engine.search)
+        await cache.on_corpus_event({"payload": {"project_id": "p1", "document_id": "d1"}})
+        await cache.search(SearchQuery(query="q"), engine.search)
+
+        assert len(engine.calls) == 2
+
+
+class TestCacheBounds:
+    """Tests for entry and memory bounds and statistics."""
+
+    @pytest.mark.asyncio
+    async def test_entry_bound_evicts_least_recent(self):
+        cache = SearchResultCache(max_entries=2)
+        engine = CountingEngine(total=5)
+
+        await cache.search(SearchQuery(query="a"), engine.search)
+        await cache.search(SearchQuery(query="b"), engine.search)
+        await cache.search(SearchQuery(query="a"), engine.search)
+        await cache.search(SearchQuery(query="c"), engine.search)
+        await cache.search(SearchQuery(query="a"), engine.search)
+
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+        assert [q.query for q in engine.calls] == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_byte_bound(self):
+        cache = SearchResultCache(max_bytes=20_000)
+
+        async def big(query):
+            return make_results(5, excerpt="x" * 2000)
+
+        for text in ("a", "b", "c"):
+            await cache.search(SearchQuery(query=text), big)
+
+        stats = cache.get_stats()
+        assert stats["bytes"] <= 20_000
+        assert stats["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hit_rate(self):
+        cache = SearchResultCache()
+        engine = CountingEngine()
+
+        for _ in range(4):
+            await cache.search(SearchQuery(query="q"), engine.search)
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 3
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.75
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_call(self):
+        cache = SearchResultCache()
+        engine = CountingEngine(delay=0.01)
+
+        pages = await asyncio.gather(*(
+            cache.search(SearchQuery(query="q", offset=i * 10, limit=10), engine.search)
+            for i in range(5)
+        ))
+
+        assert len(engine.calls) == 1
+        assert pages[4][0].doc_id == "doc-40"
+        assert cache.get_stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_engine_error_is_not_cached(self):
+        cache = SearchResultCache()
+        calls = 0
+
+        async def failing(query):
+            nonlocal calls
+            calls += 1
+            raise RuntimeError("boom")
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await cache.search(SearchQuery(query="q"), failing)
+
+        assert calls == 2
+        assert cache.get_stats()["entries"] == 0
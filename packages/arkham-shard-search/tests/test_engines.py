@@ -9,9 +9,11 @@ from unittest.mock import MagicMock, AsyncMock, patch
 from datetime import datetime
 
 from arkham_shard_search.engines.semantic import SemanticSearchEngine
-from arkham_shard_search.engines.keyword import KeywordSearchEngine
+from arkham_shard_search.engines.keyword import KeywordSearchEngine, BM25Scorer, maxscore_partition
 from arkham_shard_search.engines.hybrid import HybridSearchEngine
+from arkham_shard_search.engines.regex import RegexSearchEngine, required_literals
 from arkham_shard_search.models import (
+    RegexSearchQuery,
     SearchQuery,
     SearchMode,
     SearchFilters,
@@ -214,6 +216,87 @@ class TestSemanticSearchEngineFindSimilar:
         assert call_kwargs["score_threshold"] == 0.7
 
 
+class FakeHydrationPool:
+    """asyncpg-style pool serving chunk and document rows for ANY($1) lookups."""
+
+    def __init__(self, chunks, documents):
+        self.chunks = chunks
+        self.documents = documents
+        self.queries = []
+
+    async def acquire(self):
+        return self
+
+    async def release(self, conn):
+        pass
+
+    async def fetch(self, query, ids):
+        self.queries.append((query, list(ids)))
+        table = self.chunks if "arkham_frame.chunks" in query else self.documents
+        return [table[i] for i in ids if i in table]
+
+
+class TestSemanticSearchEngineHydration:
+    """Tests for bulk result hydration."""
+
+    @pytest.fixture
+    def pool(self):
+        return FakeHydrationPool(
+            chunks={
+                f"c{i}": {"id": f"c{i}", "text": f"alpha beta gamma {i}", "chunk_index": i,
+                          "page_number": i + 1, "doc_id": f"d{i % 2}"}
+                for i in range(6)
+            },
+            documents={
+                "d0": {"id": "d0", "filename": "zero.pdf", "mime_type": "application/pdf",
+                       "file_size": 10, "created_at": datetime(2024, 1, 1)},
+                "d1": {"id": "d1", "filename": "one.txt", "mime_type": "text/plain",
+                       "file_size": 5, "created_at": None},
+            },
+        )
+
+    @pytest.fixture
+    def engine(self, pool):
+        vectors = MagicMock()
+        vectors._pool = pool
+        vectors.search = AsyncMock(return_value=[
+            MagicMock(id=f"c{i}", score=1.0 - i / 10, payload={"chunk_id": f"c{i}"})
+            for i in range(6)
+        ])
+        engine = SemanticSearchEngine(vectors_service=vectors)
+        engine._embed_query = AsyncMock(return_value=[0.1, 0.2])
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_page_is_hydrated_with_two_queries(self, engine, pool):
+        results = await engine.search(SearchQuery(query="gamma", mode=SearchMode.SEMANTIC))
+
+        assert len(pool.queries) == 2
+        assert pool.queries[0][1] == [f"c{i}" for i in range(6)]
+        assert pool.queries[1][1] == ["d0", "d1"]
+        assert [r.title for r in results[:2]] == ["zero.pdf", "one.txt"]
+        assert results[0].excerpt == "alpha beta gamma 0"
+        assert results[3].page_number == 4
+        assert results[0].file_type == "application/pdf"
+        assert results[0].highlights == []
+
+    @pytest.mark.asyncio
+    async def test_document_metadata_is_cached(self, engine, pool):
+        await engine.search(SearchQuery(query="gamma", mode=SearchMode.SEMANTIC))
+        pool.queries.clear()
+
+        results = await engine.search(SearchQuery(query="gamma", mode=SearchMode.SEMANTIC))
+
+        assert [q[1] for q in pool.queries] == [[f"c{i}" for i in range(6)]]
+        assert results[0].title == "zero.pdf"
+        assert engine._doc_cache.hits == 2
+
+    @pytest.mark.asyncio
+    async def test_highlights_on_request(self, engine):
+        results = await engine.search(SearchQuery(query="Gamma", mode=SearchMode.SEMANTIC, highlight=True))
+        assert results[0].highlights == ["alpha beta gamma 0"]
+
+
 class TestSemanticSearchEngineBuildFilters:
     """Tests for SemanticSearchEngine._build_filters method."""
 
@@ -399,6 +482,106 @@ class TestKeywordSearchEngineBuildWhereClause:
         assert "file_type = ANY" in clause
 
 
+class FakeIndexDB:
+    """In-memory stand-in for the BM25 index tables."""
+
+    def __init__(self, chunks: dict[str, str], scorer):
+        self.chunks = chunks
+        self.scorer = scorer
+        self.postings = {}
+        self.lengths = {}
+        self.candidate_calls = []
+        for chunk_id, text in chunks.items():
+            tokens = scorer.tokenize(text)
+            self.lengths[chunk_id] = len(tokens)
+            for term in set(tokens):
+                self.postings.setdefault(term, {})[chunk_id] = tokens.count(term)
+
+    async def fetch_one(self, query, params=None):
+        lengths = [n for n in self.lengths.values() if n > 0]
+        return {"count": len(lengths), "avg_length": sum(lengths) / len(lengths)}
+
+    async def fetch_all(self, query, params=None):
+        if "FROM arkham_search.bm25_terms" in query:
+            return [
+                {
+                    "term": term,
+                    "df": len(self.postings[term]),
+                    "max_tf": max(self.postings[term].values()),
+                    "min_length": min(self.lengths[c] for c in self.postings[term]),
+                }
+                for term in params["terms"] if term in self.postings
+            ]
+        if "bm25_postings" in query:
+            self.candidate_calls.append(list(params["candidate_terms"]))
+            k1, b, avgdl = params["k1"], params["b"], params["avgdl"]
+            weights = dict(zip(params["terms"], params["weights"]))
+            candidates = {c for t in params["candidate_terms"] for c in self.postings.get(t, {})}
+            scored = []
+            for chunk_id in candidates:
+                score = 0.0
+                for term, weight in weights.items():
+                    tf = self.postings.get(term, {}).get(chunk_id)
+                    if tf:
+                        length = self.lengths[chunk_id]
+                        score += weight * (tf * (k1 + 1)) / (tf + k1 * (1 - b + b * length / avgdl))
+                if score > params["threshold"]:
+                    scored.append({"chunk_id": chunk_id, "score": score})
+            scored.sort(key=lambda r: r["score"], reverse=True)
+            return scored[:params["limit"]]
+        return [
+            {"chunk_id": c, "document_id": f"doc-{c}", "text": self.chunks[c], "title": c}
+            for c in params["ids"]
+        ]
+
+
+class TestKeywordSearchEngineIndex:
+    """Tests for the inverted-index BM25 path."""
+
+    def test_maxscore_partition(self):
+        """Low-bound terms whose sum cannot beat the threshold are skipped."""
+        bounds = {"the_rare": 5.0, "common": 0.4, "frequent": 0.5}
+        essential, skipped = maxscore_partition(bounds, threshold=1.0)
+        assert essential == ["the_rare"]
+        assert skipped == ["common", "frequent"]
+        essential, skipped = maxscore_partition(bounds, threshold=0.0)
+        assert skipped == []
+
+    def test_upper_bound_dominates_scores(self):
+        """The per-term bound is never below an actual contribution."""
+        scorer = BM25Scorer()
+        idf = 2.0
+        bound = scorer.term_upper_bound(idf, max_tf=3, min_length=4, avg_doc_length=10.0)
+        for tf, length in [(1, 4), (3, 4), (3, 50), (2, 10)]:
+            doc = ["zebra"] * tf + ["filler"] * (length - tf)
+            assert scorer.score_document(["zebra"], doc, 10.0, {"zebra": idf}) <= bound + 1e-9
+
+    @pytest.mark.asyncio
+    async def test_index_search_matches_brute_force(self):
+        """MaxScore top-k equals exhaustive BM25 ranking."""
+        scorer = BM25Scorer()
+        chunks = {f"c{i}": "report filed " * (i % 3 + 1) + "budget" * (i % 2) for i in range(30)}
+        chunks["c_hit"] = "smuggling report smuggling"
+        chunks["c_hit2"] = "smuggling route"
+        db = FakeIndexDB(chunks, scorer)
+        engine = KeywordSearchEngine(database_service=db)
+        engine._index_ready = True
+
+        results = await engine.search(SearchQuery(query="smuggling report", limit=2))
+
+        total, avgdl = await engine._get_corpus_stats()
+        idf = {t: scorer.compute_idf(t, len(db.postings[t]), total) for t in ["smuggling", "report"]}
+        expected = sorted(
+            chunks,
+            key=lambda c: scorer.score_document(["smuggling", "report"], scorer.tokenize(chunks[c]), avgdl, idf),
+            reverse=True,
+        )[:2]
+        assert [r.chunk_id for r in results] == expected
+        assert results[0].score == 1.0
+        # "report" appears everywhere; it should not have driven candidate generation
+        assert all("report" not in call for call in db.candidate_calls)
+
+
 class TestHybridSearchEngineInit:
     """Tests for HybridSearchEngine initialization."""
 
@@ -606,3 +789,109 @@ class TestHybridSearchEngineNormalizeScores:
 
         # All should be 1.0 when scores are equal
         assert all(r.score == 1.0 for r in normalized)
+
+
+class FakeRegexDB:
+    """Serves keyset-ordered chunk batches and an EXPLAIN estimate."""
+
+    def __init__(self, texts, estimate=0):
+        self.rows = [
+            {"chunk_id": f"c{i:03d}", "document_id": f"d{i // 10}", "chunk_index": i % 10,
+             "text": text, "document_title": f"doc {i // 10}", "page_number": 1}
+            for i, text in enumerate(texts)
+        ]
+        self.estimate = estimate
+        self.batches = []
+        self.explained = False
+
+    async def fetch_all(self, sql, params):
+        self.batches.append((sql, params))
+        rows = self.rows
+        if "after_doc" in params:
+            key = (params["after_doc"], params["after_index"], params["after_id"])
+            rows = [r for r in rows if (r["document_id"], r["chunk_index"], r["chunk_id"]) > key]
+        return rows[:params["batch_size"]]
+
+    async def fetch_one(self, sql, params):
+        self.explained = "EXPLAIN" in sql
+        return {"QUERY PLAN": [{"Plan": {"Plan Rows": self.estimate}}]}
+
+
+class TestRegexSearchEngine:
+    """Tests for trigram-prefiltered, streamed regex search."""
+
+    @pytest.mark.asyncio
+    async def test_index_built_concurrently_replacing_invalid_leftover(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+        db.execute_autocommit = AsyncMock()
+        db.fetch_one = AsyncMock(return_value={"valid": False, "building": False})
+        engine = RegexSearchEngine(db)
+
+        assert await engine.initialize_index() is True
+
+        statements = [c.args[0] for c in db.execute_autocommit.call_args_list]
+        assert statements[0].startswith("DROP INDEX CONCURRENTLY")
+        assert "CREATE INDEX CONCURRENTLY" in statements[1]
+
+        # An index another process is still building is left alone
+        db.execute_autocommit.reset_mock()
+        db.fetch_one.return_value = {"valid": False, "building": True}
+        assert await engine.initialize_index() is False
+        db.execute_autocommit.assert_not_called()
+
+    def test_required_literals(self):
+        assert required_literals(r"https?://[^\s]+") == [["http"], ["://"]]
+        assert required_literals(r"(invoice|receipt) no\. \d+") == [["invoice", "receipt"], [" no. "]]
+        assert required_literals(r"[a-z]+@[a-z]+\.com") == [[".com"]]
+        assert required_literals(r"\d{3}-\d{2}-\d{4}") == []
+        assert required_literals(r"ab(cd)?ef") == []
+
+    @pytest.mark.asyncio
+    async def test_stops_when_page_is_filled_and_estimates_totals(self):
+        db = FakeRegexDB([f"call 555-{i:04d} today" for i in range(50)], estimate=400)
+        engine = RegexSearchEngine(db, config={"scan_batch_size": 4})
+
+        result = await engine.search(RegexSearchQuery(pattern=r"555-\d{4}", limit=5))
+
+        assert [m.match_text for m in result.matches] == [f"555-{i:04d}" for i in range(5)]
+        assert result.matches[0].start_offset == 5 and result.matches[0].end_offset == 13
+        assert len(db.batches) == 2
+        assert db.explained
+        assert result.count_is_estimate
+        assert result.total_chunks_with_matches == 400
+        assert result.total_matches == 400
+
+    @pytest.mark.asyncio
+    async def test_last_short_batch_filling_page_is_exact(self):
+        db = FakeRegexDB([f"call 555-{i:04d} today" for i in range(6)], estimate=400)
+        engine = RegexSearchEngine(db, config={"scan_batch_size": 4})
+
+        result = await engine.search(RegexSearchQuery(pattern=r"555-\d{4}", limit=6))
+
+        assert len(result.matches) == 6
+        assert not result.count_is_estimate and not db.explained
+        assert result.total_matches == 6
+
+        # Stopping before the end of the short batch leaves rows unscanned
+        result = await engine.search(RegexSearchQuery(pattern=r"555-\d{4}", limit=5))
+
+        assert result.count_is_estimate
+
+    @pytest.mark.asyncio
+    async def test_exhausted_scan_reports_exact_counts_with_prefilter(self):
+        db = FakeRegexDB(["IBAN GB29 NWBK", "nothing", "iban de89 3704\nIBAN FR76 3000"])
+        engine = RegexSearchEngine(db)
+
+        result = await engine.search(RegexSearchQuery(
+            pattern=r"IBAN [A-Z]{2}\d{2}", flags=["case_insensitive"], limit=10,
+        ))
+
+        sql, params = db.batches[0]
+        assert "c.text ~* :pattern" in sql
+        assert "c.text ILIKE :lit_0_0" in sql and params["lit_0_0"] == "%IBAN %"
+        assert not result.count_is_estimate and not db.explained
+        assert result.total_matches == 3
+        assert result.total_chunks_with_matches == 2
+        assert result.documents_searched == 1
+        assert [m.line_number for m in result.matches] == [1, 1, 2]
@@ -5,10 +5,15 @@ Tests for the SearchShard class including initialization,
 lifecycle, and public API.
 """
 
+import asyncio
+import threading
+
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
 
-from arkham_shard_search.shard import SearchShard
+from arkham_frame.services.database import BACKEND_ASYNCPG, BACKEND_SQLALCHEMY
+from arkham_frame.services.events import EventBus
+from arkham_shard_search.shard import SearchShard, _background_db_task
 from arkham_shard_search.models import SearchMode
 
 
@@ -131,7 +136,7 @@ class TestShardInitialization:
         assert mock_event_bus.subscribe.call_count == 2
         event_names = [call[0][0] for call in mock_event_bus.subscribe.call_args_list]
         assert "documents.indexed" in event_names
-        assert "documents.deleted" in event_names
+        assert "documents.document.deleted" in event_names
 
     @pytest.mark.asyncio
     async def test_initialize_without_services(self, mock_frame):
@@ -207,6 +212,55 @@ class TestShardShutdown:
         assert shard.filter_optimizer is None
 
 
+class TestBackgroundIndexBuild:
+    """Tests for running index builds off the event loop."""
+
+    @staticmethod
+    async def _build_thread(backend):
+        db = MagicMock()
+        db.backend = backend
+
+        async def build():
+            await asyncio.sleep(0)
+            return threading.get_ident()
+
+        return await _background_db_task(db, build())
+
+    @pytest.mark.asyncio
+    async def test_blocking_backend_builds_in_worker_thread(self):
+        """Test the synchronous SQLAlchemy backend never runs on the loop thread."""
+        assert await self._build_thread(BACKEND_SQLALCHEMY) != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_asyncpg_backend_builds_on_loop(self):
+        """Test the native async backend stays on the event loop."""
+        assert await self._build_thread(BACKEND_ASYNCPG) == threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_cancel_reaches_worker_thread(self):
+        """Test cancelling the task stops the build in its thread."""
+        db = MagicMock()
+        db.backend = BACKEND_SQLALCHEMY
+        started = threading.Event()
+        stopped = threading.Event()
+
+        async def build():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                stopped.set()
+                raise
+
+        task = _background_db_task(db, build())
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert await asyncio.to_thread(stopped.wait, 5)
+
+
 class TestShardRoutes:
     """Tests for shard route configuration."""
 
@@ -248,11 +302,28 @@ class TestEventHandlers:
 
     @pytest.mark.asyncio
     async def test_on_document_deleted(self, initialized_shard):
-        """Test handling document deleted event."""
-        event = {"doc_id": "doc-123"}
+        """Test a deleted document's postings and pattern extractions are dropped."""
+        initialized_shard.keyword_engine.index_documents = AsyncMock()
+        initialized_shard._db = MagicMock()
+        initialized_shard._db.execute = AsyncMock()
 
-        # Should not raise
-        await initialized_shard._on_document_deleted(event)
+        bus = EventBus()
+        await bus.subscribe("documents.document.deleted", initialized_shard._on_document_deleted)
+        await bus.emit("documents.document.deleted", {"document_id": "doc-123"}, source="documents")
+
+        initialized_shard.keyword_engine.index_documents.assert_awaited_once_with(["doc-123"])
+        sql, params = initialized_shard._db.execute.await_args.args
+        assert "pattern_extractions" in sql
+        assert params == {"doc_id": "doc-123"}
+
+    @pytest.mark.asyncio
+    async def test_on_chunks_created_reindexes_document(self, initialized_shard):
+        """Test a chunk batch reindexes its document's BM25 postings."""
+        initialized_shard.keyword_engine.index_documents = AsyncMock()
+
+        await initialized_shard._on_chunks_created({"document_id": "doc-123", "chunk_ids": ["c1", "c2"]})
+
+        initialized_shard.keyword_engine.index_documents.assert_awaited_once_with(["doc-123"])
 
 
 class TestPublicSearchAPI:
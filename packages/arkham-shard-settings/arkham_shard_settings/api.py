@@ -451,12 +451,16 @@ async def get_vector_health(request: Request):
 
 
 @router.post("/vectors/reindex", response_model=VectorMaintenanceResponse)
-async def trigger_reindex_all(request: Request):
+async def trigger_reindex_all(
+    request: Request,
+    index_type: Optional[str] = Query(None, pattern="^(ivfflat|hnsw)$"),
+):
     """
     Trigger manual reindex of all vector collections.
 
-    This rebuilds all IVFFlat indexes with optimal parameters based on
-    current data distribution. Use after significant data changes.
+    This rebuilds all indexes with optimal parameters based on current data
+    distribution. Indexes are rebuilt online, so search stays available.
+    Pass index_type to switch collections between IVFFlat and HNSW.
     """
     shard = get_shard(request)
     frame = shard._frame
@@ -480,7 +484,7 @@ async def trigger_reindex_all(request: Request):
             raise HTTPException(status_code=500, detail=f"Reindex failed: {str(e)}")
 
     try:
-        result = await maintenance.reindex_all()
+        result = await maintenance.reindex_all(index_type=index_type)
         return VectorMaintenanceResponse(
             success=result.get("success", False),
             message=f"Reindexed {result.get('collections_reindexed', 0)} collection(s)",
@@ -492,12 +496,17 @@ async def trigger_reindex_all(request: Request):
 
 
 @router.post("/vectors/reindex/{collection_name}", response_model=VectorMaintenanceResponse)
-async def trigger_reindex_collection(collection_name: str, request: Request):
+async def trigger_reindex_collection(
+    collection_name: str,
+    request: Request,
+    index_type: Optional[str] = Query(None, pattern="^(ivfflat|hnsw)$"),
+):
     """
     Trigger manual reindex of a specific vector collection.
 
     Args:
         collection_name: Name of the collection to reindex
+        index_type: Optional index type to switch to (ivfflat or hnsw)
     """
     shard = get_shard(request)
     frame = shard._frame
@@ -509,7 +518,7 @@ async def trigger_reindex_collection(collection_name: str, request: Request):
             raise HTTPException(status_code=503, detail="Vector service not available")
 
         try:
-            result = await vectors.reindex_collection(collection_name)
+            result = await vectors.reindex_collection(collection_name, index_type=index_type)
             return VectorMaintenanceResponse(
                 success=True,
                 message=f"Reindexed collection '{collection_name}'",
@@ -520,7 +529,7 @@ async def trigger_reindex_collection(collection_name: str, request: Request):
             raise HTTPException(status_code=500, detail=f"Reindex failed: {str(e)}")
 
     try:
-        result = await maintenance.reindex_collection(collection_name)
+        result = await maintenance.reindex_collection(collection_name, index_type=index_type)
         return VectorMaintenanceResponse(
             success=result.get("success", False),
             message=f"Reindexed collection '{collection_name}'",
@@ -544,6 +553,19 @@ async def get_reindex_history(request: Request, limit: int = Query(20, ge=1, le=
     return {"history": maintenance.get_reindex_history(limit=limit)}
 
 
+@router.get("/vectors/reindex/progress")
+async def get_reindex_progress(request: Request):
+    """Get progress of running (or most recent) index builds per collection."""
+    shard = get_shard(request)
+    frame = shard._frame
+    vectors = frame.get_service("vectors")
+
+    if not vectors or not hasattr(vectors, "get_reindex_progress"):
+        return {"progress": {}, "message": "Vector service not available"}
+
+    return {"progress": vectors.get_reindex_progress()}
+
+
 @router.post("/data/reset-all", response_model=DataActionResponse)
 async def reset_all_data(request: Request):
     """Reset all data - database, vectors, and temp files."""